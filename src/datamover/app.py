@@ -2,14 +2,36 @@ import logging
 import queue
 import threading
 import time
-from typing import Any
+from typing import Any, Optional
 
+from datamover.file_functions.atomic_move import AtomicNoReplaceMover
+from datamover.file_functions.destination_name_index import DestinationNameIndex
 from datamover.file_functions.move_file_safely import move_file_safely_impl
-from datamover.file_functions.scan_directory_and_filter import scan_directory_and_filter
-from datamover.mover.thread_factory import create_file_move_thread
+from datamover.file_functions.scan_directory_and_filter import (
+    fast_iter_directory_and_filter,
+    iter_directory_and_filter,
+)
+from datamover.mover.fused_upload import (
+    FusedMoveUploader,
+    create_fused_move_uploader,
+)
+from datamover.mover.fused_upload_thread import FusedUploadThread
+from datamover.mover.thread_factory import create_file_move_threads
+from datamover.mover.move_journal import MoveJournal
+from datamover.mover.move_retry_heap import MoveRetryHeap
+from datamover.mover.spill_queue import SpillingQueue
+from datamover.mover.timed_queue import TimedQueue
+from datamover.protocols import SafeFileMover
 from datamover.purger.thread_factory import create_purger_thread
-from datamover.scanner.thread_factory import create_scan_thread
+from datamover.queues.claim_registry import ClaimRegistry
+from datamover.queues.manifest_index import ManifestIndex
+from datamover.scanner.thread_factory import (
+    create_close_write_trigger_thread,
+    create_scan_thread,
+    create_sharded_scan_thread,
+)
 from datamover.startup_code.context import AppContext
+from datamover.startup_code.load_config import volume_configs
 from datamover.tailer.thread_factory import create_csv_tailer_thread
 from datamover.uploader.thread_factory import (
     create_uploader_thread,
@@ -37,11 +59,60 @@ THREAD_JOIN_TIMEOUT = 5.0
 HEALTH_CHECK_INTERVAL_SECONDS = 5.0
 MOVE_QUEUE_MAXSIZE = 1000
 TAILER_EVENT_QUEUE_MAXSIZE = 1000
+MOVE_QUEUE_SPILL_FILENAME = "move_queue.spill"
+MOVE_JOURNAL_FILENAME = "move_queue.journal"
+SCANNER_STATE_FILENAME = "scanner.state"
+CLOSE_WRITE_DEFAULT_SUPPRESSION_TTL_SECONDS = 300.0
+
+
+def _replay_move_journal(journal: MoveJournal, move_queue: queue.Queue) -> None:
+    """
+    Puts the paths left pending by the previous run back on the move queue.
+
+    The queue must not have the journal attached yet: the paths are already
+    journaled, so they are loaded without a new record (and fsync) each.
+    """
+    pending = journal.replay()
+    replayed = 0
+    for path in pending:
+        try:
+            move_queue.put(path, block=False)
+        except queue.Full:
+            # Nothing consumes the queue yet; the scanner will find the rest
+            logger.warning(
+                "Move queue full during journal replay; %d path(s) left to the scanner.",
+                len(pending) - replayed,
+            )
+            break
+        replayed += 1
+    for path in pending[replayed:]:
+        journal.record_done(path)  # Not queued; the scanner journals it again
+    journal.compact()
+    if pending:
+        logger.info("Re-queued %d path(s) from the move journal.", replayed)
 
 
-def _initialize_queues() -> dict[str, queue.Queue]:
+def _initialize_queues(context: AppContext) -> dict[str, queue.Queue]:
     logger.debug("Initializing application queues...")
-    move_queue: queue.Queue = queue.Queue(maxsize=MOVE_QUEUE_MAXSIZE)
+    cfg = context.config
+    journal: Optional[MoveJournal] = None
+    if cfg.move_journal_enabled:
+        journal = MoveJournal(
+            journal_path=cfg.base_dir / MOVE_JOURNAL_FILENAME, fs=context.fs
+        )
+    # TimedQueue lets the mover workers report how long files wait to be moved
+    move_queue: TimedQueue
+    if cfg.move_queue_spill_enabled:
+        move_queue = SpillingQueue(
+            MOVE_QUEUE_MAXSIZE,
+            spill_path=cfg.base_dir / MOVE_QUEUE_SPILL_FILENAME,
+            fs=context.fs,
+        )
+    else:
+        move_queue = TimedQueue(maxsize=MOVE_QUEUE_MAXSIZE)
+    if journal is not None:
+        _replay_move_journal(journal, move_queue)
+        move_queue.journal = journal
     tailer_queue: queue.Queue = queue.Queue(maxsize=TAILER_EVENT_QUEUE_MAXSIZE)
     logger.info(
         "Application queues initialized (MoveQ: %d, TailerQ: %d).",
@@ -51,31 +122,189 @@ def _initialize_queues() -> dict[str, queue.Queue]:
     return {"move_queue": move_queue, "tailer_queue": tailer_queue}
 
 
-def _define_thread_factory_specs(
-    context: AppContext, queues: dict[str, queue.Queue]
-) -> list[dict[str, Any]]:
+def _select_file_mover(
+    context: AppContext, name_index: DestinationNameIndex
+) -> SafeFileMover:
+    if context.config.noreplace_move_enabled:
+        logger.info("Using atomic no-replace move engine.")
+        return AtomicNoReplaceMover(name_index=name_index)
+    return move_file_safely_impl
+
+
+def _build_claim_registry(context: AppContext) -> Optional[ClaimRegistry]:
+    ttl = context.config.duplicate_suppression_ttl_seconds
+    if ttl <= 0 and context.config.close_write_trigger_enabled:
+        # The close-write trigger and the tailer announce every file twice
+        ttl = CLOSE_WRITE_DEFAULT_SUPPRESSION_TTL_SECONDS
+    if ttl <= 0:
+        return None
+    logger.info("Duplicate move suppression enabled (completed TTL: %.1fs).", ttl)
+    return ClaimRegistry(completed_ttl_seconds=ttl)
+
+
+def _build_manifest_index(context: AppContext) -> Optional[ManifestIndex]:
     cfg = context.config
-    return [
-        {
+    # The fused upload path only takes files a manifest line announced
+    if not (cfg.manifest_reconciliation_enabled or cfg.fused_upload_enabled):
+        return None
+    logger.info(
+        "Manifest index enabled (up to %d announced files for %.1fs).",
+        cfg.manifest_index_max_entries,
+        cfg.manifest_index_ttl_seconds,
+    )
+    return ManifestIndex(
+        max_entries=cfg.manifest_index_max_entries,
+        ttl_seconds=cfg.manifest_index_ttl_seconds,
+    )
+
+
+def _build_move_retry_heap(context: AppContext) -> Optional[MoveRetryHeap]:
+    cfg = context.config
+    if cfg.move_retry_max_attempts <= 0:
+        return None
+    logger.info(
+        "Move retries enabled (up to %d attempt(s), backoff %.1fs to %.1fs).",
+        cfg.move_retry_max_attempts,
+        cfg.move_retry_initial_delay_seconds,
+        cfg.move_retry_max_delay_seconds,
+    )
+    return MoveRetryHeap(
+        max_attempts=cfg.move_retry_max_attempts,
+        initial_delay_seconds=cfg.move_retry_initial_delay_seconds,
+        max_delay_seconds=cfg.move_retry_max_delay_seconds,
+    )
+
+
+def _build_fused_uploader(
+    context: AppContext,
+    name_index: DestinationNameIndex,
+    manifest_index: Optional[ManifestIndex],
+) -> Optional[FusedMoveUploader]:
+    cfg = context.config
+    if not cfg.fused_upload_enabled or manifest_index is None:
+        return None
+    return create_fused_move_uploader(
+        source_dir_path=cfg.source_dir,
+        worker_dir_path=cfg.worker_dir,
+        uploaded_dir_path=cfg.uploaded_dir,
+        remote_url=cfg.remote_host_url,
+        request_timeout_seconds=cfg.request_timeout,
+        verify_ssl=cfg.verify_ssl,
+        http_client=context.http_client,
+        fs=context.fs,
+        is_announced=manifest_index.is_announced,
+        name_index=name_index,
+    )
+
+
+def _directory_scanner_spec(
+    context: AppContext,
+    queues: dict[str, queue.Queue],
+    claim_registry: Optional[ClaimRegistry],
+    manifest_index: Optional[ManifestIndex] = None,
+) -> dict[str, Any]:
+    """
+    The scanner spec: a ScanThread for the source directory, or a
+    ShardedScanThread when extra source directories are configured.
+    """
+    cfg = context.config
+
+    def common_args() -> dict[str, Any]:
+        return {
+            "csv_directory_to_put_restart_in": cfg.csv_dir,
+            "file_extension_to_scan": cfg.pcap_extension_no_dot,
+            "scan_interval_seconds": cfg.scanner_check_seconds,
+            "lost_timeout_seconds": cfg.lost_timeout_seconds,
+            "stuck_active_file_timeout_seconds": cfg.stuck_active_file_timeout_seconds,
+            "lost_file_queue": queues["move_queue"],
+            "stop_event": context.shutdown_event,
+            "fs": context.fs,
+            "time_func": time.time,
+            "monotonic_func": time.monotonic,
+            "claim_registry": claim_registry,
+            "manifest_index": manifest_index,
+            "fast_scan": cfg.fast_scan_enabled,
+            "wake_for_deadlines": cfg.deadline_wake_enabled,
+            "activity_rescan_seconds": (
+                cfg.activity_rescan_seconds if cfg.activity_tracking_enabled else None
+            ),
+            "state_file_path": (
+                cfg.base_dir / SCANNER_STATE_FILENAME
+                if cfg.scanner_state_enabled
+                else None
+            ),
+            "state_save_interval_seconds": cfg.scanner_state_save_seconds,
+            "adaptive_interval_bounds": (
+                (cfg.scanner_min_check_seconds, cfg.scanner_max_check_seconds)
+                if cfg.adaptive_interval_enabled
+                else None
+            ),
+            "cadence_factors": (
+                (cfg.cadence_lost_factor, cfg.cadence_stuck_factor)
+                if cfg.cadence_thresholds_enabled
+                else None
+            ),
+            "app_overrun_factor": (
+                cfg.app_overrun_factor if cfg.app_health_enabled else None
+            ),
+            "open_writer_producers": (
+                (cfg.open_writer_process_names, cfg.open_writer_user_ids)
+                if cfg.open_writer_check_enabled
+                else None
+            ),
+        }
+
+    if cfg.extra_source_dirs:
+        return {
             "key": "directory_scanner",
-            "factory": create_scan_thread,
+            "factory": create_sharded_scan_thread,
             "args_builder": lambda: {
-                "scan_directory_path": cfg.source_dir,
-                "csv_directory_to_put_restart_in": cfg.csv_dir,
-                "file_extension_to_scan": cfg.pcap_extension_no_dot,
-                "scan_interval_seconds": cfg.scanner_check_seconds,
-                "lost_timeout_seconds": cfg.lost_timeout_seconds,
-                "stuck_active_file_timeout_seconds": cfg.stuck_active_file_timeout_seconds,
-                "lost_file_queue": queues["move_queue"],
-                "stop_event": context.shutdown_event,
-                "fs": context.fs,
-                "time_func": time.time,
-                "monotonic_func": time.monotonic,
+                "scan_directory_paths": [cfg.source_dir, *cfg.extra_source_dirs],
+                "max_workers": cfg.scanner_workers,
+                **common_args(),
             },
+        }
+    return {
+        "key": "directory_scanner",
+        "factory": create_scan_thread,
+        "args_builder": lambda: {
+            "scan_directory_path": cfg.source_dir,
+            **common_args(),
         },
+    }
+
+
+def _define_thread_factory_specs(
+    context: AppContext, queues: dict[str, queue.Queue]
+) -> list[dict[str, Any]]:
+    cfg = context.config
+    # Shared by every no-replace rename into the worker/uploaded/dead letter dirs
+    name_index = DestinationNameIndex(fs=context.fs)
+    file_mover = _select_file_mover(context, name_index)
+    claim_registry = _build_claim_registry(context)
+    manifest_index = _build_manifest_index(context)
+    fused_uploaders: dict[str, Optional[FusedMoveUploader]] = {}
+
+    def fused_uploader() -> Optional[FusedMoveUploader]:
+        # Built with the first component that needs it (validating its dirs
+        # and recovering in-flight files), then shared by the mover threads
+        # and its own upload thread
+        if "shared" not in fused_uploaders:
+            fused_uploaders["shared"] = _build_fused_uploader(
+                context, name_index, manifest_index
+            )
+        return fused_uploaders["shared"]
+
+    specs: list[dict[str, Any]] = [
+        _directory_scanner_spec(
+            context,
+            queues,
+            claim_registry,
+            manifest_index if cfg.manifest_reconciliation_enabled else None,
+        ),
         {
             "key": "file_mover",
-            "factory": create_file_move_thread,
+            "factory": create_file_move_threads,
             "args_builder": lambda: {
                 "source_dir_path": cfg.source_dir,
                 "worker_dir_path": cfg.worker_dir,
@@ -83,7 +312,15 @@ def _define_thread_factory_specs(
                 "source_queue": queues["move_queue"],
                 "stop_event": context.shutdown_event,
                 "fs": context.fs,
+                "file_mover_func": file_mover,
                 "sleep_func": time.sleep,
+                "fused_uploader": fused_uploader(),
+                "claim_registry": claim_registry,
+                "worker_count": cfg.mover_worker_count,
+                "batch_size": cfg.mover_batch_size,
+                "move_journal": getattr(queues["move_queue"], "journal", None),
+                "retry_heap": _build_move_retry_heap(context),
+                "extra_source_dir_paths": cfg.extra_source_dirs,
             },
         },
         {
@@ -98,6 +335,10 @@ def _define_thread_factory_specs(
                 "fs": context.fs,
                 "file_scanner": context.file_scanner,
                 "poll_interval": cfg.event_queue_poll_timeout_seconds,
+                "claim_registry": claim_registry,
+                "manifest_index": manifest_index,
+                "coalesce_modified_events": cfg.modify_coalescing_enabled,
+                "fd_cache_max_open": cfg.fd_cache_max_open,
             },
         },
         {
@@ -122,8 +363,12 @@ def _define_thread_factory_specs(
                 "stop_event": context.shutdown_event,
                 "fs": context.fs,
                 "http_client": context.http_client,
-                "file_scanner_impl": scan_directory_and_filter,
-                "safe_file_mover_impl": move_file_safely_impl,
+                "file_scanner_impl": (
+                    fast_iter_directory_and_filter
+                    if cfg.fast_scan_enabled
+                    else iter_directory_and_filter
+                ),
+                "safe_file_mover_impl": file_mover,
             },
         },
         {
@@ -137,9 +382,95 @@ def _define_thread_factory_specs(
                 "target_disk_usage_percent": cfg.target_disk_usage_percent,
                 "check_interval_seconds": cfg.purger_poll_interval_seconds,
                 "stop_event": context.shutdown_event,
+                "fast_scan": cfg.fast_scan_enabled,
             },
         },
     ]
+    if cfg.fused_upload_enabled and manifest_index is not None:
+        specs.append(
+            {
+                "key": "fused_uploader",
+                "factory": FusedUploadThread,
+                "args_builder": lambda: {
+                    "fused_uploader": fused_uploader(),
+                    "stop_event": context.shutdown_event,
+                    "poll_interval": cfg.move_poll_interval_seconds,
+                },
+            }
+        )
+    if cfg.close_write_trigger_enabled:
+        specs.append(
+            {
+                "key": "close_write_trigger",
+                "factory": create_close_write_trigger_thread,
+                "args_builder": lambda: {
+                    "scan_directory_path": cfg.source_dir,
+                    "file_extension_to_scan": cfg.pcap_extension_no_dot,
+                    "settle_seconds": cfg.close_write_settle_seconds,
+                    "move_queue": queues["move_queue"],
+                    "stop_event": context.shutdown_event,
+                    "fs": context.fs,
+                    "claim_registry": claim_registry,
+                    "manifest_index": manifest_index,
+                },
+            }
+        )
+    return specs
+
+
+def _extra_volume_contexts(context: AppContext) -> list[AppContext]:
+    """
+    Builds a context for each extra volume. They share the primary context's
+    filesystem, HTTP client, file scanner and shutdown event; only the
+    directories in their config differ.
+    """
+    volume_contexts: list[AppContext] = []
+    for volume_cfg in volume_configs(context.config)[1:]:
+        volume_context = AppContext(
+            config=volume_cfg,
+            fs=context.fs,
+            http_client=context.http_client,
+            file_scanner=context.file_scanner,
+        )
+        volume_context.shutdown_event = context.shutdown_event
+        volume_contexts.append(volume_context)
+    return volume_contexts
+
+
+def _define_volume_specs(
+    context: AppContext,
+    queue_sets: Optional[list[dict[str, queue.Queue]]] = None,
+) -> list[dict[str, Any]]:
+    """
+    Builds queues and a full pipeline for each extra volume. Component keys
+    get a 'volumeN_' prefix and thread names a 'VolumeN-' prefix. Each
+    volume's queues are appended to queue_sets, if given, so they can be
+    closed at shutdown.
+    """
+    specs: list[dict[str, Any]] = []
+    for index, volume_context in enumerate(_extra_volume_contexts(context), start=2):
+        logger.info(
+            "Defining pipeline for volume %d at %s.",
+            index,
+            volume_context.config.base_dir,
+        )
+        volume_queues = _initialize_queues(volume_context)
+        if queue_sets is not None:
+            queue_sets.append(volume_queues)
+        for spec in _define_thread_factory_specs(volume_context, volume_queues):
+            specs.append(
+                {
+                    **spec,
+                    "key": f"volume{index}_{spec['key']}",
+                    "name_prefix": f"Volume{index}-",
+                }
+            )
+    return specs
+
+
+def _apply_name_prefix(instance: Any, name_prefix: str) -> None:
+    if name_prefix and hasattr(instance, "name"):
+        instance.name = f"{name_prefix}{instance.name}"
 
 
 def _build_components(specs: list[dict[str, Any]]) -> tuple[dict[str, Any], list[Any]]:
@@ -148,20 +479,38 @@ def _build_components(specs: list[dict[str, Any]]) -> tuple[dict[str, Any], list
 
     for spec in specs:
         component_key_being_built = spec["key"]
+        name_prefix = spec.get("name_prefix", "")
         logger.info("Building component %s...", component_key_being_built)
         instance_or_tuple = spec["factory"](**spec["args_builder"]())
 
-        if component_key_being_built == "csv_tailer_components":
+        if component_key_being_built.endswith("csv_tailer_components"):
+            key_prefix = component_key_being_built[: -len("csv_tailer_components")]
             observer, consumer = instance_or_tuple  # type: ignore[misc]
-            components["observer"] = observer
-            components["csv_tail_consumer"] = consumer
+            _apply_name_prefix(observer, name_prefix)
+            _apply_name_prefix(consumer, name_prefix)
+            components[f"{key_prefix}observer"] = observer
+            components[f"{key_prefix}csv_tail_consumer"] = consumer
             to_join.extend([observer, consumer])
             if hasattr(observer, "daemon"):
                 observer.daemon = True
             if hasattr(consumer, "daemon"):
                 consumer.daemon = True
+        elif isinstance(instance_or_tuple, list):
+            # A pool of identical workers; a single worker keeps the plain key
+            for index, instance in enumerate(instance_or_tuple, start=1):
+                key = (
+                    component_key_being_built
+                    if len(instance_or_tuple) == 1
+                    else f"{component_key_being_built}_{index}"
+                )
+                _apply_name_prefix(instance, name_prefix)
+                components[key] = instance
+                to_join.append(instance)
+                if hasattr(instance, "daemon"):
+                    instance.daemon = True
         else:
             instance = instance_or_tuple
+            _apply_name_prefix(instance, name_prefix)
             components[component_key_being_built] = instance
             to_join.append(instance)
             if hasattr(instance, "daemon"):
@@ -217,15 +566,21 @@ def _stop_and_join_components(
 ) -> None:
     shutdown_event.set()
 
-    observer = components.get("observer")
-    if observer and observer.is_alive():
-        logger.info("Stopping observer...")
-        observer.stop()
-
-    csv_consumer = components.get("csv_tail_consumer")
-    if csv_consumer and csv_consumer.is_alive() and hasattr(csv_consumer, "stop"):
-        logger.info("Stopping csv_tail_consumer...")
-        csv_consumer.stop()
+    # One observer and consumer per volume ('observer', 'volume2_observer', ...)
+    for key, observer in components.items():
+        if key.endswith("observer") and observer and observer.is_alive():
+            logger.info("Stopping %s...", key)
+            observer.stop()
+
+    for key, csv_consumer in components.items():
+        if (
+            key.endswith("csv_tail_consumer")
+            and csv_consumer
+            and csv_consumer.is_alive()
+            and hasattr(csv_consumer, "stop")
+        ):
+            logger.info("Stopping %s...", key)
+            csv_consumer.stop()
 
     logger.info("Joining all components...")
     for obj in to_join:
@@ -237,15 +592,32 @@ def _stop_and_join_components(
                 logger.warning("%s did not shut down cleanly.", name)
 
 
+def _close_queues(queue_sets: list[dict[str, queue.Queue]]) -> None:
+    """
+    Closes the spill files and move journals behind the move queues. Called
+    once the mover threads are joined, so nothing writes to them any more.
+    """
+    for queues in queue_sets:
+        move_queue = queues["move_queue"]
+        if isinstance(move_queue, SpillingQueue):
+            move_queue.close()
+        journal = getattr(move_queue, "journal", None)
+        if journal is not None:
+            journal.close()
+
+
 def run(context: AppContext) -> None:
     thread_components: dict[str, Any] = {}
     objects_to_join: list[Any] = []
+    queue_sets: list[dict[str, queue.Queue]] = []
 
     logger.info("Starting main application run loop...")
     try:
         # --- Setup Phase ---
-        queues = _initialize_queues()
+        queues = _initialize_queues(context)
+        queue_sets.append(queues)
         specs = _define_thread_factory_specs(context, queues)
+        specs.extend(_define_volume_specs(context, queue_sets))
         thread_components, objects_to_join = _build_components(specs)
         _start_components(thread_components, context.shutdown_event)
         # --- End of Setup Phase ---
@@ -298,4 +670,5 @@ def run(context: AppContext) -> None:
         _stop_and_join_components(
             thread_components, objects_to_join, context.shutdown_event
         )
+        _close_queues(queue_sets)
         logger.info("Application shutdown complete.")
@@ -6,7 +6,11 @@ from time import sleep
 
 from datamover.startup_code.cli import parse_args
 from datamover.file_functions.create_directories import create_directories
-from datamover.startup_code.load_config import load_config, ConfigError
+from datamover.startup_code.load_config import (
+    ConfigError,
+    load_config,
+    volume_configs,
+)
 from datamover.startup_code.context import build_context
 from datamover.startup_code.logger_setup import (
     LoggingConfigurationError,
@@ -112,18 +116,19 @@ def main_entrypoint():
 
     # 6. Ensure the base directory exists and create operational directories
     try:
-        if not context.fs.exists(context.config.base_dir):
-            logger.critical(
-                "Base directory %s does not exist and is required. Please create it or check configuration.",
-                context.config.base_dir,
+        for volume_cfg in volume_configs(context.config):
+            if not context.fs.exists(volume_cfg.base_dir):
+                logger.critical(
+                    "Base directory %s does not exist and is required. Please create it or check configuration.",
+                    volume_cfg.base_dir,
+                )
+                sys.exit(EX_CONFIG)  # Base dir is config dependent
+
+            create_directories(cfg=volume_cfg, fs=context.fs)
+            logger.info(
+                "Required operational directories verified/created under %s.",
+                volume_cfg.base_dir,
             )
-            sys.exit(EX_CONFIG)  # Base dir is config dependent
-
-        create_directories(cfg=context.config, fs=context.fs)
-        logger.info(
-            "Required operational directories verified/created under %s.",
-            context.config.base_dir,
-        )
     except ConfigError as e:  # create_directories might raise this for same-fs check
         logger.critical(
             "Directory setup failed due to configuration issue: %s", e, exc_info=True
@@ -0,0 +1,319 @@
+import logging
+import stat
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from datamover.file_functions.destination_name_index import DestinationNameIndex
+from datamover.file_functions.fs_mock import FS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFLICT_LIMIT = 100
+DEFAULT_REPORT_EVERY_MOVES = 1000
+
+
+@dataclass(frozen=True)
+class MoveEngineStats:
+    """Snapshot of the counters kept by AtomicNoReplaceMover."""
+
+    moves: int
+    failures: int
+    conflicts: int
+    syscalls: int
+
+    @property
+    def syscalls_per_move(self) -> float:
+        attempts = self.moves + self.failures
+        return self.syscalls / attempts if attempts else 0.0
+
+
+def rename_into_noreplace(
+    source_path: Path,
+    destination_dir: Path,
+    *,
+    fs: FS,
+    target_name: Optional[str] = None,
+    limit: int = DEFAULT_CONFLICT_LIMIT,
+    name_index: Optional[DestinationNameIndex] = None,
+) -> tuple[Path, int, int]:
+    """
+    Renames source_path into destination_dir without ever overwriting.
+
+    The plain name is tried first, then 'stem-1.suffix', 'stem-2.suffix', ...
+    Each attempt is a single no-replace rename; a conflict is detected
+    atomically by the rename failing with EEXIST, so there is no window
+    between checking a name and using it.
+
+    With a name_index, the first attempt uses the suffix the index reserves,
+    and a conflict re-reads the directory once (one listdir) to jump past
+    the highest existing suffix instead of probing upwards one at a time.
+
+    Args:
+        source_path: The file to rename.
+        destination_dir: The directory to rename it into (same filesystem).
+        fs: Filesystem abstraction providing rename_noreplace.
+        target_name: Name to use in destination_dir. Defaults to the
+                     source file's name.
+        limit: Maximum number of conflicts before giving up. With a
+               name_index this only counts races with other writers after
+               the index was refreshed.
+        name_index: Optional shared index of next free suffixes.
+
+    Returns:
+        A tuple (final_path, syscalls, conflicts).
+
+    Raises:
+        FileExistsError: If more than limit candidate names were taken.
+        OSError: Any other rename failure (including FileNotFoundError if the
+                 source vanished), with nothing changed on disk.
+    """
+    name = target_name if target_name is not None else source_path.name
+    base = destination_dir / name
+    stem, suffix = base.stem, base.suffix
+
+    syscalls = 0
+    conflicts = 0
+    refreshed = False
+    n = 0 if name_index is None else name_index.reserve(destination_dir, name)
+    while True:
+        candidate = base if n == 0 else destination_dir / f"{stem}-{n}{suffix}"
+        try:
+            syscalls += fs.rename_noreplace(source_path, candidate)
+            return candidate, syscalls, conflicts
+        except FileExistsError:
+            syscalls += 1
+            conflicts += 1
+            if conflicts > limit:
+                raise FileExistsError(
+                    f"No free name for '{name}' in '{destination_dir}' "
+                    f"within {limit} attempts"
+                )
+        if name_index is None:
+            n += 1
+        elif not refreshed:
+            refreshed = True
+            syscalls += 1
+            try:
+                n = name_index.refresh(destination_dir, name)
+            except OSError as e:
+                logger.warning(
+                    "Could not list '%s' to resolve a name conflict: %s",
+                    destination_dir,
+                    e,
+                )
+                n += 1
+        else:
+            # Lost a race for a reserved name; take the next one
+            n = name_index.reserve(destination_dir, name)
+
+
+class AtomicNoReplaceMover:
+    """
+    SafeFileMover built on a no-replace rename instead of exists() + shutil.move.
+
+    move_file_safely_impl needs lstat, resolve(strict), access, one or more
+    exists() probes and a shutil.move (which stats again) for every file, and
+    the exists()/move pair is racy. This engine does:
+
+      1. One lstat: the source must exist and be a regular file (symlinks
+         are rejected, as validate_file does).
+      2. A lexical confinement check against expected_source_dir. Only if
+         the path is not lexically inside it is the parent directory
+         resolved once, so symlinked base paths keep working.
+      3. rename_into_noreplace: one rename per candidate name; EEXIST moves
+         on to the next '-N' suffix (or, with a DestinationNameIndex, past
+         the highest suffix already on disk).
+
+    A typical move is therefore two syscalls (lstat + renameat2), or three
+    with the link()+unlink() fallback. Unlike validate_file, readability is
+    not checked: a rename only needs write access to the directories, and
+    the uploader reports files it cannot read.
+
+    All application directories live on one filesystem (enforced by
+    create_directories), which the no-replace rename requires.
+
+    Instances are thread-safe and keep running counters, logged every
+    `report_every` moves and available through stats().
+    """
+
+    def __init__(
+        self,
+        *,
+        conflict_limit: int = DEFAULT_CONFLICT_LIMIT,
+        report_every: int = DEFAULT_REPORT_EVERY_MOVES,
+        name_index: Optional[DestinationNameIndex] = None,
+    ):
+        """
+        Args:
+            conflict_limit: Maximum number of '-N' name variants to try.
+            report_every: Log the counters every this many successful moves
+                          (0 disables periodic reporting).
+            name_index: Optional index of next free '-N' suffixes, shared by
+                        everything that moves files with this engine.
+        """
+        self._conflict_limit = conflict_limit
+        self._name_index = name_index
+        self._report_every = report_every
+        self._lock = threading.Lock()
+        self._moves = 0
+        self._failures = 0
+        self._conflicts = 0
+        self._syscalls = 0
+
+    def stats(self) -> MoveEngineStats:
+        """Returns a consistent snapshot of the counters."""
+        with self._lock:
+            return MoveEngineStats(
+                moves=self._moves,
+                failures=self._failures,
+                conflicts=self._conflicts,
+                syscalls=self._syscalls,
+            )
+
+    def _record(self, *, moved: bool, syscalls: int, conflicts: int) -> None:
+        with self._lock:
+            if moved:
+                self._moves += 1
+            else:
+                self._failures += 1
+            self._syscalls += syscalls
+            self._conflicts += conflicts
+            report = (
+                moved and self._report_every > 0 and self._moves % self._report_every == 0
+            )
+        if report:
+            snapshot = self.stats()
+            logger.info(
+                "Move engine: %d moved, %d failed, %d name conflicts, "
+                "%.2f syscalls/move.",
+                snapshot.moves,
+                snapshot.failures,
+                snapshot.conflicts,
+                snapshot.syscalls_per_move,
+            )
+
+    def _confined_source(
+        self, source_path: Path, expected_source_dir: Path, fs: FS
+    ) -> tuple[Optional[Path], int]:
+        """
+        Returns (path to move, syscalls), or (None, syscalls) if the file is
+        not directly within expected_source_dir.
+        """
+        if source_path.is_absolute() and source_path.parent == expected_source_dir:
+            return source_path, 0
+        try:
+            resolved_parent = fs.resolve(source_path.parent, strict=True)
+        except OSError as e:
+            logger.error(
+                "Move aborted for '%s': cannot resolve parent directory: %s",
+                source_path,
+                e,
+            )
+            return None, 1
+        if resolved_parent != expected_source_dir:
+            logger.error(
+                "Move aborted for '%s': not directly within expected directory '%s'.",
+                source_path,
+                expected_source_dir,
+            )
+            return None, 1
+        return expected_source_dir / source_path.name, 1
+
+    def __call__(
+        self,
+        *,
+        source_path_raw: Path,
+        destination_dir: Path,
+        fs: FS,
+        expected_source_dir: Optional[Path] = None,
+    ) -> Optional[Path]:
+        """
+        Moves source_path_raw into destination_dir, never overwriting.
+
+        Args:
+            source_path_raw: The raw, unverified source file Path.
+            destination_dir: The existing, resolved target directory Path.
+            fs: A filesystem abstraction instance for all file operations.
+            expected_source_dir: Optional. If provided, the source file must
+                                 be directly within this (resolved) directory.
+
+        Returns:
+            The final destination Path on success, None on any failure
+            (logged here).
+        """
+        syscalls = 0
+        source_path = Path(source_path_raw)
+
+        try:
+            st = fs.lstat(source_path)
+            syscalls += 1
+        except FileNotFoundError:
+            logger.warning("Move skipped: source '%s' does not exist.", source_path)
+            self._record(moved=False, syscalls=1, conflicts=0)
+            return None
+        except OSError as e:
+            logger.error("Move aborted for '%s': lstat failed: %s", source_path, e)
+            self._record(moved=False, syscalls=1, conflicts=0)
+            return None
+
+        if not stat.S_ISREG(st.st_mode):
+            logger.error(
+                "Move aborted for '%s': not a regular file (mode %o).",
+                source_path,
+                st.st_mode,
+            )
+            self._record(moved=False, syscalls=syscalls, conflicts=0)
+            return None
+
+        if expected_source_dir is not None:
+            confined_path, extra = self._confined_source(
+                source_path, expected_source_dir, fs
+            )
+            syscalls += extra
+            if confined_path is None:
+                self._record(moved=False, syscalls=syscalls, conflicts=0)
+                return None
+            source_path = confined_path
+
+        try:
+            final_path, rename_syscalls, conflicts = rename_into_noreplace(
+                source_path,
+                destination_dir,
+                fs=fs,
+                limit=self._conflict_limit,
+                name_index=self._name_index,
+            )
+        except FileExistsError as e:
+            logger.error("Move aborted for '%s': %s", source_path, e)
+            self._record(
+                moved=False,
+                syscalls=syscalls + self._conflict_limit + 1,
+                conflicts=self._conflict_limit + 1,
+            )
+            return None
+        except FileNotFoundError as e:
+            logger.warning(
+                "Move skipped: '%s' vanished before it could be renamed: %s",
+                source_path,
+                e,
+            )
+            self._record(moved=False, syscalls=syscalls + 1, conflicts=0)
+            return None
+        except OSError as e:
+            logger.error(
+                "Move aborted for '%s' -> '%s': %s", source_path, destination_dir, e
+            )
+            self._record(moved=False, syscalls=syscalls + 1, conflicts=0)
+            return None
+
+        syscalls += rename_syscalls
+        self._record(moved=True, syscalls=syscalls, conflicts=conflicts)
+        logger.debug(
+            "Successfully moved '%s' to '%s' (%d syscalls)",
+            source_path,
+            final_path,
+            syscalls,
+        )
+        return final_path
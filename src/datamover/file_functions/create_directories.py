@@ -14,7 +14,9 @@ def create_directories(cfg: Config, fs: FS) -> None:  # <-- Inject fs: FS
     an injected FS object for all filesystem interactions.
 
     Ensures `base_dir` exists and is a directory. Creates other required dirs
-    if missing. Validates all required dirs are on the same device as `base_dir`.
+    if missing. Validates all required dirs are on the same device as `base_dir`,
+    except that with `tiered_storage_enabled` the worker, uploaded and
+    dead-letter dirs may live on other devices (moves into them are copied).
 
     Args:
         cfg: The application Config object (assumed typed correctly).
@@ -72,6 +74,9 @@ def create_directories(cfg: Config, fs: FS) -> None:  # <-- Inject fs: FS
         raise ConfigError(msg) from e_base
 
     # --- 2. Ensure Other Directories Exist on Correct Device ---
+    tiered_paths: set[Path] = set()
+    if cfg.tiered_storage_enabled:
+        tiered_paths = {cfg.worker_dir, cfg.uploaded_dir, cfg.dead_letter_dir}
     sorted_paths = sorted(list(paths_to_process))
 
     for path in sorted_paths:
@@ -98,7 +103,15 @@ def create_directories(cfg: Config, fs: FS) -> None:  # <-- Inject fs: FS
             current_dev = get_device(path, fs=fs)
 
             # Compare device ID
-            if current_dev != base_dev:
+            if current_dev != base_dev and path in tiered_paths:
+                logger.info(
+                    "Tiered storage: directory '%s' is on device %d (base directory "
+                    "on %d); moves into it will be copied across devices.",
+                    path,
+                    current_dev,
+                    base_dev,
+                )
+            elif current_dev != base_dev:
                 raise ConfigError(
                     f"Directory '{path}' (device {current_dev}) is not on the same filesystem as base directory '{base_dir}' (device {base_dev})."
                 )
@@ -0,0 +1,284 @@
+import dataclasses
+import errno
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+from datamover.file_functions.fs_mock import FS
+from datamover.file_functions.rename_noreplace import rename_noreplace
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_CONCURRENT_COPIES = 2
+DEFAULT_REPORT_EVERY_COPIES = 100
+
+# errno values meaning "copy_file_range cannot do this pair of files"
+# (kernel before 5.3 across filesystems, or a filesystem without support).
+_COPY_RANGE_UNSUPPORTED = frozenset(
+    {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP}
+)
+
+_copy_file_range: Optional[Callable[..., int]] = getattr(os, "copy_file_range", None)
+
+
+@dataclass(frozen=True)
+class CrossDeviceCopyStats:
+    """Snapshot of the CrossDeviceMover counters."""
+
+    copies: int
+    failures: int
+    bytes_copied: int
+    copy_seconds: float
+    max_copy_seconds: float
+    fallback_copies: int
+
+    @property
+    def bytes_per_second(self) -> float:
+        return self.bytes_copied / self.copy_seconds if self.copy_seconds else 0.0
+
+
+class CrossDeviceMover:
+    """
+    Moves files between filesystems for the tiered storage layout.
+
+    A move is first attempted as a plain rename, which is what happens for
+    every move between directories on the same device. Only when that fails
+    with EXDEV is the file copied: into a hidden temporary file next to the
+    destination with os.copy_file_range (in-kernel, no copy through user
+    space) in `chunk_bytes` pieces, then size-checked, fsynced, given the
+    source's timestamps, renamed to its final name, the destination
+    directory fsynced so the rename is durable, and the source unlinked.
+    If copy_file_range cannot handle the pair of filesystems, a buffered
+    copy is used instead.
+
+    At most `max_concurrent_copies` copies run at once, so several mover and
+    uploader threads cannot saturate the slow device together; further
+    copies wait their turn. Throughput figures are logged every
+    `report_every` copies and are available through stats().
+
+    move() and rename_noreplace() match the FS fields of the same name;
+    with_cross_device_moves() installs them on an FS.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrent_copies: int = DEFAULT_MAX_CONCURRENT_COPIES,
+        chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+        monotonic_func: Callable[[], float] = time.monotonic,
+        report_every: int = DEFAULT_REPORT_EVERY_COPIES,
+        rename_func: Callable[[PathLike, PathLike], None] = os.rename,
+        rename_noreplace_func: Callable[[PathLike, PathLike], int] = rename_noreplace,
+    ):
+        """
+        Args:
+            max_concurrent_copies: Cross-device copies allowed at once (>= 1).
+            chunk_bytes: Bytes requested per copy_file_range call.
+            monotonic_func: Clock used for copy timings.
+            report_every: Log the counters every this many copies
+                          (0 disables periodic reporting).
+            rename_func: Same-device rename used by move().
+            rename_noreplace_func: Same-device no-replace rename used by
+                                   rename_noreplace().
+
+        Raises:
+            ValueError: If max_concurrent_copies or chunk_bytes is not positive.
+        """
+        if max_concurrent_copies < 1:
+            raise ValueError(
+                f"max_concurrent_copies must be at least 1, got {max_concurrent_copies}"
+            )
+        if chunk_bytes < 1:
+            raise ValueError(f"chunk_bytes must be positive, got {chunk_bytes}")
+        self._slots = threading.BoundedSemaphore(max_concurrent_copies)
+        self._chunk_bytes = chunk_bytes
+        self._monotonic = monotonic_func
+        self._report_every = report_every
+        self._rename = rename_func
+        self._rename_noreplace = rename_noreplace_func
+
+        self._lock = threading.Lock()
+        self._copies = 0
+        self._failures = 0
+        self._bytes_copied = 0
+        self._copy_seconds = 0.0
+        self._max_copy_seconds = 0.0
+        self._fallback_copies = 0
+
+    def move(self, src: PathLike, dst: PathLike) -> None:
+        """
+        Moves src to dst, replacing dst if it exists (like os.rename).
+
+        Raises:
+            OSError: If the rename or the copy fails; src is left in place.
+        """
+        try:
+            self._rename(src, dst)
+            return
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        self._copy_then_unlink(Path(src), Path(dst), noreplace=False)
+
+    def rename_noreplace(self, src: PathLike, dst: PathLike) -> int:
+        """
+        Renames src to dst, failing if dst exists; copies across devices.
+
+        Returns:
+            The number of rename/unlink syscalls issued (the copy itself is
+            not counted).
+
+        Raises:
+            FileExistsError: If dst already exists; src is left in place.
+            OSError: For any other failure; src is left in place.
+        """
+        try:
+            return self._rename_noreplace(src, dst)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+        # Cheap early answer for taken names, so a conflict costs no copy;
+        # the final no-replace rename still decides
+        if os.path.lexists(dst):
+            raise FileExistsError(errno.EEXIST, os.strerror(errno.EEXIST), str(dst))
+        return self._copy_then_unlink(Path(src), Path(dst), noreplace=True)
+
+    def _copy_then_unlink(self, src: Path, dst: Path, *, noreplace: bool) -> int:
+        tmp = dst.with_name(f".{dst.name}.{os.getpid()}.{threading.get_ident()}.part")
+        with self._slots:
+            started = self._monotonic()
+            try:
+                size, used_fallback = self._copy_to(src, tmp)
+                if noreplace:
+                    syscalls = self._rename_noreplace(tmp, dst)
+                else:
+                    self._rename(tmp, dst)
+                    syscalls = 1
+            except BaseException:
+                with self._lock:
+                    self._failures += 1
+                try:
+                    os.unlink(tmp)
+                except OSError:
+                    pass
+                raise
+            elapsed = self._monotonic() - started
+
+        # The rename must be durable before the source goes: otherwise a crash
+        # can keep the unlink on one device and lose the rename on the other
+        _fsync_directory(dst.parent)
+        try:
+            os.unlink(src)
+        except FileNotFoundError:
+            pass
+        self._record_copy(size, elapsed, used_fallback)
+        logger.debug(
+            "Copied '%s' to '%s' across devices (%d bytes in %.3fs).",
+            src,
+            dst,
+            size,
+            elapsed,
+        )
+        return syscalls + 1
+
+    def _copy_to(self, src: Path, tmp: Path) -> tuple[int, bool]:
+        """Copies src into the new file tmp. Returns (size, used_fallback)."""
+        used_fallback = False
+        with open(src, "rb") as fsrc:
+            st = os.fstat(fsrc.fileno())
+            # A crashed run may have left this temp name behind; O_EXCL would
+            # then fail with EEXIST, which reads as a taken destination name
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+            fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+            with open(fd, "wb") as fdst:
+                if _copy_file_range is not None:
+                    try:
+                        self._copy_range(fsrc.fileno(), fdst.fileno())
+                    except OSError as e:
+                        if e.errno not in _COPY_RANGE_UNSUPPORTED:
+                            raise
+                        used_fallback = True
+                else:
+                    used_fallback = True
+                if used_fallback:
+                    # Start over; copy_file_range may have advanced both offsets
+                    fsrc.seek(0)
+                    fdst.seek(0)
+                    fdst.truncate()
+                    shutil.copyfileobj(fsrc, fdst, min(self._chunk_bytes, 1 << 20))
+                    fdst.flush()
+                written = os.fstat(fdst.fileno()).st_size
+                if written != st.st_size:
+                    raise OSError(
+                        errno.EIO,
+                        f"Size mismatch after copy: {written} of {st.st_size} bytes",
+                        str(tmp),
+                    )
+                os.fsync(fdst.fileno())
+        os.utime(tmp, ns=(st.st_atime_ns, st.st_mtime_ns))
+        return st.st_size, used_fallback
+
+    def _copy_range(self, in_fd: int, out_fd: int) -> None:
+        assert _copy_file_range is not None
+        while _copy_file_range(in_fd, out_fd, self._chunk_bytes):
+            pass
+
+    def _record_copy(self, size: int, elapsed: float, used_fallback: bool) -> None:
+        with self._lock:
+            self._copies += 1
+            self._bytes_copied += size
+            self._copy_seconds += elapsed
+            self._max_copy_seconds = max(self._max_copy_seconds, elapsed)
+            if used_fallback:
+                self._fallback_copies += 1
+            copies = self._copies
+        if self._report_every > 0 and copies % self._report_every == 0:
+            snapshot = self.stats()
+            logger.info(
+                "Cross-device moves: %d copied (%.1f MB, %.1f MB/s), "
+                "max copy %.2fs, %d buffered fallback(s), %d failure(s).",
+                snapshot.copies,
+                snapshot.bytes_copied / 1e6,
+                snapshot.bytes_per_second / 1e6,
+                snapshot.max_copy_seconds,
+                snapshot.fallback_copies,
+                snapshot.failures,
+            )
+
+    def stats(self) -> CrossDeviceCopyStats:
+        """Returns a consistent snapshot of the counters."""
+        with self._lock:
+            return CrossDeviceCopyStats(
+                copies=self._copies,
+                failures=self._failures,
+                bytes_copied=self._bytes_copied,
+                copy_seconds=self._copy_seconds,
+                max_copy_seconds=self._max_copy_seconds,
+                fallback_copies=self._fallback_copies,
+            )
+
+
+def _fsync_directory(directory: Path) -> None:
+    fd = os.open(directory, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def with_cross_device_moves(fs: FS, mover: CrossDeviceMover) -> FS:
+    """Returns a copy of fs whose move and rename_noreplace go through mover."""
+    return dataclasses.replace(
+        fs, move=mover.move, rename_noreplace=mover.rename_noreplace
+    )
@@ -0,0 +1,101 @@
+import logging
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+from datamover.file_functions.fs_mock import FS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class DestinationNameIndex:
+    """
+    In-memory record of the next free '-N' suffix per name and directory.
+
+    Without it, a name conflict is resolved by trying 'stem-1.suffix',
+    'stem-2.suffix', ... one filesystem call each, which gets slow (and
+    eventually gives up) when a directory already holds many variants of a
+    name, e.g. after exportcliv2 restarts and reuses its file names.
+
+    Only names that have had a conflict are tracked; a name moved without a
+    conflict costs nothing here. The first conflict on a name reads the
+    directory once to find its highest existing suffix, and after that
+    reserve() hands out suffixes from a counter. The index is only a hint:
+    callers still use a no-replace rename, and report a conflict on a
+    reserved name with refresh(), which re-reads the directory.
+
+    Entries for names that have not been used recently are dropped once
+    more than `max_entries` names are tracked. All methods are thread-safe.
+    """
+
+    def __init__(self, *, fs: FS, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            fs: Filesystem abstraction used to list a directory on refresh.
+            max_entries: Maximum number of (directory, name) entries kept.
+        """
+        self._fs = fs
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        # (directory, name) -> next suffix to hand out
+        self._next: OrderedDict[tuple[Path, str], int] = OrderedDict()
+        self.refreshes: int = 0
+
+    def reserve(self, directory: Path, name: str) -> int:
+        """
+        Returns the suffix to try next for name in directory and advances
+        the counter, so concurrent callers get different suffixes.
+
+        Returns:
+            0 for the plain name (no conflict seen yet), otherwise N for
+            'stem-N.suffix'.
+        """
+        key = (directory, name)
+        with self._lock:
+            n = self._next.get(key)
+            if n is None:
+                return 0
+            self._next[key] = n + 1
+            self._next.move_to_end(key)
+            return n
+
+    def refresh(self, directory: Path, name: str) -> int:
+        """
+        Re-reads directory after a conflict and reserves the first suffix
+        above the highest one that exists on disk for name.
+
+        Returns:
+            The reserved suffix (at least 1).
+
+        Raises:
+            OSError: If the directory cannot be listed.
+        """
+        entries = self._fs.listdir(directory)
+        stem, suffix = Path(name).stem, Path(name).suffix
+        variant = re.compile(rf"{re.escape(stem)}-(\d+){re.escape(suffix)}")
+        highest = 0
+        for entry in entries:
+            match = variant.fullmatch(entry)
+            if match:
+                highest = max(highest, int(match.group(1)))
+
+        key = (directory, name)
+        with self._lock:
+            self.refreshes += 1
+            # Another thread may have reserved past what is on disk already
+            n = max(highest + 1, self._next.get(key, 1))
+            self._next[key] = n + 1
+            self._next.move_to_end(key)
+            while len(self._next) > self._max_entries:
+                self._next.popitem(last=False)
+        logger.debug(
+            "Name index refreshed for '%s' in '%s': next suffix %d (%d entries listed).",
+            name,
+            directory,
+            n,
+            len(entries),
+        )
+        return n
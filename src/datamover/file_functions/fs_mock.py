@@ -13,6 +13,9 @@ from typing import (
     Optional,
 )
 
+from datamover.file_functions.inotify_watch import DirectoryWatch, open_inotify_watch
+from datamover.file_functions.rename_noreplace import rename_noreplace
+
 logger = logging.getLogger(__name__)
 
 PathLike = Union[str, Path]
@@ -110,6 +113,10 @@ def _default_move(src: PathLike, dst: PathLike) -> None:
         raise
 
 
+def _default_replace(src: PathLike, dst: PathLike) -> None:
+    os.replace(str(src), str(dst))
+
+
 def _default_isfile(path: PathLike) -> bool:
     return os.path.isfile(str(path))
 
@@ -136,6 +143,10 @@ class FS:
     resolve: ResolveCallable = field(default=_default_resolve)
     access: Callable[[PathLike, int], bool] = field(default=_default_access)
     move: Callable[[PathLike, PathLike], None] = field(default=_default_move)
+    replace: Callable[[PathLike, PathLike], None] = field(default=_default_replace)
+    rename_noreplace: Callable[[PathLike, PathLike], int] = field(
+        default=rename_noreplace
+    )
     is_file: Callable[[PathLike], bool] = field(default=_default_isfile)
     scandir: Callable[[PathLike], ContextManager[Iterator[os.DirEntry]]] = field(
         default=_default_scandir
@@ -143,3 +154,6 @@ class FS:
     relative_to: Callable[[PathLike, PathLike], Path] = field(
         default=_default_relative_to
     )
+    watch_directory: Callable[[PathLike, int], DirectoryWatch] = field(
+        default=open_inotify_watch
+    )
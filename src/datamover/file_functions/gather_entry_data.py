@@ -1,5 +1,6 @@
 import logging
 import os
+from collections.abc import Iterator
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -22,7 +23,12 @@ class GatheredEntryData:
     path: Path = field(compare=False)
 
 
-def gather_file_data(directory: Path, fs: FS) -> list[GatheredEntryData]:
+_FileTuple = tuple[float, int, Path]  # (mtime, size, path)
+
+
+def gather_file_data(
+    directory: Path, fs: FS, *, fast_scan: bool = False
+) -> list[GatheredEntryData]:
     """
     Implementation of the FileScanner protocol.
 
@@ -34,9 +40,15 @@ def gather_file_data(directory: Path, fs: FS) -> list[GatheredEntryData]:
     canonical paths. Errors processing individual entries are logged, and
     processing continues for others.
 
+    With `fast_scan`, fs.resolve is called once for the directory instead of
+    once per entry, and each path is the resolved directory joined with the
+    entry name. Only regular files (never symlinks) are returned, so this
+    gives the same paths without a realpath walk per file.
+
     Args:
         directory: The directory path to scan.
         fs: An instance of the FS abstraction providing filesystem operations.
+        fast_scan: Resolve the directory once rather than every entry.
 
     Returns:
         A list of GatheredEntryData instances for each valid regular file found.
@@ -49,9 +61,75 @@ def gather_file_data(directory: Path, fs: FS) -> list[GatheredEntryData]:
                            wrapping the original low-level exception.
     """
     logger.debug("Gathering file data in directory: %s", directory)
-    gathered_data: list[GatheredEntryData] = []
+    gathered_data: list[GatheredEntryData] = list(
+        iter_file_data(directory, fs, fast_scan=fast_scan)
+    )
+
+    # --- Log summary and return on successful scan (even if no files found) ---
+    if not gathered_data:
+        logger.debug(
+            "Successfully scanned directory '%s', but found no regular files.",
+            directory,
+        )
+    else:
+        logger.debug(
+            "Gathered data for %d regular files in %s", len(gathered_data), directory
+        )
+
+    return gathered_data
+
 
+def iter_file_data(
+    directory: Path, fs: FS, *, fast_scan: bool = False
+) -> Iterator[GatheredEntryData]:
+    """
+    Streaming form of gather_file_data: yields each regular file's data as
+    scandir reaches it, so callers can start on the first file at once and
+    memory stays flat however large the directory is.
+
+    The directory stays open until the iterator is exhausted or closed;
+    callers that stop early should close() it rather than wait for it to be
+    garbage collected.
+
+    Raises:
+        ScanDirectoryError: As gather_file_data, but from the iteration: on
+                            the first next() if the directory cannot be
+                            opened, or part-way through if reading it fails.
+    """
+    for mtime, size, path in _iter_regular_files(directory, fs, fast_scan):
+        yield GatheredEntryData(mtime=mtime, size=size, path=path)
+
+
+def iter_file_batches(
+    directory: Path, fs: FS, *, batch_size: int, fast_scan: bool = False
+) -> Iterator[list[GatheredEntryData]]:
+    """
+    iter_file_data in lists of up to batch_size entries, for callers that
+    hand work on in chunks.
+
+    Raises:
+        ValueError: If batch_size is less than 1.
+        ScanDirectoryError: As iter_file_data.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+    batch: list[GatheredEntryData] = []
+    for entry in iter_file_data(directory, fs, fast_scan=fast_scan):
+        batch.append(entry)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _iter_regular_files(
+    directory: Path, fs: FS, fast_scan: bool
+) -> Iterator[_FileTuple]:
     try:
+        resolved_directory = (
+            fs.resolve(directory, strict=False) if fast_scan else directory
+        )
         # Use the scandir provided by the FS abstraction.
         with fs.scandir(directory) as scanner:
             for entry in scanner:
@@ -63,18 +141,15 @@ def gather_file_data(directory: Path, fs: FS) -> list[GatheredEntryData]:
                         stats: os.stat_result = entry.stat(follow_symlinks=False)
 
                         # 3. Resolve the path using the FS abstraction
-                        raw_path = Path(entry.path)
-                        resolved_path = fs.resolve(raw_path, strict=False)
-
-                        # 4. Create and store the data object
-                        gathered_data.append(
-                            GatheredEntryData(
-                                mtime=stats.st_mtime,  # Ensure correct order for constructor
-                                size=stats.st_size,
-                                path=resolved_path,
-                            )
-                        )
+                        if fast_scan:
+                            resolved_path = resolved_directory / entry_name
+                        else:
+                            raw_path = Path(entry.path)
+                            resolved_path = fs.resolve(raw_path, strict=False)
+
+                        # 4. Hand the data on
                         logger.debug("Gathered data for: %s", resolved_path)
+                        yield stats.st_mtime, stats.st_size, resolved_path
 
                 # --- Handle errors for THIS specific entry - LOG AND CONTINUE ---
                 except OSError as entry_error:
@@ -117,16 +192,3 @@ def gather_file_data(directory: Path, fs: FS) -> list[GatheredEntryData]:
         # Log full exception here as it's unexpected
         logger.exception("%s for directory %s", msg, directory)
         raise ScanDirectoryError(msg, directory, e) from e
-
-    # --- Log summary and return on successful scan (even if no files found) ---
-    if not gathered_data:
-        logger.debug(
-            "Successfully scanned directory '%s', but found no regular files.",
-            directory,
-        )
-    else:
-        logger.debug(
-            "Gathered data for %d regular files in %s", len(gathered_data), directory
-        )
-
-    return gathered_data
@@ -0,0 +1,171 @@
+"""
+Minimal inotify binding for the scanner's ActivityTracker.
+
+The tailer and the close-write trigger use watchdog, whose observer turns
+kernel events into FileSystemEvent callbacks on its own thread. The
+ActivityTracker cannot work that way. It must know when the kernel queue
+overflowed (IN_Q_OVERFLOW) or the watch was removed (IN_IGNORED), because
+then its in-memory view of the directory is wrong and a full scan is needed.
+watchdog does not hand either signal to its handlers. The tracker also reads
+events in batches on its own thread, with a timeout, which the observer's
+callback model does not offer. This module reads the raw events straight
+from one inotify descriptor instead, and FS.watch_directory exposes it so
+tests can inject a fake watch.
+"""
+
+import ctypes
+import errno
+import logging
+import os
+import select
+import struct
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional, Protocol, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# From <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+# struct inotify_event { int wd; uint32_t mask, cookie, len; char name[]; }
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_BUFFER_BYTES = 64 * 1024
+
+
+class InotifyEvent(NamedTuple):
+    mask: int
+    name: str  # Entry name inside the watched directory; "" for the directory
+
+
+class DirectoryWatch(Protocol):
+    def read_events(self, timeout: float) -> list[InotifyEvent]: ...
+
+    def close(self) -> None: ...
+
+
+def _load_inotify() -> Optional[tuple[Callable[..., int], Callable[..., int]]]:
+    """
+    Looks up inotify_init1() and inotify_add_watch() in the C library.
+
+    Returns:
+        The two ctypes functions, or None where the libc does not export
+        them (non-Linux platforms).
+    """
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        init1 = libc.inotify_init1
+        add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    init1.argtypes = [ctypes.c_int]
+    init1.restype = ctypes.c_int
+    add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+    add_watch.restype = ctypes.c_int
+    return init1, add_watch
+
+
+_inotify = _load_inotify()
+
+
+def parse_events(buffer: bytes) -> list[InotifyEvent]:
+    """Splits a buffer read from an inotify descriptor into events."""
+    events: list[InotifyEvent] = []
+    offset = 0
+    header_size = _EVENT_HEADER.size
+    while offset + header_size <= len(buffer):
+        _wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(buffer, offset)
+        offset += header_size
+        raw_name = buffer[offset : offset + name_len].rstrip(b"\0")
+        offset += name_len
+        events.append(InotifyEvent(mask=mask, name=os.fsdecode(raw_name)))
+    return events
+
+
+class InotifyWatch:
+    """
+    A non-recursive inotify watch on a single directory.
+
+    Owns the inotify descriptor; read_events() drains everything the kernel
+    has queued, waiting up to `timeout` seconds for the first event.
+    """
+
+    def __init__(self, fd: int, directory: Path):
+        self._fd = fd
+        self.directory = directory
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read_events(self, timeout: float) -> list[InotifyEvent]:
+        """
+        Returns the queued events, or an empty list if none arrive in time.
+
+        Raises:
+            OSError: If the descriptor cannot be polled or read.
+        """
+        poller = select.poll()
+        poller.register(self._fd, select.POLLIN)
+        if not poller.poll(max(0, int(timeout * 1000))):
+            return []
+        chunks: list[bytes] = []
+        while True:
+            try:
+                chunk = os.read(self._fd, _READ_BUFFER_BYTES)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return parse_events(b"".join(chunks))
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __enter__(self) -> "InotifyWatch":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_inotify_watch(directory: PathLike, mask: int) -> InotifyWatch:
+    """
+    Starts watching `directory` for the events in `mask`.
+
+    IN_Q_OVERFLOW and IN_IGNORED are always reported by the kernel, whether
+    or not they are in the mask.
+
+    Raises:
+        OSError: ENOSYS where inotify is unavailable, otherwise the errno of
+                 the failing call (e.g. ENOTDIR, ENOSPC when the per-user
+                 watch limit is reached).
+    """
+    path_str = str(directory)
+    if _inotify is None:
+        raise OSError(errno.ENOSYS, "inotify is not available", path_str)
+    init1, add_watch = _inotify
+    fd = init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    if fd < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), path_str)
+    if add_watch(fd, os.fsencode(path_str), mask | IN_ONLYDIR) < 0:
+        err = ctypes.get_errno()
+        os.close(fd)
+        raise OSError(err, os.strerror(err), path_str)
+    logger.debug("Opened inotify watch (mask 0x%x) on '%s'", mask, path_str)
+    return InotifyWatch(fd, Path(directory))
@@ -0,0 +1,129 @@
+import ctypes
+import errno
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+
+# From <linux/fs.h>
+RENAME_NOREPLACE = 1
+_AT_FDCWD = -100
+
+# errno values meaning "renameat2/RENAME_NOREPLACE is not available here"
+# (old kernel, old libc, or a filesystem that does not support the flag).
+_UNSUPPORTED_ERRNOS = frozenset({errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP})
+
+
+def _load_renameat2() -> Optional[Callable[..., int]]:
+    """
+    Looks up renameat2() in the C library of the running process.
+
+    Returns:
+        The ctypes function, or None if the libc does not export it
+        (non-Linux platforms, glibc older than 2.28).
+    """
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fn = libc.renameat2
+    except (OSError, AttributeError):
+        return None
+    fn.argtypes = [
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_int,
+        ctypes.c_char_p,
+        ctypes.c_uint,
+    ]
+    fn.restype = ctypes.c_int
+    return fn
+
+
+_renameat2 = _load_renameat2()
+_renameat2_usable: bool = _renameat2 is not None
+
+
+def renameat2_available() -> bool:
+    """True while renameat2(RENAME_NOREPLACE) is being used for no-replace renames."""
+    return _renameat2_usable
+
+
+def _link_unlink(src: str, dst: str) -> int:
+    """
+    No-replace rename built from link() + unlink().
+
+    link() fails with EEXIST if dst exists, which gives the same atomic
+    conflict detection as RENAME_NOREPLACE. If the unlink of the old name
+    fails, the new link is removed again so the file keeps a single name.
+    """
+    os.link(src, dst, follow_symlinks=False)
+    try:
+        os.unlink(src)
+    except FileNotFoundError:
+        # Someone else removed the old name; the file lives on at dst.
+        pass
+    except OSError:
+        try:
+            os.unlink(dst)
+        except OSError as cleanup_err:
+            logger.error(
+                "Could not remove new link '%s' after failing to unlink '%s': %s",
+                dst,
+                src,
+                cleanup_err,
+            )
+        raise
+    return 2
+
+
+def rename_noreplace(src: PathLike, dst: PathLike) -> int:
+    """
+    Renames src to dst, failing atomically if dst already exists.
+
+    Uses renameat2(RENAME_NOREPLACE) where the kernel, libc and filesystem
+    support it, otherwise link() + unlink(). Both only work within a single
+    filesystem, which create_directories already guarantees for the
+    application's directories.
+
+    Args:
+        src: Existing path to rename.
+        dst: New path; must not exist.
+
+    Returns:
+        The number of filesystem syscalls issued for the successful rename
+        (1 with renameat2, 2 with link + unlink).
+
+    Raises:
+        FileExistsError: If dst already exists (nothing was changed).
+        FileNotFoundError: If src (or dst's directory) does not exist.
+        OSError: For any other failure, e.g. EXDEV across filesystems.
+    """
+    global _renameat2_usable
+
+    src_str = str(src)
+    dst_str = str(dst)
+
+    if _renameat2_usable and _renameat2 is not None:
+        rc = _renameat2(
+            _AT_FDCWD,
+            os.fsencode(src_str),
+            _AT_FDCWD,
+            os.fsencode(dst_str),
+            RENAME_NOREPLACE,
+        )
+        if rc == 0:
+            return 1
+        err = ctypes.get_errno()
+        if err not in _UNSUPPORTED_ERRNOS:
+            raise OSError(err, os.strerror(err), src_str, None, dst_str)
+        _renameat2_usable = False
+        logger.info(
+            "renameat2(RENAME_NOREPLACE) not supported here (%s); "
+            "using link()+unlink() for no-replace renames.",
+            errno.errorcode.get(err, err),
+        )
+
+    return _link_unlink(src_str, dst_str)
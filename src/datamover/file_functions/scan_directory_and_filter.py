@@ -1,17 +1,19 @@
 import logging
+from collections.abc import Iterator
 from pathlib import Path
 
 from datamover.file_functions.fs_mock import FS
 from datamover.file_functions.gather_entry_data import (
     GatheredEntryData,
     gather_file_data,
+    iter_file_data,
 )
 
 logger = logging.getLogger(__name__)
 
 
 def scan_directory_and_filter(
-    directory: Path, fs: FS, extension_no_dot: str
+    directory: Path, fs: FS, extension_no_dot: str, fast_scan: bool = False
 ) -> list[GatheredEntryData]:
     """
     Scans the directory using gather_file_data and filters the results
@@ -21,6 +23,8 @@ def scan_directory_and_filter(
         directory: The directory path to scan.
         fs: An instance of the FS abstraction.
         extension_no_dot: The required file extension (lowercase, no leading dot).
+        fast_scan: Passed to gather_file_data; resolve the directory once
+                   instead of every entry.
 
     Returns:
         A list of GatheredEntryData for matching files.
@@ -29,7 +33,9 @@ def scan_directory_and_filter(
         ScanDirectoryError: If gather_file_data fails critically.
     """
     # gather_file_data might raise ScanDirectoryError - let it propagate
-    all_gathered_data = gather_file_data(directory=directory, fs=fs)
+    all_gathered_data = gather_file_data(
+        directory=directory, fs=fs, fast_scan=fast_scan
+    )
 
     expected_suffix = f".{extension_no_dot.lower()}"
     filtered_data = [
@@ -44,3 +50,40 @@ def scan_directory_and_filter(
         expected_suffix,
     )
     return filtered_data
+
+
+def iter_directory_and_filter(
+    *, directory: Path, fs: FS, extension_no_dot: str, fast_scan: bool = False
+) -> Iterator[GatheredEntryData]:
+    """
+    Streaming form of scan_directory_and_filter, as a StreamingFileScanner.
+
+    Yields matching entries while the directory is read (see iter_file_data),
+    so neither the whole listing nor the filtered one is ever held; close()
+    the iterator when stopping early.
+
+    Raises:
+        ScanDirectoryError: From the iteration, if the scan fails critically.
+    """
+    expected_suffix = f".{extension_no_dot.lower()}"
+    for entry in iter_file_data(directory, fs, fast_scan=fast_scan):
+        if entry.path.suffix.lower() == expected_suffix:
+            yield entry
+
+
+def fast_scan_directory_and_filter(
+    *, directory: Path, fs: FS, extension_no_dot: str
+) -> list[GatheredEntryData]:
+    """scan_directory_and_filter with fast_scan, as a FileScanner."""
+    return scan_directory_and_filter(
+        directory=directory, fs=fs, extension_no_dot=extension_no_dot, fast_scan=True
+    )
+
+
+def fast_iter_directory_and_filter(
+    *, directory: Path, fs: FS, extension_no_dot: str
+) -> Iterator[GatheredEntryData]:
+    """iter_directory_and_filter with fast_scan, as a StreamingFileScanner."""
+    return iter_directory_and_filter(
+        directory=directory, fs=fs, extension_no_dot=extension_no_dot, fast_scan=True
+    )
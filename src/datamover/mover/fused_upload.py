@@ -0,0 +1,415 @@
+import logging
+import threading
+import time
+from pathlib import Path
+from queue import Empty, Full, Queue
+from typing import Callable, Optional
+
+from datamover.file_functions.atomic_move import rename_into_noreplace
+from datamover.file_functions.destination_name_index import DestinationNameIndex
+from datamover.file_functions.directory_validation import (
+    resolve_and_validate_directory,
+)
+from datamover.file_functions.fs_mock import FS
+from datamover.file_functions.safe_stat import safe_stat
+from datamover.protocols import HttpClient, HttpResponse
+from datamover.uploader.upload_audit_event import create_upload_audit_event
+
+logger = logging.getLogger(__name__)
+
+# Suffix appended to a claimed source file while its upload is in flight.
+# The scanner, tailer and uploader all filter on the pcap extension, so a
+# claimed file is invisible to every other component.
+INFLIGHT_SUFFIX = ".inflight"
+
+# Claimed files waiting for the upload worker. When it is full, further
+# claimed files go straight to the worker directory.
+PENDING_UPLOADS_MAXSIZE = 64
+
+
+class FusedMoveUploader:
+    """
+    Fast path that uploads a file straight out of the source directory.
+
+    Instead of source -> worker -> (scan) -> upload -> uploaded, a file is
+    claimed in place with a single rename to an in-flight name, uploaded once,
+    and renamed into the uploaded directory. Any failure hands the file over
+    to the worker directory, where the regular UploaderThread retries it (and
+    dead-letters it on terminal errors). The worker directory therefore only
+    ever holds retries.
+
+    Only files a manifest line announced (and so are complete) take this
+    path; anything else, e.g. files the scanner found lost, is declined and
+    moved as usual. The mover thread only claims the file (process()); the
+    upload itself runs on a FusedUploadThread (upload_next()), so queued
+    moves never wait behind an HTTP request. When the upload worker is
+    behind, claimed files are handed straight to the worker directory.
+
+    process() may be called from several mover threads at once.
+    """
+
+    def __init__(
+        self,
+        *,
+        validated_source_dir: Path,
+        validated_worker_dir: Path,
+        validated_uploaded_dir: Path,
+        remote_url: str,
+        request_timeout_seconds: float,
+        verify_ssl: bool,
+        http_client: HttpClient,
+        fs: FS,
+        is_announced: Callable[[Path], bool],
+        name_index: Optional[DestinationNameIndex] = None,
+        pending_maxsize: int = PENDING_UPLOADS_MAXSIZE,
+    ):
+        """
+        Args:
+            validated_source_dir: Resolved directory the files are claimed in.
+            validated_worker_dir: Resolved directory failed uploads are handed to.
+            validated_uploaded_dir: Resolved directory for successful uploads.
+            remote_url: The URL of the remote endpoint for uploads.
+            request_timeout_seconds: Network request timeout for the single attempt.
+            verify_ssl: Whether to verify SSL certificates.
+            http_client: An object adhering to the HttpClient protocol.
+            fs: Filesystem abstraction instance.
+            is_announced: Tells whether a manifest line announced a path;
+                          only those files are uploaded on this path.
+            name_index: Optional shared index of next free '-N' suffixes in
+                        the worker and uploaded directories.
+            pending_maxsize: Most claimed files waiting for the upload worker.
+        """
+        self._source_dir = validated_source_dir
+        self._worker_dir = validated_worker_dir
+        self._uploaded_dir = validated_uploaded_dir
+        self._remote_url = remote_url
+        self._request_timeout = request_timeout_seconds
+        self._verify_ssl = verify_ssl
+        self._http_client = http_client
+        self._fs = fs
+        self._is_announced = is_announced
+        self._name_index = name_index
+        self._pending: Queue[tuple[Path, str, int]] = Queue(maxsize=pending_maxsize)
+        self._pending_lock = threading.Lock()
+        self._accepting = True  # False once the upload worker has stopped
+
+        # Counters, read for reporting; updated from the mover and upload threads
+        self._counts_lock = threading.Lock()
+        self.uploaded_count: int = 0
+        self.handed_off_count: int = 0
+        self.fallback_count: int = 0
+
+    def _count(self, counter: str) -> None:
+        with self._counts_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def process(self, source_path: Path) -> bool:
+        """
+        Claims a single source file for the upload worker.
+
+        Args:
+            source_path: Path of the file, as announced on the move queue.
+
+        Returns:
+            True if the file was dealt with (claimed for upload, handed off to
+            the worker directory, or already gone). False if the file is not
+            for this path or could not be claimed, and the caller should fall
+            back to the regular move.
+        """
+        if source_path.parent != self._source_dir:
+            # Not a plain child of the resolved source dir (e.g. a symlinked
+            # path); let the regular move resolve and validate it.
+            self._count("fallback_count")
+            return False
+
+        if not self._is_announced(source_path):
+            # Not (or no longer) announced by a manifest line, so possibly
+            # incomplete; the regular move and uploader handle it.
+            self._count("fallback_count")
+            return False
+
+        stat_info = safe_stat(source_path, fs=self._fs)
+        if stat_info is None:
+            # Missing, or not a regular file; the regular move logs the details.
+            self._count("fallback_count")
+            return False
+        _, file_size = stat_info
+
+        inflight_path = source_path.with_name(source_path.name + INFLIGHT_SUFFIX)
+        try:
+            self._fs.rename_noreplace(source_path, inflight_path)
+        except FileNotFoundError:
+            logger.debug(
+                "Fused upload: '%s' already gone before claim; nothing to do.",
+                source_path,
+            )
+            return True
+        except OSError as e:
+            logger.warning(
+                "Fused upload: could not claim '%s' (%s); falling back to regular move.",
+                source_path,
+                e,
+            )
+            self._count("fallback_count")
+            return False
+
+        with self._pending_lock:
+            queued = self._accepting
+            if queued:
+                try:
+                    self._pending.put_nowait(
+                        (inflight_path, source_path.name, file_size)
+                    )
+                except Full:
+                    queued = False
+        if not queued:
+            logger.debug(
+                "Fused upload: worker busy or stopped; handing '%s' over to the uploader.",
+                source_path.name,
+            )
+            self._hand_off(inflight_path, source_path.name)
+        return True
+
+    def upload_next(self, timeout: float) -> bool:
+        """
+        Uploads and files away the next claimed file, waiting up to timeout
+        seconds for one. Called from the FusedUploadThread.
+
+        Returns:
+            True if a file was processed.
+        """
+        try:
+            if timeout > 0:
+                item = self._pending.get(timeout=timeout)
+            else:
+                item = self._pending.get_nowait()
+        except Empty:
+            return False
+        inflight_path, file_name, file_size = item
+        try:
+            if self._upload_once(inflight_path, file_name, file_size):
+                if self._file_away(inflight_path, file_name, self._uploaded_dir):
+                    self._count("uploaded_count")
+                    return True
+                logger.critical(
+                    "CRITICAL: Fused upload succeeded for '%s' but FAILED TO MOVE TO UPLOADED DIR '%s'. "
+                    "Handing over to the worker directory.",
+                    file_name,
+                    self._uploaded_dir,
+                )
+            self._hand_off(inflight_path, file_name)
+        finally:
+            self._pending.task_done()
+        return True
+
+    def hand_off_pending(self) -> int:
+        """
+        Stops accepting claimed files and hands every one still waiting for
+        an upload over to the worker directory, without uploading it. Files
+        claimed afterwards are handed over straight away.
+
+        Returns:
+            The number of files handed off.
+        """
+        with self._pending_lock:
+            self._accepting = False
+        handed_off = 0
+        while True:
+            try:
+                inflight_path, file_name, _ = self._pending.get_nowait()
+            except Empty:
+                return handed_off
+            self._hand_off(inflight_path, file_name)
+            self._pending.task_done()
+            handed_off += 1
+
+    def _hand_off(self, inflight_path: Path, file_name: str) -> None:
+        if self._file_away(inflight_path, file_name, self._worker_dir):
+            self._count("handed_off_count")
+        else:
+            logger.critical(
+                "CRITICAL: Fused upload could not hand '%s' over to worker dir '%s'. "
+                "File left as '%s'; it will be recovered on next start.",
+                file_name,
+                self._worker_dir,
+                inflight_path,
+            )
+
+    def _upload_once(self, inflight_path: Path, file_name: str, file_size: int) -> bool:
+        """Single upload attempt. Returns True only on a 2xx response."""
+        start_time = time.perf_counter()
+        headers: dict[str, str] = {
+            "x-filename": file_name,
+            "Content-Type": "application/octet-stream",
+        }
+        try:
+            with self._fs.open(inflight_path, "rb") as f:
+                response: HttpResponse = self._http_client.post(
+                    self._remote_url,
+                    data=f,
+                    headers=headers,
+                    timeout=self._request_timeout,
+                    verify=self._verify_ssl,
+                )
+        except Exception as e:
+            logger.warning(
+                "Fused upload attempt for '%s' failed (%s: %s); handing over to uploader.",
+                file_name,
+                type(e).__name__,
+                e,
+            )
+            create_upload_audit_event(
+                level=logging.WARNING,
+                event_type="upload_fused_handoff_error",
+                file_name=file_name,
+                file_size_bytes=file_size,
+                destination_url=self._remote_url,
+                attempt=1,
+                duration_ms=(time.perf_counter() - start_time) * 1000,
+                failure_category="Fused Upload Error",
+                failure_detail=str(e),
+                exception_type=type(e).__name__,
+            )
+            return False
+
+        duration_ms = (time.perf_counter() - start_time) * 1000
+        if 200 <= response.status_code < 300:
+            create_upload_audit_event(
+                level=logging.INFO,
+                event_type="upload_success",
+                file_name=file_name,
+                file_size_bytes=file_size,
+                destination_url=self._remote_url,
+                attempt=1,
+                duration_ms=duration_ms,
+                status_code=response.status_code,
+                response_text_snippet=response.text[:100] if response.text else None,
+            )
+            logger.info(
+                "Fused upload SUCCESS for '%s' (Status: %d, Duration: %.2fms).",
+                file_name,
+                response.status_code,
+                duration_ms,
+            )
+            return True
+
+        logger.warning(
+            "Fused upload for '%s' returned status %d; handing over to uploader.",
+            file_name,
+            response.status_code,
+        )
+        create_upload_audit_event(
+            level=logging.WARNING,
+            event_type="upload_fused_handoff_status",
+            file_name=file_name,
+            file_size_bytes=file_size,
+            destination_url=self._remote_url,
+            attempt=1,
+            duration_ms=duration_ms,
+            status_code=response.status_code,
+            failure_category="Fused Upload Status",
+            failure_detail=f"HTTP Status: {response.status_code}",
+        )
+        return False
+
+    def _file_away(self, inflight_path: Path, file_name: str, target_dir: Path) -> bool:
+        """Renames the in-flight file to its original name inside target_dir."""
+        try:
+            final_path, _, _ = rename_into_noreplace(
+                inflight_path,
+                target_dir,
+                fs=self._fs,
+                target_name=file_name,
+                name_index=self._name_index,
+            )
+        except OSError as e:
+            logger.error(
+                "Fused upload: rename '%s' into '%s' failed: %s",
+                inflight_path,
+                target_dir,
+                e,
+            )
+            return False
+        logger.debug("Fused upload: '%s' -> '%s'", inflight_path, final_path)
+        return True
+
+    def recover_inflight_files(self) -> int:
+        """
+        Hands any in-flight files left behind by a previous run over to the
+        worker directory, so the uploader picks them up.
+
+        Returns:
+            The number of files recovered.
+        """
+        recovered = 0
+        try:
+            names = self._fs.listdir(self._source_dir)
+        except OSError as e:
+            logger.error(
+                "Fused upload: cannot list '%s' to recover in-flight files: %s",
+                self._source_dir,
+                e,
+            )
+            return 0
+
+        for name in names:
+            if not name.endswith(INFLIGHT_SUFFIX):
+                continue
+            original_name = name[: -len(INFLIGHT_SUFFIX)]
+            if not original_name:
+                continue
+            if self._file_away(
+                self._source_dir / name, original_name, self._worker_dir
+            ):
+                recovered += 1
+                logger.warning(
+                    "Fused upload: recovered in-flight file '%s' into worker dir.",
+                    original_name,
+                )
+        return recovered
+
+
+def create_fused_move_uploader(
+    *,
+    source_dir_path: Path,
+    worker_dir_path: Path,
+    uploaded_dir_path: Path,
+    remote_url: str,
+    request_timeout_seconds: float,
+    verify_ssl: bool,
+    http_client: HttpClient,
+    fs: FS,
+    is_announced: Callable[[Path], bool],
+    name_index: Optional[DestinationNameIndex] = None,
+) -> FusedMoveUploader:
+    """
+    Validates the directories, builds a FusedMoveUploader and recovers any
+    in-flight files left over from a previous run.
+
+    Raises:
+        FileNotFoundError, NotADirectoryError, ValueError: If directory validation fails.
+    """
+    fused = FusedMoveUploader(
+        validated_source_dir=resolve_and_validate_directory(
+            raw_path=source_dir_path, fs=fs, dir_label="source for fused upload"
+        ),
+        validated_worker_dir=resolve_and_validate_directory(
+            raw_path=worker_dir_path, fs=fs, dir_label="worker for fused upload"
+        ),
+        validated_uploaded_dir=resolve_and_validate_directory(
+            raw_path=uploaded_dir_path, fs=fs, dir_label="uploaded for fused upload"
+        ),
+        remote_url=remote_url,
+        request_timeout_seconds=request_timeout_seconds,
+        verify_ssl=verify_ssl,
+        http_client=http_client,
+        fs=fs,
+        is_announced=is_announced,
+        name_index=name_index,
+    )
+    recovered = fused.recover_inflight_files()
+    logger.info(
+        "Fused move-and-upload path enabled (recovered %d in-flight file(s)).",
+        recovered,
+    )
+    return fused
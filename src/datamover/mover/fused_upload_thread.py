@@ -0,0 +1,53 @@
+import logging
+import threading
+
+from datamover.mover.fused_upload import FusedMoveUploader
+
+logger = logging.getLogger(__name__)
+
+
+class FusedUploadThread(threading.Thread):
+    """
+    Thread that uploads the files the mover threads claimed for the fused
+    move-and-upload path, so the HTTP request never runs on a mover thread.
+
+    On shutdown, claimed files not yet uploaded are handed over to the
+    worker directory for the regular uploader.
+    """
+
+    def __init__(
+        self,
+        *,
+        fused_uploader: FusedMoveUploader,
+        stop_event: threading.Event,
+        poll_interval: float,
+        name: str = "FusedUploader",
+    ):
+        """
+        Args:
+            fused_uploader: The fused path shared with the mover threads.
+            stop_event: Event used to signal the thread to stop.
+            poll_interval: How long each wait for a claimed file lasts (seconds).
+            name: Thread name.
+        """
+        super().__init__(daemon=True, name=name)
+        self.fused_uploader = fused_uploader
+        self.stop_event = stop_event
+        self.poll_interval = poll_interval
+
+    def run(self) -> None:
+        logger.info("%s starting.", self.name)
+        while not self.stop_event.is_set():
+            try:
+                self.fused_uploader.upload_next(timeout=self.poll_interval)
+            except Exception:
+                logger.exception("%s: Unexpected error in fused upload", self.name)
+        handed_off = self.fused_uploader.hand_off_pending()
+        logger.info(
+            "%s stopping (uploaded %d, handed off %d, declined %d; %d handed off at shutdown).",
+            self.name,
+            self.fused_uploader.uploaded_count,
+            self.fused_uploader.handed_off_count,
+            self.fused_uploader.fallback_count,
+            handed_off,
+        )
@@ -0,0 +1,311 @@
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable, cast
+
+from datamover.file_functions.fs_mock import FS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_EVERY_COMMITS = 1000
+DEFAULT_COMPACT_AFTER_RECORDS = 10000
+
+_ENQUEUED = b"E"
+_DONE = b"D"
+
+
+@dataclass(frozen=True)
+class MoveJournalStats:
+    """Snapshot of the MoveJournal counters."""
+
+    pending: int
+    records: int
+    commits: int
+    total_commit_seconds: float
+    max_commit_seconds: float
+    replayed: int
+    replay_seconds: float
+
+    @property
+    def records_per_commit(self) -> float:
+        return self.records / self.commits if self.commits else 0.0
+
+    @property
+    def avg_commit_seconds(self) -> float:
+        return self.total_commit_seconds / self.commits if self.commits else 0.0
+
+
+class MoveJournal:
+    """
+    Write-ahead journal of move work items, so queued paths survive a restart.
+
+    Without it, paths sitting in the in-memory move queue are forgotten when
+    the process stops, and only come back once the scanner declares them
+    lost (lost_timeout_seconds later).
+
+    Each line is 'E<TAB>path' when a path is enqueued, or 'D<TAB>path' when
+    the mover has finished with it. record_enqueued() returns only once its
+    line is fsynced. Concurrent callers share one fsync (group commit): the
+    first caller writes and syncs everything buffered so far while the
+    others wait for it. Completion lines are not waited for; losing one only
+    means the path is offered to the mover once more after a crash, and the
+    mover skips files that are gone.
+
+    A path may be queued more than once (by the tailer and the scanner, say),
+    so each path carries a count of enqueues not yet matched by a completion;
+    it is pending until the count drops to zero.
+
+    replay() reads the journal at startup and returns the paths that were
+    enqueued but never completed, in order. compact() rewrites the file so
+    that it only holds the pending paths; this also happens automatically
+    once `compact_after_records` records have been written since the last
+    compaction.
+    """
+
+    def __init__(
+        self,
+        *,
+        journal_path: Path,
+        fs: FS,
+        monotonic_func: Callable[[], float] = time.monotonic,
+        fsync_func: Callable[[int], None] = os.fsync,
+        report_every: int = DEFAULT_REPORT_EVERY_COMMITS,
+        compact_after_records: int = DEFAULT_COMPACT_AFTER_RECORDS,
+    ):
+        """
+        Args:
+            journal_path: The journal file; created if missing.
+            fs: Filesystem abstraction used to open and replace the file.
+            monotonic_func: Clock used for commit and replay timings.
+            fsync_func: Function that flushes a file descriptor to disk.
+            report_every: Log the commit figures every this many commits
+                          (0 disables periodic reporting).
+            compact_after_records: Rewrite the file after this many records.
+
+        Raises:
+            OSError: If the journal file cannot be opened.
+        """
+        self._path = journal_path
+        self._fs = fs
+        self._monotonic = monotonic_func
+        self._fsync = fsync_func
+        self._report_every = report_every
+        self._compact_after = compact_after_records
+        self._since_compact = 0
+
+        self._cond = threading.Condition()
+        self._file = cast(IO[bytes], fs.open(journal_path, "ab"))
+        self._buffer: list[bytes] = []
+        self._seq = 0  # Number of records appended to the buffer so far
+        self._durable_seq = 0  # Records known to be fsynced
+        self._committing = False
+        # Paths enqueued and not yet completed, in enqueue order, with the
+        # number of their enqueues still outstanding
+        self._pending: dict[Path, int] = {}
+
+        self._records = 0
+        self._commits = 0
+        self._total_commit_seconds = 0.0
+        self._max_commit_seconds = 0.0
+        self._replayed = 0
+        self._replay_seconds = 0.0
+
+    @staticmethod
+    def _encode(kind: bytes, path: Path) -> bytes:
+        encoded = os.fsencode(str(path))
+        if b"\n" in encoded:
+            raise ValueError(f"Cannot journal a path containing a newline: {path!r}")
+        return kind + b"\t" + encoded + b"\n"
+
+    def replay(self) -> list[Path]:
+        """
+        Reads the journal and returns the paths still pending, oldest first.
+
+        Each path is returned once, however many enqueues it has outstanding,
+        and is then pending exactly once: the caller queues it again once.
+        Incomplete trailing lines (from a crash mid-write) are ignored.
+        """
+        started = self._monotonic()
+        pending: dict[Path, int] = {}
+        lines = 0
+        with self._fs.open(self._path, "rb") as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    logger.warning(
+                        "Move journal '%s': ignoring incomplete last record.",
+                        self._path,
+                    )
+                    break
+                kind, _, raw_path = line[:-1].partition(b"\t")
+                path = Path(os.fsdecode(raw_path))
+                lines += 1
+                if kind == _ENQUEUED:
+                    pending[path] = pending.get(path, 0) + 1
+                elif kind == _DONE:
+                    _release(pending, path)
+
+        elapsed = self._monotonic() - started
+        with self._cond:
+            self._pending = dict.fromkeys(pending, 1)
+            self._replayed = len(pending)
+            self._replay_seconds = elapsed
+        logger.info(
+            "Move journal replayed %d record(s) in %.1fms: %d path(s) pending.",
+            lines,
+            1000.0 * elapsed,
+            len(pending),
+        )
+        return list(pending)
+
+    def record_enqueued(self, path: Path) -> None:
+        """
+        Appends an enqueue record for path and waits until it is on disk.
+
+        Raises:
+            ValueError: If path contains a newline.
+        """
+        line = self._encode(_ENQUEUED, path)
+        with self._cond:
+            self._pending[path] = self._pending.get(path, 0) + 1
+            self._buffer.append(line)
+            self._seq += 1
+            my_seq = self._seq
+            while self._durable_seq < my_seq:
+                if self._committing:
+                    self._cond.wait()
+                else:
+                    self._commit_locked()
+
+    def record_done(self, path: Path) -> None:
+        """
+        Appends a completion record for path. Does not wait for an fsync.
+
+        Raises:
+            ValueError: If path contains a newline.
+        """
+        line = self._encode(_DONE, path)
+        with self._cond:
+            _release(self._pending, path)
+            self._buffer.append(line)
+            self._seq += 1
+            if self._committing:
+                # Written out with the next commit
+                return
+            if self._since_compact + len(self._buffer) >= self._compact_after:
+                self._compact_locked()
+                return
+            try:
+                self._file.writelines(self._buffer)
+                self._file.flush()
+                self._records += len(self._buffer)
+                self._since_compact += len(self._buffer)
+            except OSError as e:
+                logger.error("Move journal '%s': write failed: %s", self._path, e)
+            self._buffer = []
+
+    def _commit_locked(self) -> None:
+        """
+        Writes and fsyncs the buffer as the group-commit leader. Called with
+        the condition held; releases it during the I/O.
+        """
+        self._committing = True
+        batch, self._buffer = self._buffer, []
+        upto = self._seq
+        self._cond.release()
+        started = self._monotonic()
+        try:
+            self._file.writelines(batch)
+            self._file.flush()
+            self._fsync(self._file.fileno())
+        except OSError as e:
+            # The journal is a recovery aid; keep the pipeline moving
+            logger.error("Move journal '%s': commit failed: %s", self._path, e)
+        finally:
+            elapsed = self._monotonic() - started
+            self._cond.acquire()
+            self._committing = False
+            self._durable_seq = max(self._durable_seq, upto)
+            self._records += len(batch)
+            self._since_compact += len(batch)
+            self._commits += 1
+            self._total_commit_seconds += elapsed
+            self._max_commit_seconds = max(self._max_commit_seconds, elapsed)
+            self._cond.notify_all()
+
+        if self._report_every > 0 and self._commits % self._report_every == 0:
+            logger.info(
+                "Move journal: %d commit(s), %.1f record(s)/commit, "
+                "commit latency avg %.2fms, max %.2fms.",
+                self._commits,
+                self._records / self._commits,
+                1000.0 * self._total_commit_seconds / self._commits,
+                1000.0 * self._max_commit_seconds,
+            )
+
+    def compact(self) -> None:
+        """Rewrites the journal so that it only holds the pending paths."""
+        with self._cond:
+            while self._committing:
+                self._cond.wait()
+            self._compact_locked()
+
+    def _compact_locked(self) -> None:
+        tmp_path = self._path.with_name(self._path.name + ".tmp")
+        try:
+            with self._fs.open(tmp_path, "wb") as f:
+                f.writelines(
+                    self._encode(_ENQUEUED, p) * count
+                    for p, count in self._pending.items()
+                )
+                f.flush()
+                self._fsync(f.fileno())
+            self._file.close()
+            self._fs.replace(tmp_path, self._path)
+        except OSError as e:
+            logger.error("Move journal '%s': compaction failed: %s", self._path, e)
+        finally:
+            if self._file.closed:
+                self._file = cast(IO[bytes], self._fs.open(self._path, "ab"))
+        # Everything buffered is either superseded or rewritten above
+        self._buffer = []
+        self._durable_seq = self._seq
+        self._since_compact = 0
+        self._cond.notify_all()
+
+    def stats(self) -> MoveJournalStats:
+        """Returns a consistent snapshot of the counters."""
+        with self._cond:
+            return MoveJournalStats(
+                pending=len(self._pending),
+                records=self._records,
+                commits=self._commits,
+                total_commit_seconds=self._total_commit_seconds,
+                max_commit_seconds=self._max_commit_seconds,
+                replayed=self._replayed,
+                replay_seconds=self._replay_seconds,
+            )
+
+    def close(self) -> None:
+        """Flushes anything buffered and closes the journal file."""
+        with self._cond:
+            while self._committing:
+                self._cond.wait()
+            try:
+                self._file.writelines(self._buffer)
+                self._file.flush()
+            except OSError as e:
+                logger.error("Move journal '%s': write failed: %s", self._path, e)
+            self._buffer = []
+            self._file.close()
+
+
+def _release(pending: dict[Path, int], path: Path) -> None:
+    """Matches one outstanding enqueue of path with a completion."""
+    count = pending.get(path, 0)
+    if count > 1:
+        pending[path] = count - 1
+    else:
+        pending.pop(path, None)
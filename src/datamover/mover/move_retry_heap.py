@@ -0,0 +1,240 @@
+import heapq
+import logging
+import stat
+import threading
+import time
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Optional
+
+from datamover.file_functions.fs_mock import FS
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_EVERY_RETRIES = 100
+
+
+class MoveFailure(Enum):
+    """Why a move attempt failed, as far as it matters for retrying it."""
+
+    GONE = "gone"  # Source no longer exists; nothing left to move
+    TRANSIENT = "transient"  # Source is still a regular file; worth another try
+    PERMANENT = "permanent"  # Source is not something the mover will ever accept
+
+
+def classify_move_failure(
+    source_path: Path, expected_source_dir: Path, fs: FS
+) -> MoveFailure:
+    """
+    Classifies a failed move by the state of its source afterwards.
+
+    The movers log the underlying error and only report failure, so the
+    source is inspected instead: a file that is still there as a regular
+    file in the source directory failed for a reason that may clear (a
+    permission problem, a rename in progress, a busy destination). An
+    lstat error other than FileNotFoundError is treated as transient too.
+
+    Args:
+        source_path: The path that failed to move.
+        expected_source_dir: The resolved source directory.
+        fs: Filesystem abstraction used for the lstat.
+
+    Returns:
+        The MoveFailure classification.
+    """
+    if source_path.parent != expected_source_dir:
+        try:
+            if fs.resolve(source_path.parent, strict=True) != expected_source_dir:
+                return MoveFailure.PERMANENT
+        except FileNotFoundError:
+            return MoveFailure.GONE
+        except OSError:
+            return MoveFailure.TRANSIENT
+    try:
+        st = fs.lstat(source_path)
+    except FileNotFoundError:
+        return MoveFailure.GONE
+    except OSError:
+        return MoveFailure.TRANSIENT
+    if stat.S_ISREG(st.st_mode):
+        return MoveFailure.TRANSIENT
+    return MoveFailure.PERMANENT
+
+
+@dataclass(frozen=True)
+class MoveRetryStats:
+    """Snapshot of the MoveRetryHeap counters."""
+
+    pending: int
+    scheduled: int
+    retried: int
+    succeeded_after_retry: int
+    gave_up: int
+    failures_by_kind: dict[str, int]
+
+
+class MoveRetryHeap:
+    """
+    Delayed-retry heap for moves that failed for a possibly transient reason.
+
+    Without it, a failed move is only logged, and the file waits until the
+    scanner reports it lost (lost_timeout_seconds later). Here a transient
+    failure is scheduled again after a delay that starts at
+    `initial_delay_seconds` and doubles with each further failure of the
+    same path, up to `max_delay_seconds`. After `max_attempts` failed
+    attempts the path is given up on and left to the scanner.
+
+    The heap is kept apart from the move queue, so waiting retries neither
+    take queue capacity nor hold up new work. Mover threads take due paths
+    with pop_due(). All methods are thread-safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_attempts: int,
+        initial_delay_seconds: float,
+        max_delay_seconds: float,
+        monotonic_func: Callable[[], float] = time.monotonic,
+        report_every: int = DEFAULT_REPORT_EVERY_RETRIES,
+    ):
+        """
+        Args:
+            max_attempts: Failed attempts per path before giving up (>= 1).
+            initial_delay_seconds: Delay before the first retry.
+            max_delay_seconds: Cap on the delay between retries.
+            monotonic_func: Clock used for due times.
+            report_every: Log the counters every this many scheduled retries
+                          (0 disables periodic reporting).
+
+        Raises:
+            ValueError: If max_attempts is less than 1 or a delay is negative.
+        """
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+        if initial_delay_seconds < 0 or max_delay_seconds < 0:
+            raise ValueError("retry delays must be >= 0")
+        self._max_attempts = max_attempts
+        self._initial_delay = initial_delay_seconds
+        self._max_delay = max(max_delay_seconds, initial_delay_seconds)
+        self._monotonic = monotonic_func
+        self._report_every = report_every
+        self._lock = threading.Lock()
+        self._heap: list[tuple[float, int, Path]] = []
+        self._seq = 0
+        # Path -> failed attempts so far; present while a path is retried
+        self._attempts: dict[Path, int] = {}
+        self._waiting: set[Path] = set()
+
+        self._scheduled = 0
+        self._retried = 0
+        self._succeeded_after_retry = 0
+        self._gave_up = 0
+        self._failures: dict[str, int] = {kind.value: 0 for kind in MoveFailure}
+
+    def delay_for(self, attempts: int) -> float:
+        """Returns the delay before the retry that follows `attempts` failures."""
+        return min(self._max_delay, self._initial_delay * (2 ** (attempts - 1)))
+
+    def record_failure(self, path: Path, failure: MoveFailure) -> bool:
+        """
+        Records a failed move of path and schedules a retry if it is worth one.
+
+        Returns:
+            True if a retry was scheduled, False if path is not retried
+            (gone, permanent, or out of attempts).
+        """
+        with self._lock:
+            self._failures[failure.value] += 1
+            if failure is not MoveFailure.TRANSIENT:
+                self._attempts.pop(path, None)
+                return False
+            attempts = self._attempts.get(path, 0) + 1
+            if attempts >= self._max_attempts:
+                self._attempts.pop(path, None)
+                self._gave_up += 1
+                give_up = True
+            else:
+                give_up = False
+                self._attempts[path] = attempts
+                delay = self.delay_for(attempts)
+                if path not in self._waiting:
+                    self._seq += 1
+                    heapq.heappush(
+                        self._heap, (self._monotonic() + delay, self._seq, path)
+                    )
+                    self._waiting.add(path)
+                self._scheduled += 1
+                scheduled = self._scheduled
+
+        if give_up:
+            logger.warning(
+                "Giving up on moving '%s' after %d failed attempt(s); "
+                "leaving it to the scanner.",
+                path,
+                attempts,
+            )
+            return False
+        logger.info(
+            "Move of '%s' failed (attempt %d); retrying in %.1fs.",
+            path,
+            attempts,
+            delay,
+        )
+        if self._report_every > 0 and scheduled % self._report_every == 0:
+            snapshot = self.stats()
+            logger.info(
+                "Move retries: %d scheduled, %d pending, %d succeeded after "
+                "retry, %d given up; failures %s",
+                snapshot.scheduled,
+                snapshot.pending,
+                snapshot.succeeded_after_retry,
+                snapshot.gave_up,
+                snapshot.failures_by_kind,
+            )
+        return True
+
+    def record_success(self, path: Path) -> None:
+        """Forgets the attempt count of a path that has now moved."""
+        with self._lock:
+            if self._attempts.pop(path, None) is not None:
+                self._succeeded_after_retry += 1
+
+    def is_retrying(self, path: Path) -> bool:
+        """Returns True if path has failed before and is still being retried."""
+        with self._lock:
+            return path in self._attempts
+
+    def pop_due(self, limit: Optional[int] = None) -> list[Path]:
+        """Removes and returns the paths whose retry is due, oldest first."""
+        due: list[Path] = []
+        with self._lock:
+            now = self._monotonic()
+            while self._heap and self._heap[0][0] <= now:
+                if limit is not None and len(due) >= limit:
+                    break
+                _, _, path = heapq.heappop(self._heap)
+                self._waiting.discard(path)
+                due.append(path)
+            self._retried += len(due)
+        return due
+
+    def seconds_until_due(self) -> Optional[float]:
+        """Returns the time until the next retry is due, or None if none waits."""
+        with self._lock:
+            if not self._heap:
+                return None
+            return max(0.0, self._heap[0][0] - self._monotonic())
+
+    def stats(self) -> MoveRetryStats:
+        """Returns a consistent snapshot of the counters."""
+        with self._lock:
+            return MoveRetryStats(
+                pending=len(self._heap),
+                scheduled=self._scheduled,
+                retried=self._retried,
+                succeeded_after_retry=self._succeeded_after_retry,
+                gave_up=self._gave_up,
+                failures_by_kind=dict(self._failures),
+            )
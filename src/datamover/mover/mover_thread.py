@@ -5,6 +5,9 @@ from queue import Queue, Empty
 from pathlib import Path
 from typing import Callable, Optional
 
+from datamover.mover.move_retry_heap import MoveRetryHeap
+from datamover.mover.timed_queue import TimedQueue
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,6 +17,14 @@ class FileMoveThread(threading.Thread):
     the move operation to a provided callable. This class handles queue
     polling, graceful shutdown, and task bookkeeping, but does not
     implement the business logic of file validation or moving.
+
+    With batch_size > 1 each wakeup drains whatever is already queued (up to
+    batch_size items) and handles it as one batch, which absorbs bursts with
+    one blocking get and one stats update per batch instead of per item.
+
+    With a retry_heap, paths whose retry is due are taken from the heap
+    before the queue is polled, and the poll never waits past the next
+    due retry.
     """
 
     def __init__(
@@ -25,6 +36,11 @@ class FileMoveThread(threading.Thread):
         sleep_func: Callable[[float], None] = time.sleep,
         name: Optional[str] = None,
         poll_interval: float,
+        stats_interval_seconds: float = 60.0,
+        monotonic_func: Callable[[], float] = time.monotonic,
+        batch_size: int = 1,
+        process_batch: Optional[Callable[[list[Path]], None]] = None,
+        retry_heap: Optional[MoveRetryHeap] = None,
     ):
         """
         Args:
@@ -34,7 +50,24 @@ class FileMoveThread(threading.Thread):
             sleep_func: Function to sleep (injectable for test speed or error backoff).
             name: Optional thread name; defaults to 'FileMoveThread'.
             poll_interval: Time to wait between queue checks (in seconds).
+            stats_interval_seconds: How often to log this worker's throughput
+                                    and queue-wait figures (0 disables).
+            monotonic_func: Clock used for throughput and busy-time figures.
+            batch_size: Maximum number of items handled per wakeup. After the
+                        blocking get, up to batch_size - 1 further items that
+                        are already queued are taken without waiting. The
+                        batch is de-duplicated and ordered by directory and
+                        name before processing. 1 keeps one item per wakeup.
+            process_batch: Optional callable that processes a whole ordered
+                           batch at once, so per-directory work can be shared
+                           between its items. Without it, process_single is
+                           called for each item.
+            retry_heap: Optional heap of failed moves to retry. The callables
+                        schedule the retries; this thread only runs them
+                        when they are due.
         """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
         thread_name = name or "FileMoveThread"
         super().__init__(daemon=True, name=thread_name)
 
@@ -43,17 +76,189 @@ class FileMoveThread(threading.Thread):
         self.stop_event = stop_event
         self.sleep_func = sleep_func
         self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.process_batch = process_batch
+        self.retry_heap = retry_heap
+        self.stats_interval_seconds = stats_interval_seconds
+        self._monotonic = monotonic_func
+
+        # Lifetime counters
+        self.items_processed: int = 0
+        self.total_busy_seconds: float = 0.0
+        self.total_queue_wait_seconds: float = 0.0
+        self.batches_processed: int = 0
+        self.max_batch_size: int = 0
+        self.max_batch_seconds: float = 0.0
+
+        # Counters for the current reporting window
+        self._window_start = self._monotonic()
+        self._window_items = 0
+        self._window_busy = 0.0
+        self._window_wait = 0.0
+        self._window_max_wait = 0.0
+        self._window_batches = 0
+        self._window_max_batch = 0
+        self._window_max_batch_seconds = 0.0
+
+    def _last_queue_wait(self) -> Optional[float]:
+        if isinstance(self.source_queue, TimedQueue):
+            return self.source_queue.last_get_wait_seconds()
+        return None
+
+    def _record_batch(
+        self, size: int, busy_seconds: float, waits: list[Optional[float]]
+    ) -> None:
+        self.items_processed += size
+        self.total_busy_seconds += busy_seconds
+        self.batches_processed += 1
+        self.max_batch_size = max(self.max_batch_size, size)
+        self.max_batch_seconds = max(self.max_batch_seconds, busy_seconds)
+        self._window_items += size
+        self._window_busy += busy_seconds
+        self._window_batches += 1
+        self._window_max_batch = max(self._window_max_batch, size)
+        self._window_max_batch_seconds = max(
+            self._window_max_batch_seconds, busy_seconds
+        )
+        for wait_seconds in waits:
+            if wait_seconds is not None:
+                self.total_queue_wait_seconds += wait_seconds
+                self._window_wait += wait_seconds
+                self._window_max_wait = max(self._window_max_wait, wait_seconds)
+
+    def _maybe_report_stats(self) -> None:
+        if self.stats_interval_seconds <= 0:
+            return
+        now = self._monotonic()
+        elapsed = now - self._window_start
+        if elapsed < self.stats_interval_seconds:
+            return
+
+        if self._window_items:
+            logger.info(
+                "%s: moved %d item(s) in %.1fs (%.1f/s, busy %.0f%%); "
+                "queue wait avg %.1fms, max %.1fms",
+                self.name,
+                self._window_items,
+                elapsed,
+                self._window_items / elapsed,
+                100.0 * self._window_busy / elapsed,
+                1000.0 * self._window_wait / self._window_items,
+                1000.0 * self._window_max_wait,
+            )
+            if self.batch_size > 1:
+                logger.info(
+                    "%s: %d batch(es), avg %.1f item(s), max %d; "
+                    "max batch latency %.1fms",
+                    self.name,
+                    self._window_batches,
+                    self._window_items / self._window_batches,
+                    self._window_max_batch,
+                    1000.0 * self._window_max_batch_seconds,
+                )
+        else:
+            logger.debug("%s: idle for the last %.1fs", self.name, elapsed)
+
+        self._window_start = now
+        self._window_items = 0
+        self._window_busy = 0.0
+        self._window_wait = 0.0
+        self._window_max_wait = 0.0
+        self._window_batches = 0
+        self._window_max_batch = 0
+        self._window_max_batch_seconds = 0.0
+
+    def _drain_more(self, batch: list[Path], waits: list[Optional[float]]) -> None:
+        """Adds already-queued items to batch, without blocking, up to batch_size."""
+        while len(batch) < self.batch_size:
+            try:
+                item = self.source_queue.get_nowait()
+            except Empty:
+                return
+            batch.append(item)
+            waits.append(self._last_queue_wait())
+
+    @staticmethod
+    def _order_batch(batch: list[Path]) -> list[Path]:
+        """Drops duplicate paths and groups the rest by directory, then name."""
+        unique = list(dict.fromkeys(batch))
+        unique.sort(key=lambda p: (str(p.parent), p.name))
+        return unique
+
+    def _process_items(self, items: list[Path]) -> None:
+        if self.process_batch is not None and len(items) > 1:
+            try:
+                self.process_batch(items)
+            except Exception:
+                logger.exception(
+                    "%s: unexpected exception in process_batch for %d item(s)",
+                    self.name,
+                    len(items),
+                )
+            return
+
+        for item in items:
+            try:
+                self.process_single(item)
+            except Exception:
+                # This catches unexpected errors from the process_single callable itself
+                # The process_single_item in the factory already has its own try/except
+                # but another implementation of process_single might not so defensive here
+                logger.exception(
+                    "%s: unexpected exception in process_single for item %s",
+                    self.name,
+                    item,
+                )
+
+    def _mark_done(self, item: Path) -> None:
+        try:
+            self.source_queue.task_done()
+        except ValueError:  # More specific exception for task_done issues
+            logger.warning(
+                "%s: task_done() called on %s when queue was not expecting it (e.g. already empty or too many calls).",
+                self.name,
+                item,
+            )
+        except Exception as td_e:  # General catch-all for other task_done() errors
+            logger.warning("%s: task_done() error for %s: %s", self.name, item, td_e)
+
+    def _run_due_retries(self) -> bool:
+        """Processes retries that are due. Returns True if there were any."""
+        if self.retry_heap is None:
+            return False
+        due = self.retry_heap.pop_due(limit=self.batch_size)
+        if not due:
+            return False
+        logger.debug("%s retrying %d item(s)", self.name, len(due))
+        started = self._monotonic()
+        try:
+            self._process_items(self._order_batch(due))
+        finally:
+            self._record_batch(len(due), self._monotonic() - started, [])
+        return True
+
+    def _poll_timeout(self) -> float:
+        if self.retry_heap is None:
+            return self.poll_interval
+        until_due = self.retry_heap.seconds_until_due()
+        if until_due is None:
+            return self.poll_interval
+        return min(self.poll_interval, until_due)
 
     def run(self) -> None:
         """
-        Main loop: poll the queue, invoke process_single, track counts,
-        call task_done, and exit when stop_event is set.
+        Main loop: run due retries, poll the queue, drain up to batch_size items, invoke
+        process_single (or process_batch) on them, track counts, call
+        task_done for every dequeued item, and exit when stop_event is set.
         """
         logger.info("%s starting", self.name)
 
         while not self.stop_event.is_set():
+            self._maybe_report_stats()
+            if self._run_due_retries():
+                continue
             try:
-                item = self.source_queue.get(block=True, timeout=self.poll_interval)
+                item = self.source_queue.get(block=True, timeout=self._poll_timeout())
             except Empty:
                 # Queue was empty, loop again to check stop_event
                 continue
@@ -63,36 +268,29 @@ class FileMoveThread(threading.Thread):
                 self.sleep_func(self.poll_interval)
                 continue
 
-            # Got an item; ensure task_done after processing
+            # Got an item; ensure task_done for everything dequeued
+            batch = [item]
+            waits = [self._last_queue_wait()]
+            started = self._monotonic()
             try:
-                logger.debug("%s dequeued: %s", self.name, item)
-
-                try:
-                    self.process_single(item)
-                except Exception:
-                    # This catches unexpected errors from the process_single callable itself
-                    # The process_single_item in the factory already has its own try/except
-                    # but another implementation of process_single might not so defensive here
-                    logger.exception(
-                        "%s: unexpected exception in process_single for item %s",
+                if self.batch_size > 1:
+                    self._drain_more(batch, waits)
+                    items = self._order_batch(batch)
+                    logger.debug(
+                        "%s dequeued %d item(s), %d unique",
                         self.name,
-                        item,
+                        len(batch),
+                        len(items),
                     )
+                else:
+                    items = batch
+                    logger.debug("%s dequeued: %s", self.name, item)
+
+                self._process_items(items)
             finally:
-                try:
-                    self.source_queue.task_done()
-                except ValueError:  # More specific exception for task_done issues
-                    logger.warning(
-                        "%s: task_done() called on %s when queue was not expecting it (e.g. already empty or too many calls).",
-                        self.name,
-                        item,
-                    )
-                except (
-                    Exception
-                ) as td_e:  # General catch-all for other task_done() errors
-                    logger.warning(
-                        "%s: task_done() error for %s: %s", self.name, item, td_e
-                    )
+                self._record_batch(len(batch), self._monotonic() - started, waits)
+                for dequeued in batch:
+                    self._mark_done(dequeued)
 
         logger.info(
             "%s stopping",
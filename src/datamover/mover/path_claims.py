@@ -0,0 +1,36 @@
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class PathClaimGuard:
+    """
+    Serialises work on the same path across mover workers.
+
+    A worker holds a claim on a path while it moves it. A second worker that
+    dequeues the same path waits until the first one is done, so a path is
+    never moved by two workers at once and attempts on one path run in
+    queue order. Different paths never block each other.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition()
+        self._active: set[Path] = set()
+        self.contended_count: int = 0
+
+    @contextmanager
+    def claim(self, path: Path) -> Iterator[None]:
+        """Holds an exclusive claim on path for the duration of the with-block."""
+        with self._cond:
+            if path in self._active:
+                self.contended_count += 1
+                while path in self._active:
+                    self._cond.wait()
+            self._active.add(path)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active.discard(path)
+                self._cond.notify_all()
@@ -0,0 +1,286 @@
+import logging
+import os
+import time
+from queue import Empty
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Optional, cast
+
+from datamover.file_functions.fs_mock import FS
+from datamover.mover.move_journal import MoveJournal
+from datamover.mover.timed_queue import TimedQueue
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_EVERY_SPILLS = 1000
+
+
+@dataclass(frozen=True)
+class SpillQueueStats:
+    """Snapshot of the SpillingQueue counters."""
+
+    in_memory: int
+    on_disk: int
+    spilled_total: int
+    drained_total: int
+    bursts: int
+
+
+class SpillingQueue(TimedQueue):
+    """
+    Move queue that spills to an append-only file instead of blocking.
+
+    With a plain bounded queue, a put on a full queue blocks the producer.
+    For the move queue that producer is the tailer, so a burst that outruns
+    the mover stalls the tailer's consumer thread, then the watchdog
+    observer feeding it, and finally risks inotify queue overflow.
+
+    This queue holds up to `maxsize` items in memory as usual. When memory
+    is full, put() appends the path to `spill_path` and returns at once;
+    from then on every new item goes to the file until it has been drained,
+    so items always come out in FIFO order. When the in-memory part runs
+    empty, get() reads the next `maxsize` items back from the file. Once
+    the file is fully drained it is truncated and puts go to memory again.
+
+    Items must be Paths without newlines. Items still in the file at
+    shutdown are read back on the next start, so they are not lost; close()
+    first rewrites the file without the items already taken by the mover,
+    so those are not fed to it a second time.
+    Counters are logged at the start and end of every burst and every
+    `report_every` spills in between, and are available through stats().
+    """
+
+    def __init__(
+        self,
+        maxsize: int,
+        *,
+        spill_path: Path,
+        fs: FS,
+        monotonic_func: Callable[[], float] = time.monotonic,
+        report_every: int = DEFAULT_REPORT_EVERY_SPILLS,
+        journal: Optional[MoveJournal] = None,
+    ):
+        """
+        Args:
+            maxsize: Maximum number of items held in memory (must be > 0).
+            spill_path: File that overflow items are appended to.
+            fs: Filesystem abstraction used to open the spill file.
+            monotonic_func: Clock used to stamp items and measure rates.
+            report_every: Log the counters every this many spills during a
+                          burst (0 disables the periodic lines).
+            journal: Optional write-ahead journal that records each put.
+
+        Raises:
+            ValueError: If maxsize is not positive.
+            OSError: If the spill file cannot be opened.
+        """
+        if maxsize <= 0:
+            raise ValueError("SpillingQueue needs a positive maxsize")
+        super().__init__(maxsize, monotonic_func=monotonic_func, journal=journal)
+        self._spill_path = spill_path
+        self._fs = fs
+        self._report_every = report_every
+        self._writer = cast(IO[bytes], fs.open(spill_path, "ab"))
+        self._reader = cast(IO[bytes], fs.open(spill_path, "rb"))
+
+        # Items left on disk by a previous run are pending work. Their
+        # stamps come from another process's clock, so they are restamped.
+        self._on_disk = sum(1 for _ in self._reader)
+        self._reader.seek(0)
+        self._unstamped = self._on_disk
+        self.unfinished_tasks = self._on_disk
+
+        self._spilled_total = 0
+        self._drained_total = 0
+        self._bursts = 0
+        self._burst_start = 0.0
+        self._burst_spilled = 0
+        self._burst_drained = 0
+        self._first_drain: Optional[float] = None
+        if self._on_disk:
+            logger.warning(
+                "Move queue: %d item(s) pending in '%s' from a previous run.",
+                self._on_disk,
+                spill_path,
+            )
+            self._start_burst(self._monotonic())
+
+    def _start_burst(self, now: float) -> None:
+        self._bursts += 1
+        self._burst_start = now
+        self._burst_spilled = 0
+        self._burst_drained = 0
+        self._first_drain = None
+
+    def put(
+        self, item: Any, block: bool = True, timeout: Optional[float] = None
+    ) -> None:
+        """
+        Puts item in memory, or appends it to the spill file if memory is
+        full or earlier items are still on disk. Never blocks on a full queue;
+        block and timeout are accepted for compatibility with queue.Queue.
+
+        Raises:
+            ValueError: If item's text contains a newline.
+            OSError: If the spill file cannot be written.
+        """
+        if self.journal is not None:
+            self.journal.record_enqueued(item)
+        with self.not_full:
+            try:
+                if self._on_disk == 0 and len(self.queue) < self.maxsize:
+                    self._put(item)
+                else:
+                    self._spill(item)
+            except (OSError, ValueError):
+                if self.journal is not None:
+                    self.journal.record_done(item)  # Never queued: undo the record
+                raise
+            self.unfinished_tasks += 1
+            self.not_empty.notify()
+
+    def _spill(self, item: Any) -> None:
+        """Appends item to the spill file. Caller holds the mutex."""
+        encoded = os.fsencode(str(item))
+        if b"\n" in encoded:
+            raise ValueError(f"Cannot spill item containing a newline: {item!r}")
+        now = self._monotonic()
+        self._writer.write(f"{now!r}\t".encode() + encoded + b"\n")
+        self._writer.flush()
+
+        if self._on_disk == 0 and self._burst_spilled == 0:
+            self._start_burst(now)
+            logger.warning(
+                "Move queue full (%d in memory); spilling new items to '%s'.",
+                len(self.queue),
+                self._spill_path,
+            )
+        self._on_disk += 1
+        self._spilled_total += 1
+        self._burst_spilled += 1
+        if self._report_every > 0 and self._burst_spilled % self._report_every == 0:
+            logger.info(
+                "Move queue overflow: %d item(s) on disk (%d spilled, %d drained "
+                "in this burst).",
+                self._on_disk,
+                self._burst_spilled,
+                self._burst_drained,
+            )
+
+    def _qsize(self) -> int:
+        return len(self.queue) + self._on_disk
+
+    def _get(self) -> Any:
+        if not self.queue:
+            self._refill()
+            if not self.queue:
+                raise Empty
+        return super()._get()
+
+    def _refill(self) -> None:
+        """Reads up to maxsize items back into memory. Caller holds the mutex."""
+        now = self._monotonic()
+        if self._first_drain is None:
+            self._first_drain = now
+        read = 0
+        while read < self.maxsize and self._on_disk:
+            line = self._reader.readline()
+            if not line.endswith(b"\n"):
+                # Should not happen: every spill is a complete, flushed line
+                logger.error(
+                    "Move queue: spill file '%s' ended early; %d item(s) lost.",
+                    self._spill_path,
+                    self._on_disk,
+                )
+                self.unfinished_tasks -= self._on_disk
+                self._on_disk = 0
+                break
+            stamp, _, raw_path = line[:-1].partition(b"\t")
+            enqueued_at = now
+            if self._unstamped:
+                self._unstamped -= 1
+            else:
+                try:
+                    enqueued_at = float(stamp)
+                except ValueError:
+                    pass
+            self.queue.append((enqueued_at, Path(os.fsdecode(raw_path))))
+            self._on_disk -= 1
+            read += 1
+
+        self._drained_total += read
+        self._burst_drained += read
+        if self._on_disk == 0:
+            self._end_burst(now)
+
+    def _end_burst(self, now: float) -> None:
+        # Start the file over. The reader is reopened rather than rewound so
+        # that none of its buffered bytes from before the truncate survive.
+        self._writer.truncate(0)
+        self._reader.close()
+        self._reader = cast(IO[bytes], self._fs.open(self._spill_path, "rb"))
+        spill_elapsed = max(now - self._burst_start, 1e-9)
+        drain_elapsed = max(now - (self._first_drain or now), 1e-9)
+        logger.info(
+            "Move queue overflow drained: %d item(s) spilled over %.1fs "
+            "(%.1f/s), %d drained over %.1fs (%.1f/s).",
+            self._burst_spilled,
+            spill_elapsed,
+            self._burst_spilled / spill_elapsed,
+            self._burst_drained,
+            drain_elapsed,
+            self._burst_drained / drain_elapsed,
+        )
+        self._burst_spilled = 0
+        self._burst_drained = 0
+        self._first_drain = None
+
+    def stats(self) -> SpillQueueStats:
+        """Returns a consistent snapshot of the counters."""
+        with self.mutex:
+            return SpillQueueStats(
+                in_memory=len(self.queue),
+                on_disk=self._on_disk,
+                spilled_total=self._spilled_total,
+                drained_total=self._drained_total,
+                bursts=self._bursts,
+            )
+
+    def close(self) -> None:
+        """
+        Closes the spill file handles. The items still on disk, and those
+        read back but not yet taken, stay in the file for the next run; the
+        lines of items already taken are dropped.
+        """
+        with self.mutex:
+            try:
+                self._compact()
+            except OSError as e:
+                logger.error(
+                    "Move queue: could not compact spill file '%s': %s",
+                    self._spill_path,
+                    e,
+                )
+            finally:
+                self._writer.close()
+                self._reader.close()
+
+    def _compact(self) -> None:
+        """Drops the lines of items already taken. Caller holds the mutex."""
+        if self._on_disk == 0:
+            self._writer.truncate(0)
+            return
+        if self._reader.tell() == 0:
+            return  # Nothing drained yet
+        # Since the first refill of this burst, memory has only held items
+        # read back from the file; they have not been taken, so keep them
+        taken_back = [
+            f"{enqueued_at!r}\t".encode() + os.fsencode(str(item)) + b"\n"
+            for enqueued_at, item in self.queue
+        ]
+        remaining = self._reader.read()
+        tmp_path = self._spill_path.with_name(self._spill_path.name + ".tmp")
+        with self._fs.open(tmp_path, "wb") as f:
+            f.writelines(taken_back)
+            f.write(remaining)
+        self._fs.replace(tmp_path, self._spill_path)
@@ -3,14 +3,19 @@ import time
 import threading
 from pathlib import Path
 from queue import Queue
-from typing import Optional
+from typing import Callable, Optional, Sequence
 
 from datamover.file_functions.directory_validation import (
     resolve_and_validate_directory,
 )
 from datamover.file_functions.fs_mock import FS
 from datamover.file_functions.move_file_safely import move_file_safely_impl
+from datamover.mover.fused_upload import FusedMoveUploader
+from datamover.mover.move_journal import MoveJournal
+from datamover.mover.move_retry_heap import MoveRetryHeap, classify_move_failure
+from datamover.mover.path_claims import PathClaimGuard
 from datamover.protocols import SafeFileMover, SleepCallable
+from datamover.queues.claim_registry import ClaimRegistry
 from datamover.mover.mover_thread import FileMoveThread
 
 logger = logging.getLogger(__name__)
@@ -26,14 +31,67 @@ def create_file_move_thread(
     fs: FS,
     file_mover_func: Optional[SafeFileMover] = None,
     sleep_func: Optional[SleepCallable] = None,
+    fused_uploader: Optional[FusedMoveUploader] = None,
+    claim_registry: Optional[ClaimRegistry] = None,
+    batch_size: int = 1,
+    move_journal: Optional[MoveJournal] = None,
+    retry_heap: Optional[MoveRetryHeap] = None,
 ) -> FileMoveThread:
     """
-    Construct a FileMoveThread with all dependencies resolved.
+    Construct a single FileMoveThread with all dependencies resolved.
+
+    Convenience wrapper around create_file_move_threads with worker_count=1;
+    see there for the arguments.
+
+    Returns:
+        A configured FileMoveThread instance (daemon, not yet started).
+    """
+    return create_file_move_threads(
+        source_dir_path=source_dir_path,
+        worker_dir_path=worker_dir_path,
+        poll_interval_seconds=poll_interval_seconds,
+        source_queue=source_queue,
+        stop_event=stop_event,
+        fs=fs,
+        file_mover_func=file_mover_func,
+        sleep_func=sleep_func,
+        fused_uploader=fused_uploader,
+        claim_registry=claim_registry,
+        batch_size=batch_size,
+        move_journal=move_journal,
+        retry_heap=retry_heap,
+        worker_count=1,
+    )[0]
+
+
+def create_file_move_threads(
+    *,
+    source_dir_path: Path,
+    worker_dir_path: Path,
+    poll_interval_seconds: float,
+    source_queue: Queue[Path],
+    stop_event: threading.Event,
+    fs: FS,
+    file_mover_func: Optional[SafeFileMover] = None,
+    sleep_func: Optional[SleepCallable] = None,
+    fused_uploader: Optional[FusedMoveUploader] = None,
+    claim_registry: Optional[ClaimRegistry] = None,
+    worker_count: int = 1,
+    batch_size: int = 1,
+    move_journal: Optional[MoveJournal] = None,
+    retry_heap: Optional[MoveRetryHeap] = None,
+    extra_source_dir_paths: Sequence[Path] = (),
+) -> list[FileMoveThread]:
+    """
+    Construct a pool of FileMoveThreads sharing one queue, with all
+    dependencies resolved.
 
     - Resolves configured source and worker dirs using the provided fs.
     - Uses the provided source_queue (shared across threads) for work items.
     - Uses the provided stop_event to control thread shutdown.
     - Injects the file moving logic via file_mover_func (conforming to SafeFileMover).
+    - All workers share one PathClaimGuard, so a given path is never moved
+      by two workers at once.
 
     Args:
         source_dir_path: The path to the source directory.
@@ -44,13 +102,43 @@ def create_file_move_thread(
         fs: Filesystem abstraction instance (must be provided).
         file_mover_func: A callable conforming to the SafeFileMover protocol
                          responsible for safely moving a single file. Defaults
-                         to move_file_safely_impl.
+                         to move_file_safely_impl. Must be thread-safe when
+                         worker_count > 1.
         sleep_func: Function to sleep (conforming to SleepCallable).
                          Passed to FileMoveThread for internal use.
+        fused_uploader: Optional fused move-and-upload fast path. When given,
+                        each item is first offered to it; only items it
+                        declines go through file_mover_func into the worker dir.
+        claim_registry: Optional shared registry the producers consult before
+                        enqueuing; each item is marked in flight while it is
+                        processed and completed (or forgotten) afterwards.
+        worker_count: Number of mover threads to build (at least 1).
+        batch_size: Maximum number of queued items each thread takes per
+                    wakeup. Within a batch, the source directory of each
+                    distinct parent is resolved and checked once and the
+                    result is shared by all of its items.
+        move_journal: Optional write-ahead journal of the source_queue; each
+                      item is recorded as done once it has been processed,
+                      whether or not it moved.
+        retry_heap: Optional shared heap for failed moves. A failure is
+                    classified by the state of its source; transient ones
+                    are retried with backoff instead of being dropped. A
+                    path waiting for a retry stays in flight in the claim
+                    registry and pending in the journal.
+        extra_source_dir_paths: Further directories files may be queued
+                                from (a sharded scanner's other
+                                directories). Each file is validated
+                                against the one it is in.
 
     Returns:
-        A configured FileMoveThread instance (daemon, not yet started).
+        A list of configured FileMoveThread instances (daemon, not yet started).
+
+    Raises:
+        ValueError: If worker_count is less than 1.
     """
+    if worker_count < 1:
+        raise ValueError(f"worker_count must be at least 1, got {worker_count}")
+
     # Resolve and validate configured directories using the passed-in paths
     # the calling code will catch Any exceptions from here in app.run
     src_dir = resolve_and_validate_directory(
@@ -63,61 +151,174 @@ def create_file_move_thread(
         fs=fs,
         dir_label="destination for FileMover (worker)",
     )
-
-    # Thread name based on the destination directory
-    thread_name = f"FileMover-{dst_dir.name}"
+    source_dirs: set[Path] = {src_dir}
+    for extra_path in extra_source_dir_paths:
+        source_dirs.add(
+            resolve_and_validate_directory(
+                raw_path=extra_path,
+                fs=fs,
+                dir_label="extra source for FileMover",
+            )
+        )
 
     # Create the dependencies if not provided
     final_file_mover_func = (
         move_file_safely_impl if file_mover_func is None else file_mover_func
     )
     final_sleep_func = time.sleep if sleep_func is None else sleep_func
+    claim_guard = PathClaimGuard()
 
-    # Build the process_single callback, capturing resolved paths and using file_mover_func
-    def process_single_item(path_to_move: Path) -> None:
-        """
-        Processes a single file path from the queue using the injected file_mover_func.
-        This function is the core work delegate for FileMoveThread.
-        It handles logging for the thread's processing attempt.
-        """
-        try:
-            final_dest_path: Optional[Path] = final_file_mover_func(  # Use renamed var
-                source_path_raw=path_to_move,
-                expected_source_dir=src_dir,
-                destination_dir=dst_dir,
-                fs=fs,
-            )
-
-            if final_dest_path:
-                logger.debug(
-                    "%s: Successfully processed and moved '%s' to '%s'",
-                    thread_name,
-                    path_to_move.name,
-                    final_dest_path,
-                )
-            else:
-                # This case implies the mover function itself handled logging for the specific failure reason
-                logger.warning(
-                    "%s: Failed to process '%s'. See previous logs from the file mover for details.",
+    def make_process_single(thread_name: str) -> Callable[[Path], None]:
+        # Build the process_single callback, capturing resolved paths and using file_mover_func
+        def process_single_item(path_to_move: Path) -> None:
+            """
+            Processes a single file path from the queue using the injected file_mover_func.
+            This function is the core work delegate for FileMoveThread.
+            It handles logging for the thread's processing attempt.
+            """
+            try:
+                with claim_guard.claim(path_to_move):
+                    _move_one(thread_name, path_to_move)
+            except Exception as e:
+                # This catches unexpected errors in the process_single_item or file_mover_func
+                logger.exception(
+                    "%s: Unexpected critical error during file processing for '%s': %s",
                     thread_name,
                     path_to_move,
+                    e,
                 )
-        except Exception as e:
-            # This catches unexpected errors in the process_single_item or file_mover_func
-            logger.exception(
-                "%s: Unexpected critical error during file processing for '%s': %s",
+
+        return process_single_item
+
+    def make_process_batch(thread_name: str) -> Callable[[list[Path]], None]:
+        def process_batch(paths: list[Path]) -> None:
+            """
+            Processes an ordered batch from FileMoveThread. Each distinct
+            parent directory is resolved once per batch; items whose parent
+            resolves to the source directory are handed to the mover in
+            canonical form, so it can skip its own per-file resolution.
+            """
+            resolved_parents: dict[Path, Optional[Path]] = {}
+            for path_to_move in paths:
+                try:
+                    source_path = _canonical_source(path_to_move, resolved_parents)
+                    with claim_guard.claim(path_to_move):
+                        _move_one(thread_name, path_to_move, source_path)
+                except Exception as e:
+                    logger.exception(
+                        "%s: Unexpected critical error during file processing for '%s': %s",
+                        thread_name,
+                        path_to_move,
+                        e,
+                    )
+
+        return process_batch
+
+    def _canonical_source(
+        path_to_move: Path, resolved_parents: dict[Path, Optional[Path]]
+    ) -> Path:
+        if path_to_move.is_absolute() and path_to_move.parent in source_dirs:
+            return path_to_move
+        parent = path_to_move.parent
+        if parent not in resolved_parents:
+            try:
+                resolved_parents[parent] = fs.resolve(parent, strict=True)
+            except OSError:
+                # Leave it to the mover to report the problem for each file
+                resolved_parents[parent] = None
+        resolved_parent = resolved_parents[parent]
+        if resolved_parent is not None and resolved_parent in source_dirs:
+            return resolved_parent / path_to_move.name
+        return path_to_move
+
+    def _expected_source_dir(path_to_move: Path) -> Path:
+        # Files outside every source dir are validated (and rejected) against
+        # the primary one
+        parent = path_to_move.parent
+        return parent if parent in source_dirs else src_dir
+
+    def _move_one(
+        thread_name: str, path_to_move: Path, source_path: Optional[Path] = None
+    ) -> None:
+        moved = False
+        retry_scheduled = False
+        attempted_path = path_to_move if source_path is None else source_path
+        if claim_registry is not None:
+            claim_registry.mark_in_flight(path_to_move)
+        try:
+            moved = _attempt_move(thread_name, attempted_path)
+            if retry_heap is not None:
+                if moved:
+                    retry_heap.record_success(path_to_move)
+                else:
+                    retry_scheduled = retry_heap.record_failure(
+                        path_to_move,
+                        classify_move_failure(
+                            attempted_path, _expected_source_dir(attempted_path), fs
+                        ),
+                    )
+        finally:
+            # A path waiting for a retry stays claimed and pending in the journal
+            if not retry_scheduled:
+                if claim_registry is not None:
+                    claim_registry.mark_done(path_to_move, moved=moved)
+                if move_journal is not None:
+                    move_journal.record_done(path_to_move)
+
+    def _attempt_move(thread_name: str, path_to_move: Path) -> bool:
+        if fused_uploader is not None and fused_uploader.process(path_to_move):
+            logger.debug(
+                "%s: '%s' handled by fused upload path",
                 thread_name,
-                path_to_move,
-                e,
+                path_to_move.name,
             )
+            return True
 
-    # Construct and return the thread
-    thread = FileMoveThread(
-        source_queue=source_queue,
-        process_single=process_single_item,
-        stop_event=stop_event,
-        sleep_func=final_sleep_func,  # Use renamed var
-        name=thread_name,
-        poll_interval=poll_interval_seconds,  # Use the direct argument
-    )
-    return thread
+        final_dest_path: Optional[Path] = final_file_mover_func(
+            source_path_raw=path_to_move,
+            expected_source_dir=_expected_source_dir(path_to_move),
+            destination_dir=dst_dir,
+            fs=fs,
+        )
+
+        if final_dest_path:
+            logger.debug(
+                "%s: Successfully processed and moved '%s' to '%s'",
+                thread_name,
+                path_to_move.name,
+                final_dest_path,
+            )
+            return True
+
+        # This case implies the mover function itself handled logging for the specific failure reason
+        logger.warning(
+            "%s: Failed to process '%s'. See previous logs from the file mover for details.",
+            thread_name,
+            path_to_move,
+        )
+        return False
+
+    threads: list[FileMoveThread] = []
+    for index in range(1, worker_count + 1):
+        # Thread name based on the destination directory
+        thread_name = (
+            f"FileMover-{dst_dir.name}"
+            if worker_count == 1
+            else f"FileMover-{dst_dir.name}-{index}"
+        )
+        threads.append(
+            FileMoveThread(
+                source_queue=source_queue,
+                process_single=make_process_single(thread_name),
+                stop_event=stop_event,
+                sleep_func=final_sleep_func,
+                name=thread_name,
+                poll_interval=poll_interval_seconds,  # Use the direct argument
+                batch_size=batch_size,
+                process_batch=(
+                    make_process_batch(thread_name) if batch_size > 1 else None
+                ),
+                retry_heap=retry_heap,
+            )
+        )
+    return threads
@@ -0,0 +1,68 @@
+import threading
+import time
+from queue import Full, Queue
+from typing import Any, Callable, Optional
+
+from datamover.mover.move_journal import MoveJournal
+
+
+class TimedQueue(Queue):
+    """
+    Queue that remembers how long each item waited before it was taken.
+
+    Items are stamped with a monotonic time when put. When a consumer gets an
+    item, the time it spent queued is recorded for that consumer thread and
+    can be read back with last_get_wait_seconds(). Producers and consumers
+    use it exactly like a queue.Queue.
+
+    With a journal, every put is recorded in it (and on disk) before the
+    item is queued, so it can be replayed after a restart. A put that
+    times out is recorded as done again, so it is not replayed.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 0,
+        *,
+        monotonic_func: Callable[[], float] = time.monotonic,
+        journal: Optional[MoveJournal] = None,
+    ):
+        """
+        Args:
+            maxsize: Maximum number of items, as for queue.Queue (0 = unbounded).
+            monotonic_func: Clock used to stamp items.
+            journal: Optional write-ahead journal that records each put.
+        """
+        self._monotonic = monotonic_func
+        self._local = threading.local()
+        self.journal = journal
+        super().__init__(maxsize)
+
+    def put(
+        self, item: Any, block: bool = True, timeout: Optional[float] = None
+    ) -> None:
+        if self.journal is not None:
+            # Outside the queue mutex, so one fsync can cover several producers
+            self.journal.record_enqueued(item)
+        try:
+            super().put(item, block, timeout)
+        except Full:
+            if self.journal is not None:
+                self.journal.record_done(item)  # Never queued: undo the record
+            raise
+
+    # _put/_get are called by Queue with its mutex held.
+    def _put(self, item: Any) -> None:
+        self.queue.append((self._monotonic(), item))
+
+    def _get(self) -> Any:
+        enqueued_at, item = self.queue.popleft()
+        self._local.last_wait = self._monotonic() - enqueued_at
+        return item
+
+    def last_get_wait_seconds(self) -> Optional[float]:
+        """
+        Returns how long the item most recently taken by the calling thread
+        waited in the queue, or None if this thread has not taken one yet.
+        """
+        return getattr(self._local, "last_wait", None)
@@ -1,4 +1,13 @@
-from typing import Protocol, Optional, IO, Dict, List, Callable, runtime_checkable
+from typing import (
+    Protocol,
+    Optional,
+    IO,
+    Dict,
+    Iterable,
+    List,
+    Callable,
+    runtime_checkable,
+)
 from pathlib import Path
 
 from datamover.file_functions.fs_mock import FS
@@ -52,6 +61,23 @@ class FileScanner(Protocol):
         ...
 
 
+class StreamingFileScanner(Protocol):
+    """
+    Protocol for a callable that yields the GatheredEntryData of matching
+    files while it scans, instead of returning them all at the end.
+
+    A FileScanner satisfies it too (a list is iterable). Iterators that
+    hold the directory open have a close() method; callers that stop
+    early should call it.
+    """
+
+    def __call__(
+        self, *, directory: Path, fs: FS, extension_no_dot: str
+    ) -> Iterable[GatheredEntryData]:
+        """Scans the directory using fs for files with the given extension."""
+        ...
+
+
 # --- Timing/Concurrency Related Type Aliases/Protocols ---
 
 SleepCallable = Callable[[float], None]
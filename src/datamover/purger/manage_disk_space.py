@@ -16,6 +16,7 @@ def manage_disk_space(
     fs: FS,
     total_disk_capacity_bytes: int,
     target_disk_usage_percent: float = 0.80,
+    fast_scan: bool = False,
 ) -> None:
     """
     Manages disk space by deleting the oldest files to keep usage below a target.
@@ -30,6 +31,7 @@ def manage_disk_space(
         fs: Filesystem abstraction instance (as per your FS dataclass).
         total_disk_capacity_bytes: Total capacity of the disk in bytes.
         target_disk_usage_percent: The target disk usage (e.g., 0.80 for 80%).
+        fast_scan: Resolve each directory once per scan instead of every file.
     """
     logger.info(
         "Starting disk space management. Target: < %.0f%% of %s.",
@@ -39,9 +41,11 @@ def manage_disk_space(
 
     # 1. Scan directories and sort files
     uploaded_files_sorted, scan_uploaded_ok = scan_and_sort_files(
-        uploaded_dir_path, fs, "uploaded"
+        uploaded_dir_path, fs, "uploaded", fast_scan
+    )
+    work_files_sorted, scan_work_ok = scan_and_sort_files(
+        work_dir_path, fs, "work", fast_scan
     )
-    work_files_sorted, scan_work_ok = scan_and_sort_files(work_dir_path, fs, "work")
 
     if not scan_work_ok and not scan_uploaded_ok:
         logger.error("Both directory scans failed. Aborting cleanup.")
@@ -21,6 +21,7 @@ class PurgerThread(threading.Thread):
         check_interval_seconds: float,
         stop_event: threading.Event,
         name: Optional[str] = "PurgerThread",
+        fast_scan: bool = False,
     ):
         super().__init__(daemon=True, name=name)
         self.work_dir_path = work_dir_path
@@ -30,6 +31,7 @@ class PurgerThread(threading.Thread):
         self.target_disk_usage_percent = target_disk_usage_percent
         self.check_interval_seconds = check_interval_seconds
         self.stop_event = stop_event
+        self.fast_scan = fast_scan
         self.cycles_completed = 0
 
     def run(self) -> None:
@@ -57,6 +59,7 @@ class PurgerThread(threading.Thread):
                     fs=self.fs,
                     total_disk_capacity_bytes=self.total_disk_capacity_bytes,
                     target_disk_usage_percent=self.target_disk_usage_percent,
+                    fast_scan=self.fast_scan,
                 )
                 self.cycles_completed += 1
                 logger.debug(
@@ -13,14 +13,14 @@ logger = logging.getLogger(__name__)
 
 
 def scan_and_sort_files(
-    directory_path: Path, fs: FS, description: str
+    directory_path: Path, fs: FS, description: str, fast_scan: bool = False
 ) -> Tuple[List[GatheredEntryData], bool]:
     """Scans a directory, sorts the files by mtime, and handles potential errors."""
     files_sorted: List[GatheredEntryData] = []
     scan_ok = True
     try:
         logger.debug("Scanning %s directory: %s", description, directory_path)
-        files_sorted = gather_file_data(directory_path, fs)
+        files_sorted = gather_file_data(directory_path, fs, fast_scan=fast_scan)
         files_sorted.sort()
         logger.info(
             "Found and sorted %d files in %s directory.", len(files_sorted), description
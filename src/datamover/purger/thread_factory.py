@@ -22,6 +22,7 @@ def create_purger_thread(
     check_interval_seconds: float,
     stop_event: threading.Event,
     thread_name: Optional[str] = "PurgerThread",
+    fast_scan: bool = False,
 ) -> PurgerThread:
     """
     Constructs a PurgerThread.
@@ -69,5 +70,6 @@ def create_purger_thread(
         check_interval_seconds=check_interval_seconds,
         stop_event=stop_event,
         name=thread_name,
+        fast_scan=fast_scan,
     )
     return thread
@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_EVERY_SUPPRESSIONS = 100
+
+
+class ClaimState(Enum):
+    QUEUED = "queued"
+    IN_FLIGHT = "in_flight"
+    COMPLETED = "completed"
+
+
+@dataclass(frozen=True)
+class ClaimRegistryStats:
+    """Snapshot of the ClaimRegistry counters."""
+
+    queued: int
+    in_flight: int
+    completed: int
+    suppressed_by_source: dict[str, int]
+
+    @property
+    def suppressed_total(self) -> int:
+        return sum(self.suppressed_by_source.values())
+
+
+class ClaimRegistry:
+    """
+    Shared record of source paths that are queued, in flight, or recently
+    moved, used to drop duplicate move requests before they reach the queue.
+
+    The tailer and the lost-file scanner can both announce the same file,
+    and a file can be announced again after it has already moved. Producers
+    call try_register() before safe_put() and skip the put if it returns
+    False; the mover reports progress with mark_in_flight() and mark_done().
+    Completed entries are forgotten after `completed_ttl_seconds`, so a new
+    file that reuses an old name is only suppressed within that window.
+
+    All methods are thread-safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        completed_ttl_seconds: float,
+        monotonic_func: Callable[[], float] = time.monotonic,
+        report_every: int = DEFAULT_REPORT_EVERY_SUPPRESSIONS,
+    ):
+        """
+        Args:
+            completed_ttl_seconds: How long a moved path keeps suppressing
+                                   new requests for the same path.
+            monotonic_func: Clock used for TTL eviction.
+            report_every: Log the counters every this many suppressions
+                          (0 disables periodic reporting).
+        """
+        if completed_ttl_seconds < 0:
+            raise ValueError("completed_ttl_seconds must be >= 0")
+        self._ttl = completed_ttl_seconds
+        self._monotonic = monotonic_func
+        self._report_every = report_every
+        self._lock = threading.Lock()
+        self._entries: dict[Path, tuple[ClaimState, float]] = {}
+        # Completion order, for cheap eviction of expired entries from the front
+        self._completions: deque[tuple[float, Path]] = deque()
+        self._suppressed: dict[str, int] = {}
+
+    def _evict_expired(self, now: float) -> None:
+        """Drops completed entries older than the TTL. Caller holds the lock."""
+        cutoff = now - self._ttl
+        while self._completions and self._completions[0][0] <= cutoff:
+            completed_at, path = self._completions.popleft()
+            entry = self._entries.get(path)
+            # Only drop it if it was not re-registered since
+            if entry == (ClaimState.COMPLETED, completed_at):
+                del self._entries[path]
+
+    def try_register(self, path: Path, *, source: str) -> bool:
+        """
+        Records path as queued unless it is already queued, in flight, or
+        was moved within the TTL.
+
+        Args:
+            path: The source path about to be enqueued.
+            source: Short producer name used for the suppression counters
+                    (e.g. "tailer", "scanner").
+
+        Returns:
+            True if the caller should enqueue path, False if it is a duplicate.
+        """
+        with self._lock:
+            now = self._monotonic()
+            self._evict_expired(now)
+            entry = self._entries.get(path)
+            if entry is None:
+                self._entries[path] = (ClaimState.QUEUED, now)
+                return True
+            self._suppressed[source] = self._suppressed.get(source, 0) + 1
+            total = sum(self._suppressed.values())
+            state = entry[0]
+
+        logger.debug(
+            "Suppressed duplicate move request from %s for '%s' (%s).",
+            source,
+            path,
+            state.value,
+        )
+        if self._report_every > 0 and total % self._report_every == 0:
+            snapshot = self.stats()
+            logger.info(
+                "Duplicate move requests suppressed so far: %d %s",
+                snapshot.suppressed_total,
+                snapshot.suppressed_by_source,
+            )
+        return False
+
+    def release(self, path: Path) -> None:
+        """Forgets a queued path whose put failed, so it can be announced again."""
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] is ClaimState.QUEUED:
+                del self._entries[path]
+
+    def mark_in_flight(self, path: Path) -> None:
+        """Records that a mover has taken path off the queue."""
+        with self._lock:
+            self._entries[path] = (ClaimState.IN_FLIGHT, self._monotonic())
+
+    def mark_done(self, path: Path, *, moved: bool) -> None:
+        """
+        Records the outcome of a move attempt.
+
+        Args:
+            path: The source path that was processed.
+            moved: True if the file left the source directory. A failed
+                   attempt is forgotten so that a later announcement (for
+                   example from the lost-file scanner) can retry it.
+        """
+        with self._lock:
+            if moved:
+                now = self._monotonic()
+                self._entries[path] = (ClaimState.COMPLETED, now)
+                self._completions.append((now, path))
+                self._evict_expired(now)
+            else:
+                self._entries.pop(path, None)
+
+    def stats(self) -> ClaimRegistryStats:
+        """Returns a consistent snapshot of the counters."""
+        with self._lock:
+            self._evict_expired(self._monotonic())
+            counts = {state: 0 for state in ClaimState}
+            for state, _ in self._entries.values():
+                counts[state] += 1
+            return ClaimRegistryStats(
+                queued=counts[ClaimState.QUEUED],
+                in_flight=counts[ClaimState.IN_FLIGHT],
+                completed=counts[ClaimState.COMPLETED],
+                suppressed_by_source=dict(self._suppressed),
+            )
@@ -0,0 +1,175 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    """A file announced by a manifest (CSV) line."""
+
+    path: Path
+    timestamp: int
+    sha256_hash: str
+    announced_mono: float
+    requeued: bool = False
+
+
+@dataclass(frozen=True)
+class ManifestIndexStats:
+    """Snapshot of the ManifestIndex counters."""
+
+    entries: int
+    announced: int
+    evicted: int
+    requeued: int
+
+
+class ManifestIndex:
+    """
+    Bounded record of the files the manifest (CSV) lines have announced,
+    keyed by file name, so the scanner can join them with what it finds in
+    the source directory.
+
+    The tailer records every parsed line, whether or not its enqueue
+    succeeded. Each scan cycle, reconcile() returns the announced files
+    still in the source directory that were announced before the previous
+    cycle: their move request was lost (a missed event or a failed put) and
+    they are queued again at once instead of after the lost timeout. Each
+    announcement is re-queued at most once; a file that is still there
+    afterwards is left to the lost-file path. The same join forgets
+    announced files that have left the source directory.
+
+    The index holds at most `max_entries` names, evicting the least recently
+    announced first, and forgets names announced more than `ttl_seconds`
+    ago. All methods are thread-safe.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int,
+        ttl_seconds: float,
+        monotonic_func: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            max_entries: Most names kept at once.
+            ttl_seconds: How long an announcement is kept.
+            monotonic_func: Clock used for announcement times and the TTL.
+
+        Raises:
+            ValueError: If max_entries is less than 1 or ttl_seconds is not
+                        positive.
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be at least 1, got {max_entries}")
+        if ttl_seconds <= 0:
+            raise ValueError(f"ttl_seconds must be > 0, got {ttl_seconds}")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._monotonic = monotonic_func
+        self._lock = threading.Lock()
+        # Oldest announcement first
+        self._entries: OrderedDict[str, ManifestEntry] = OrderedDict()
+        self._announced = 0
+        self._evicted = 0
+        self._requeued = 0
+
+    def _evict_expired(self, now: float) -> None:
+        """Drops announcements older than the TTL. Caller holds the lock."""
+        cutoff = now - self.ttl_seconds
+        while self._entries:
+            name, entry = next(iter(self._entries.items()))
+            if entry.announced_mono > cutoff:
+                return
+            del self._entries[name]
+            self._evicted += 1
+
+    def record(self, path: Path, *, timestamp: int, sha256_hash: str) -> None:
+        """Records that a manifest line announced path."""
+        with self._lock:
+            now = self._monotonic()
+            self._entries.pop(path.name, None)
+            self._entries[path.name] = ManifestEntry(
+                path=path,
+                timestamp=timestamp,
+                sha256_hash=sha256_hash,
+                announced_mono=now,
+            )
+            self._announced += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evicted += 1
+            self._evict_expired(now)
+
+    def get(self, path: Path) -> Optional[ManifestEntry]:
+        """The announcement of path's file name, if it is still indexed."""
+        with self._lock:
+            self._evict_expired(self._monotonic())
+            return self._entries.get(path.name)
+
+    def is_announced(self, path: Path) -> bool:
+        return self.get(path) is not None
+
+    def reconcile(
+        self, present: Iterable[Path], *, directory: Path, announced_before: float
+    ) -> list[Path]:
+        """
+        Joins the index with the files of one source directory scan.
+
+        Args:
+            present: Every file the scan found.
+            directory: The scanned directory.
+            announced_before: Monotonic time of the previous scan; files
+                              announced since may still be on their way.
+
+        Returns:
+            The present files announced before announced_before that have
+            not been returned before, sorted. Their entries are kept (marked
+            re-queued) so is_announced() still knows them, but they are not
+            returned again unless a new manifest line announces them. Files
+            announced in directory before announced_before that are not
+            present have been moved and are forgotten. Only announcements for
+            directory are joined: a file of the same name announced for
+            another directory is neither returned nor forgotten.
+        """
+        with self._lock:
+            self._evict_expired(self._monotonic())
+            present_by_name = {path.name: path for path in present}
+            requeue: list[Path] = []
+            for name, entry in list(self._entries.items()):
+                if entry.announced_mono >= announced_before:
+                    break  # Oldest first: the rest are newer still
+                if entry.path.parent != directory:
+                    continue  # Announced for another source directory
+                path = present_by_name.get(name)
+                if path is None:
+                    del self._entries[name]
+                    continue
+                if entry.requeued:
+                    continue
+                requeue.append(path)
+                self._entries[name] = replace(entry, requeued=True)
+            self._requeued += len(requeue)
+        return sorted(requeue)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def stats(self) -> ManifestIndexStats:
+        """Returns a consistent snapshot of the counters."""
+        with self._lock:
+            return ManifestIndexStats(
+                entries=len(self._entries),
+                announced=self._announced,
+                evicted=self._evicted,
+                requeued=self._requeued,
+            )
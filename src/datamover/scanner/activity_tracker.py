@@ -0,0 +1,317 @@
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from datamover.file_functions.fs_mock import FS
+from datamover.file_functions.gather_entry_data import GatheredEntryData
+from datamover.file_functions.inotify_watch import (
+    IN_CLOSE_WRITE,
+    IN_CREATE,
+    IN_DELETE,
+    IN_DELETE_SELF,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MODIFY,
+    IN_MOVE_SELF,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    IN_Q_OVERFLOW,
+    DirectoryWatch,
+    InotifyEvent,
+)
+
+logger = logging.getLogger(__name__)
+
+# IN_CREATE and IN_MOVED_TO make a file known before its first write; the
+# *_SELF events tell us the watch itself has gone.
+WATCH_MASK = (
+    IN_MODIFY
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_DELETE
+    | IN_CREATE
+    | IN_MOVED_TO
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+_WRITE_EVENTS = IN_MODIFY | IN_CLOSE_WRITE
+_STAT_EVENTS = IN_CLOSE_WRITE | IN_CREATE | IN_MOVED_TO
+_GONE_EVENTS = IN_DELETE | IN_MOVED_FROM
+_WATCH_LOST_EVENTS = IN_IGNORED | IN_DELETE_SELF | IN_MOVE_SELF
+
+DEFAULT_MODIFY_STAT_INTERVAL = 1.0
+
+
+class ActivityTracker(threading.Thread):
+    """
+    Tracks file activity in the scanned directory from inotify events.
+
+    Holds, in memory, the same (mtime, size, path) data a directory scan
+    produces, so that DoSingleCycle can run without listing or stat'ing the
+    directory. Files are stat'ed when they appear, when their writer closes
+    them, and on a write (IN_MODIFY) at most once every
+    `modify_stat_interval` seconds per file; other writes only record the
+    time of the event as the file's mtime. Sizes therefore lag a growing
+    file by at most that interval, which keeps the cadence index's growth
+    figures and the open-writer check's sizes current.
+
+    A full scan is still needed at startup, after an IN_Q_OVERFLOW (events
+    were dropped), when the watch is lost, and every `rescan_interval`
+    seconds as a safety net. snapshot() returns None while one is due; the
+    caller then scans and hands the result to complete_rescan(). Events
+    that arrive during the scan take precedence over what it found.
+
+    The thread reads events until stop_event is set; the owning ScanThread
+    starts and joins it.
+    """
+
+    def __init__(
+        self,
+        *,
+        directory: Path,
+        extension_no_dot: str,
+        fs: FS,
+        stop_event: threading.Event,
+        rescan_interval: float,
+        poll_interval: float = 0.5,
+        modify_stat_interval: float = DEFAULT_MODIFY_STAT_INTERVAL,
+        time_func: Callable[[], float] = time.time,
+        monotonic_func: Callable[[], float] = time.monotonic,
+        name: Optional[str] = None,
+    ):
+        """
+        Args:
+            directory: Resolved directory to watch (non-recursively).
+            extension_no_dot: Extension of the files to track.
+            fs: Filesystem abstraction; provides the inotify watch and stat.
+            stop_event: Event used to signal the thread to stop.
+            rescan_interval: Longest time (seconds) between full scans.
+            poll_interval: Longest time to block waiting for events, which
+                           bounds how long stopping takes.
+            modify_stat_interval: Shortest time (seconds) between two stats
+                                  of a file that is being written.
+            time_func: Wall clock used as the mtime of written files.
+            monotonic_func: Clock used to schedule full rescans.
+            name: Thread name; defaults to 'ActivityTracker-<dir name>'.
+        """
+        super().__init__(daemon=True, name=name or f"ActivityTracker-{directory.name}")
+        self.directory = directory
+        self.extension = "." + extension_no_dot.lower().lstrip(".")
+        self.fs = fs
+        self.stop_event = stop_event
+        self.rescan_interval = rescan_interval
+        self.poll_interval = poll_interval
+        self.modify_stat_interval = modify_stat_interval
+        self._time = time_func
+        self._monotonic = monotonic_func
+
+        self._lock = threading.Lock()
+        self._watch: Optional[DirectoryWatch] = None
+        self._entries: dict[Path, GatheredEntryData] = {}
+        # Bumped whenever events may have been missed; a rescan that started
+        # in an older epoch cannot be trusted
+        self._epoch = 0
+        self._rescan_due_at: Optional[float] = None  # None: rescan needed now
+        # Paths evented since begin_rescan(), mapped to None once gone
+        self._touched: Optional[dict[Path, Optional[GatheredEntryData]]] = None
+        # Monotonic time each tracked file was last stat'ed (tracker thread)
+        self._stat_at: dict[Path, float] = {}
+
+        # Counters
+        self.events_applied: int = 0
+        self.overflow_count: int = 0
+        self.rescan_count: int = 0
+
+    # --- Called from the scan thread ---
+
+    def snapshot(self) -> Optional[list[GatheredEntryData]]:
+        """
+        Returns the tracked files, or None when a full scan is due instead.
+        """
+        with self._lock:
+            if self._watch is None or self._rescan_due_at is None:
+                return None
+            if self._monotonic() >= self._rescan_due_at:
+                return None
+            return list(self._entries.values())
+
+    def begin_rescan(self) -> Optional[int]:
+        """
+        Marks the start of a full scan; returns the token for complete_rescan.
+
+        The token is None while no watch is open, since the scan result
+        could not then be kept up to date.
+        """
+        with self._lock:
+            if self._watch is None:
+                return None
+            self._touched = {}
+            return self._epoch
+
+    def complete_rescan(
+        self, token: Optional[int], gathered: list[GatheredEntryData]
+    ) -> None:
+        """Replaces the tracked files with a full scan started by begin_rescan."""
+        with self._lock:
+            touched, self._touched = self._touched, None
+            if token is None or token != self._epoch or touched is None:
+                logger.debug(
+                    "%s: events may have been missed during the rescan; "
+                    "another full scan is needed.",
+                    self.name,
+                )
+                return
+            entries = {entry.path: entry for entry in gathered}
+            for path, entry in touched.items():
+                if entry is None:
+                    entries.pop(path, None)
+                else:
+                    entries[path] = entry
+            self._entries = entries
+            self._rescan_due_at = self._monotonic() + self.rescan_interval
+            self.rescan_count += 1
+        logger.debug("%s: rescan installed %d file(s).", self.name, len(entries))
+
+    # --- Event handling (tracker thread) ---
+
+    def apply_events(self, events: list[InotifyEvent]) -> None:
+        """Updates the tracked files from a batch of inotify events."""
+        previous: Optional[InotifyEvent] = None
+        for event in events:
+            if event == previous:
+                continue  # Repeated writes to the same file
+            previous = event
+            if event.mask & IN_Q_OVERFLOW:
+                self.overflow_count += 1
+                logger.warning(
+                    "%s: inotify queue overflowed; falling back to a full scan.",
+                    self.name,
+                )
+                self._invalidate()
+                continue
+            if event.mask & _WATCH_LOST_EVENTS and not event.name:
+                logger.warning(
+                    "%s: watch on '%s' was removed; reopening.",
+                    self.name,
+                    self.directory,
+                )
+                self._drop_watch()
+                continue
+            path = self.directory / event.name
+            if event.mask & IN_ISDIR or path.suffix.lower() != self.extension:
+                continue
+            if event.mask & _GONE_EVENTS:
+                self._set(path, None)
+            elif event.mask & _STAT_EVENTS:
+                self._set(path, self._stat(path))
+            elif event.mask & _WRITE_EVENTS:
+                self._note_write(path)
+            self.events_applied += 1
+
+    def _note_write(self, path: Path) -> None:
+        with self._lock:
+            entry = self._entries.get(path)
+        stat_due = (
+            self._monotonic() - self._stat_at.get(path, float("-inf"))
+            >= self.modify_stat_interval
+        )
+        if entry is None or stat_due:
+            # Also covers a file we have not seen created (e.g. written
+            # during a rescan)
+            self._set(path, self._stat(path))
+            return
+        self._set(
+            path, GatheredEntryData(mtime=self._time(), size=entry.size, path=path)
+        )
+
+    def _stat(self, path: Path) -> Optional[GatheredEntryData]:
+        self._stat_at[path] = self._monotonic()
+        try:
+            st = self.fs.stat(path)
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning("%s: could not stat '%s': %s", self.name, path, e)
+            return None
+        return GatheredEntryData(mtime=st.st_mtime, size=st.st_size, path=path)
+
+    def _set(self, path: Path, entry: Optional[GatheredEntryData]) -> None:
+        with self._lock:
+            if entry is None:
+                self._entries.pop(path, None)
+                self._stat_at.pop(path, None)
+            else:
+                self._entries[path] = entry
+            if self._touched is not None:
+                self._touched[path] = entry
+
+    def _invalidate(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            self._rescan_due_at = None
+
+    def _open_watch(self) -> bool:
+        try:
+            watch = self.fs.watch_directory(self.directory, WATCH_MASK)
+        except OSError as e:
+            logger.error(
+                "%s: cannot watch '%s' (%s); the scanner will list the "
+                "directory every cycle until it can.",
+                self.name,
+                self.directory,
+                e,
+            )
+            return False
+        with self._lock:
+            self._watch = watch
+            self._epoch += 1
+            self._rescan_due_at = None
+        logger.info("%s: watching '%s'.", self.name, self.directory)
+        return True
+
+    def _drop_watch(self) -> None:
+        with self._lock:
+            watch, self._watch = self._watch, None
+            self._epoch += 1
+            self._rescan_due_at = None
+        if watch is not None:
+            try:
+                watch.close()
+            except OSError as e:
+                logger.debug("%s: error closing watch: %s", self.name, e)
+
+    def run(self) -> None:
+        logger.info(
+            "%s starting for '%s' (full rescan every %.0fs)",
+            self.name,
+            self.directory,
+            self.rescan_interval,
+        )
+        try:
+            while not self.stop_event.is_set():
+                watch = self._watch
+                if watch is None:
+                    if not self._open_watch():
+                        self.stop_event.wait(self.rescan_interval)
+                    continue
+                try:
+                    events = watch.read_events(self.poll_interval)
+                except OSError as e:
+                    logger.error("%s: error reading events: %s", self.name, e)
+                    self._drop_watch()
+                    continue
+                if events:
+                    self.apply_events(events)
+        except Exception:
+            logger.exception("%s: unexpected error; stopping.", self.name)
+        finally:
+            self._drop_watch()
+            logger.info(
+                "%s stopping (%d events, %d overflows, %d full rescans)",
+                self.name,
+                self.events_applied,
+                self.overflow_count,
+                self.rescan_count,
+            )
@@ -0,0 +1,117 @@
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Wake this much after a deadline so the file is past it when rescanned
+DEADLINE_MARGIN_SECONDS = 0.1
+
+
+@dataclass(frozen=True)
+class CycleMetrics:
+    """What one scan cycle saw, as reported by DoSingleCycle."""
+
+    entries: int  # Files in the directory
+    new_files: int  # Files not seen by the previous cycle
+    changed_files: int  # Known files whose size or mtime changed
+    removed_files: int  # Known files no longer in the directory
+
+    @property
+    def changes(self) -> int:
+        return self.new_files + self.changed_files + self.removed_files
+
+
+@dataclass(frozen=True)
+class ScanCycleStats:
+    """Snapshot of a ScanThread's cycle counters."""
+
+    cycles: int
+    failed_cycles: int
+    overruns: int  # Cycles that took at least the scan interval
+    last_cycle_seconds: float
+    max_cycle_seconds: float
+    interval_seconds: float  # Interval used after the last cycle
+    last_metrics: Optional[CycleMetrics]
+
+
+class AdaptiveScanInterval:
+    """
+    Chooses the time between scan cycles from what the last cycle saw.
+
+    Starts at `initial_seconds`. A cycle that saw new files arriving (or
+    files being removed) moves the interval to `min_seconds`; one in which
+    files only grew shortens it by `speed_up`; a quiet cycle lengthens it by
+    `slow_down`, up to `max_seconds`. A lost or stuck deadline due before
+    the chosen interval ends shortens it to that deadline (never below
+    `min_seconds`), so detection is not delayed by a long quiet interval.
+    """
+
+    def __init__(
+        self,
+        *,
+        min_seconds: float,
+        max_seconds: float,
+        initial_seconds: float,
+        speed_up: float = 0.5,
+        slow_down: float = 1.5,
+    ):
+        """
+        Args:
+            min_seconds: Shortest interval.
+            max_seconds: Longest interval.
+            initial_seconds: Interval before the first cycle; clamped to
+                             [min_seconds, max_seconds].
+            speed_up: Factor (< 1) applied while files are being written.
+            slow_down: Factor (> 1) applied after a quiet cycle.
+
+        Raises:
+            ValueError: If the bounds or factors are inconsistent.
+        """
+        if not 0 < min_seconds <= max_seconds:
+            raise ValueError(
+                f"Need 0 < min_seconds <= max_seconds, got {min_seconds}, {max_seconds}"
+            )
+        if not 0 < speed_up < 1 or slow_down <= 1:
+            raise ValueError(
+                f"Need 0 < speed_up < 1 < slow_down, got {speed_up}, {slow_down}"
+            )
+        self.min_seconds = min_seconds
+        self.max_seconds = max_seconds
+        self.speed_up = speed_up
+        self.slow_down = slow_down
+        self.interval_seconds = self._clamp(initial_seconds)
+
+    def _clamp(self, seconds: float) -> float:
+        return min(self.max_seconds, max(self.min_seconds, seconds))
+
+    def next_interval(
+        self, metrics: Optional[CycleMetrics], seconds_until_deadline: Optional[float]
+    ) -> float:
+        """
+        Updates and returns the interval to wait before the next cycle.
+
+        Args:
+            metrics: The last cycle's metrics; None keeps the interval.
+            seconds_until_deadline: Time until the next file turns lost or
+                                    stuck, if known.
+        """
+        interval = self.interval_seconds
+        if metrics is not None:
+            if metrics.new_files or metrics.removed_files:
+                interval = self.min_seconds
+            elif metrics.changed_files:
+                interval *= self.speed_up
+            else:
+                interval *= self.slow_down
+        interval = self._clamp(interval)
+        if self.interval_seconds != interval:
+            logger.debug(
+                "Scan interval %.2fs -> %.2fs", self.interval_seconds, interval
+            )
+        self.interval_seconds = interval
+        if seconds_until_deadline is not None:
+            interval = self._clamp(
+                min(interval, seconds_until_deadline + DEADLINE_MARGIN_SECONDS)
+            )
+        return interval
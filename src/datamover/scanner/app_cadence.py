@@ -0,0 +1,307 @@
+import logging
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+from datamover.scanner.stuck_app_reset import get_app_name_from_path
+
+logger = logging.getLogger(__name__)
+
+# Lost timeouts derived from a very fast cadence are kept at least this long
+MIN_DERIVED_LOST_SECONDS = 5.0
+
+
+class AppStatus(Enum):
+    LEARNING = "learning"  # Cadence not known yet
+    OK = "ok"
+    OVERRUN = "overrun"  # Still writing a file it should have rotated by now
+    SILENT = "silent"  # Neither a new file nor any growth for too long
+
+
+@dataclass(frozen=True)
+class AppHealth:
+    """Snapshot of what the AppCadenceIndex knows about one app."""
+
+    app: str
+    status: AppStatus
+    cadence_seconds: Optional[float]
+    bytes_per_second: float
+    typical_file_size: Optional[float]
+    current_file: Path
+    seconds_since_arrival: float
+    seconds_since_growth: float
+
+
+class _AppActivity:
+    __slots__ = (
+        "last_arrival_mono",
+        "mean_interval",
+        "samples",
+        "current_file",
+        "current_size",
+        "previous_file",
+        "previous_size",
+        "last_growth_mono",
+        "bytes_per_second",
+        "typical_file_size",
+    )
+
+    def __init__(self, current_file: Path, monotonic_now: float):
+        self.last_arrival_mono = monotonic_now
+        self.mean_interval: Optional[float] = None
+        self.samples = 0
+        self.current_file = current_file
+        self.current_size = 0
+        # The file before the current one may still grow until it is closed
+        self.previous_file: Optional[Path] = None
+        self.previous_size = 0
+        self.last_growth_mono = monotonic_now
+        self.bytes_per_second = 0.0
+        self.typical_file_size: Optional[float] = None
+
+
+class AppCadenceIndex:
+    """
+    Rolling per-app view of the source directory: how often each application
+    starts a new pcap file, how fast it writes and how large its files get.
+
+    Files are grouped by app name (get_app_name_from_path). Each cycle's new
+    files give an arrival sample per app: the time since that app's previous
+    arrival, divided by the number of its files that appeared (a scan may
+    find several). The cadence is an exponentially weighted mean of those
+    samples. An app's first arrival only starts its clock.
+
+    observe_growth() is given the new and changed files of each cycle: the
+    bytes an app wrote since the previous cycle give its write rate. A file's
+    size is taken as final once the app has started two files after it
+    (the previous file may still be flushed after rotation), and gives the
+    typical file size. Both are weighted means like the cadence.
+
+    Fed by the scanner thread; the lock lets health() be read from others.
+    """
+
+    def __init__(self, *, smoothing: float = 0.2, min_samples: int = 3):
+        """
+        Args:
+            smoothing: Weight of the newest sample in the means (0 < s <= 1).
+            min_samples: Samples needed before an app's cadence is reported.
+        """
+        self.smoothing = smoothing
+        self.min_samples = min_samples
+        self._apps: dict[str, _AppActivity] = {}
+        self._last_growth_observed: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _smooth(self, mean: Optional[float], sample: float) -> float:
+        return sample if mean is None else mean + self.smoothing * (sample - mean)
+
+    def observe_new_files(self, paths: Iterable[Path], monotonic_now: float) -> None:
+        """Records the files that appeared in a cycle scanned at monotonic_now."""
+        by_app: dict[str, list[Path]] = {}
+        for path in paths:
+            app = get_app_name_from_path(path, warn=False)
+            if app is not None:
+                by_app.setdefault(app, []).append(path)
+        with self._lock:
+            for app, app_paths in by_app.items():
+                # Names carry a timestamp, so the last one is the newest
+                newest = max(app_paths)
+                activity = self._apps.get(app)
+                if activity is None:
+                    self._apps[app] = _AppActivity(newest, monotonic_now)
+                    continue
+                sample = (monotonic_now - activity.last_arrival_mono) / len(app_paths)
+                activity.mean_interval = self._smooth(activity.mean_interval, sample)
+                activity.samples += 1
+                if activity.previous_size:
+                    activity.typical_file_size = self._smooth(
+                        activity.typical_file_size, activity.previous_size
+                    )
+                activity.last_arrival_mono = monotonic_now
+                activity.last_growth_mono = monotonic_now
+                activity.previous_file = activity.current_file
+                activity.previous_size = activity.current_size
+                activity.current_file = newest
+                activity.current_size = 0
+
+    def observe_growth(
+        self, files: Iterable[tuple[Path, int, int]], monotonic_now: float
+    ) -> None:
+        """
+        Records how much each app wrote in a cycle scanned at monotonic_now.
+
+        Args:
+            files: (path, size, bytes written since the previous cycle) of
+                   the cycle's new and changed files; call after
+                   observe_new_files() for the same cycle.
+            monotonic_now: Monotonic time of the scan.
+        """
+        written: dict[str, int] = {}
+        with self._lock:
+            for path, size, grown in files:
+                app = get_app_name_from_path(path, warn=False)
+                if app is None:
+                    continue
+                activity = self._apps.get(app)
+                if activity is None or grown <= 0:
+                    continue
+                written[app] = written.get(app, 0) + grown
+                activity.last_growth_mono = monotonic_now
+                if path == activity.current_file:
+                    activity.current_size = size
+                elif path == activity.previous_file:
+                    activity.previous_size = size
+            previous, self._last_growth_observed = (
+                self._last_growth_observed,
+                monotonic_now,
+            )
+            if previous is None or monotonic_now <= previous:
+                return
+            elapsed = monotonic_now - previous
+            # Quiet apps get a zero sample, so their rate decays
+            for app, activity in self._apps.items():
+                activity.bytes_per_second = self._smooth(
+                    activity.bytes_per_second, written.get(app, 0) / elapsed
+                )
+
+    def cadence(self, app: str) -> Optional[float]:
+        """Mean seconds between an app's files, or None while still learning."""
+        with self._lock:
+            activity = self._apps.get(app)
+            return None if activity is None else self._cadence(activity)
+
+    def _cadence(self, activity: _AppActivity) -> Optional[float]:
+        if activity.samples < self.min_samples:
+            return None
+        return activity.mean_interval
+
+    def slowest_cadence(self) -> Optional[float]:
+        """The longest learned cadence of any app, or None if none is known."""
+        with self._lock:
+            known = [
+                cadence
+                for cadence in map(self._cadence, self._apps.values())
+                if cadence is not None
+            ]
+        return max(known) if known else None
+
+    def health(self, monotonic_now: float, overrun_factor: float) -> list[AppHealth]:
+        """
+        Returns every app's health, sorted by app name.
+
+        An app with a known cadence that has not started a new file for
+        overrun_factor times that cadence is OVERRUN if its current file
+        grew within the last cadence, and SILENT otherwise.
+        """
+        with self._lock:
+            return [
+                self._health(app, activity, monotonic_now, overrun_factor)
+                for app, activity in sorted(self._apps.items())
+            ]
+
+    def _health(
+        self,
+        app: str,
+        activity: _AppActivity,
+        monotonic_now: float,
+        overrun_factor: float,
+    ) -> AppHealth:
+        cadence = self._cadence(activity)
+        since_arrival = monotonic_now - activity.last_arrival_mono
+        since_growth = monotonic_now - activity.last_growth_mono
+        if cadence is None:
+            status = AppStatus.LEARNING
+        elif since_arrival <= overrun_factor * cadence:
+            status = AppStatus.OK
+        elif since_growth <= cadence:
+            status = AppStatus.OVERRUN
+        else:
+            status = AppStatus.SILENT
+        return AppHealth(
+            app=app,
+            status=status,
+            cadence_seconds=cadence,
+            bytes_per_second=activity.bytes_per_second,
+            typical_file_size=activity.typical_file_size,
+            current_file=activity.current_file,
+            seconds_since_arrival=since_arrival,
+            seconds_since_growth=since_growth,
+        )
+
+
+class CadenceThresholds:
+    """
+    Derives the lost and stuck timeouts from the learned app cadences.
+
+    The file state table classifies every file with one pair of timeouts,
+    so the slowest app sets them: a file is lost once it has been idle for
+    `lost_factor` cadences and stuck once it has been present for
+    `stuck_factor` cadences. Until a cadence is known, or if the factors
+    would make stuck no later than lost, the configured timeouts are kept.
+    """
+
+    def __init__(
+        self,
+        *,
+        index: AppCadenceIndex,
+        lost_factor: float,
+        stuck_factor: float,
+    ):
+        self.index = index
+        self.lost_factor = lost_factor
+        self.stuck_factor = stuck_factor
+
+    def derive(
+        self, configured_lost: float, configured_stuck: float
+    ) -> tuple[float, float]:
+        """Returns the (lost, stuck) timeouts to use for the next cycle."""
+        cadence = self.index.slowest_cadence()
+        if cadence is None:
+            return configured_lost, configured_stuck
+        lost = max(MIN_DERIVED_LOST_SECONDS, self.lost_factor * cadence)
+        stuck = self.stuck_factor * cadence
+        if stuck <= lost:
+            return configured_lost, configured_stuck
+        return lost, stuck
+
+
+class AppHealthMonitor:
+    """
+    Flags apps that have fallen behind their own learned cadence.
+
+    The stuck-active timeout only catches an app once one of its files has
+    been written to for stuck_active_file_timeout; an app that normally
+    rotates every few seconds is flagged here after `overrun_factor` of its
+    own cadences without a new file, whether it is still writing (OVERRUN)
+    or has stopped altogether (SILENT). Flagged apps get a restart trigger
+    like stuck ones (see determine_app_restart_actions).
+    """
+
+    def __init__(self, *, index: AppCadenceIndex, overrun_factor: float):
+        """
+        Args:
+            index: The cadence index the scanner feeds.
+            overrun_factor: Cadences an app may go without a new file (> 1).
+
+        Raises:
+            ValueError: If overrun_factor is not greater than 1.
+        """
+        if overrun_factor <= 1:
+            raise ValueError(f"overrun_factor must be > 1, got {overrun_factor}")
+        self.index = index
+        self.overrun_factor = overrun_factor
+
+    def health(self, monotonic_now: float) -> list[AppHealth]:
+        """Every app's health at monotonic_now, sorted by app name."""
+        return self.index.health(monotonic_now, self.overrun_factor)
+
+    def flagged_apps(self, monotonic_now: float) -> dict[str, AppHealth]:
+        """The OVERRUN and SILENT apps at monotonic_now, by name."""
+        return {
+            health.app: health
+            for health in self.health(monotonic_now)
+            if health.status in (AppStatus.OVERRUN, AppStatus.SILENT)
+        }
@@ -0,0 +1,279 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from os import fsdecode
+from pathlib import Path
+from queue import Queue
+from typing import Callable, Optional
+
+from watchdog.events import FileClosedEvent, FileSystemEventHandler
+from watchdog.observers import Observer
+from watchdog.observers.api import BaseObserver
+
+from datamover.file_functions.fs_mock import FS
+from datamover.queues.claim_registry import ClaimRegistry
+from datamover.queues.manifest_index import ManifestIndex
+from datamover.queues.queue_functions import QueuePutError, safe_put
+
+logger = logging.getLogger(__name__)
+
+CLAIM_SOURCE = "close_write"
+
+
+@dataclass
+class _PendingClose:
+    due_at: float
+    size: int
+    closed_at: float
+
+
+class PcapCloseHandler(FileSystemEventHandler):
+    """
+    Watchdog handler that reports IN_CLOSE_WRITE events for files with the
+    given extension directly inside the watched directory.
+
+    Runs on the observer thread, so it only hands the path to `on_file_closed`
+    and returns; stat calls and queueing happen on CloseWriteTriggerThread.
+    """
+
+    def __init__(
+        self,
+        *,
+        watched_directory: Path,
+        file_extension: str,
+        on_file_closed: Callable[[Path], None],
+    ) -> None:
+        super().__init__()
+        self.watched_directory = watched_directory
+        raw_extension = (
+            file_extension if file_extension.startswith(".") else "." + file_extension
+        )
+        self.file_extension = raw_extension.lower()
+        self.on_file_closed = on_file_closed
+
+    def on_closed(self, event: FileClosedEvent) -> None:
+        super().on_closed(event)
+        if event.is_directory:
+            return
+        path = Path(fsdecode(event.src_path))
+        if path.parent != self.watched_directory:
+            return
+        if not path.name.lower().endswith(self.file_extension):
+            return
+        self.on_file_closed(path)
+
+
+class CloseWriteTriggerThread(threading.Thread):
+    """
+    Enqueues pcap files for moving as soon as the writer has closed them.
+
+    Normally a pcap is only moved once its manifest (CSV) line is tailed, or
+    when the scanner declares it lost. This thread watches the source
+    directory for IN_CLOSE_WRITE events instead. A closed file is enqueued
+    after `settle_seconds`, provided its size has not changed since the
+    close; a file that grew is re-armed, and one that vanished (because the
+    tailer's request already moved it) is dropped.
+
+    When a manifest index is available, a file its manifest line already
+    announced is left to the tailer, which enqueued it on that line. The
+    claim registry covers the rest: whichever of the tailer and this trigger
+    registers a path first enqueues it, and the other is suppressed.
+
+    The thread owns its watchdog observer: it starts it in run() and stops
+    it on shutdown.
+    """
+
+    def __init__(
+        self,
+        *,
+        watched_directory: Path,
+        file_extension_no_dot: str,
+        move_queue: Queue[Path],
+        stop_event: threading.Event,
+        fs: FS,
+        settle_seconds: float,
+        claim_registry: Optional[ClaimRegistry],
+        manifest_index: Optional[ManifestIndex] = None,
+        poll_interval: float = 0.5,
+        monotonic_func: Callable[[], float] = time.monotonic,
+        observer_factory: Callable[[], BaseObserver] = Observer,
+        name: Optional[str] = None,
+    ):
+        """
+        Args:
+            watched_directory: Resolved source directory to watch.
+            file_extension_no_dot: Extension of the files to trigger on.
+            move_queue: Queue that closed files are put on.
+            stop_event: Event used to signal the thread to stop.
+            fs: Filesystem abstraction used to stat closed files.
+            settle_seconds: How long a closed file must keep its size before
+                            it is enqueued.
+            claim_registry: Shared registry used to avoid enqueueing a path
+                            the tailer (or scanner) has already enqueued.
+            manifest_index: Announcements tailed from the manifest; files it
+                            knows are not enqueued again.
+            poll_interval: Longest time between checks for settled files.
+            monotonic_func: Clock used for settle deadlines and latencies.
+            observer_factory: Builds the watchdog observer (injectable for tests).
+            name: Thread name; defaults to 'CloseWriteTrigger-<dir name>'.
+        """
+        super().__init__(
+            daemon=True, name=name or f"CloseWriteTrigger-{watched_directory.name}"
+        )
+        self.watched_directory = watched_directory
+        self.move_queue = move_queue
+        self.stop_event = stop_event
+        self.fs = fs
+        self.settle_seconds = settle_seconds
+        self.claim_registry = claim_registry
+        self.manifest_index = manifest_index
+        self.poll_interval = poll_interval
+        self._monotonic = monotonic_func
+        self.move_queue_name = f"MoveQueueFromCloseWrite-{watched_directory.name}"
+
+        self.handler = PcapCloseHandler(
+            watched_directory=watched_directory,
+            file_extension=file_extension_no_dot,
+            on_file_closed=self.note_closed,
+        )
+        self.observer = observer_factory()
+        self.observer.schedule(self.handler, str(watched_directory), recursive=False)
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending: dict[Path, _PendingClose] = {}
+
+        # Counters
+        self.enqueued_count: int = 0
+        self.rearmed_count: int = 0
+        self.vanished_count: int = 0
+        self.suppressed_count: int = 0
+        self.total_close_to_enqueue_seconds: float = 0.0
+
+    def note_closed(self, path: Path) -> None:
+        """
+        Records a close event; called from the observer thread. The file's
+        size is sampled right away by this thread, and compared again once
+        settle_seconds have passed.
+        """
+        now = self._monotonic()
+        with self._lock:
+            entry = self._pending.get(path)
+            if entry is None:
+                self._pending[path] = _PendingClose(due_at=now, size=-1, closed_at=now)
+            else:
+                # Closed again (e.g. reopened for append): sample afresh
+                entry.due_at = now
+                entry.size = -1
+        self._wakeup.set()
+
+    def check_pending(self) -> None:
+        """Enqueues settled files and re-arms files that are still changing."""
+        now = self._monotonic()
+        with self._lock:
+            due = [(p, e) for p, e in self._pending.items() if e.due_at <= now]
+
+        for path, entry in due:
+            try:
+                size = self.fs.stat(path).st_size
+            except FileNotFoundError:
+                if self._forget(path, entry):
+                    self.vanished_count += 1
+                logger.debug("Closed file '%s' already gone; skipping.", path)
+                continue
+            except OSError as e:
+                self._forget(path, entry)
+                logger.warning("Could not stat closed file '%s': %s", path, e)
+                continue
+
+            if size == entry.size:
+                # Same size a full settle period after the previous sample
+                if self._forget(path, entry):
+                    self._enqueue(path, now - entry.closed_at)
+                continue
+
+            with self._lock:
+                if self._pending.get(path) is not entry:
+                    continue  # A newer close arrived while we were checking
+                if entry.size >= 0:
+                    self.rearmed_count += 1
+                    logger.debug(
+                        "Closed file '%s' changed size (%d -> %d); settling again.",
+                        path,
+                        entry.size,
+                        size,
+                    )
+                entry.size = size
+                entry.due_at = now + self.settle_seconds
+
+    def _forget(self, path: Path, entry: _PendingClose) -> bool:
+        with self._lock:
+            if self._pending.get(path) is entry:
+                del self._pending[path]
+                return True
+            return False
+
+    def _enqueue(self, path: Path, latency: float) -> None:
+        if self.manifest_index is not None and self.manifest_index.is_announced(path):
+            self.suppressed_count += 1
+            logger.debug("Closed file '%s' already announced by manifest.", path)
+            return
+        if self.claim_registry is not None and not self.claim_registry.try_register(
+            path, source=CLAIM_SOURCE
+        ):
+            self.suppressed_count += 1
+            return
+        try:
+            safe_put(
+                item=path,
+                output_queue=self.move_queue,
+                queue_name=self.move_queue_name,
+            )
+        except QueuePutError:
+            if self.claim_registry is not None:
+                self.claim_registry.release(path)
+            logger.error(
+                "Failed to enqueue closed file '%s'; the scanner will pick it up.",
+                path,
+            )
+            return
+        self.enqueued_count += 1
+        self.total_close_to_enqueue_seconds += latency
+        logger.info("Enqueued closed file '%s' %.2fs after close.", path, latency)
+
+    def run(self) -> None:
+        logger.info(
+            "%s starting (settle %.1fs) for '%s'",
+            self.name,
+            self.settle_seconds,
+            self.watched_directory,
+        )
+        self.observer.start()
+        try:
+            while not self.stop_event.is_set():
+                self._wakeup.wait(self._next_wait())
+                self._wakeup.clear()
+                try:
+                    self.check_pending()
+                except Exception:
+                    logger.exception("%s: error checking closed files", self.name)
+        finally:
+            self.observer.stop()
+            self.observer.join(timeout=5.0)
+            logger.info(
+                "%s stopping (%d enqueued, %d suppressed as duplicates, "
+                "%d re-armed, %d gone before settling)",
+                self.name,
+                self.enqueued_count,
+                self.suppressed_count,
+                self.rearmed_count,
+                self.vanished_count,
+            )
+
+    def _next_wait(self) -> float:
+        with self._lock:
+            if not self._pending:
+                return self.poll_interval
+            earliest = min(e.due_at for e in self._pending.values())
+        return max(0.0, min(self.poll_interval, earliest - self._monotonic()))
@@ -1,7 +1,8 @@
 import logging
+from collections.abc import Iterable, KeysView, Mapping
 from pathlib import Path
 from queue import Queue
-from typing import Callable, Dict, Set, Tuple, List
+from typing import AbstractSet, Callable, Optional, Set, Tuple, List
 
 from datamover.file_functions.file_exceptions import ScanDirectoryError
 from datamover.file_functions.fs_mock import FS
@@ -9,10 +10,26 @@ from datamover.file_functions.gather_entry_data import GatheredEntryData
 from datamover.file_functions.scan_directory_and_filter import (
     scan_directory_and_filter,
 )
+from datamover.queues.claim_registry import ClaimRegistry
+from datamover.queues.manifest_index import ManifestIndex
 from datamover.queues.queue_functions import safe_put, QueuePutError
+from datamover.scanner.activity_tracker import ActivityTracker
+from datamover.scanner.adaptive_interval import CycleMetrics
+from datamover.scanner.app_cadence import (
+    AppCadenceIndex,
+    AppHealth,
+    AppHealthMonitor,
+    CadenceThresholds,
+)
 from datamover.scanner.file_state_record import FileStateRecord
+from datamover.scanner.file_state_table import FileStateTable
+from datamover.scanner.open_writers import ProcOpenWriters, closed_stable_files
 from datamover.scanner.process_scan_results import process_scan_results
 from datamover.scanner.scan_reporting import report_state_changes
+from datamover.scanner.scanner_state_store import (
+    SavedScannerState,
+    reconcile_with_scan,
+)
 from datamover.scanner.stuck_app_reset import determine_app_restart_actions
 
 logger = logging.getLogger(__name__)
@@ -41,6 +58,13 @@ class DoSingleCycle:
         time_func: Callable[[], float],
         monotonic_func: Callable[[], float],
         fs: FS,
+        claim_registry: Optional[ClaimRegistry] = None,
+        fast_scan: bool = False,
+        activity_tracker: Optional[ActivityTracker] = None,
+        cadence_thresholds: Optional[CadenceThresholds] = None,
+        app_health: Optional[AppHealthMonitor] = None,
+        open_writers: Optional[ProcOpenWriters] = None,
+        manifest_index: Optional[ManifestIndex] = None,
     ):
         """
         Initializes the processor with its dependencies and configuration.
@@ -56,6 +80,31 @@ class DoSingleCycle:
             time_func: Callable returning current wall-clock time (e.g., `time.time()`).
             monotonic_func: Callable returning current monotonic time (e.g., `time.monotonic()`).
             fs: Filesystem abstraction instance.
+            claim_registry: Optional shared registry consulted before enqueuing
+                            a lost file, so paths already queued (e.g. by the
+                            tailer), in flight or recently moved are skipped.
+            fast_scan: Resolve the scanned directory once per cycle instead
+                       of every file (see gather_file_data).
+            activity_tracker: Optional inotify-fed tracker. While it has an
+                              up-to-date view of the directory, cycles use
+                              it instead of scanning; the directory is only
+                              scanned when the tracker asks for a rescan.
+            cadence_thresholds: Optional policy that learns each app's file
+                                cadence from the new files of every cycle
+                                and replaces lost_timeout and
+                                stuck_active_file_timeout with values
+                                derived from it once known.
+            app_health: Optional monitor that flags apps which fall behind
+                        their own cadence, so they get a restart trigger.
+            open_writers: Optional /proc view of the producers' open files.
+                          A file seen before whose size did not change
+                          since the last scan, and which no producer has
+                          open for writing, is treated as lost at once
+                          instead of after lost_timeout.
+            manifest_index: Optional index of the files the tailer's
+                            manifest lines announced. Each cycle, announced
+                            files still here a cycle later are queued again,
+                            and lost files never announced are reported.
         """
         self.extension_no_dot: str = extension_to_scan_no_dot
         self.csv_restart_directory: Path = csv_restart_directory
@@ -65,9 +114,32 @@ class DoSingleCycle:
         self.time_func: Callable[[], float] = time_func
         self.monotonic_func: Callable[[], float] = monotonic_func
         self.fs: FS = fs
+        self.claim_registry: Optional[ClaimRegistry] = claim_registry
+        self.fast_scan: bool = fast_scan
+        self.activity_tracker: Optional[ActivityTracker] = activity_tracker
+        self.cadence_thresholds: Optional[CadenceThresholds] = cadence_thresholds
+        self.app_health: Optional[AppHealthMonitor] = app_health
+        self.open_writers: Optional[ProcOpenWriters] = open_writers
+        self.manifest_index: Optional[ManifestIndex] = manifest_index
+        self._previous_cycle_mono: Optional[float] = None
+        # The index both policies read (the factory gives them the same one)
+        self._cadence_index: Optional[AppCadenceIndex] = (
+            cadence_thresholds.index
+            if cadence_thresholds is not None
+            else app_health.index
+            if app_health is not None
+            else None
+        )
+        self._flagged_apps: Set[str] = set()
+        self.configured_lost_timeout: float = lost_timeout
+        self.configured_stuck_active_file_timeout: float = stuck_active_file_timeout
+        # What the last successful cycle saw, for the ScanThread's instrumentation
+        self.last_cycle_metrics: Optional[CycleMetrics] = None
         self.directory_to_scan: Path = validated_directory_to_scan
         self.lost_queue_name = f"LostFileQ-{self.directory_to_scan.name}"
         self.previously_signaled_stuck_apps: Set[str] = set()
+        # Saved file states, checked against the first scan after a restart
+        self._restored_file_states: Optional[Mapping[Path, FileStateRecord]] = None
 
         logger.info(
             "Initialized %s for '%s' [CSV Restart Dir: '%s', Ext: '.%s', Lost Timeout: %.1fs, Stuck Active Timeout: %.1fs]",
@@ -81,10 +153,10 @@ class DoSingleCycle:
 
     def process_one_cycle(
         self,
-        current_file_states: Dict[Path, FileStateRecord],
+        current_file_states: Mapping[Path, FileStateRecord],
         previously_lost_paths: Set[Path],
         previously_stuck_active_paths: Set[Path],
-    ) -> Tuple[Dict[Path, FileStateRecord], Set[Path], Set[Path]]:
+    ) -> Tuple[Mapping[Path, FileStateRecord], Set[Path], Set[Path]]:
         """
         Executes one full scan cycle.
 
@@ -106,11 +178,7 @@ class DoSingleCycle:
 
         # --- Phase 1: Scan & Filter ---
         try:
-            gathered_data: List[GatheredEntryData] = scan_directory_and_filter(
-                directory=self.directory_to_scan,
-                fs=self.fs,
-                extension_no_dot=self.extension_no_dot,
-            )
+            gathered_data: List[GatheredEntryData] = self._gather_entries()
             # This is a high-volume, keep at DEBUG
             logger.debug(
                 "Scan found %d files matching '.%s' in '%s'",
@@ -135,10 +203,25 @@ class DoSingleCycle:
                 original_exception=e,
             ) from e
 
+        if self._restored_file_states is not None:
+            current_file_states = self._seed_restored_states(
+                current_file_states, gathered_data
+            )
+
+        if self.cadence_thresholds is not None:
+            self._apply_cadence_thresholds(self.cadence_thresholds)
+
         # --- Phase 2: Process Scan Results ---
         try:
             mono_now: float = self.monotonic_func()
             wall_now: float = self.time_func()
+            # A table is updated in place and counts its own new files; a
+            # dict is replaced, so its keys still describe the last cycle
+            previous_paths = (
+                None
+                if isinstance(current_file_states, FileStateTable)
+                else current_file_states.keys()
+            )
             (
                 next_file_states,
                 removed_tracking_paths,
@@ -172,6 +255,41 @@ class DoSingleCycle:
                 previously_stuck_active_paths,
             )
 
+        new_paths = self._new_paths(previous_paths, next_file_states)
+        changed_paths = self._changed_paths(previous_paths, next_file_states)
+        self.last_cycle_metrics = CycleMetrics(
+            entries=len(gathered_data),
+            new_files=len(new_paths),
+            changed_files=len(changed_paths),
+            removed_files=len(removed_tracking_paths),
+        )
+        if self._cadence_index is not None:
+            self._observe_apps(
+                self._cadence_index,
+                new_paths,
+                changed_paths,
+                next_file_states,
+                mono_now,
+            )
+        if self.open_writers is not None:
+            currently_lost_paths = self._add_closed_files(
+                self.open_writers,
+                next_file_states,
+                new_paths,
+                changed_paths,
+                currently_lost_paths,
+                previously_lost_paths,
+            )
+        if self.manifest_index is not None:
+            self._reconcile_manifest(
+                self.manifest_index, next_file_states, currently_lost_paths, mono_now
+            )
+        flagged_apps: Set[str] = (
+            self._check_app_health(self.app_health, mono_now)
+            if self.app_health is not None
+            else set()
+        )
+
         # --- Phase 3a: Calculate Deltas ---
         try:
             newly_lost_paths = currently_lost_paths - previously_lost_paths
@@ -202,10 +320,231 @@ class DoSingleCycle:
             newly_stuck_active_paths=newly_stuck_active_paths,
             currently_stuck_active_paths=currently_stuck_active_paths,
             removed_tracking_paths=removed_tracking_paths,
+            flagged_apps=flagged_apps,
         )
 
         return next_file_states, currently_lost_paths, currently_stuck_active_paths
 
+    @staticmethod
+    def _new_paths(
+        previous_paths: Optional[KeysView[Path]],
+        next_file_states: Mapping[Path, FileStateRecord],
+    ) -> list[Path]:
+        if isinstance(next_file_states, FileStateTable):
+            return next_file_states.new_paths()
+        previous: AbstractSet[Path] = previous_paths or set()
+        return [path for path in next_file_states if path not in previous]
+
+    @staticmethod
+    def _changed_paths(
+        previous_paths: Optional[KeysView[Path]],
+        next_file_states: Mapping[Path, FileStateRecord],
+    ) -> list[Path]:
+        if isinstance(next_file_states, FileStateTable):
+            return next_file_states.changed_paths()
+        previous: AbstractSet[Path] = previous_paths or set()
+        return [
+            path
+            for path, record in next_file_states.items()
+            if path in previous
+            and (
+                record.size != record.prev_scan_size
+                or record.mtime_wall != record.prev_scan_mtime_wall
+            )
+        ]
+
+    @staticmethod
+    def _observe_apps(
+        index: AppCadenceIndex,
+        new_paths: list[Path],
+        changed_paths: list[Path],
+        next_file_states: Mapping[Path, FileStateRecord],
+        monotonic_now: float,
+    ) -> None:
+        index.observe_new_files(new_paths, monotonic_now)
+        growth: list[tuple[Path, int, int]] = []
+        for path in new_paths:
+            size = next_file_states[path].size
+            growth.append((path, size, size))
+        for path in changed_paths:
+            record = next_file_states[path]
+            growth.append((path, record.size, record.size - record.prev_scan_size))
+        index.observe_growth(growth, monotonic_now)
+
+    def _add_closed_files(
+        self,
+        open_writers: ProcOpenWriters,
+        next_file_states: Mapping[Path, FileStateRecord],
+        new_paths: list[Path],
+        changed_paths: list[Path],
+        currently_lost_paths: Set[Path],
+        previously_lost_paths: Set[Path],
+    ) -> Set[Path]:
+        """Adds the settled files no producer is writing to the lost paths."""
+        settled = (
+            set(next_file_states)
+            .difference(new_paths, changed_paths)
+            .difference(currently_lost_paths)
+        )
+        # Closed early in an earlier cycle and still unchanged: stay lost
+        still_closed = settled & previously_lost_paths
+        closed = closed_stable_files(
+            candidates=settled - previously_lost_paths, open_writers=open_writers
+        )
+        if closed is None:
+            logger.debug(
+                "Open writers of '%s' could not all be read; waiting for lost "
+                "timeout this cycle.",
+                self.directory_to_scan,
+            )
+            closed = set()
+        for path in sorted(closed):
+            logger.info(
+                "Identified file as CLOSED: %s (no producer has it open for "
+                "writing, size unchanged at %d bytes)",
+                path,
+                next_file_states[path].size,
+            )
+        return currently_lost_paths | still_closed | closed
+
+    def _reconcile_manifest(
+        self,
+        index: ManifestIndex,
+        next_file_states: Mapping[Path, FileStateRecord],
+        currently_lost_paths: Set[Path],
+        monotonic_now: float,
+    ) -> None:
+        """Queues again the announced files a previous request did not move."""
+        previous, self._previous_cycle_mono = self._previous_cycle_mono, monotonic_now
+        if previous is None:
+            return
+        requeue = index.reconcile(
+            next_file_states,
+            directory=self.directory_to_scan,
+            announced_before=previous,
+        )
+        # Lost files are (or were) queued by the lost-file path already
+        requeue = [path for path in requeue if path not in currently_lost_paths]
+        if requeue:
+            self._enqueue_files(
+                paths_to_enqueue=requeue, kind="announced", claim_source="manifest"
+            )
+
+    def _report_unannounced(self, index: ManifestIndex, paths: Set[Path]) -> None:
+        unannounced = sorted(path for path in paths if not index.is_announced(path))
+        for path in unannounced:
+            logger.warning("Lost file was never announced by a manifest line: %s", path)
+        if unannounced:
+            logger.info(
+                "%d of %d newly lost file(s) in '%s' were never announced.",
+                len(unannounced),
+                len(paths),
+                self.directory_to_scan,
+            )
+
+    def _check_app_health(
+        self, monitor: AppHealthMonitor, monotonic_now: float
+    ) -> Set[str]:
+        """Logs apps that became flagged or recovered; returns the flagged ones."""
+        flagged = monitor.flagged_apps(monotonic_now)
+        for app in sorted(flagged.keys() - self._flagged_apps):
+            health = flagged[app]
+            logger.warning(
+                "App '%s' in '%s' is %s: no new file for %.1fs (cadence %.1fs), "
+                "last growth %.1fs ago, current file '%s'.",
+                app,
+                self.directory_to_scan,
+                health.status.value,
+                health.seconds_since_arrival,
+                health.cadence_seconds,
+                health.seconds_since_growth,
+                health.current_file,
+            )
+        for app in sorted(self._flagged_apps - flagged.keys()):
+            logger.info(
+                "App '%s' in '%s' is back on its cadence.", app, self.directory_to_scan
+            )
+        self._flagged_apps = set(flagged)
+        return self._flagged_apps
+
+    def app_health_stats(self) -> list[AppHealth]:
+        """Per-app health from the app health monitor (empty without one)."""
+        if self.app_health is None:
+            return []
+        return self.app_health.health(self.monotonic_func())
+
+    def _apply_cadence_thresholds(self, thresholds: CadenceThresholds) -> None:
+        lost, stuck = thresholds.derive(
+            self.configured_lost_timeout, self.configured_stuck_active_file_timeout
+        )
+        if (lost, stuck) == (self.lost_timeout, self.stuck_active_file_timeout):
+            return
+        # The cadence moves a little every cycle; only log large steps at INFO
+        level = (
+            logging.INFO
+            if abs(lost - self.lost_timeout) > 0.1 * self.lost_timeout
+            else logging.DEBUG
+        )
+        logger.log(
+            level,
+            "Timeouts for '%s' now lost %.1fs, stuck active %.1fs (from app cadence).",
+            self.directory_to_scan,
+            lost,
+            stuck,
+        )
+        self.lost_timeout = lost
+        self.stuck_active_file_timeout = stuck
+
+    def restore_saved_state(self, saved: SavedScannerState) -> None:
+        """
+        Takes the state saved before a restart.
+
+        The signalled apps apply at once; the file states are checked
+        against the next scan (see reconcile_with_scan) and used as that
+        cycle's existing states.
+        """
+        self.previously_signaled_stuck_apps = set(saved.signaled_apps)
+        self._restored_file_states = saved.file_states
+
+    def _seed_restored_states(
+        self,
+        current_file_states: Mapping[Path, FileStateRecord],
+        gathered_data: List[GatheredEntryData],
+    ) -> Mapping[Path, FileStateRecord]:
+        saved, self._restored_file_states = self._restored_file_states, None
+        if saved is None or current_file_states:
+            return current_file_states
+        records = reconcile_with_scan(saved, gathered_data)
+        logger.info(
+            "Restored saved state for %d of %d file(s) in '%s'.",
+            len(records),
+            len(saved),
+            self.directory_to_scan,
+        )
+        if isinstance(current_file_states, FileStateTable):
+            current_file_states.load_records(records)
+            return current_file_states
+        return {record.path: record for record in records}
+
+    def _gather_entries(self) -> List[GatheredEntryData]:
+        """Files in the directory, from the activity tracker or a scan."""
+        tracker = self.activity_tracker
+        rescan_token: Optional[int] = None
+        if tracker is not None:
+            tracked = tracker.snapshot()
+            if tracked is not None:
+                return tracked
+            rescan_token = tracker.begin_rescan()
+        gathered = scan_directory_and_filter(
+            directory=self.directory_to_scan,
+            fs=self.fs,
+            extension_no_dot=self.extension_no_dot,
+            fast_scan=self.fast_scan,
+        )
+        if tracker is not None:
+            tracker.complete_rescan(rescan_token, gathered)
+        return gathered
+
     def _handle_scan_results_side_effects(
         self,
         *,
@@ -213,6 +552,7 @@ class DoSingleCycle:
         newly_stuck_active_paths: Set[Path],  # For reporting via report_state_changes
         currently_stuck_active_paths: Set[Path],  # For determining restart triggers
         removed_tracking_paths: Set[Path],
+        flagged_apps: Set[str],
     ) -> None:
         """Orchestrates side effects: reporting, queuing, and restart triggers."""
         try:
@@ -223,6 +563,8 @@ class DoSingleCycle:
                 lost_timeout=self.lost_timeout,
                 stuck_active_timeout=self.stuck_active_file_timeout,
             )
+            if self.manifest_index is not None:
+                self._report_unannounced(self.manifest_index, newly_lost_paths)
             self._enqueue_lost_files(paths_to_enqueue=newly_lost_paths)
 
             # --- Handle Restart Triggers for Stuck Applications ---
@@ -242,6 +584,7 @@ class DoSingleCycle:
                     current_stuck_file_paths=currently_stuck_active_paths,
                     previously_signaled_apps=self.previously_signaled_stuck_apps,
                     restart_trigger_directory=self.csv_restart_directory,
+                    flagged_apps=flagged_apps,
                 )
             )
 
@@ -276,27 +619,49 @@ class DoSingleCycle:
 
     def _enqueue_lost_files(self, *, paths_to_enqueue: Set[Path]) -> None:
         """Enqueues newly identified 'lost' file paths onto the lost_file_queue."""
-        if not paths_to_enqueue:
+        self._enqueue_files(
+            paths_to_enqueue=paths_to_enqueue, kind="lost", claim_source="scanner"
+        )
+
+    def _enqueue_files(
+        self, *, paths_to_enqueue: Iterable[Path], kind: str, claim_source: str
+    ) -> None:
+        """Enqueues paths onto the lost_file_queue, skipping claimed ones."""
+        paths = sorted(paths_to_enqueue)
+        if not paths:
             return
 
         # This is an action taken on potentially problematic files, so INFO is appropriate here.
         # It's not per-file in a tight loop, but a summary of an action.
         logger.info(
-            "Processor enqueuing %d newly identified 'lost' files from '%s'",
-            len(paths_to_enqueue),
+            "Processor enqueuing %d newly identified '%s' files from '%s'",
+            len(paths),
+            kind,
             self.directory_to_scan,
         )
-        for path in sorted(paths_to_enqueue):
+        for path in paths:
+            if self.claim_registry is not None and not self.claim_registry.try_register(
+                path, source=claim_source
+            ):
+                logger.info(
+                    "Processor skipped '%s' file already queued or moved: %s",
+                    kind,
+                    path,
+                )
+                continue
             try:
                 safe_put(
                     item=path,
                     output_queue=self.lost_file_queue,
                     queue_name=self.lost_queue_name,
                 )
-                logger.info("Processor enqueued 'lost' file: %s", path)
+                logger.info("Processor enqueued '%s' file: %s", kind, path)
             except QueuePutError as e:
+                if self.claim_registry is not None:
+                    self.claim_registry.release(path)
                 logger.error(
-                    "Processor QueuePutError enqueuing 'lost' file '%s' for %s: %s",
+                    "Processor QueuePutError enqueuing '%s' file '%s' for %s: %s",
+                    kind,
                     path,
                     self.lost_queue_name,
                     e,
@@ -304,8 +669,11 @@ class DoSingleCycle:
             except (
                 Exception
             ):  # Unexpected error during a specific put, log as EXCEPTION
+                if self.claim_registry is not None:
+                    self.claim_registry.release(path)
                 logger.exception(
-                    "Processor unexpected error enqueuing 'lost' file '%s' for %s",
+                    "Processor unexpected error enqueuing '%s' file '%s' for %s",
+                    kind,
                     path,
                     self.lost_queue_name,
                 )
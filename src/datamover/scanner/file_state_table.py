@@ -0,0 +1,452 @@
+import heapq
+import logging
+from array import array
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+from datamover.file_functions.gather_entry_data import GatheredEntryData
+from datamover.scanner.file_state_record import FileStateRecord
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python path is used instead
+    np = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+HAVE_NUMPY: bool = np is not None
+
+
+@dataclass(frozen=True)
+class StateClassification:
+    """Result of FileStateTable.classify(), as sets of paths."""
+
+    lost: set[Path]
+    stuck_active: set[Path]
+    present_too_long_idle: set[Path]
+    lost_eligible: int
+
+
+class FileStateTable(Mapping[Path, FileStateRecord]):
+    """
+    Columnar store of the scanner's per-file state.
+
+    Holds the same information as a dict of FileStateRecord, but as one
+    `array` column per field (size, mtime_wall, first_seen_mono,
+    prev_scan_size, prev_scan_mtime_wall) plus a path -> row index. A scan
+    cycle updates the rows of files seen again in place (bulk-assigned
+    through NumPy views when NumPy is installed), appends rows for new files
+    and swap-removes rows of files that disappeared, so no per-file objects
+    are created once a file is tracked.
+
+    Lost and stuck-active classification is driven by two deadline heaps
+    rather than a pass over every row: one keyed by mtime_wall (a file is
+    lost once wall_now - mtime_wall > lost_timeout) and one keyed by
+    first_seen_mono (present too long once monotonic_now - first_seen_mono
+    > stuck_active_timeout). An entry is pushed only when a file appears or
+    its mtime changes; entries made stale by a later change or by removal
+    are dropped when they reach the top. classify() pops only the expired
+    entries, so its cost follows changes and expiries, not directory size.
+    The rules are those of is_file_lost, is_active_since_last_scan and
+    is_file_present_too_long. The timeouts may change between cycles (see
+    CadenceThresholds): when one grows, files already taken as lost or
+    overdue that are inside the new timeout go back on their heap.
+
+    The table is a read-only Mapping of Path to FileStateRecord (records are
+    built on access), so it can stand in for the dict the scanner used to
+    keep. It is not thread-safe; it is owned by a single scanner thread.
+    """
+
+    def __init__(self, *, use_numpy: Optional[bool] = None):
+        """
+        Args:
+            use_numpy: Force (True) or avoid (False) the NumPy classification
+                       path. Defaults to using NumPy when it is installed.
+
+        Raises:
+            ValueError: If use_numpy is True but NumPy is not installed.
+        """
+        if use_numpy and not HAVE_NUMPY:
+            raise ValueError("use_numpy=True but NumPy is not installed")
+        self._use_numpy: bool = HAVE_NUMPY if use_numpy is None else use_numpy
+        self._paths: list[Path] = []
+        self._index: dict[Path, int] = {}
+        self._size = array("q")
+        self._mtime = array("d")
+        self._first_seen = array("d")
+        self._prev_size = array("q")
+        self._prev_mtime = array("d")
+        # Generation of each row, so heap entries of a removed file are not
+        # taken for a later file of the same name
+        self._gen = array("q")
+        self._next_gen: int = 0
+        # Rows at or after this one were added by the last update()
+        self._first_new_row: int = 0
+
+        # Deadline heaps of (time, generation, path)
+        self._lost_heap: list[tuple[float, int, Path]] = []
+        self._overdue_heap: list[tuple[float, int, Path]] = []
+        # Lost-heap entries of new files, pushed after their first classify()
+        self._deferred_lost: list[tuple[float, int, Path]] = []
+        self._lost: set[Path] = set()
+        self._overdue: set[Path] = set()
+        self._active: set[Path] = set()
+        # (wall_now, monotonic_now, lost_timeout, stuck_active_timeout) of the
+        # last classify(), for seconds_until_next_deadline()
+        self._last_classify: Optional[tuple[float, float, float, float]] = None
+
+    @property
+    def uses_numpy(self) -> bool:
+        return self._use_numpy
+
+    # --- Mapping interface ---
+
+    def __getitem__(self, path: Path) -> FileStateRecord:
+        row = self._index[path]
+        return FileStateRecord(
+            path=path,
+            size=self._size[row],
+            mtime_wall=self._mtime[row],
+            first_seen_mono=self._first_seen[row],
+            prev_scan_size=self._prev_size[row],
+            prev_scan_mtime_wall=self._prev_mtime[row],
+        )
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._index
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    # --- Cycle update ---
+
+    def update(
+        self, gathered_data: list[GatheredEntryData], monotonic_time_now: float
+    ) -> set[Path]:
+        """
+        Applies one scan's results to the table in place.
+
+        Same rules as update_file_state_record: files seen before keep their
+        first_seen_mono and get their previous size/mtime as prev_scan_*;
+        new files start with prev_scan_* equal to their current values and
+        first_seen_mono = monotonic_time_now.
+
+        Args:
+            gathered_data: Entries found by the current scan.
+            monotonic_time_now: Monotonic time of the scan, for new files.
+
+        Returns:
+            Paths tracked before but absent from this scan (now removed).
+        """
+        self._push_deferred_lost()
+        index = self._index
+        seen = bytearray(len(self._paths))
+        rows: list[int] = []
+        existing_entries: list[GatheredEntryData] = []
+        new_entries: list[GatheredEntryData] = []
+        for entry in gathered_data:
+            row = index.get(entry.path)
+            if row is None:
+                new_entries.append(entry)
+            elif not seen[row]:
+                seen[row] = 1
+                rows.append(row)
+                existing_entries.append(entry)
+
+        removed = self._remove_unseen(seen)
+        if removed:
+            # Swap-removal moved rows; look the seen ones up again
+            rows = [index[entry.path] for entry in existing_entries]
+
+        changed_rows, mtime_changed_rows = self._update_rows(rows, existing_entries)
+        paths = self._paths
+        self._active = {paths[row] for row in changed_rows}
+        for row in mtime_changed_rows:
+            path = paths[row]
+            # A new mtime moves the lost deadline; re-decided on expiry
+            self._lost.discard(path)
+            heapq.heappush(self._lost_heap, (self._mtime[row], self._gen[row], path))
+
+        self._first_new_row = len(paths)
+        for entry in new_entries:
+            if entry.path in index:  # Duplicate path within one scan
+                continue
+            gen = self._next_gen
+            self._next_gen += 1
+            index[entry.path] = len(paths)
+            paths.append(entry.path)
+            self._size.append(entry.size)
+            self._mtime.append(entry.mtime)
+            self._first_seen.append(monotonic_time_now)
+            self._prev_size.append(entry.size)
+            self._prev_mtime.append(entry.mtime)
+            self._gen.append(gen)
+            heapq.heappush(self._overdue_heap, (monotonic_time_now, gen, entry.path))
+            # New files are never lost in their first cycle
+            self._deferred_lost.append((entry.mtime, gen, entry.path))
+        return removed
+
+    def load_records(self, records: Iterable[FileStateRecord]) -> None:
+        """
+        Adds saved records (e.g. from before a restart) as known files.
+
+        Unlike files found by update(), they are not new: they can be lost
+        in the next classify(), and keep their first_seen_mono. Paths
+        already in the table are skipped.
+        """
+        index, paths = self._index, self._paths
+        for record in records:
+            if record.path in index:
+                continue
+            gen = self._next_gen
+            self._next_gen += 1
+            index[record.path] = len(paths)
+            paths.append(record.path)
+            self._size.append(record.size)
+            self._mtime.append(record.mtime_wall)
+            self._first_seen.append(record.first_seen_mono)
+            self._prev_size.append(record.prev_scan_size)
+            self._prev_mtime.append(record.prev_scan_mtime_wall)
+            self._gen.append(gen)
+            heapq.heappush(self._lost_heap, (record.mtime_wall, gen, record.path))
+            heapq.heappush(
+                self._overdue_heap, (record.first_seen_mono, gen, record.path)
+            )
+        self._first_new_row = len(paths)
+
+    def _remove_unseen(self, seen: bytearray) -> set[Path]:
+        """Swap-removes every row not marked in seen; returns their paths."""
+        unseen_rows = [row for row, flag in enumerate(seen) if not flag]
+        removed: set[Path] = set()
+        columns = self._columns()
+        # Highest rows first, so the row moved into a hole is always a kept one
+        for row in reversed(unseen_rows):
+            path = self._paths[row]
+            removed.add(path)
+            del self._index[path]
+            self._lost.discard(path)
+            self._overdue.discard(path)
+            last = len(self._paths) - 1
+            if row != last:
+                moved = self._paths[last]
+                self._paths[row] = moved
+                self._index[moved] = row
+                for column in columns:
+                    column[row] = column[last]
+            self._paths.pop()
+            for column in columns:
+                column.pop()
+        return removed
+
+    def _update_rows(
+        self, rows: list[int], entries: list[GatheredEntryData]
+    ) -> tuple[list[int], list[int]]:
+        """
+        Shifts current values into prev_scan_* and stores the new ones.
+
+        Returns:
+            (rows whose size or mtime changed, rows whose mtime changed).
+        """
+        if not rows:
+            return [], []
+        if self._use_numpy:
+            idx = np.fromiter(rows, dtype=np.intp, count=len(rows))
+            new_size = np.fromiter(
+                (e.size for e in entries), dtype=np.int64, count=len(rows)
+            )
+            new_mtime = np.fromiter(
+                (e.mtime for e in entries), dtype=np.float64, count=len(rows)
+            )
+            size = _view(self._size)
+            mtime = _view(self._mtime)
+            prev_size = _view(self._prev_size)
+            prev_mtime = _view(self._prev_mtime)
+            prev_size[idx] = size[idx]
+            prev_mtime[idx] = mtime[idx]
+            mtime_changed = prev_mtime[idx] != new_mtime
+            changed = mtime_changed | (prev_size[idx] != new_size)
+            size[idx] = new_size
+            mtime[idx] = new_mtime
+            del size, mtime, prev_size, prev_mtime  # Release the buffers
+            return idx[changed].tolist(), idx[mtime_changed].tolist()
+
+        changed_rows: list[int] = []
+        mtime_changed_rows: list[int] = []
+        size, mtime = self._size, self._mtime
+        prev_size, prev_mtime = self._prev_size, self._prev_mtime
+        for row, entry in zip(rows, entries):
+            old_size = size[row]
+            old_mtime = mtime[row]
+            # Only touch rows whose stored values actually change
+            if prev_size[row] != old_size or prev_mtime[row] != old_mtime:
+                prev_size[row] = old_size
+                prev_mtime[row] = old_mtime
+            if entry.size != old_size or entry.mtime != old_mtime:
+                size[row] = entry.size
+                mtime[row] = entry.mtime
+                changed_rows.append(row)
+                if entry.mtime != old_mtime:
+                    mtime_changed_rows.append(row)
+        return changed_rows, mtime_changed_rows
+
+    # --- Classification ---
+
+    def is_new(self, path: Path) -> bool:
+        """Returns True if path was first seen by the last update()."""
+        return self._index[path] >= self._first_new_row
+
+    def new_paths(self) -> list[Path]:
+        """Paths first seen by the last update()."""
+        return self._paths[self._first_new_row :]
+
+    def changed_paths(self) -> list[Path]:
+        """Known files whose size or mtime changed in the last update()."""
+        return list(self._active)
+
+    def classify(
+        self,
+        *,
+        wall_now: float,
+        lost_timeout: float,
+        monotonic_now: float,
+        stuck_active_timeout: float,
+    ) -> StateClassification:
+        """
+        Classifies the tracked files as lost, stuck active or idle-too-long.
+
+        Pops the expired deadlines: files whose mtime_wall is older than
+        lost_timeout join the lost set, files first seen more than
+        stuck_active_timeout ago join the overdue set. Rows added by the
+        last update() are never lost. A lost file is not checked further;
+        other overdue files are stuck active when they changed in the last
+        update(), idle-too-long otherwise.
+        """
+        if self._last_classify is not None:
+            _, _, last_lost_timeout, last_stuck_timeout = self._last_classify
+            if lost_timeout > last_lost_timeout:
+                self._unexpire_lost(wall_now, lost_timeout)
+            if stuck_active_timeout > last_stuck_timeout:
+                self._unexpire_overdue(monotonic_now, stuck_active_timeout)
+
+        index, gen, mtime = self._index, self._gen, self._mtime
+        lost_heap = self._lost_heap
+        while lost_heap and (wall_now - lost_heap[0][0]) > lost_timeout:
+            entry_mtime, entry_gen, path = heapq.heappop(lost_heap)
+            row = index.get(path)
+            if row is not None and gen[row] == entry_gen and mtime[row] == entry_mtime:
+                self._lost.add(path)
+
+        overdue_heap = self._overdue_heap
+        while (
+            overdue_heap and (monotonic_now - overdue_heap[0][0]) > stuck_active_timeout
+        ):
+            _, entry_gen, path = heapq.heappop(overdue_heap)
+            row = index.get(path)
+            if row is not None and gen[row] == entry_gen:
+                self._overdue.add(path)
+
+        self._push_deferred_lost()
+        self._last_classify = (
+            wall_now,
+            monotonic_now,
+            lost_timeout,
+            stuck_active_timeout,
+        )
+
+        candidates = self._overdue - self._lost
+        return StateClassification(
+            lost=set(self._lost),
+            stuck_active=candidates & self._active,
+            present_too_long_idle=candidates - self._active,
+            lost_eligible=min(self._first_new_row, len(self._paths)),
+        )
+
+    def seconds_until_next_deadline(self, monotonic_now: float) -> Optional[float]:
+        """
+        Returns the time until the next file turns lost or overdue.
+
+        Based on the clocks and timeouts of the last classify(); None before
+        the first classify() or when no deadline is pending.
+        """
+        if self._last_classify is None:
+            return None
+        wall_then, mono_then, lost_timeout, stuck_timeout = self._last_classify
+        index, gen, mtime = self._index, self._gen, self._mtime
+        # Drop stale entries from the tops so they do not cause early wakeups
+        lost_heap = self._lost_heap
+        while lost_heap:
+            entry_mtime, entry_gen, path = lost_heap[0]
+            row = index.get(path)
+            if row is not None and gen[row] == entry_gen and mtime[row] == entry_mtime:
+                break
+            heapq.heappop(lost_heap)
+        overdue_heap = self._overdue_heap
+        while overdue_heap:
+            row = index.get(overdue_heap[0][2])
+            if row is not None and gen[row] == overdue_heap[0][1]:
+                break
+            heapq.heappop(overdue_heap)
+
+        waits: list[float] = []
+        if lost_heap:
+            waits.append(lost_timeout - (wall_then - lost_heap[0][0]))
+        if overdue_heap:
+            waits.append(stuck_timeout - (mono_then - overdue_heap[0][0]))
+        if not waits:
+            return None
+        return max(0.0, min(waits) - (monotonic_now - mono_then))
+
+    def _unexpire_lost(self, wall_now: float, lost_timeout: float) -> None:
+        """Puts lost files that are within lost_timeout back on the lost heap."""
+        index, gen, mtime = self._index, self._gen, self._mtime
+        for path in [
+            p for p in self._lost if (wall_now - mtime[index[p]]) <= lost_timeout
+        ]:
+            row = index[path]
+            self._lost.discard(path)
+            heapq.heappush(self._lost_heap, (mtime[row], gen[row], path))
+
+    def _unexpire_overdue(
+        self, monotonic_now: float, stuck_active_timeout: float
+    ) -> None:
+        """Puts overdue files within stuck_active_timeout back on their heap."""
+        index, gen, first_seen = self._index, self._gen, self._first_seen
+        for path in [
+            p
+            for p in self._overdue
+            if (monotonic_now - first_seen[index[p]]) <= stuck_active_timeout
+        ]:
+            row = index[path]
+            self._overdue.discard(path)
+            heapq.heappush(self._overdue_heap, (first_seen[row], gen[row], path))
+
+    def _push_deferred_lost(self) -> None:
+        for entry in self._deferred_lost:
+            heapq.heappush(self._lost_heap, entry)
+        self._deferred_lost.clear()
+
+    def _columns(self) -> tuple[array, ...]:
+        return (
+            self._size,
+            self._mtime,
+            self._first_seen,
+            self._prev_size,
+            self._prev_mtime,
+            self._gen,
+        )
+
+
+def _view(column: array) -> Any:
+    """
+    Zero-copy NumPy view of an array column.
+
+    An array cannot be resized while a view of it exists, so callers must
+    drop their views before the table is appended to or shrunk.
+    """
+    dtype = np.int64 if column.typecode == "q" else np.float64
+    return np.frombuffer(column, dtype=dtype)
@@ -0,0 +1,172 @@
+import logging
+import os
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AbstractSet, Optional
+
+logger = logging.getLogger(__name__)
+
+PROC_ROOT = Path("/proc")
+
+# /proc/<pid>/comm holds at most this many characters of the process name
+_COMM_LENGTH = 15
+
+
+@dataclass(frozen=True)
+class OpenWriterSnapshot:
+    """
+    The files in a directory that the producer processes had open for
+    writing when the snapshot was taken.
+
+    complete is False when some producer's descriptors could not be read;
+    such a snapshot cannot show that a file is closed.
+    """
+
+    paths: frozenset[Path]
+    complete: bool
+    processes: int
+
+    def is_open_for_writing(self, path: Path) -> bool:
+        return path in self.paths
+
+
+class ProcOpenWriters:
+    """
+    Finds the files a directory's producers hold open for writing, from /proc.
+
+    A snapshot lists /proc once, keeps the processes that match the
+    configured process names or user ids (every process when neither is
+    given), and reads their /proc/<pid>/fd links. Only descriptors that
+    point into the directory are kept, and of those only the ones whose
+    /proc/<pid>/fdinfo flags show O_WRONLY or O_RDWR. The scanner takes one
+    snapshot per cycle and looks every candidate file up in it.
+
+    Processes that exit while being read are skipped; descriptors that
+    cannot be read (e.g. another user's process without CAP_SYS_PTRACE)
+    make the snapshot incomplete.
+    """
+
+    def __init__(
+        self,
+        *,
+        directory: Path,
+        proc_root: Path = PROC_ROOT,
+        process_names: Iterable[str] = (),
+        user_ids: Iterable[int] = (),
+    ):
+        """
+        Args:
+            directory: Resolved directory whose files are of interest.
+            proc_root: Root of the proc filesystem (a fake one in tests).
+            process_names: Producer process names, as in /proc/<pid>/comm.
+            user_ids: Producer user ids.
+        """
+        self.directory = directory
+        self.proc_root = proc_root
+        self.process_names: frozenset[str] = frozenset(
+            name[:_COMM_LENGTH] for name in process_names
+        )
+        self.user_ids: frozenset[int] = frozenset(user_ids)
+        self._prefix = os.path.join(str(directory), "")
+        self._root_warned = False
+
+    def snapshot(self) -> OpenWriterSnapshot:
+        """Reads the producers' open descriptors now."""
+        paths: set[Path] = set()
+        complete = True
+        processes = 0
+        try:
+            with os.scandir(self.proc_root) as entries:
+                pids = [entry.name for entry in entries if entry.name.isdigit()]
+        except OSError as e:
+            if not self._root_warned:
+                logger.warning(
+                    "Cannot list '%s' for open writers: %s", self.proc_root, e
+                )
+                self._root_warned = True
+            return OpenWriterSnapshot(paths=frozenset(), complete=False, processes=0)
+
+        for pid in pids:
+            process_dir = self.proc_root / pid
+            if not self._is_producer(process_dir):
+                continue
+            processes += 1
+            if not self._collect_writers(process_dir, paths):
+                complete = False
+        return OpenWriterSnapshot(
+            paths=frozenset(paths), complete=complete, processes=processes
+        )
+
+    def _is_producer(self, process_dir: Path) -> bool:
+        if not self.process_names and not self.user_ids:
+            return True
+        try:
+            if self.user_ids and os.stat(process_dir).st_uid in self.user_ids:
+                return True
+            if self.process_names:
+                comm = (process_dir / "comm").read_text().rstrip("\n")
+                return comm in self.process_names
+        except OSError:
+            pass  # Exited since /proc was listed
+        return False
+
+    def _collect_writers(self, process_dir: Path, paths: set[Path]) -> bool:
+        """Adds the process's writers into the directory; False if unreadable."""
+        try:
+            with os.scandir(process_dir / "fd") as fds:
+                links = [(fd.name, fd.path) for fd in fds]
+        except FileNotFoundError:
+            return True
+        except OSError as e:
+            logger.debug("Cannot read descriptors of '%s': %s", process_dir, e)
+            return False
+
+        readable = True
+        for fd, link in links:
+            try:
+                target = os.readlink(link)
+            except FileNotFoundError:
+                continue  # Closed since the listing
+            except OSError:
+                readable = False
+                continue
+            if not target.startswith(self._prefix):
+                continue
+            flags = self._fd_flags(process_dir / "fdinfo" / fd)
+            if flags is None:
+                readable = False
+            elif flags & os.O_ACCMODE in (os.O_WRONLY, os.O_RDWR):
+                paths.add(Path(target))
+        return readable
+
+    @staticmethod
+    def _fd_flags(fdinfo: Path) -> Optional[int]:
+        try:
+            for line in fdinfo.read_text().splitlines():
+                if line.startswith("flags:"):
+                    return int(line.split(":", 1)[1].strip(), 8)
+        except FileNotFoundError:
+            return 0  # Closed since the listing: no longer a writer
+        except (OSError, ValueError):
+            return None
+        return None
+
+
+def closed_stable_files(
+    *,
+    candidates: AbstractSet[Path],
+    open_writers: ProcOpenWriters,
+) -> Optional[set[Path]]:
+    """
+    Returns the candidates no producer has open for writing, or None when
+    that cannot be told (the snapshot was incomplete).
+
+    The snapshot is only taken when there are candidates.
+    """
+    if not candidates:
+        return set()
+    snapshot = open_writers.snapshot()
+    if not snapshot.complete:
+        return None
+    return {path for path in candidates if not snapshot.is_open_for_writing(path)}
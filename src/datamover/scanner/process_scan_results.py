@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Mapping
 from datetime import datetime
 from pathlib import Path
 
@@ -12,6 +13,7 @@ from datamover.scanner.file_state_record import (
     is_active_since_last_scan,
     is_file_present_too_long,
 )
+from datamover.scanner.file_state_table import FileStateTable
 from datamover.scanner.update_file_state_record import update_file_state_record
 
 logger = logging.getLogger(__name__)
@@ -20,13 +22,13 @@ logger = logging.getLogger(__name__)
 def process_scan_results(
     *,
     gathered_data: list[GatheredEntryData],
-    existing_states: dict[Path, FileStateRecord],
+    existing_states: Mapping[Path, FileStateRecord],
     lost_timeout: float,
     stuck_active_timeout: float,
     monotonic_now: float,
     wall_now: float,
 ) -> tuple[
-    dict[Path, FileStateRecord],  # next_file_states
+    Mapping[Path, FileStateRecord],  # next_file_states
     set[Path],  # removed_tracking_paths
     set[Path],  # currently_lost_paths
     set[Path],  # currently_stuck_active_paths (New return element)
@@ -68,10 +70,14 @@ def process_scan_results(
         due to how `is_active_since_last_scan` and `is_file_present_too_long`
         evaluate new files.
 
+    When `existing_states` is a `FileStateTable`, the same steps run on its
+    columns instead: the table is updated in place, classified from its
+    deadline heaps, and returned as `next_file_states`.
+
     Args:
         gathered_data: List of `GatheredEntryData` from the current scan.
-        existing_states: Dictionary of `Path` to `FileStateRecord` from the
-                         previous scan.
+        existing_states: Mapping of `Path` to `FileStateRecord` from the
+                         previous scan (a dict, or a `FileStateTable`).
         lost_timeout: Duration (seconds) after which an unmodified file is 'lost'.
         stuck_active_timeout: Duration (seconds) after being first seen, beyond
                               which an *active* file is considered 'stuck active'.
@@ -81,7 +87,8 @@ def process_scan_results(
 
     Returns:
         A tuple containing four elements:
-        - next_file_states: Updated dictionary of file states.
+        - next_file_states: Updated file states (the same object when
+          `existing_states` is a `FileStateTable`).
         - removed_tracking_paths: Set of Paths no longer found.
         - currently_lost_paths: Set of Paths for files deemed 'lost'.
         - currently_stuck_active_paths: Set of Paths for files deemed 'stuck active'.
@@ -92,6 +99,16 @@ def process_scan_results(
         stuck_active_timeout,
     )
 
+    if isinstance(existing_states, FileStateTable):
+        return _process_scan_results_columnar(
+            gathered_data=gathered_data,
+            table=existing_states,
+            lost_timeout=lost_timeout,
+            stuck_active_timeout=stuck_active_timeout,
+            monotonic_now=monotonic_now,
+            wall_now=wall_now,
+        )
+
     # Step 1: Update states and identify files that disappeared.
     next_file_states, removed_tracking_paths = update_file_state_record(
         existing_file_states=existing_states,
@@ -120,22 +137,7 @@ def process_scan_results(
                 state=state, wall_time_now=wall_now, lost_timeout=lost_timeout
             ):
                 currently_lost_paths.add(path)
-
-                # Format the file's mtime_wall
-                mtime_wall_str = datetime.fromtimestamp(state.mtime_wall).strftime(
-                    "%Y-%m-%d %H:%M:%S"
-                )
-                # Calculate age of mtime (how long since last modification)
-                mtime_age_seconds = wall_now - state.mtime_wall
-
-                logger.info(
-                    "Identified file as LOST: %s "
-                    "(last_modified_wall: %s, mtime_age: %.1fs > threshold: %.1fs sec)",
-                    path,
-                    mtime_wall_str,  # Human-readable last modification time
-                    mtime_age_seconds,  # How long ago it was modified
-                    lost_timeout,
-                )
+                _log_lost(path, state, wall_now, lost_timeout)
                 # Skip stuck‐active check for anything already lost
                 continue
 
@@ -150,21 +152,119 @@ def process_scan_results(
 
         if active and present_too_long:
             currently_stuck_active_paths.add(path)
-            age_seconds = monotonic_now - state.first_seen_mono
-            logger.warning(
-                "Identified file as STUCK ACTIVE: %s (age: %.1fs > threshold: %.1fs sec)",
-                path,
-                age_seconds,
-                stuck_active_timeout,
-            )
+            _log_stuck_active(path, state, monotonic_now, stuck_active_timeout)
         elif present_too_long:
-            # present too long but didn’t change
-            logger.warning(
-                "File %s present too long (%.1fs) but NOT active.",
-                path,
-                (monotonic_now - state.first_seen_mono),
-            )
+            _log_present_too_long_idle(path, state, monotonic_now)
+
+    _log_check_summary(
+        lost_check_count,
+        currently_lost_paths,
+        stuck_check_eligible_count,
+        currently_stuck_active_paths,
+    )
+
+    return (
+        next_file_states,
+        removed_tracking_paths,
+        currently_lost_paths,
+        currently_stuck_active_paths,
+    )
+
+
+def _process_scan_results_columnar(
+    *,
+    gathered_data: list[GatheredEntryData],
+    table: FileStateTable,
+    lost_timeout: float,
+    stuck_active_timeout: float,
+    monotonic_now: float,
+    wall_now: float,
+) -> tuple[FileStateTable, set[Path], set[Path], set[Path]]:
+    """process_scan_results for a FileStateTable: update in place, then classify."""
+    removed_tracking_paths = table.update(gathered_data, monotonic_now)
+
+    logger.debug(
+        "State update complete. Number of files being watched: %d, Removed tracking this cycle: %d",
+        len(table),
+        len(removed_tracking_paths),
+    )
+
+    result = table.classify(
+        wall_now=wall_now,
+        lost_timeout=lost_timeout,
+        monotonic_now=monotonic_now,
+        stuck_active_timeout=stuck_active_timeout,
+    )
+    # Records are only built for the (few) files that get logged
+    for path in result.lost:
+        _log_lost(path, table[path], wall_now, lost_timeout)
+    for path in result.stuck_active:
+        _log_stuck_active(path, table[path], monotonic_now, stuck_active_timeout)
+    for path in result.present_too_long_idle:
+        _log_present_too_long_idle(path, table[path], monotonic_now)
+
+    _log_check_summary(
+        result.lost_eligible,
+        result.lost,
+        len(table) - len(result.lost),
+        result.stuck_active,
+    )
+
+    return table, removed_tracking_paths, result.lost, result.stuck_active
 
+
+def _log_lost(
+    path: Path, state: FileStateRecord, wall_now: float, lost_timeout: float
+) -> None:
+    # Format the file's mtime_wall
+    mtime_wall_str = datetime.fromtimestamp(state.mtime_wall).strftime(
+        "%Y-%m-%d %H:%M:%S"
+    )
+    # Calculate age of mtime (how long since last modification)
+    mtime_age_seconds = wall_now - state.mtime_wall
+
+    logger.info(
+        "Identified file as LOST: %s "
+        "(last_modified_wall: %s, mtime_age: %.1fs > threshold: %.1fs sec)",
+        path,
+        mtime_wall_str,  # Human-readable last modification time
+        mtime_age_seconds,  # How long ago it was modified
+        lost_timeout,
+    )
+
+
+def _log_stuck_active(
+    path: Path,
+    state: FileStateRecord,
+    monotonic_now: float,
+    stuck_active_timeout: float,
+) -> None:
+    age_seconds = monotonic_now - state.first_seen_mono
+    logger.warning(
+        "Identified file as STUCK ACTIVE: %s (age: %.1fs > threshold: %.1fs sec)",
+        path,
+        age_seconds,
+        stuck_active_timeout,
+    )
+
+
+def _log_present_too_long_idle(
+    path: Path, state: FileStateRecord, monotonic_now: float
+) -> None:
+    # present too long but didn’t change
+    logger.warning(
+        "File %s present too long (%.1fs) but NOT active.",
+        path,
+        (monotonic_now - state.first_seen_mono),
+    )
+
+
+def _log_check_summary(
+    lost_check_count: int,
+    currently_lost_paths: set[Path],
+    stuck_check_eligible_count: int,
+    currently_stuck_active_paths: set[Path],
+) -> None:
     logger.debug(
         "Problem file checks complete. Lost eligible: %d, Found lost: %d. "
         "Stuck active eligible: %d, Found stuck active: %d.",
@@ -180,10 +280,3 @@ def process_scan_results(
             len(currently_stuck_active_paths),
             ", ".join(str(p) for p in currently_stuck_active_paths),
         )
-
-    return (
-        next_file_states,
-        removed_tracking_paths,
-        currently_lost_paths,
-        currently_stuck_active_paths,
-    )
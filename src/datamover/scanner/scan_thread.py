@@ -1,6 +1,6 @@
 import logging
 import threading
-from collections.abc import Callable
+from collections.abc import Callable, Mapping
 from pathlib import Path
 from typing import Union, Optional
 
@@ -8,11 +8,27 @@ from datamover.file_functions.file_exceptions import ScanDirectoryError
 
 from datamover.protocols import SleepCallable
 
+from datamover.scanner.activity_tracker import ActivityTracker
+from datamover.scanner.adaptive_interval import (
+    AdaptiveScanInterval,
+    CycleMetrics,
+    ScanCycleStats,
+)
+from datamover.scanner.app_cadence import AppHealth
 from datamover.scanner.file_state_record import FileStateRecord
+from datamover.scanner.file_state_table import FileStateTable
 from datamover.scanner.do_single_cycle import DoSingleCycle
+from datamover.scanner.scanner_state_store import ScannerStateStore
 
 logger = logging.getLogger(__name__)
 
+# With wake_for_deadlines, never wake sooner than this after a cycle, and
+# wake this much after a deadline so the file is past it when rescanned
+MIN_DEADLINE_WAIT_SECONDS = 1.0
+DEADLINE_WAKE_MARGIN_SECONDS = 0.1
+
+ACTIVITY_TRACKER_JOIN_TIMEOUT = 5.0
+
 
 class ScanThread(threading.Thread):
     """
@@ -33,6 +49,10 @@ class ScanThread(threading.Thread):
         sleep_func: SleepCallable,
         monotonic_func: Callable[[], float],
         name: str,
+        wake_for_deadlines: bool = False,
+        state_store: Optional[ScannerStateStore] = None,
+        state_save_interval_seconds: float = 60.0,
+        interval_policy: Optional[AdaptiveScanInterval] = None,
     ):
         """
         Initializes the ScanThread.
@@ -51,6 +71,16 @@ class ScanThread(threading.Thread):
             monotonic_func: A callable returning current monotonic time
                             (e.g., `time.monotonic()`), used for cycle timing.
             name: The name for this thread.
+            wake_for_deadlines: Start the next cycle early when a tracked
+                                file's lost or stuck deadline falls before
+                                the end of the scan interval (waiting at
+                                least MIN_DEADLINE_WAIT_SECONDS).
+            state_store: Optional store the file states are restored from at
+                         startup and saved to while running and on exit.
+            state_save_interval_seconds: Minimum time between saves.
+            interval_policy: Optional policy that replaces the fixed
+                             scan_interval_seconds with one chosen after
+                             each cycle from what it saw.
         """
         super().__init__(daemon=True, name=name)
 
@@ -61,12 +91,36 @@ class ScanThread(threading.Thread):
             sleep_func  # Stored but primarily used via stop_event.wait
         )
         self.monotonic_func: Callable[[], float] = monotonic_func
+        self.wake_for_deadlines: bool = wake_for_deadlines
+        self.state_store: Optional[ScannerStateStore] = state_store
+        self.state_save_interval_seconds: float = state_save_interval_seconds
+        self._last_state_save: Optional[float] = None
+        self.interval_policy: Optional[AdaptiveScanInterval] = interval_policy
+        # Interval chosen by the policy; None means scan_interval_seconds
+        self._adaptive_interval: Optional[float] = (
+            None if interval_policy is None else interval_policy.interval_seconds
+        )
 
-        # Internal state persisted cross scan cycles
-        self._current_file_states: dict[Path, FileStateRecord] = {}
+        # Cycle instrumentation, read by stats() from other threads
+        self._stats_lock = threading.Lock()
+        self._cycles: int = 0
+        self._failed_cycles: int = 0
+        self._overruns: int = 0
+        self._last_cycle_seconds: float = 0.0
+        self._max_cycle_seconds: float = 0.0
+        self._last_metrics: Optional[CycleMetrics] = None
+
+        # Internal state persisted cross scan cycles. The columnar table is
+        # updated in place by each cycle rather than rebuilt.
+        self._current_file_states: Mapping[Path, FileStateRecord] = FileStateTable()
         self._previously_lost_paths: set[Path] = set()
         self._previously_stuck_active_paths: set[Path] = set()
 
+        # Started and stopped with this thread; the processor reads from it
+        self.activity_tracker: Optional[ActivityTracker] = getattr(
+            self.processor, "activity_tracker", None
+        )
+
         # Attributes derived from the processor for logging context
         self.log_scan_dir: Union[Path, str] = getattr(
             self.processor, "directory_to_scan", "UnknownDir"
@@ -111,6 +165,7 @@ class ScanThread(threading.Thread):
 
         # Use the thread's own injected monotonic_func for timing the loop
         monotonic_func = self.monotonic_func
+        self.begin_scanning()
 
         while not self.stop_event.is_set():
             iteration += 1
@@ -120,76 +175,11 @@ class ScanThread(threading.Thread):
                 "%s cycle %d starting for '%s'", self.name, iteration, self.log_scan_dir
             )
 
-            next_states: Optional[dict[Path, FileStateRecord]] = None
-            current_lost: Optional[set[Path]] = None
-            current_stuck: Optional[set[Path]] = None
-            cycle_success: bool = False
-
             try:
-                # Delegate to the processor for one scan cycle
-                (
-                    next_states,
-                    current_lost,
-                    current_stuck,
-                ) = self.processor.process_one_cycle(
-                    current_file_states=self._current_file_states,
-                    previously_lost_paths=self._previously_lost_paths,
-                    previously_stuck_active_paths=self._previously_stuck_active_paths,
-                )
-                cycle_success = True
-
-            except ScanDirectoryError as e:
-                # Critical error related to accessing the scan directory
-                logger.error(
-                    "%s: Critical ScanDirectoryError for '%s': %s. Original: %s. Thread stopping.",
-                    self.name,
-                    getattr(e, "directory", self.log_scan_dir),
-                    e,
-                    getattr(e, "original_exception", "N/A"),
-                )
+                cycle_success = self.run_cycle(iteration)
+            except ScanDirectoryError:
                 break  # Exit the main loop
 
-            except Exception:
-                # Other unexpected errors during processor execution
-                logger.exception(
-                    "%s: Unexpected error during processor cycle for '%s'; state not updated for this cycle.",
-                    self.name,
-                    self.log_scan_dir,
-                )
-                # cycle_success remains False, state update will be skipped
-
-            # Log newly identified stuck active files as CRITICAL
-            if cycle_success and current_stuck is not None:
-                newly_stuck_this_cycle = (
-                    current_stuck - self._previously_stuck_active_paths
-                )
-                if newly_stuck_this_cycle:
-                    # CRITICAL log for a potentially serious condition
-                    logger.critical(
-                        "%s detected NEWLY STUCK ACTIVE files in '%s' (active & present > %s sec): %s",
-                        self.name,
-                        self.log_scan_dir,
-                        self.log_stuck_timeout,  # Use the stored timeout value for the log
-                        sorted(list(p.as_posix() for p in newly_stuck_this_cycle)),
-                    )
-
-            # Update internal state if the cycle was successful
-            if (
-                cycle_success
-                and next_states is not None
-                and current_lost is not None
-                and current_stuck is not None
-            ):
-                self._update_state(next_states, current_lost, current_stuck)
-            elif not cycle_success:
-                # WARNING if a cycle fails but the thread continues
-                logger.warning(
-                    "%s cycle %d for '%s' did not complete successfully, state not updated.",
-                    self.name,
-                    iteration,
-                    self.log_scan_dir,
-                )
-
             end_time: float = monotonic_func()
             cycle_duration: float = end_time - start_time
             # Repetitive per-cycle log, keep as DEBUG
@@ -201,8 +191,41 @@ class ScanThread(threading.Thread):
                 cycle_duration,
                 cycle_success,
             )
+            self.record_cycle(
+                success=cycle_success, cycle_seconds=cycle_duration, now=end_time
+            )
+            if cycle_success:
+                self.save_state_if_due(end_time)
             self._wait_or_stop(cycle_duration)
 
+        self.end_scanning()
+
+        stats = self.stats()
+        logger.info(
+            "%s ran %d cycles (%d failed, %d overran the interval); "
+            "longest %.3f sec, last %.3f sec",
+            self.name,
+            stats.cycles,
+            stats.failed_cycles,
+            stats.overruns,
+            stats.max_cycle_seconds,
+            stats.last_cycle_seconds,
+        )
+        for health in self.app_health():
+            logger.info(
+                "%s app '%s': %s, cadence %s, %.0f bytes/sec, typical file %s",
+                self.name,
+                health.app,
+                health.status.value,
+                "unknown"
+                if health.cadence_seconds is None
+                else f"{health.cadence_seconds:.1f} sec",
+                health.bytes_per_second,
+                "unknown"
+                if health.typical_file_size is None
+                else f"{health.typical_file_size:.0f} bytes",
+            )
+
         # Single INFO log for thread stop
         logger.info(
             "Stopping %s monitoring for '%s' - Graceful exit after %d iterations.",
@@ -211,6 +234,206 @@ class ScanThread(threading.Thread):
             iteration,
         )
 
+    def begin_scanning(self) -> None:
+        """Starts the activity tracker and restores saved state, if configured."""
+        if self.activity_tracker is not None:
+            self.activity_tracker.start()
+        if self.state_store is not None:
+            self._restore_state(self.state_store)
+
+    def end_scanning(self) -> None:
+        """Stops the activity tracker and saves the final state, if configured."""
+        self._stop_activity_tracker()
+        if self.state_store is not None and self._last_state_save is not None:
+            self._save_state(self.state_store)
+
+    def run_cycle(self, iteration: int) -> bool:
+        """
+        Runs one scan cycle through the processor and updates this thread's
+        state from its results, logging newly stuck active files as CRITICAL.
+
+        Returns:
+            True if the cycle completed and the state was updated.
+
+        Raises:
+            ScanDirectoryError: The directory could not be scanned (already
+                                logged); scanning it should stop.
+        """
+        next_states: Optional[Mapping[Path, FileStateRecord]] = None
+        current_lost: Optional[set[Path]] = None
+        current_stuck: Optional[set[Path]] = None
+        cycle_success: bool = False
+
+        try:
+            # Delegate to the processor for one scan cycle
+            (
+                next_states,
+                current_lost,
+                current_stuck,
+            ) = self.processor.process_one_cycle(
+                current_file_states=self._current_file_states,
+                previously_lost_paths=self._previously_lost_paths,
+                previously_stuck_active_paths=self._previously_stuck_active_paths,
+            )
+            cycle_success = True
+
+        except ScanDirectoryError as e:
+            # Critical error related to accessing the scan directory
+            logger.error(
+                "%s: Critical ScanDirectoryError for '%s': %s. Original: %s. Thread stopping.",
+                self.name,
+                getattr(e, "directory", self.log_scan_dir),
+                e,
+                getattr(e, "original_exception", "N/A"),
+            )
+            raise
+
+        except Exception:
+            # Other unexpected errors during processor execution
+            logger.exception(
+                "%s: Unexpected error during processor cycle for '%s'; state not updated for this cycle.",
+                self.name,
+                self.log_scan_dir,
+            )
+            # cycle_success remains False, state update will be skipped
+
+        # Log newly identified stuck active files as CRITICAL
+        if cycle_success and current_stuck is not None:
+            newly_stuck_this_cycle = current_stuck - self._previously_stuck_active_paths
+            if newly_stuck_this_cycle:
+                # CRITICAL log for a potentially serious condition
+                logger.critical(
+                    "%s detected NEWLY STUCK ACTIVE files in '%s' (active & present > %s sec): %s",
+                    self.name,
+                    self.log_scan_dir,
+                    self.log_stuck_timeout,  # Use the stored timeout value for the log
+                    sorted(list(p.as_posix() for p in newly_stuck_this_cycle)),
+                )
+
+        # Update internal state if the cycle was successful
+        if (
+            cycle_success
+            and next_states is not None
+            and current_lost is not None
+            and current_stuck is not None
+        ):
+            self._update_state(next_states, current_lost, current_stuck)
+            return True
+        if not cycle_success:
+            # WARNING if a cycle fails but the thread continues
+            logger.warning(
+                "%s cycle %d for '%s' did not complete successfully, state not updated.",
+                self.name,
+                iteration,
+                self.log_scan_dir,
+            )
+        return False
+
+    def record_cycle(self, *, success: bool, cycle_seconds: float, now: float) -> None:
+        """
+        Records a finished cycle's duration and metrics and, with an
+        interval policy, chooses the interval before the next one.
+
+        Args:
+            success: Whether run_cycle() completed.
+            cycle_seconds: How long the cycle took.
+            now: Monotonic time at the end of the cycle.
+        """
+        metrics: Optional[CycleMetrics] = (
+            getattr(self.processor, "last_cycle_metrics", None) if success else None
+        )
+        with self._stats_lock:
+            self._cycles += 1
+            if not success:
+                self._failed_cycles += 1
+            if cycle_seconds >= self.current_interval_seconds:
+                self._overruns += 1
+            self._last_cycle_seconds = cycle_seconds
+            self._max_cycle_seconds = max(self._max_cycle_seconds, cycle_seconds)
+            if metrics is not None:
+                self._last_metrics = metrics
+        if self.interval_policy is not None:
+            states = self._current_file_states
+            deadline_wait = (
+                states.seconds_until_next_deadline(now)
+                if isinstance(states, FileStateTable)
+                else None
+            )
+            self._adaptive_interval = self.interval_policy.next_interval(
+                metrics, deadline_wait
+            )
+        if metrics is not None:
+            # Repetitive per-cycle log, keep as DEBUG
+            logger.debug(
+                "%s cycle saw %d files (%d new, %d changed, %d removed); "
+                "next cycle in %.2f sec",
+                self.name,
+                metrics.entries,
+                metrics.new_files,
+                metrics.changed_files,
+                metrics.removed_files,
+                self.current_interval_seconds,
+            )
+
+    @property
+    def current_interval_seconds(self) -> float:
+        """The interval before the next cycle starts."""
+        if self._adaptive_interval is None:
+            return self.scan_interval_seconds
+        return self._adaptive_interval
+
+    def stats(self) -> ScanCycleStats:
+        """Returns a consistent snapshot of the cycle counters."""
+        with self._stats_lock:
+            return ScanCycleStats(
+                cycles=self._cycles,
+                failed_cycles=self._failed_cycles,
+                overruns=self._overruns,
+                last_cycle_seconds=self._last_cycle_seconds,
+                max_cycle_seconds=self._max_cycle_seconds,
+                interval_seconds=self.current_interval_seconds,
+                last_metrics=self._last_metrics,
+            )
+
+    def app_health(self) -> list[AppHealth]:
+        """Per-app health of the directory (empty without an app health monitor)."""
+        return self.processor.app_health_stats()
+
+    def _restore_state(self, store: ScannerStateStore) -> None:
+        saved = store.load()
+        if saved is None:
+            return
+        self._previously_stuck_active_paths = set(saved.stuck_active_paths)
+        self.processor.restore_saved_state(saved)
+
+    def save_state_if_due(self, now: float) -> None:
+        """Saves the state if the save interval has passed since the last save."""
+        store = self.state_store
+        if store is None:
+            return
+        if (
+            self._last_state_save is None
+            or now - self._last_state_save >= self.state_save_interval_seconds
+        ):
+            self._save_state(store)
+            self._last_state_save = now
+
+    def _save_state(self, store: ScannerStateStore) -> None:
+        store.save(
+            file_states=self._current_file_states,
+            stuck_active_paths=self._previously_stuck_active_paths,
+            signaled_apps=self.processor.previously_signaled_stuck_apps,
+        )
+
+    def _stop_activity_tracker(self) -> None:
+        tracker = self.activity_tracker
+        if tracker is None or not tracker.is_alive():
+            return
+        tracker.stop_event.set()
+        tracker.join(timeout=ACTIVITY_TRACKER_JOIN_TIMEOUT)
+        if tracker.is_alive():
+            logger.warning("%s did not shut down cleanly.", tracker.name)
+
     def stop(self) -> None:
         """Signals the thread to stop its scanning loop gracefully."""
         if not self.stop_event.is_set():
@@ -229,7 +452,9 @@ class ScanThread(threading.Thread):
         if self.stop_event.is_set():  # Check before attempting to wait
             return
 
-        wait_time: float = max(0.0, self.scan_interval_seconds - cycle_duration)
+        wait_time: float = max(0.0, self.current_interval_seconds - cycle_duration)
+        if self.wake_for_deadlines and wait_time > 0:
+            wait_time = self.shorten_wait_for_deadline(wait_time)
 
         if wait_time > 0:
             # Repetitive per-cycle log, keep as DEBUG
@@ -246,12 +471,31 @@ class ScanThread(threading.Thread):
                 "%s scan cycle duration (%.3f sec) met or exceeded interval (%.1f sec), starting next cycle immediately.",
                 self.name,
                 cycle_duration,
-                self.scan_interval_seconds,
+                self.current_interval_seconds,
             )
 
+    def shorten_wait_for_deadline(self, wait_time: float) -> float:
+        """Returns wait_time, cut short if a file deadline falls within it."""
+        states = self._current_file_states
+        if not isinstance(states, FileStateTable):
+            return wait_time
+        deadline_wait = states.seconds_until_next_deadline(self.monotonic_func())
+        if deadline_wait is None:
+            return wait_time
+        deadline_wait += DEADLINE_WAKE_MARGIN_SECONDS
+        if deadline_wait >= wait_time:
+            return wait_time
+        shortened = max(deadline_wait, min(MIN_DEADLINE_WAIT_SECONDS, wait_time))
+        logger.debug(
+            "%s next file deadline in %.3f seconds; waking early.",
+            self.name,
+            deadline_wait,
+        )
+        return shortened
+
     def _update_state(
         self,
-        next_states: dict[Path, FileStateRecord],
+        next_states: Mapping[Path, FileStateRecord],
         currently_lost_paths: set[Path],
         currently_stuck_active_paths: set[Path],
     ) -> None:
@@ -0,0 +1,248 @@
+import logging
+import os
+import time
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Callable, Optional, cast
+
+from datamover.file_functions.fs_mock import FS
+from datamover.file_functions.gather_entry_data import GatheredEntryData
+from datamover.scanner.file_state_record import FileStateRecord
+
+logger = logging.getLogger(__name__)
+
+FORMAT_HEADER = b"datamover-scanner-state 1\n"
+
+_DIRECTORY = b"D"
+_FILE = b"F"
+_STUCK = b"S"
+_SIGNALED_APP = b"A"
+
+
+@dataclass(frozen=True)
+class SavedScannerState:
+    """Scanner state read back by ScannerStateStore.load()."""
+
+    file_states: dict[Path, FileStateRecord]
+    stuck_active_paths: set[Path]
+    signaled_apps: set[str]
+
+
+class ScannerStateStore:
+    """
+    Saves the scanner's file states to a file so they survive a restart.
+
+    Without it, every file is new again after a restart: its first_seen_mono
+    restarts, so a stuck file is only reported stuck_active_file_timeout
+    later, lost detection waits an extra cycle, and stuck applications are
+    signalled a second time.
+
+    Monotonic times mean nothing to another process, so first_seen_mono is
+    saved as the wall-clock time it corresponds to and converted back on
+    load. The file is tab-separated lines: a directory line, one 'F' line
+    per file (size, mtime, first seen, previous size, previous mtime, name),
+    'S' lines for stuck active files and 'A' lines for signalled apps. Only
+    file names are stored; every tracked file is directly inside the
+    scanned directory. It is rewritten whole (temp file, fsync, rename).
+
+    A saved state is only a hint: reconcile_with_scan() keeps the records of
+    files the first scan after the restart finds no smaller and no older.
+    """
+
+    def __init__(
+        self,
+        *,
+        state_path: Path,
+        directory: Path,
+        fs: FS,
+        time_func: Callable[[], float] = time.time,
+        monotonic_func: Callable[[], float] = time.monotonic,
+        fsync_func: Callable[[int], None] = os.fsync,
+    ):
+        """
+        Args:
+            state_path: The state file.
+            directory: The scanned directory the states belong to.
+            fs: Filesystem abstraction used to open and replace the file.
+            time_func: Wall clock, used to convert monotonic times.
+            monotonic_func: The scanner's monotonic clock.
+            fsync_func: Function that flushes a file descriptor to disk.
+        """
+        self.state_path = state_path
+        self.directory = directory
+        self._fs = fs
+        self._time = time_func
+        self._monotonic = monotonic_func
+        self._fsync = fsync_func
+
+    def save(
+        self,
+        *,
+        file_states: Mapping[Path, FileStateRecord],
+        stuck_active_paths: Iterable[Path],
+        signaled_apps: Iterable[str],
+    ) -> bool:
+        """
+        Writes the given state, replacing the previous file.
+
+        Returns:
+            True if the state was written; failures are logged, not raised.
+        """
+        wall_now = self._time()
+        mono_now = self._monotonic()
+        directory = self.directory
+        tmp_path = self.state_path.with_name(self.state_path.name + ".tmp")
+        started = time.perf_counter()
+        saved = 0
+        try:
+            with self._fs.open(tmp_path, "wb") as f:
+                out = cast(IO[bytes], f)
+                out.write(FORMAT_HEADER)
+                out.write(_DIRECTORY + b"\t" + os.fsencode(str(directory)) + b"\n")
+                for record in file_states.values():
+                    name = _encode_name(record.path, directory)
+                    if name is None:
+                        continue
+                    first_seen_wall = wall_now - (mono_now - record.first_seen_mono)
+                    out.write(
+                        b"%b\t%d\t%r\t%r\t%d\t%r\t%b\n"
+                        % (
+                            _FILE,
+                            record.size,
+                            record.mtime_wall,
+                            first_seen_wall,
+                            record.prev_scan_size,
+                            record.prev_scan_mtime_wall,
+                            name,
+                        )
+                    )
+                    saved += 1
+                for path in stuck_active_paths:
+                    name = _encode_name(path, directory)
+                    if name is not None:
+                        out.write(_STUCK + b"\t" + name + b"\n")
+                for app in signaled_apps:
+                    out.write(_SIGNALED_APP + b"\t" + app.encode() + b"\n")
+                out.flush()
+                self._fsync(out.fileno())
+            self._fs.replace(tmp_path, self.state_path)
+        except (OSError, ValueError) as e:
+            logger.error("Scanner state '%s': save failed: %s", self.state_path, e)
+            return False
+        logger.debug(
+            "Saved scanner state for %d file(s) to '%s' in %.1fms.",
+            saved,
+            self.state_path,
+            1000.0 * (time.perf_counter() - started),
+        )
+        return True
+
+    def load(self) -> Optional[SavedScannerState]:
+        """
+        Reads the saved state, converting first-seen times back to monotonic.
+
+        Returns:
+            The saved state, or None if there is none, it belongs to another
+            directory, or it cannot be read (logged).
+        """
+        wall_now = self._time()
+        mono_now = self._monotonic()
+        file_states: dict[Path, FileStateRecord] = {}
+        stuck: set[Path] = set()
+        apps: set[str] = set()
+        try:
+            with self._fs.open(self.state_path, "rb") as f:
+                lines = iter(cast(IO[bytes], f))
+                if next(lines, b"") != FORMAT_HEADER:
+                    logger.warning(
+                        "Scanner state '%s' has an unknown format; ignoring it.",
+                        self.state_path,
+                    )
+                    return None
+                for line in lines:
+                    kind, _, rest = line.rstrip(b"\n").partition(b"\t")
+                    if kind == _FILE:
+                        size, mtime, seen, prev_size, prev_mtime, name = rest.split(
+                            b"\t", 5
+                        )
+                        path = self.directory / os.fsdecode(name)
+                        # A first-seen time in the future (clock stepped back)
+                        # counts as now
+                        age = max(0.0, wall_now - float(seen))
+                        file_states[path] = FileStateRecord(
+                            path=path,
+                            size=int(size),
+                            mtime_wall=float(mtime),
+                            first_seen_mono=mono_now - age,
+                            prev_scan_size=int(prev_size),
+                            prev_scan_mtime_wall=float(prev_mtime),
+                        )
+                    elif kind == _STUCK:
+                        stuck.add(self.directory / os.fsdecode(rest))
+                    elif kind == _SIGNALED_APP:
+                        apps.add(rest.decode())
+                    elif kind == _DIRECTORY:
+                        if Path(os.fsdecode(rest)) != self.directory:
+                            logger.warning(
+                                "Scanner state '%s' is for '%s', not '%s'; ignoring it.",
+                                self.state_path,
+                                os.fsdecode(rest),
+                                self.directory,
+                            )
+                            return None
+        except FileNotFoundError:
+            logger.info("No saved scanner state at '%s'.", self.state_path)
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(
+                "Scanner state '%s' could not be read (%s); ignoring it.",
+                self.state_path,
+                e,
+            )
+            return None
+        logger.info(
+            "Loaded scanner state from '%s': %d file(s), %d stuck, %d signalled app(s).",
+            self.state_path,
+            len(file_states),
+            len(stuck),
+            len(apps),
+        )
+        return SavedScannerState(
+            file_states=file_states, stuck_active_paths=stuck, signaled_apps=apps
+        )
+
+
+def _encode_name(path: Path, directory: Path) -> Optional[bytes]:
+    """The file name to save for path, or None if it cannot be saved."""
+    if path.parent != directory:
+        return None
+    name = os.fsencode(path.name)
+    if b"\n" in name or b"\t" in name:
+        logger.debug("Not saving state for '%s': tab or newline in name.", path)
+        return None
+    return name
+
+
+def reconcile_with_scan(
+    saved: Mapping[Path, FileStateRecord], gathered_data: list[GatheredEntryData]
+) -> list[FileStateRecord]:
+    """
+    Returns the saved records that still describe the files just scanned.
+
+    A file missing from the scan is dropped. One that is now smaller or has
+    an older mtime than when it was saved has been replaced since, and is
+    treated as new.
+    """
+    kept: list[FileStateRecord] = []
+    for entry in gathered_data:
+        record = saved.get(entry.path)
+        if record is None:
+            continue
+        if entry.size < record.size or entry.mtime < record.mtime_wall:
+            logger.debug(
+                "Saved state for '%s' is stale; treating it as new.", entry.path
+            )
+            continue
+        kept.append(record)
+    return kept
@@ -0,0 +1,276 @@
+import logging
+import threading
+from collections.abc import Callable
+from concurrent import futures
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Union
+
+from datamover.file_functions.file_exceptions import ScanDirectoryError
+from datamover.scanner.scan_thread import ScanThread
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPORT_EVERY_ROUNDS = 60
+
+
+@dataclass(frozen=True)
+class DirectoryScanStats:
+    """Snapshot of the cycle counters of one directory of a ShardedScanThread."""
+
+    directory: Union[Path, str]
+    cycles: int
+    failed_cycles: int
+    overruns: int
+    last_cycle_seconds: float
+    max_cycle_seconds: float
+    total_cycle_seconds: float
+
+    @property
+    def avg_cycle_seconds(self) -> float:
+        return self.total_cycle_seconds / self.cycles if self.cycles else 0.0
+
+
+class _Shard:
+    """A directory's ScanThread (used for its cycle logic only) and counters."""
+
+    def __init__(self, scanner: ScanThread):
+        self.scanner = scanner
+        self.cycles = 0
+        self.failed_cycles = 0
+        self.overruns = 0
+        self.last_cycle_seconds = 0.0
+        self.max_cycle_seconds = 0.0
+        self.total_cycle_seconds = 0.0
+
+    def record(self, success: bool, seconds: float) -> None:
+        self.cycles += 1
+        if not success:
+            self.failed_cycles += 1
+        self.last_cycle_seconds = seconds
+        self.max_cycle_seconds = max(self.max_cycle_seconds, seconds)
+        self.total_cycle_seconds += seconds
+
+    def stats(self) -> DirectoryScanStats:
+        return DirectoryScanStats(
+            directory=self.scanner.log_scan_dir,
+            cycles=self.cycles,
+            failed_cycles=self.failed_cycles,
+            overruns=self.overruns,
+            last_cycle_seconds=self.last_cycle_seconds,
+            max_cycle_seconds=self.max_cycle_seconds,
+            total_cycle_seconds=self.total_cycle_seconds,
+        )
+
+
+class ShardedScanThread(threading.Thread):
+    """
+    Scans several source directories from one thread, on a small pool.
+
+    Each directory keeps its own ScanThread, which is never started: it holds
+    the directory's file states, timeouts, activity tracker and state store,
+    and its run_cycle() does one cycle. Every scan interval this thread
+    submits a cycle for each directory to the pool, so directories are
+    listed and stat'ed in parallel. All the processors put lost files on the
+    same queue.
+
+    The interval is the shortest one the scanners want next: their
+    scan_interval_seconds, or what their AdaptiveScanInterval chose.
+
+    A directory whose previous cycle is still running when the next interval
+    starts is skipped for that interval and counted as an overrun, so a slow
+    directory never delays the others. A directory that can no longer be
+    scanned (ScanDirectoryError) is dropped; the thread stops when none are
+    left. Per-directory cycle times are logged every `report_every` rounds
+    and are available from stats().
+    """
+
+    def __init__(
+        self,
+        *,
+        scanners: list[ScanThread],
+        stop_event: threading.Event,
+        scan_interval_seconds: float,
+        monotonic_func: Callable[[], float],
+        max_workers: int,
+        name: str = "ShardedScanner",
+        report_every: int = DEFAULT_REPORT_EVERY_ROUNDS,
+        executor_factory: Optional[Callable[[int], Executor]] = None,
+    ):
+        """
+        Args:
+            scanners: One ScanThread per directory, not started.
+            stop_event: Event used to signal the thread to stop.
+            scan_interval_seconds: Configured interval between rounds (for
+                                   logging; each round uses the scanners'
+                                   current intervals).
+            monotonic_func: Clock used to time rounds and cycles.
+            max_workers: Number of directories scanned at the same time.
+            name: The name for this thread.
+            report_every: Log per-directory cycle times every this many
+                          rounds (0 disables the report).
+            executor_factory: Builds the pool from max_workers; defaults to
+                              a ThreadPoolExecutor.
+
+        Raises:
+            ValueError: If scanners is empty or max_workers is less than 1.
+        """
+        super().__init__(daemon=True, name=name)
+        if not scanners:
+            raise ValueError("ShardedScanThread needs at least one scanner")
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+        self.stop_event = stop_event
+        self.scan_interval_seconds = scan_interval_seconds
+        self.monotonic_func = monotonic_func
+        self.max_workers = max_workers
+        self.report_every = report_every
+        self._executor_factory = executor_factory or (
+            lambda workers: ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=f"{name}-worker"
+            )
+        )
+        self._lock = threading.Lock()
+        self._shards: list[_Shard] = [_Shard(scanner) for scanner in scanners]
+        self._active: list[_Shard] = list(self._shards)
+        self._pending: dict[Future, _Shard] = {}
+
+        logger.info(
+            "Initialized %s for %d directories [Interval: %.1fs, Workers: %d]: %s",
+            self.name,
+            len(self._shards),
+            scan_interval_seconds,
+            max_workers,
+            [str(shard.scanner.log_scan_dir) for shard in self._shards],
+        )
+
+    def stats(self) -> list[DirectoryScanStats]:
+        """Returns a snapshot of the counters of every directory."""
+        with self._lock:
+            return [shard.stats() for shard in self._shards]
+
+    def run(self) -> None:
+        logger.info("Starting %s", self.name)
+        executor = self._executor_factory(self.max_workers)
+        for shard in self._shards:
+            shard.scanner.begin_scanning()
+        iteration = 0
+        try:
+            while self._active and not self.stop_event.is_set():
+                iteration += 1
+                start_time = self.monotonic_func()
+                interval = self._round_interval()
+                self._submit_round(executor, iteration)
+                self._collect_until(start_time + interval)
+                if self.report_every and iteration % self.report_every == 0:
+                    self._report()
+                self._wait_or_stop(start_time, interval)
+        except Exception:
+            logger.exception("%s: unexpected error; stopping.", self.name)
+        finally:
+            # Let running cycles finish before the final state saves
+            executor.shutdown(wait=True)
+            for future, shard in list(self._pending.items()):
+                self._collect(future, shard)
+            self._pending.clear()
+            for shard in self._shards:
+                shard.scanner.end_scanning()
+            self._report()
+            logger.info("%s stopped after %d rounds.", self.name, iteration)
+
+    def _round_interval(self) -> float:
+        """The shortest interval any directory's scanner wants next."""
+        return min(shard.scanner.current_interval_seconds for shard in self._active)
+
+    def _submit_round(self, executor: Executor, iteration: int) -> None:
+        busy = set(self._pending.values())
+        for shard in self._active:
+            if shard in busy:
+                with self._lock:
+                    shard.overruns += 1
+                logger.warning(
+                    "%s: previous cycle for '%s' is still running; skipping it "
+                    "this round.",
+                    self.name,
+                    shard.scanner.log_scan_dir,
+                )
+                continue
+            future = executor.submit(self._scan_one, shard.scanner, iteration)
+            self._pending[future] = shard
+
+    def _scan_one(self, scanner: ScanThread, iteration: int) -> tuple[bool, float]:
+        """Runs one cycle of a directory on a pool thread."""
+        start_time = self.monotonic_func()
+        success = scanner.run_cycle(iteration)
+        end_time = self.monotonic_func()
+        scanner.record_cycle(
+            success=success, cycle_seconds=end_time - start_time, now=end_time
+        )
+        if success:
+            scanner.save_state_if_due(end_time)
+        return success, end_time - start_time
+
+    def _collect_until(self, deadline: float) -> None:
+        """Records finished cycles until all are done or the deadline passes."""
+        while self._pending and not self.stop_event.is_set():
+            remaining = deadline - self.monotonic_func()
+            if remaining <= 0:
+                return
+            done, _ = futures.wait(
+                self._pending, timeout=remaining, return_when=futures.FIRST_COMPLETED
+            )
+            for future in done:
+                self._collect(future, self._pending.pop(future))
+
+    def _collect(self, future: Future, shard: _Shard) -> None:
+        try:
+            success, seconds = future.result()
+        except ScanDirectoryError:
+            # Already logged by the ScanThread
+            logger.error(
+                "%s: no longer scanning '%s'.", self.name, shard.scanner.log_scan_dir
+            )
+            self._active.remove(shard)
+            return
+        except Exception:
+            logger.exception(
+                "%s: unexpected error scanning '%s'.",
+                self.name,
+                shard.scanner.log_scan_dir,
+            )
+            success, seconds = False, 0.0
+        with self._lock:
+            shard.record(success, seconds)
+
+    def _wait_or_stop(self, start_time: float, interval: float) -> None:
+        """Waits out the rest of the interval, waking early for file deadlines."""
+        if self.stop_event.is_set():
+            return
+        wait_time = max(0.0, interval - (self.monotonic_func() - start_time))
+        for shard in self._active:
+            if wait_time > 0 and shard.scanner.wake_for_deadlines:
+                wait_time = shard.scanner.shorten_wait_for_deadline(wait_time)
+        if wait_time > 0:
+            self.stop_event.wait(wait_time)
+
+    def _report(self) -> None:
+        for stats in self.stats():
+            logger.info(
+                "%s: '%s': %d cycles (%d failed, %d overruns), "
+                "last %.3fs, avg %.3fs, max %.3fs",
+                self.name,
+                stats.directory,
+                stats.cycles,
+                stats.failed_cycles,
+                stats.overruns,
+                stats.last_cycle_seconds,
+                stats.avg_cycle_seconds,
+                stats.max_cycle_seconds,
+            )
+
+    def stop(self) -> None:
+        """Signals the thread to stop its scanning loop gracefully."""
+        if not self.stop_event.is_set():
+            logger.info("%s received stop signal, requesting shutdown.", self.name)
+            self.stop_event.set()
@@ -1,15 +1,16 @@
 import logging
 from pathlib import Path
-from typing import Optional, Set, Tuple
+from typing import AbstractSet, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
 
-def get_app_name_from_path(file_path: Path) -> Optional[str]:
+def get_app_name_from_path(file_path: Path, warn: bool = True) -> Optional[str]:
     """
     Extracts the App Name from a filename like 'APPNAME-timestamp.ext'.
     The App Name is assumed to be the part of the filename before the first hyphen.
     (As per Glossary in requirements doc - stuck_files.md)
+    Set warn to False for callers that see every file, not just stuck ones.
     """
     name: str = file_path.name
     head, sep, _ = name.partition("-")
@@ -17,10 +18,11 @@ def get_app_name_from_path(file_path: Path) -> Optional[str]:
         return head
 
     # If there's no hyphen (or it starts with one), warn and return None
-    logger.warning(
-        "Could not extract App Name (part before first hyphen) from filename: %r",
-        name,
-    )
+    if warn:
+        logger.warning(
+            "Could not extract App Name (part before first hyphen) from filename: %r",
+            name,
+        )
     return None
 
 
@@ -28,6 +30,7 @@ def determine_app_restart_actions(
     current_stuck_file_paths: Set[Path],
     previously_signaled_apps: Set[str],
     restart_trigger_directory: Path,
+    flagged_apps: AbstractSet[str] = frozenset(),
 ) -> Tuple[Set[Path], Set[str]]:
     """
     Determines .restart files to create for newly stuck applications and
@@ -43,6 +46,8 @@ def determine_app_restart_actions(
         restart_trigger_directory: The directory where .restart files (Restart Trigger Files)
                                    should be notionally created. This function does not
                                    create files, only determines their paths.
+        flagged_apps: App Names flagged by other means (e.g. an
+                      AppHealthMonitor) that are treated as stuck too.
 
     Returns:
         A tuple containing:
@@ -50,7 +55,8 @@ def determine_app_restart_actions(
             Set of Path objects for .restart files that should be created for
             applications that are newly considered stuck.
         - Current_stuck_apps (Set[str]):
-            Set of all unique App Names derived from `current_stuck_file_paths`.
+            Set of all unique App Names derived from `current_stuck_file_paths`,
+            plus `flagged_apps`.
             This set should be used as `previously_signaled_apps` in the
             next processing cycle. (FR2.4)
     """
@@ -60,6 +66,7 @@ def determine_app_restart_actions(
         app_name: Optional[str] = get_app_name_from_path(path)
         if app_name:
             current_stuck_apps.add(app_name)
+    current_stuck_apps |= flagged_apps
 
     # FR2.2: Newly Stuck
     newly_stuck_apps: Set[str] = current_stuck_apps - previously_signaled_apps
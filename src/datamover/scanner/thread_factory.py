@@ -11,8 +11,21 @@ from datamover.file_functions.directory_validation import (
 )
 from datamover.file_functions.fs_mock import FS
 from datamover.protocols import SleepCallable
+from datamover.queues.claim_registry import ClaimRegistry
+from datamover.queues.manifest_index import ManifestIndex
+from datamover.scanner.activity_tracker import ActivityTracker
+from datamover.scanner.adaptive_interval import AdaptiveScanInterval
+from datamover.scanner.app_cadence import (
+    AppCadenceIndex,
+    AppHealthMonitor,
+    CadenceThresholds,
+)
+from datamover.scanner.close_write_trigger import CloseWriteTriggerThread
 from datamover.scanner.do_single_cycle import DoSingleCycle
+from datamover.scanner.open_writers import ProcOpenWriters
 from datamover.scanner.scan_thread import ScanThread
+from datamover.scanner.scanner_state_store import ScannerStateStore
+from datamover.scanner.sharded_scan_thread import ShardedScanThread
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +44,17 @@ def create_scan_thread(
     time_func: Callable[[], float] = time.time,
     monotonic_func: Callable[[], float] = time.monotonic,
     sleep_func: Optional[SleepCallable] = None,
+    claim_registry: Optional[ClaimRegistry] = None,
+    manifest_index: Optional[ManifestIndex] = None,
+    fast_scan: bool = False,
+    wake_for_deadlines: bool = False,
+    activity_rescan_seconds: Optional[float] = None,
+    state_file_path: Optional[Path] = None,
+    state_save_interval_seconds: float = 60.0,
+    adaptive_interval_bounds: Optional[tuple[float, float]] = None,
+    cadence_factors: Optional[tuple[float, float]] = None,
+    app_overrun_factor: Optional[float] = None,
+    open_writer_producers: Optional[tuple[tuple[str, ...], tuple[int, ...]]] = None,
 ) -> ScanThread:
     """
     Factory function to create and configure a ScanThread for directory scanning.
@@ -53,6 +77,35 @@ def create_scan_thread(
         time_func: Function returning current wall-clock time.
         monotonic_func: Function returning current monotonic time.
         sleep_func: Optional sleep function for the ScanThread; defaults to time.sleep.
+        claim_registry: Optional shared registry used to skip lost files that
+                        are already queued, in flight or recently moved.
+        manifest_index: Optional index of the files the tailer announced,
+                        reconciled with the directory every cycle.
+        fast_scan: Resolve the scan directory once per cycle instead of every file.
+        wake_for_deadlines: Let the ScanThread start a cycle early for a file
+                            that is about to become lost or stuck.
+        activity_rescan_seconds: When set, follow file activity with inotify
+                                 (see ActivityTracker) and only scan the
+                                 directory at startup, after missed events
+                                 and at least this often.
+        state_file_path: When set, the scanner's file states are restored from
+                         this file at startup and saved to it periodically.
+        state_save_interval_seconds: Minimum time between state saves.
+        adaptive_interval_bounds: When set, (min, max) seconds between which
+                                  the scan interval adapts to the directory's
+                                  activity (see AdaptiveScanInterval), starting
+                                  from scan_interval_seconds.
+        cadence_factors: When set, (lost, stuck) multiples of the learned app
+                         file cadence that replace the lost and stuck
+                         timeouts (see CadenceThresholds).
+        app_overrun_factor: When set, apps that go this many of their own
+                            cadences without a new file get a restart
+                            trigger (see AppHealthMonitor).
+        open_writer_producers: When set, (process names, user ids) of the
+                               producers; settled files none of them has
+                               open for writing (see ProcOpenWriters) are
+                               lost without waiting for the lost timeout.
+                               Both empty means every process.
 
     Returns:
         A configured but not started ScanThread instance.
@@ -75,6 +128,43 @@ def create_scan_thread(
         dir_label="CSV restart directory",
     )
 
+    activity_tracker: Optional[ActivityTracker] = None
+    if activity_rescan_seconds is not None:
+        # Has its own stop event: the ScanThread stops it when it exits
+        activity_tracker = ActivityTracker(
+            directory=validated_scan_directory,
+            extension_no_dot=file_extension_to_scan,
+            fs=fs,
+            stop_event=threading.Event(),
+            rescan_interval=activity_rescan_seconds,
+            time_func=time_func,
+            monotonic_func=monotonic_func,
+        )
+
+    cadence_index = AppCadenceIndex()
+    cadence_thresholds: Optional[CadenceThresholds] = None
+    if cadence_factors is not None:
+        lost_factor, stuck_factor = cadence_factors
+        cadence_thresholds = CadenceThresholds(
+            index=cadence_index,
+            lost_factor=lost_factor,
+            stuck_factor=stuck_factor,
+        )
+    app_health: Optional[AppHealthMonitor] = None
+    if app_overrun_factor is not None:
+        app_health = AppHealthMonitor(
+            index=cadence_index, overrun_factor=app_overrun_factor
+        )
+
+    open_writers: Optional[ProcOpenWriters] = None
+    if open_writer_producers is not None:
+        process_names, user_ids = open_writer_producers
+        open_writers = ProcOpenWriters(
+            directory=validated_scan_directory,
+            process_names=process_names,
+            user_ids=user_ids,
+        )
+
     # 2. Create the single-cycle processor
     processor = DoSingleCycle(
         validated_directory_to_scan=validated_scan_directory,
@@ -86,8 +176,34 @@ def create_scan_thread(
         time_func=time_func,
         monotonic_func=monotonic_func,
         fs=fs,
+        claim_registry=claim_registry,
+        fast_scan=fast_scan,
+        activity_tracker=activity_tracker,
+        cadence_thresholds=cadence_thresholds,
+        app_health=app_health,
+        open_writers=open_writers,
+        manifest_index=manifest_index,
     )
 
+    state_store: Optional[ScannerStateStore] = None
+    if state_file_path is not None:
+        state_store = ScannerStateStore(
+            state_path=state_file_path,
+            directory=validated_scan_directory,
+            fs=fs,
+            time_func=time_func,
+            monotonic_func=monotonic_func,
+        )
+
+    interval_policy: Optional[AdaptiveScanInterval] = None
+    if adaptive_interval_bounds is not None:
+        min_seconds, max_seconds = adaptive_interval_bounds
+        interval_policy = AdaptiveScanInterval(
+            min_seconds=min_seconds,
+            max_seconds=max_seconds,
+            initial_seconds=scan_interval_seconds,
+        )
+
     # 3. Choose sleep function (Step 5 in original code)
     actual_sleep_func = time.sleep if sleep_func is None else sleep_func
 
@@ -100,6 +216,160 @@ def create_scan_thread(
         sleep_func=actual_sleep_func,
         monotonic_func=monotonic_func,
         name=thread_name,
+        wake_for_deadlines=wake_for_deadlines,
+        state_store=state_store,
+        state_save_interval_seconds=state_save_interval_seconds,
+        interval_policy=interval_policy,
     )
 
     return scan_thread
+
+
+def create_sharded_scan_thread(
+    *,
+    scan_directory_paths: list[Path],
+    max_workers: int,
+    csv_directory_to_put_restart_in: Path,
+    file_extension_to_scan: str,
+    scan_interval_seconds: float,
+    lost_timeout_seconds: float,
+    stuck_active_file_timeout_seconds: float,
+    lost_file_queue: Queue[Path],
+    stop_event: threading.Event,
+    fs: FS,
+    time_func: Callable[[], float] = time.time,
+    monotonic_func: Callable[[], float] = time.monotonic,
+    claim_registry: Optional[ClaimRegistry] = None,
+    manifest_index: Optional[ManifestIndex] = None,
+    fast_scan: bool = False,
+    wake_for_deadlines: bool = False,
+    activity_rescan_seconds: Optional[float] = None,
+    state_file_path: Optional[Path] = None,
+    state_save_interval_seconds: float = 60.0,
+    adaptive_interval_bounds: Optional[tuple[float, float]] = None,
+    cadence_factors: Optional[tuple[float, float]] = None,
+    app_overrun_factor: Optional[float] = None,
+    open_writer_producers: Optional[tuple[tuple[str, ...], tuple[int, ...]]] = None,
+) -> ShardedScanThread:
+    """
+    Factory function to create a ShardedScanThread over several directories.
+
+    Each directory gets its own ScanThread from create_scan_thread (so its
+    own file states, timeouts and activity tracker), all putting lost files
+    on lost_file_queue. The first directory saves its state to
+    state_file_path; the others to the same name with '.<n>' appended.
+
+    Args:
+        scan_directory_paths: The directories to scan; at least one.
+        max_workers: Number of directories scanned at the same time.
+        state_file_path: When set, state file of the first directory.
+        (The remaining arguments are as for create_scan_thread and apply to
+        every directory.)
+
+    Returns:
+        A configured but not started ShardedScanThread instance.
+
+    Raises:
+        FileNotFoundError, NotADirectoryError, ValueError: If directory
+            validation fails for any directory, or no directory is given.
+    """
+    scanners: list[ScanThread] = []
+    for index, scan_directory_path in enumerate(scan_directory_paths):
+        shard_state_path: Optional[Path] = None
+        if state_file_path is not None:
+            shard_state_path = (
+                state_file_path
+                if index == 0
+                else state_file_path.with_name(f"{state_file_path.name}.{index}")
+            )
+        scanners.append(
+            create_scan_thread(
+                scan_directory_path=scan_directory_path,
+                csv_directory_to_put_restart_in=csv_directory_to_put_restart_in,
+                file_extension_to_scan=file_extension_to_scan,
+                scan_interval_seconds=scan_interval_seconds,
+                lost_timeout_seconds=lost_timeout_seconds,
+                stuck_active_file_timeout_seconds=stuck_active_file_timeout_seconds,
+                lost_file_queue=lost_file_queue,
+                stop_event=stop_event,
+                fs=fs,
+                time_func=time_func,
+                monotonic_func=monotonic_func,
+                claim_registry=claim_registry,
+                manifest_index=manifest_index,
+                fast_scan=fast_scan,
+                wake_for_deadlines=wake_for_deadlines,
+                activity_rescan_seconds=activity_rescan_seconds,
+                state_file_path=shard_state_path,
+                state_save_interval_seconds=state_save_interval_seconds,
+                adaptive_interval_bounds=adaptive_interval_bounds,
+                cadence_factors=cadence_factors,
+                app_overrun_factor=app_overrun_factor,
+                open_writer_producers=open_writer_producers,
+            )
+        )
+
+    return ShardedScanThread(
+        scanners=scanners,
+        stop_event=stop_event,
+        scan_interval_seconds=scan_interval_seconds,
+        monotonic_func=monotonic_func,
+        max_workers=max_workers,
+    )
+
+
+def create_close_write_trigger_thread(
+    *,
+    scan_directory_path: Path,
+    file_extension_to_scan: str,
+    settle_seconds: float,
+    move_queue: Queue[Path],
+    stop_event: threading.Event,
+    fs: FS,
+    claim_registry: Optional[ClaimRegistry],
+    manifest_index: Optional[ManifestIndex] = None,
+) -> CloseWriteTriggerThread:
+    """
+    Factory function to create a CloseWriteTriggerThread for the source directory.
+
+    Args:
+        scan_directory_path: The source directory to watch for closed pcaps.
+        file_extension_to_scan: The file extension (without dot) to trigger on.
+        settle_seconds: How long a closed file must keep its size before it
+                        is enqueued.
+        move_queue: Queue that closed files are put on.
+        stop_event: Event to signal the thread (and its observer) to stop.
+        fs: Filesystem abstraction instance.
+        claim_registry: Shared registry that stops a file being enqueued by
+                        both this trigger and the tailer.
+        manifest_index: Announcements tailed from the manifest, if indexed;
+                        files it knows are left to the tailer.
+
+    Returns:
+        A configured but not started CloseWriteTriggerThread instance.
+
+    Raises:
+        FileNotFoundError, NotADirectoryError, ValueError: If directory validation fails.
+    """
+    validated_scan_directory: Path = resolve_and_validate_directory(
+        raw_path=scan_directory_path,
+        fs=fs,
+        dir_label="close-write trigger source directory",
+    )
+    thread = CloseWriteTriggerThread(
+        watched_directory=validated_scan_directory,
+        file_extension_no_dot=file_extension_to_scan,
+        move_queue=move_queue,
+        stop_event=stop_event,
+        fs=fs,
+        settle_seconds=settle_seconds,
+        claim_registry=claim_registry,
+        manifest_index=manifest_index,
+    )
+    logger.info(
+        "CloseWriteTriggerThread '%s' configured for '%s' (settle %.1fs).",
+        thread.name,
+        validated_scan_directory,
+        settle_seconds,
+    )
+    return thread
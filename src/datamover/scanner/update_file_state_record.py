@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Mapping
 from pathlib import Path
 
 from datamover.file_functions.gather_entry_data import GatheredEntryData
@@ -8,7 +9,7 @@ logger = logging.getLogger(__name__)
 
 
 def update_file_state_record(
-    existing_file_states: dict[Path, FileStateRecord],
+    existing_file_states: Mapping[Path, FileStateRecord],
     gathered_data: list[GatheredEntryData],
     monotonic_time_now: float,
 ) -> tuple[dict[Path, FileStateRecord], set[Path]]:
@@ -2,8 +2,13 @@ import threading
 from typing import Optional
 
 # Import concrete default implementations
+from datamover.file_functions.cross_device_move import (
+    CrossDeviceMover,
+    with_cross_device_moves,
+)
 from datamover.file_functions.fs_mock import FS as DefaultFSImplementation
 from datamover.file_functions.scan_directory_and_filter import (
+    fast_scan_directory_and_filter,
     scan_directory_and_filter as default_file_scanner_implementation,
 )
 from datamover.protocols import FS, HttpClient, FileScanner  # For type hinting
@@ -56,6 +61,14 @@ def build_context(
     fs_instance: FS = (
         fs_override if fs_override is not None else DefaultFSImplementation()
     )
+    if fs_override is None and config.tiered_storage_enabled:
+        # Renames that fail with EXDEV fall back to a kernel-side copy
+        fs_instance = with_cross_device_moves(
+            fs_instance,
+            CrossDeviceMover(
+                max_concurrent_copies=config.cross_device_max_concurrent_copies
+            ),
+        )
 
     http_client_instance: HttpClient = (
         http_client_override
@@ -68,6 +81,9 @@ def build_context(
         if file_scanner_override is not None
         else default_file_scanner_implementation
     )
+    if file_scanner_override is None and config.fast_scan_enabled:
+        # Directory resolved once per scan rather than once per file
+        file_scanner_instance = fast_scan_directory_and_filter
 
     return AppContext(
         config=config,
@@ -1,10 +1,11 @@
+import pwd
 from configparser import (
     ConfigParser,
     MissingSectionHeaderError,
     ParsingError,
     NoOptionError,
 )
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Optional, Union
 
@@ -61,6 +62,57 @@ class Config:
     initial_backoff: float
     max_backoff: float
 
+    # Optional settings - these default to the original behaviour when absent
+
+    # From [Mover]
+    fused_upload_enabled: bool = False
+    noreplace_move_enabled: bool = False
+    mover_worker_count: int = 1
+    duplicate_suppression_ttl_seconds: float = 0.0
+    mover_batch_size: int = 1
+    move_queue_spill_enabled: bool = False
+    move_journal_enabled: bool = False
+    move_retry_max_attempts: int = 0
+    move_retry_initial_delay_seconds: float = 1.0
+    move_retry_max_delay_seconds: float = 30.0
+
+    # From [Scanner]
+    close_write_trigger_enabled: bool = False
+    close_write_settle_seconds: float = 2.0
+    deadline_wake_enabled: bool = False
+    activity_tracking_enabled: bool = False
+    activity_rescan_seconds: float = 300.0
+    scanner_state_enabled: bool = False
+    scanner_state_save_seconds: float = 60.0
+    scanner_workers: int = 4
+    adaptive_interval_enabled: bool = False
+    scanner_min_check_seconds: float = 1.0
+    scanner_max_check_seconds: float = 60.0
+    cadence_thresholds_enabled: bool = False
+    cadence_lost_factor: float = 2.0
+    cadence_stuck_factor: float = 4.0
+    app_health_enabled: bool = False
+    app_overrun_factor: float = 3.0
+    open_writer_check_enabled: bool = False
+    open_writer_process_names: tuple[str, ...] = ()
+    open_writer_user_ids: tuple[int, ...] = ()
+    manifest_reconciliation_enabled: bool = False
+    manifest_index_max_entries: int = 100000
+    manifest_index_ttl_seconds: float = 3600.0
+
+    # From [Tailer]
+    modify_coalescing_enabled: bool = False
+    fd_cache_max_open: int = 0
+
+    # From [Directories]
+    tiered_storage_enabled: bool = False
+    cross_device_max_concurrent_copies: int = 2
+    extra_base_dirs: tuple[Path, ...] = ()
+    extra_source_dirs: tuple[Path, ...] = ()
+
+    # From [Files]
+    fast_scan_enabled: bool = False
+
     def __post_init__(self):
         # Perform validations that depend on multiple fields
         if self.stuck_active_file_timeout_seconds <= self.lost_timeout_seconds:
@@ -71,6 +123,31 @@ class Config:
             raise ConfigError("[Uploader] max_backoff must be >= initial_backoff")
 
 
+def volume_configs(config: Config) -> list[Config]:
+    """
+    Returns one Config per volume: config itself, then a copy for each of
+    its extra_base_dirs with every directory derived from that base
+    instead. All other settings are shared, except extra_source_dirs, which
+    only belong to the first volume.
+    """
+    volumes = [config]
+    for base in config.extra_base_dirs:
+        volumes.append(
+            replace(
+                config,
+                base_dir=base,
+                source_dir=base / "source",
+                worker_dir=base / "worker",
+                uploaded_dir=base / "uploaded",
+                dead_letter_dir=base / "dead_letter",
+                csv_dir=base / "csv",
+                extra_base_dirs=(),
+                extra_source_dirs=(),
+            )
+        )
+    return volumes
+
+
 # Helper functions for parsing options
 def _get_string_option(
     cp: ConfigParser, section: str, option: str, allow_empty: bool = False
@@ -89,8 +166,11 @@ def _get_int_option(
     option: str,
     min_value: Optional[int] = None,
     max_value: Optional[int] = None,
+    fallback: Optional[int] = None,
 ) -> int:
     if not cp.has_option(section, option):
+        if fallback is not None:
+            return fallback
         raise ConfigError(f"[{section}] missing option '{option}'")
     raw_value = cp.get(section, option)
     try:
@@ -114,8 +194,11 @@ def _get_float_option(
     option: str,
     min_value: Optional[float] = None,
     max_value: Optional[float] = None,
+    fallback: Optional[float] = None,
 ) -> float:
     if not cp.has_option(section, option):
+        if fallback is not None:
+            return fallback
         raise ConfigError(f"[{section}] missing option '{option}'")
     raw_value = cp.get(section, option)
     try:
@@ -133,8 +216,12 @@ def _get_float_option(
         raise ConfigError(f"[{section}] '{option}' ('{raw_value}') must be a float")
 
 
-def _get_boolean_option(cp: ConfigParser, section: str, option: str) -> bool:
+def _get_boolean_option(
+    cp: ConfigParser, section: str, option: str, fallback: Optional[bool] = None
+) -> bool:
     if not cp.has_option(section, option):
+        if fallback is not None:
+            return fallback
         raise ConfigError(f"[{section}] missing option '{option}'")
     raw_value = cp.get(section, option)
     try:
@@ -190,6 +277,55 @@ def _parse_directories_config(
     return base, logger_dir, source, worker, uploaded, dead_letter, csv_dir
 
 
+def _parse_tiered_storage_config(cp: ConfigParser) -> tuple[bool, int]:
+    enabled = _get_boolean_option(
+        cp, "Directories", "tiered_storage_enabled", fallback=False
+    )
+    max_copies = _get_int_option(
+        cp,
+        "Directories",
+        "cross_device_max_concurrent_copies",
+        min_value=1,
+        max_value=16,
+        fallback=2,
+    )
+    return enabled, max_copies
+
+
+def _parse_extra_dirs(
+    cp: ConfigParser, fs: FS, option: str, taken: Path, taken_label: str
+) -> tuple[Path, ...]:
+    if not cp.has_option("Directories", option):
+        return ()
+    raw = cp.get("Directories", option)
+    extra: list[Path] = []
+    for entry in raw.replace(",", "\n").splitlines():
+        if not entry.strip():
+            continue
+        expanded = Path(entry.strip()).expanduser()
+        try:
+            resolved = fs.resolve(expanded, strict=False)
+        except OSError as e:
+            raise ConfigError(f"Cannot resolve {option} entry '{expanded}': {e}") from e
+        if resolved == taken or resolved in extra:
+            raise ConfigError(
+                f"[Directories] {option} entry '{resolved}' is listed twice "
+                f"(or is {taken_label})."
+            )
+        extra.append(resolved)
+    return tuple(extra)
+
+
+def _parse_extra_base_dirs(cp: ConfigParser, fs: FS, base: Path) -> tuple[Path, ...]:
+    return _parse_extra_dirs(cp, fs, "extra_base_dirs", base, "base_dir")
+
+
+def _parse_extra_source_dirs(
+    cp: ConfigParser, fs: FS, source: Path
+) -> tuple[Path, ...]:
+    return _parse_extra_dirs(cp, fs, "extra_source_dirs", source, "the source dir")
+
+
 def _parse_files_section_config(cp: ConfigParser) -> tuple[str, str]:
     pcap_ext = _get_string_option(cp, "Files", "pcap_extension_no_dot")
     csv_ext = _get_string_option(cp, "Files", "csv_extension_no_dot")
@@ -204,11 +340,56 @@ def _parse_files_section_config(cp: ConfigParser) -> tuple[str, str]:
     return pcap_ext, csv_ext
 
 
-def _parse_mover_config(cp: ConfigParser) -> float:
+def _parse_fast_scan_config(cp: ConfigParser) -> bool:
+    return _get_boolean_option(cp, "Files", "fast_scan_enabled", fallback=False)
+
+
+def _parse_mover_config(
+    cp: ConfigParser,
+) -> tuple[float, bool, bool, int, float, int, bool, bool]:
     interval = _get_float_option(
         cp, "Mover", "move_poll_interval_seconds", min_value=0.0
     )
-    return interval
+    fused_upload = _get_boolean_option(
+        cp, "Mover", "fused_upload_enabled", fallback=False
+    )
+    noreplace_move = _get_boolean_option(
+        cp, "Mover", "noreplace_move_enabled", fallback=False
+    )
+    worker_count = _get_int_option(
+        cp, "Mover", "mover_worker_count", min_value=1, max_value=64, fallback=1
+    )
+    duplicate_ttl = _get_float_option(
+        cp, "Mover", "duplicate_suppression_ttl_seconds", min_value=0.0, fallback=0.0
+    )
+    batch_size = _get_int_option(
+        cp, "Mover", "mover_batch_size", min_value=1, max_value=1024, fallback=1
+    )
+    spill = _get_boolean_option(cp, "Mover", "move_queue_spill_enabled", fallback=False)
+    journal = _get_boolean_option(cp, "Mover", "move_journal_enabled", fallback=False)
+    return (
+        interval,
+        fused_upload,
+        noreplace_move,
+        worker_count,
+        duplicate_ttl,
+        batch_size,
+        spill,
+        journal,
+    )
+
+
+def _parse_move_retry_config(cp: ConfigParser) -> tuple[int, float, float]:
+    max_attempts = _get_int_option(
+        cp, "Mover", "move_retry_max_attempts", min_value=0, max_value=100, fallback=0
+    )
+    initial_delay = _get_float_option(
+        cp, "Mover", "move_retry_initial_delay_seconds", min_value=0.0, fallback=1.0
+    )
+    max_delay = _get_float_option(
+        cp, "Mover", "move_retry_max_delay_seconds", min_value=0.0, fallback=30.0
+    )
+    return max_attempts, initial_delay, max_delay
 
 
 def _parse_scanner_config(
@@ -226,6 +407,127 @@ def _parse_scanner_config(
     return scan_check_s, lost_timeout_s, stuck_active_s
 
 
+def _parse_close_write_config(cp: ConfigParser) -> tuple[bool, float]:
+    enabled = _get_boolean_option(
+        cp, "Scanner", "close_write_trigger_enabled", fallback=False
+    )
+    settle_s = _get_float_option(
+        cp, "Scanner", "close_write_settle_seconds", min_value=0.0, fallback=2.0
+    )
+    return enabled, settle_s
+
+
+def _parse_deadline_wake_config(cp: ConfigParser) -> bool:
+    return _get_boolean_option(cp, "Scanner", "deadline_wake_enabled", fallback=False)
+
+
+def _parse_activity_tracking_config(cp: ConfigParser) -> tuple[bool, float]:
+    enabled = _get_boolean_option(
+        cp, "Scanner", "activity_tracking_enabled", fallback=False
+    )
+    rescan_s = _get_float_option(
+        cp, "Scanner", "activity_rescan_seconds", min_value=1.0, fallback=300.0
+    )
+    return enabled, rescan_s
+
+
+def _parse_scanner_state_config(cp: ConfigParser) -> tuple[bool, float]:
+    enabled = _get_boolean_option(
+        cp, "Scanner", "scanner_state_enabled", fallback=False
+    )
+    save_s = _get_float_option(
+        cp, "Scanner", "scanner_state_save_seconds", min_value=1.0, fallback=60.0
+    )
+    return enabled, save_s
+
+
+def _parse_scanner_workers_config(cp: ConfigParser) -> int:
+    return _get_int_option(
+        cp, "Scanner", "scanner_workers", min_value=1, max_value=64, fallback=4
+    )
+
+
+def _parse_adaptive_interval_config(cp: ConfigParser) -> tuple[bool, float, float]:
+    enabled = _get_boolean_option(
+        cp, "Scanner", "adaptive_interval_enabled", fallback=False
+    )
+    min_s = _get_float_option(
+        cp, "Scanner", "scanner_min_check_seconds", min_value=0.1, fallback=1.0
+    )
+    max_s = _get_float_option(
+        cp, "Scanner", "scanner_max_check_seconds", min_value=0.1, fallback=60.0
+    )
+    if max_s < min_s:
+        raise ConfigError(
+            "[Scanner] scanner_max_check_seconds must be >= scanner_min_check_seconds"
+        )
+    return enabled, min_s, max_s
+
+
+def _parse_cadence_thresholds_config(cp: ConfigParser) -> tuple[bool, float, float]:
+    enabled = _get_boolean_option(
+        cp, "Scanner", "cadence_thresholds_enabled", fallback=False
+    )
+    lost_factor = _get_float_option(
+        cp, "Scanner", "cadence_lost_factor", min_value=0.1, fallback=2.0
+    )
+    stuck_factor = _get_float_option(
+        cp, "Scanner", "cadence_stuck_factor", min_value=0.1, fallback=4.0
+    )
+    if stuck_factor <= lost_factor:
+        raise ConfigError(
+            "[Scanner] cadence_stuck_factor must be greater than cadence_lost_factor"
+        )
+    return enabled, lost_factor, stuck_factor
+
+
+def _parse_app_health_config(cp: ConfigParser) -> tuple[bool, float]:
+    enabled = _get_boolean_option(cp, "Scanner", "app_health_enabled", fallback=False)
+    overrun_factor = _get_float_option(
+        cp, "Scanner", "app_overrun_factor", min_value=0.1, fallback=3.0
+    )
+    if overrun_factor <= 1:
+        raise ConfigError("[Scanner] app_overrun_factor must be greater than 1")
+    return enabled, overrun_factor
+
+
+def _parse_user_id(name: str) -> int:
+    if name.isdigit():
+        return int(name)
+    try:
+        return pwd.getpwnam(name).pw_uid
+    except KeyError:
+        raise ConfigError(
+            f"[Scanner] open_writer_users: unknown user '{name}'"
+        ) from None
+
+
+def _parse_open_writer_config(
+    cp: ConfigParser,
+) -> tuple[bool, tuple[str, ...], tuple[int, ...]]:
+    enabled = _get_boolean_option(
+        cp, "Scanner", "open_writer_check_enabled", fallback=False
+    )
+    names = cp.get("Scanner", "open_writer_process_names", fallback="")
+    users = cp.get("Scanner", "open_writer_users", fallback="")
+    process_names = tuple(n.strip() for n in names.split(",") if n.strip())
+    user_ids = tuple(_parse_user_id(u.strip()) for u in users.split(",") if u.strip())
+    return enabled, process_names, user_ids
+
+
+def _parse_manifest_reconciliation_config(cp: ConfigParser) -> tuple[bool, int, float]:
+    enabled = _get_boolean_option(
+        cp, "Scanner", "manifest_reconciliation_enabled", fallback=False
+    )
+    max_entries = _get_int_option(
+        cp, "Scanner", "manifest_index_max_entries", min_value=1, fallback=100000
+    )
+    ttl_s = _get_float_option(
+        cp, "Scanner", "manifest_index_ttl_seconds", min_value=1.0, fallback=3600.0
+    )
+    return enabled, max_entries, ttl_s
+
+
 def _parse_tailer_config(cp: ConfigParser) -> float:
     poll_timeout = _get_float_option(
         cp, "Tailer", "event_queue_poll_timeout_seconds", min_value=0.0
@@ -233,6 +535,16 @@ def _parse_tailer_config(cp: ConfigParser) -> float:
     return poll_timeout
 
 
+def _parse_modify_coalescing_config(cp: ConfigParser) -> bool:
+    return _get_boolean_option(
+        cp, "Tailer", "modify_coalescing_enabled", fallback=False
+    )
+
+
+def _parse_fd_cache_config(cp: ConfigParser) -> int:
+    return _get_int_option(cp, "Tailer", "fd_cache_max_open", min_value=0, fallback=0)
+
+
 def _parse_purger_config(cp: ConfigParser) -> tuple[float, float, int]:
     poll_interval = _get_float_option(
         cp, "Purger", "purger_poll_interval_seconds", min_value=0.0
@@ -326,10 +638,44 @@ def load_config(path: Union[str, Path], fs: FS = FS()) -> Config:
         base_d, logger_d, source_d, worker_d, uploaded_d, dead_letter_d, csv_d = (
             _parse_directories_config(cp, fs)
         )
+        extra_bases = _parse_extra_base_dirs(cp, fs, base_d)
+        extra_sources = _parse_extra_source_dirs(cp, fs, source_d)
         pcap_ext, csv_ext = _parse_files_section_config(cp)
-        move_poll = _parse_mover_config(cp)
+        fast_scan = _parse_fast_scan_config(cp)
+        (
+            move_poll,
+            fused_upload,
+            noreplace_move,
+            mover_workers,
+            duplicate_ttl,
+            mover_batch,
+            move_queue_spill,
+            move_journal,
+        ) = _parse_mover_config(cp)
+        retry_attempts, retry_initial, retry_max = _parse_move_retry_config(cp)
         scan_check, lost_timeout, stuck_active = _parse_scanner_config(cp)
+        close_write_enabled, close_write_settle = _parse_close_write_config(cp)
+        deadline_wake = _parse_deadline_wake_config(cp)
+        activity_enabled, activity_rescan = _parse_activity_tracking_config(cp)
+        state_enabled, state_save = _parse_scanner_state_config(cp)
+        scanner_workers = _parse_scanner_workers_config(cp)
+        adaptive_enabled, adaptive_min, adaptive_max = _parse_adaptive_interval_config(
+            cp
+        )
+        cadence_enabled, cadence_lost, cadence_stuck = _parse_cadence_thresholds_config(
+            cp
+        )
+        app_health_enabled, app_overrun_factor = _parse_app_health_config(cp)
+        open_writer_enabled, open_writer_names, open_writer_uids = (
+            _parse_open_writer_config(cp)
+        )
+        manifest_enabled, manifest_max_entries, manifest_ttl = (
+            _parse_manifest_reconciliation_config(cp)
+        )
+        tiered_enabled, tiered_max_copies = _parse_tiered_storage_config(cp)
         event_queue_poll = _parse_tailer_config(cp)
+        modify_coalescing = _parse_modify_coalescing_config(cp)
+        fd_cache_max_open = _parse_fd_cache_config(cp)
         (
             uploader_poll,
             heartbeat,
@@ -381,6 +727,45 @@ def load_config(path: Union[str, Path], fs: FS = FS()) -> Config:
             purger_poll_interval_seconds=purger_poll_val,
             target_disk_usage_percent=target_disk_usage_val,
             total_disk_capacity_bytes=total_disk_capacity_val,
+            fused_upload_enabled=fused_upload,
+            noreplace_move_enabled=noreplace_move,
+            mover_worker_count=mover_workers,
+            duplicate_suppression_ttl_seconds=duplicate_ttl,
+            mover_batch_size=mover_batch,
+            move_queue_spill_enabled=move_queue_spill,
+            move_journal_enabled=move_journal,
+            move_retry_max_attempts=retry_attempts,
+            move_retry_initial_delay_seconds=retry_initial,
+            move_retry_max_delay_seconds=retry_max,
+            close_write_trigger_enabled=close_write_enabled,
+            close_write_settle_seconds=close_write_settle,
+            deadline_wake_enabled=deadline_wake,
+            activity_tracking_enabled=activity_enabled,
+            activity_rescan_seconds=activity_rescan,
+            scanner_state_enabled=state_enabled,
+            scanner_state_save_seconds=state_save,
+            scanner_workers=scanner_workers,
+            adaptive_interval_enabled=adaptive_enabled,
+            scanner_min_check_seconds=adaptive_min,
+            scanner_max_check_seconds=adaptive_max,
+            cadence_thresholds_enabled=cadence_enabled,
+            cadence_lost_factor=cadence_lost,
+            cadence_stuck_factor=cadence_stuck,
+            app_health_enabled=app_health_enabled,
+            app_overrun_factor=app_overrun_factor,
+            open_writer_check_enabled=open_writer_enabled,
+            open_writer_process_names=open_writer_names,
+            open_writer_user_ids=open_writer_uids,
+            manifest_reconciliation_enabled=manifest_enabled,
+            manifest_index_max_entries=manifest_max_entries,
+            manifest_index_ttl_seconds=manifest_ttl,
+            modify_coalescing_enabled=modify_coalescing,
+            fd_cache_max_open=fd_cache_max_open,
+            tiered_storage_enabled=tiered_enabled,
+            cross_device_max_concurrent_copies=tiered_max_copies,
+            extra_base_dirs=extra_bases,
+            extra_source_dirs=extra_sources,
+            fast_scan_enabled=fast_scan,
         )
     except ConfigError:  # Catches errors from __post_init__
         raise
@@ -0,0 +1,139 @@
+import logging
+import os
+from collections import OrderedDict
+from contextlib import ExitStack
+from dataclasses import dataclass
+from pathlib import Path
+
+from datamover.file_functions.fs_mock import FS
+
+logger = logging.getLogger(__name__)
+
+
+class FileReplacedError(Exception):
+    """A tracked path now names a different file (device, inode) than before."""
+
+    def __init__(self, path: Path, st: os.stat_result):
+        super().__init__(f"File replaced: {path}")
+        self.path = path
+        self.stat_result = st
+
+
+@dataclass(frozen=True)
+class _OpenFile:
+    fd: int
+    closer: ExitStack  # Closes the file object the FS opened
+    identity: tuple[int, int]  # (st_dev, st_ino)
+
+
+class TailFileCache:
+    """
+    Keeps the tracked CSVs open so the TailProcessor can read an append with
+    an fstat and a pread on a descriptor it already holds, instead of
+    stat/open/seek/read/close by path for every modified event.
+
+    At most `max_open` descriptors are held; the least recently read is
+    closed first and reopened by path when needed. The (device, inode) each
+    path was opened on is remembered until forget(), so a file replaced
+    under its name (a reopen that finds a different inode, or an open
+    descriptor whose file has been unlinked) is reported instead of being
+    read from the old offset. Delete and move events must call forget().
+
+    Files are opened through the injected FS; the fstat and pread calls on
+    the held descriptors go to os directly, as FS has no descriptor-level
+    operations.
+
+    Used from the tailer consumer thread only; not thread-safe.
+    """
+
+    def __init__(self, *, max_open: int, fs: FS):
+        """
+        Args:
+            max_open: Most descriptors held open at once.
+            fs: Filesystem abstraction used to open the files.
+
+        Raises:
+            ValueError: If max_open is less than 1.
+        """
+        if max_open < 1:
+            raise ValueError(f"max_open must be at least 1, got {max_open}")
+        self.max_open = max_open
+        self._fs = fs
+        self._open: OrderedDict[Path, _OpenFile] = OrderedDict()  # LRU first
+        self._identities: dict[Path, tuple[int, int]] = {}
+
+    def stat(self, path: Path) -> os.stat_result:
+        """
+        Returns the current stat of the file tracked at path, opening it if
+        it is not held.
+
+        Raises:
+            FileNotFoundError: If the file is gone.
+            FileReplacedError: If path now names a different file; the new
+                               file is held from then on.
+            OSError: If the file cannot be opened or stat'ed.
+        """
+        entry = self._open.get(path)
+        if entry is not None:
+            self._open.move_to_end(path)
+            try:
+                st = os.fstat(entry.fd)
+            except OSError:
+                self._close(path)
+                raise
+            if st.st_nlink > 0:
+                return st
+            # Unlinked while held: whatever is at path now is another file
+            self._close(path)
+        return self._open_path(path)
+
+    def pread(self, path: Path, length: int, offset: int) -> bytes:
+        """Reads up to length bytes at offset from the descriptor held for path."""
+        entry = self._open.get(path)
+        if entry is None:
+            self.stat(path)
+            entry = self._open[path]
+        return os.pread(entry.fd, length, offset)
+
+    def forget(self, path: Path) -> None:
+        """Closes path's descriptor and forgets which file it was."""
+        self._close(path)
+        self._identities.pop(path, None)
+
+    def close_all(self) -> None:
+        for path in list(self._open):
+            self._close(path)
+
+    def __len__(self) -> int:
+        return len(self._open)
+
+    def _open_path(self, path: Path) -> os.stat_result:
+        closer = ExitStack()
+        try:
+            fd = closer.enter_context(self._fs.open(path, "rb")).fileno()
+            st = os.fstat(fd)
+        except OSError:
+            self._close_file(path, closer)
+            raise
+        identity = (st.st_dev, st.st_ino)
+        self._open[path] = _OpenFile(fd=fd, closer=closer, identity=identity)
+        while len(self._open) > self.max_open:
+            evicted, old = self._open.popitem(last=False)
+            self._close_file(evicted, old.closer)
+        previous = self._identities.get(path)
+        self._identities[path] = identity
+        if previous is not None and previous != identity:
+            raise FileReplacedError(path, st)
+        return st
+
+    def _close(self, path: Path) -> None:
+        entry = self._open.pop(path, None)
+        if entry is not None:
+            self._close_file(path, entry.closer)
+
+    @staticmethod
+    def _close_file(path: Path, closer: ExitStack) -> None:
+        try:
+            closer.close()
+        except OSError as e:
+            logger.debug("Error closing descriptor for %s: %s", path, e)
@@ -26,6 +26,7 @@ from datamover.tailer.data_class import (
     DeletedEvent,
     MovedEvent,
 )
+from datamover.tailer.modify_coalescer import ModifyCoalescer
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +38,9 @@ class MappingEventHandler(FileSystemEventHandler):
     Assumes watched_directory is pre-validated (absolute, resolved, exists, is a directory).
     Filters events for relevant files, maintains a map of known files, creates specific
     event dataclasses, and enqueues them.
+
+    With a ModifyCoalescer, a modify notification for a tracked file whose
+    ModifiedEvent is still queued is dropped before any filesystem call.
     """
 
     QUEUE_NAME = "MappingEventHandlerQueue"
@@ -49,12 +53,14 @@ class MappingEventHandler(FileSystemEventHandler):
         fs: FS,
         file_extension: str,
         queue_timeout: Optional[float] = None,
+        coalescer: Optional[ModifyCoalescer] = None,
     ) -> None:
         super().__init__()
         self.file_map: set[str] = file_map
         self.event_queue: Queue[TailerQueueEvent] = event_queue
         self.fs: FS = fs
         self.queue_timeout: Optional[float] = queue_timeout
+        self.coalescer: Optional[ModifyCoalescer] = coalescer
 
         # Watched directory is now assumed to be resolved and validated by the caller
         self.watched_directory: Path = watched_directory
@@ -71,7 +77,7 @@ class MappingEventHandler(FileSystemEventHandler):
             self.file_extension,
         )
 
-    def _safe_enqueue(self, event_object: TailerQueueEvent) -> None:
+    def _safe_enqueue(self, event_object: TailerQueueEvent) -> bool:
         try:
             safe_put(
                 item=event_object,
@@ -80,12 +86,14 @@ class MappingEventHandler(FileSystemEventHandler):
                 timeout=self.queue_timeout,
             )
             logger.debug("Enqueued event: %s", event_object)
+            return True
         except QueuePutError:
             logger.error(
                 "Failed to enqueue event from MappingEventHandler. Event object: %s. Queue: %s",
                 event_object,
                 self.QUEUE_NAME,
             )
+            return False
 
     def _is_path_within_monitored_directory(self, path_str: str) -> bool:
         try:
@@ -148,7 +156,15 @@ class MappingEventHandler(FileSystemEventHandler):
             logger.debug("Ignoring directory modification: %s", event.src_path)
             return
         src_path_str: str = fsdecode(event.src_path)
+        coalescer = self.coalescer
+        marked = False
+        if coalescer is not None and src_path_str in self.file_map:
+            if not coalescer.mark(src_path_str):
+                return  # Its ModifiedEvent is still queued and will read this too
+            marked = True
         if not self._should_process_file(src_path_str):
+            if marked and coalescer is not None:
+                coalescer.release(src_path_str)
             return
         if src_path_str not in self.file_map:
             logger.warning(
@@ -161,7 +177,9 @@ class MappingEventHandler(FileSystemEventHandler):
         else:
             logger.info("Detected relevant file modification: %s", src_path_str)
             modified_event_object = ModifiedEvent(path=src_path_str)
-            self._safe_enqueue(modified_event_object)
+            enqueued = self._safe_enqueue(modified_event_object)
+            if not enqueued and marked and coalescer is not None:
+                coalescer.release(src_path_str)
 
     def on_deleted(self, event: Union[FileDeletedEvent, DirDeletedEvent]) -> None:
         super().on_deleted(event)
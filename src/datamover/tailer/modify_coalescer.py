@@ -0,0 +1,79 @@
+import logging
+import threading
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CoalescingStats:
+    """Snapshot of the ModifyCoalescer counters."""
+
+    modified_events: int
+    enqueued: int
+
+    @property
+    def coalesced(self) -> int:
+        return self.modified_events - self.enqueued
+
+    @property
+    def ratio(self) -> float:
+        """Modify notifications per queued ModifiedEvent."""
+        return self.modified_events / self.enqueued if self.enqueued else 0.0
+
+
+class ModifyCoalescer:
+    """
+    Per-path dirty flags that fold bursts of modify notifications for a CSV
+    into one queued ModifiedEvent.
+
+    The MappingEventHandler marks a path for every modify notification and
+    only queues a ModifiedEvent when the path was not already pending. The
+    TailProcessor clears the flag just before it reads the file, so appends
+    made after that read start are marked (and queued) again and no data is
+    missed; everything appended before it is read in that one pass.
+
+    Shared between the observer thread and the tailer consumer thread; all
+    methods are thread-safe.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._pending: set[str] = set()
+        self._modified_events = 0
+        self._enqueued = 0
+
+    def mark(self, path: str) -> bool:
+        """
+        Records a modify notification for path.
+
+        Returns:
+            True if the caller should queue a ModifiedEvent, False if one is
+            already pending.
+        """
+        with self._lock:
+            self._modified_events += 1
+            if path in self._pending:
+                return False
+            self._pending.add(path)
+            self._enqueued += 1
+            return True
+
+    def release(self, path: str) -> None:
+        """Undoes a mark() whose ModifiedEvent was not queued after all."""
+        with self._lock:
+            if path in self._pending:
+                self._pending.discard(path)
+                self._enqueued -= 1
+
+    def clear(self, path: str) -> None:
+        """Marks path clean; called before its pending ModifiedEvent is handled."""
+        with self._lock:
+            self._pending.discard(path)
+
+    def stats(self) -> CoalescingStats:
+        """Returns a consistent snapshot of the counters."""
+        with self._lock:
+            return CoalescingStats(
+                modified_events=self._modified_events, enqueued=self._enqueued
+            )
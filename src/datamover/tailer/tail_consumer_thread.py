@@ -2,8 +2,10 @@ import logging
 import queue
 import threading
 import time
+from typing import Optional
 
 from datamover.tailer.data_class import TailerQueueEvent
+from datamover.tailer.modify_coalescer import ModifyCoalescer
 from datamover.tailer.tail_processor import TailProcessor
 
 logger = logging.getLogger(__name__)
@@ -23,6 +25,7 @@ class TailConsumerThread(threading.Thread):
         processor: TailProcessor,
         name: str,
         poll_interval: float,
+        coalescer: Optional[ModifyCoalescer] = None,
     ) -> None:
         super().__init__(daemon=True, name=name)
 
@@ -30,6 +33,7 @@ class TailConsumerThread(threading.Thread):
         self.stop_event: threading.Event = stop_event
         self.processor: TailProcessor = processor
         self.poll_interval: float = poll_interval
+        self.coalescer: Optional[ModifyCoalescer] = coalescer
 
         logger.debug(
             "%s initialized with poll_interval=%.2f s", self.name, self.poll_interval
@@ -73,6 +77,16 @@ class TailConsumerThread(threading.Thread):
                         event_object,
                         td_e,  # This is a warning, not exception, so include error string
                     )
+        self.processor.close()
+        if self.coalescer is not None:
+            stats = self.coalescer.stats()
+            logger.info(
+                "%s: %d modify notifications coalesced into %d reads (%.1f per read).",
+                self.name,
+                stats.modified_events,
+                stats.enqueued,
+                stats.ratio,
+            )
         logger.info("%s stopping.", self.name)
 
     def stop(self) -> None:
@@ -5,6 +5,10 @@ from queue import Queue
 from typing import Optional, IO
 
 from datamover.file_functions.fs_mock import FS
+from datamover.queues.claim_registry import ClaimRegistry
+from datamover.queues.manifest_index import ManifestIndex
+from datamover.tailer.fd_cache import FileReplacedError, TailFileCache
+from datamover.tailer.modify_coalescer import ModifyCoalescer
 from datamover.queues.queue_functions import QueuePutError, safe_put
 
 from datamover.tailer.data_class import (
@@ -38,6 +42,10 @@ class TailProcessor:
     4.  Truncation Handling: On shrink, reset tracked position to new (smaller)
         EOF, clear buffer, *do not read* existing content.
     5.  Move Handling: Treat as delete(source) + initial_track(destination).
+
+    With a TailFileCache, tracked files are kept open and appends are read
+    with fstat + pread on the held descriptor instead of through the FS
+    object; a file replaced under its name is tracked again at its EOF.
     """
 
     # Type annotations for the class attributes
@@ -55,6 +63,10 @@ class TailProcessor:
         move_queue: Queue[Path],
         move_queue_name: str,
         enqueuer: Optional[Callable[[Path], None]] = None,
+        claim_registry: Optional[ClaimRegistry] = None,
+        manifest_index: Optional[ManifestIndex] = None,
+        coalescer: Optional[ModifyCoalescer] = None,
+        fd_cache: Optional[TailFileCache] = None,
     ) -> None:
         """
         Initializes the TailProcessor.
@@ -68,10 +80,26 @@ class TailProcessor:
             enqueuer: An optional callable that takes a Path and enqueues it.
                       If None, a default enqueuer using `safe_put` with the
                       provided `move_queue` will be used.
+            claim_registry: Optional shared registry consulted by the default
+                            enqueuer, so paths already queued, in flight or
+                            recently moved are not enqueued again.
+            manifest_index: Optional shared index that every parsed line is
+                            recorded in before its target is enqueued, so
+                            the scanner can re-queue announced files whose
+                            request was lost.
+            coalescer: Optional dirty flags shared with the MappingEventHandler;
+                       a file's flag is cleared just before a ModifiedEvent
+                       reads it, so later appends queue a new event.
+            fd_cache: Optional cache of open descriptors used to stat and
+                      read tracked files.
         """
         self.fs = fs
         self.move_queue = move_queue
         self.move_queue_name = move_queue_name
+        self.claim_registry = claim_registry
+        self.manifest_index = manifest_index
+        self.coalescer = coalescer
+        self.fd_cache = fd_cache
 
         # inject or fall back to default
         self.enqueuer = enqueuer or self._default_enqueue
@@ -90,6 +118,8 @@ class TailProcessor:
         elif isinstance(event, CreatedEvent):
             self._handle_track(Path(event.path), "Created file")
         elif isinstance(event, ModifiedEvent):
+            if self.coalescer is not None:
+                self.coalescer.clear(event.path)
             self._handle_modified(Path(event.path))
         elif isinstance(event, DeletedEvent):
             self._handle_deleted(Path(event.path))
@@ -98,13 +128,34 @@ class TailProcessor:
         else:
             logger.warning("Unhandled event type: %s", type(event))
 
+    def close(self) -> None:
+        """Releases the descriptors held for tracked files, if any."""
+        if self.fd_cache is not None:
+            self.fd_cache.close_all()
+
     def _handle_track(self, path: Path, action: str) -> None:
         """On initial/fresh‐create: start tracking at EOF, no backfill."""
+        if self.fd_cache is not None:
+            self.fd_cache.forget(path)  # A new file, whatever was there before
+            try:
+                size: int = self.fd_cache.stat(path).st_size
+            except FileNotFoundError:
+                logger.debug("%s: file not found %s, not tracking.", action, path)
+                return
+            except OSError as e:
+                logger.warning(
+                    "Could not stat file [%s] on %s: %s. Not tracking.", path, action, e
+                )
+                return
+            self.file_positions[path] = size
+            self.file_buffers[path] = b""
+            logger.info("%s at EOF (%d bytes): %s", action, size, path)
+            return
         try:
             if not self.fs.exists(path):
                 logger.debug("%s: file not found %s, not tracking.", action, path)
                 return
-            size: int = self.fs.stat(path).st_size
+            size = self.fs.stat(path).st_size
         except OSError as e:
             logger.warning(
                 "Could not stat file [%s] on %s: %s. Not tracking.", path, action, e
@@ -117,20 +168,26 @@ class TailProcessor:
 
     def _handle_modified(self, path: Path) -> None:  # Implicitly returns None
         """On modifications: read only new bytes, handle truncation, skip no-ops."""
-        try:
-            if not self.fs.exists(path):
+        if self.fd_cache is not None:
+            cached_size: Optional[int] = self._cached_size(path)
+            if cached_size is None:
+                return
+            current_size: int = cached_size
+        else:
+            try:
+                if not self.fs.exists(path):
+                    logger.warning(
+                        "Modified event for non-existent file: %s. Treating as delete.",
+                        path,
+                    )
+                    self._handle_deleted(path)  # Ensure state cleanup
+                    return
+                current_size = self.fs.stat(path).st_size
+            except OSError as e:
                 logger.warning(
-                    "Modified event for non-existent file: %s. Treating as delete.",
-                    path,
+                    "Could not stat file [%s] for modified: %s. Aborting.", path, e
                 )
-                self._handle_deleted(path)  # Ensure state cleanup
                 return
-            current_size: int = self.fs.stat(path).st_size
-        except OSError as e:
-            logger.warning(
-                "Could not stat file [%s] for modified: %s. Aborting.", path, e
-            )
-            return
 
         last_pos: Optional[int] = self.file_positions.get(path)
         if last_pos is None:
@@ -160,10 +217,59 @@ class TailProcessor:
             self._process_new_lines(path, data)
         # No explicit return needed if all paths lead to None or another return
 
+    def _cached_size(self, path: Path) -> Optional[int]:
+        """
+        Size of path from its held descriptor, or None when the event needs
+        no read (the file is gone, was replaced or cannot be stat'ed).
+        """
+        assert self.fd_cache is not None
+        try:
+            return self.fd_cache.stat(path).st_size
+        except FileNotFoundError:
+            logger.warning(
+                "Modified event for non-existent file: %s. Treating as delete.",
+                path,
+            )
+            self._handle_deleted(path)  # Ensure state cleanup
+        except FileReplacedError as e:
+            if path in self.file_positions:
+                logger.warning(
+                    "File replaced, resetting to EOF (%d bytes): %s",
+                    e.stat_result.st_size,
+                    path,
+                )
+                self.file_positions[path] = e.stat_result.st_size
+                self.file_buffers[path] = b""
+            else:
+                return e.stat_result.st_size  # Untracked: late sync below
+        except OSError as e:
+            logger.warning(
+                "Could not stat file [%s] for modified: %s. Aborting.", path, e
+            )
+        return None
+
     def _read_appended_data(
         self, path: Path, last_pos: int, current_size: int
     ) -> bytes:
         """Seek to last_pos and read only the new bytes up to current_size."""
+        if self.fd_cache is not None:
+            try:
+                data: bytes = self.fd_cache.pread(
+                    path, current_size - last_pos, last_pos
+                )
+            except OSError as e:
+                logger.warning(
+                    "Error reading data from %s at pos %d: %s", path, last_pos, e
+                )
+                return b""
+            self.file_positions[path] = last_pos + len(data)
+            logger.debug(
+                "Read %d bytes from %s (requested %d)",
+                len(data),
+                path,
+                current_size - last_pos,
+            )
+            return data
         try:
             with self.fs.open(path, "rb") as f_obj:
                 f: IO[bytes] = f_obj
@@ -222,6 +328,12 @@ class TailProcessor:
                 # parse_log_line returns ParsedLine
                 parsed_item: ParsedLine = parse_log_line(raw_line_str)
                 target_file_path: Path = Path(parsed_item.filepath)
+                if self.manifest_index is not None:
+                    self.manifest_index.record(
+                        target_file_path,
+                        timestamp=parsed_item.timestamp,
+                        sha256_hash=parsed_item.sha256_hash,
+                    )
                 self.enqueuer(target_file_path)
             except QueuePutError as qe:
                 logger.error(
@@ -246,14 +358,25 @@ class TailProcessor:
         The one place we call into safe_put. If you need back-off,
         metrics, special logging, do it here — all other code stays clean.
         """
-        safe_put(
-            item=target,
-            output_queue=self.move_queue,
-            queue_name=self.move_queue_name,
-        )
+        if self.claim_registry is not None and not self.claim_registry.try_register(
+            target, source="tailer"
+        ):
+            return
+        try:
+            safe_put(
+                item=target,
+                output_queue=self.move_queue,
+                queue_name=self.move_queue_name,
+            )
+        except QueuePutError:
+            if self.claim_registry is not None:
+                self.claim_registry.release(target)
+            raise
 
     def _handle_deleted(self, path: Path) -> None:
         """Stop tracking any state for this file."""
+        if self.fd_cache is not None:
+            self.fd_cache.forget(path)
         pos: Optional[int] = self.file_positions.pop(path, None)
         buf: Optional[bytes] = self.file_buffers.pop(path, None)
         if (
@@ -273,6 +396,8 @@ class TailProcessor:
         Treat a move as delete(src) + track(dst at EOF).
         """
         logger.info("File moved from %s to %s", src, dst)
+        if self.fd_cache is not None:
+            self.fd_cache.forget(src)
         src_pos: Optional[int] = self.file_positions.pop(src, None)
         src_buf: Optional[bytes] = self.file_buffers.pop(src, None)
         if src_pos is not None or src_buf is not None:
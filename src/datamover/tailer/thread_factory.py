@@ -2,6 +2,7 @@ import logging
 import threading
 from pathlib import Path
 from queue import Queue
+from typing import Optional
 
 from watchdog.observers import Observer
 from watchdog.observers.api import BaseObserver
@@ -10,10 +11,14 @@ from datamover.file_functions.file_exceptions import ScanDirectoryError
 from datamover.file_functions.fs_mock import FS
 from datamover.file_functions.gather_entry_data import GatheredEntryData
 from datamover.protocols import FileScanner
+from datamover.queues.claim_registry import ClaimRegistry
+from datamover.queues.manifest_index import ManifestIndex
 from datamover.queues.queue_functions import safe_put, QueuePutError
 
 from datamover.tailer.data_class import TailerQueueEvent, InitialFoundEvent
+from datamover.tailer.fd_cache import TailFileCache
 from datamover.tailer.handler import MappingEventHandler
+from datamover.tailer.modify_coalescer import ModifyCoalescer
 from datamover.tailer.tail_consumer_thread import TailConsumerThread
 from datamover.tailer.tail_processor import TailProcessor
 
@@ -33,6 +38,10 @@ def create_csv_tailer_thread(
     fs: FS,
     file_scanner: FileScanner,
     poll_interval: float,
+    claim_registry: Optional[ClaimRegistry] = None,
+    manifest_index: Optional[ManifestIndex] = None,
+    coalesce_modified_events: bool = False,
+    fd_cache_max_open: int = 0,
 ) -> tuple[BaseObserver, TailConsumerThread]:
     """
     Sets up CSV-tailing components using injected FS and FileScanner.
@@ -54,6 +63,16 @@ def create_csv_tailer_thread(
         file_scanner: A callable conforming to the FileScanner protocol, used for
                       the initial scan of the directory.
         poll_interval: The interval (in seconds) for the consumer thread to poll
+        claim_registry: Optional shared registry used to skip announced files
+                        that are already queued, in flight or recently moved.
+        manifest_index: Optional shared index the parsed lines are recorded
+                        in, for the scanner's reconciliation.
+        coalesce_modified_events: Queue at most one ModifiedEvent per file
+                                  until the consumer reads it, folding a
+                                  burst of appends into one read.
+        fd_cache_max_open: Keep up to this many tracked CSVs open and read
+                           appends with pread on the held descriptor;
+                           0 reads through the FS object instead.
 
     Returns:
         A tuple containing the configured (but not started) Observer
@@ -137,6 +156,9 @@ def create_csv_tailer_thread(
     )
 
     # 3. Initialize Handler
+    coalescer: Optional[ModifyCoalescer] = (
+        ModifyCoalescer() if coalesce_modified_events else None
+    )
     try:
         handler = MappingEventHandler(
             file_map=file_map,
@@ -144,6 +166,7 @@ def create_csv_tailer_thread(
             watched_directory=csv_directory_to_watch,
             fs=fs,
             file_extension=csv_file_extension_no_dot,
+            coalescer=coalescer,
         )
     except ValueError as e:  # Handler might raise ValueError for bad args
         logger.error(
@@ -168,6 +191,14 @@ def create_csv_tailer_thread(
             fs=fs,
             move_queue=move_queue,
             move_queue_name=f"MoveQueueFrom-{csv_directory_to_watch.name}",
+            claim_registry=claim_registry,
+            manifest_index=manifest_index,
+            coalescer=coalescer,
+            fd_cache=(
+                TailFileCache(max_open=fd_cache_max_open, fs=fs)
+                if fd_cache_max_open > 0
+                else None
+            ),
         )
         logger.debug("TailProcessor initialized.")
     except Exception as e:  # Catch any init error from TailProcessor
@@ -182,6 +213,7 @@ def create_csv_tailer_thread(
         processor=processor,
         name=f"TailConsumer-{csv_directory_to_watch.name}",
         poll_interval=poll_interval,
+        coalescer=coalescer,
     )
     logger.info(
         "TailConsumerThread '%s' initialized to process events for '%s'.",
@@ -11,12 +11,12 @@ from datamover.file_functions.move_file_safely import (
     move_file_safely_impl,
 )
 from datamover.file_functions.scan_directory_and_filter import (
-    scan_directory_and_filter,
+    iter_directory_and_filter,
 )
 from datamover.protocols import (
     HttpClient,
     SafeFileMover,
-    FileScanner,
+    StreamingFileScanner,
 )
 
 from datamover.uploader.send_file_with_retries import RetryableFileSender
@@ -58,7 +58,7 @@ def create_uploader_thread(
     stop_event: threading.Event,
     fs: FS,
     http_client: HttpClient,
-    file_scanner_impl: FileScanner = scan_directory_and_filter,
+    file_scanner_impl: StreamingFileScanner = iter_directory_and_filter,
     safe_file_mover_impl: SafeFileMover = move_file_safely_impl,
 ) -> UploaderThread:
     """
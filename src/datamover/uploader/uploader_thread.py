@@ -3,12 +3,17 @@ import threading
 from pathlib import Path
 
 from datamover.file_functions.fs_mock import FS
-from datamover.protocols import FileScanner
+from datamover.file_functions.gather_entry_data import GatheredEntryData
+from datamover.protocols import StreamingFileScanner
 
 from datamover.uploader.send_file_with_retries import RetryableFileSender
 
 logger = logging.getLogger(__name__)
 
+# Most entries read from one scan before the directory is closed and they are
+# sent; a full batch starts the next scan without waiting for the poll interval.
+DEFAULT_SCAN_BATCH_SIZE = 1000
+
 
 class UploaderThread(threading.Thread):
     """
@@ -26,9 +31,10 @@ class UploaderThread(threading.Thread):
         stop_event: threading.Event,
         poll_interval: float,
         heartbeat_interval: float,
-        file_scanner: FileScanner,
+        file_scanner: StreamingFileScanner,
         file_sender: RetryableFileSender,
         fs: FS,
+        scan_batch_size: int = DEFAULT_SCAN_BATCH_SIZE,
     ):
         """
         Initialize the uploader thread.
@@ -40,10 +46,17 @@ class UploaderThread(threading.Thread):
             stop_event: Event to signal thread shutdown.
             poll_interval: Seconds between scan cycles.
             heartbeat_interval: Seconds between heartbeat logs.
-            file_scanner: Callable to list files in the directory.
+            file_scanner: Callable to list files in the directory; up to
+                          scan_batch_size entries are read and the scan closed
+                          before any of them is sent.
             file_sender: Retryable sender for uploading files.
             fs: Filesystem abstraction.
+            scan_batch_size: Most files read from one scan.
         """
+        if scan_batch_size < 1:
+            raise ValueError(
+                f"scan_batch_size must be at least 1, got {scan_batch_size}"
+            )
         super().__init__(daemon=True, name=thread_name)
 
         # Configuration parameters
@@ -54,6 +67,7 @@ class UploaderThread(threading.Thread):
         self.file_scanner = file_scanner
         self.file_sender = file_sender
         self.fs = fs
+        self.scan_batch_size = scan_batch_size
 
         # Track files that failed critically (no further retries)
         self.critically_failed_files: set[Path] = set()
@@ -101,15 +115,14 @@ class UploaderThread(threading.Thread):
                 )
                 self.current_cycle_count = 0
 
+            batch: list[GatheredEntryData] = []
             try:
-                # Scan for files matching the configured extension
-                entries = self.file_scanner(
-                    directory=self.validated_work_dir,
-                    fs=self.fs,
-                    extension_no_dot=self.file_extension_no_dot,
-                )
+                # Read one bounded batch and close the directory before any
+                # upload, so a scan error never follows files already sent
+                batch, found = self._scan_batch()
+                self._send_entries(batch)
 
-                if not entries:
+                if not found:
                     # No files found: increment streak and log sparsely
                     self.empty_scan_streak += 1
                     if self.empty_scan_streak == 1 or (
@@ -130,48 +143,6 @@ class UploaderThread(threading.Thread):
                         )
                     self.empty_scan_streak = 0
 
-                # Process each found file
-                for entry in entries:
-                    # Re-check stop event between files
-                    if self.stop_event.is_set():
-                        logger.info(
-                            "%s stop event detected; breaking file loop.",
-                            self.name,
-                        )
-                        break
-
-                    path = entry.path
-                    # Skip files that have permanently failed
-                    if path in self.critically_failed_files:
-                        logger.debug(
-                            "%s skipping critically failed file: %s",
-                            self.name,
-                            path,
-                        )
-                        continue
-
-                    logger.debug("%s sending file: %s", self.name, path)
-                    try:
-                        ok = self.file_sender.send_file(path)
-                        if ok:
-                            self.files_processed_count += 1
-                        else:
-                            # Sender returned False: mark file as permanently failed
-                            self.critically_failed_files.add(path)
-                            logger.error(
-                                "%s critical failure for file %s (sender returned False).",
-                                self.name,
-                                path,
-                            )
-                    except Exception:
-                        # Unexpected exception: log and mark as critically failed
-                        self.critically_failed_files.add(path)
-                        logger.exception(
-                            "%s CRITICAL: exception during send_file('%s').",
-                            self.name,
-                            path,
-                        )
-
                 # One full scan cycle completed
                 self.scan_cycles_completed += 1
 
@@ -182,8 +153,9 @@ class UploaderThread(threading.Thread):
                     self.name,
                 )
 
-            # Wait for next cycle or stop signal
-            if not self.stop_event.is_set():
+            # Wait for next cycle or stop signal; a full batch may have left
+            # more files behind, so scan again straight away
+            if len(batch) < self.scan_batch_size and not self.stop_event.is_set():
                 if self.stop_event.wait(self.poll_interval):
                     logger.info(
                         "%s received stop signal during wait; exiting.",
@@ -192,3 +164,77 @@ class UploaderThread(threading.Thread):
                     break
 
         logger.info("%s stopping run loop.", self.name)
+
+    def _scan_batch(self) -> tuple[list[GatheredEntryData], int]:
+        """
+        Reads up to scan_batch_size sendable entries and closes the scan.
+
+        Critically failed files are skipped here so they never fill a batch.
+
+        Returns:
+            The batch, and the number of entries seen (batch plus skipped).
+
+        Raises:
+            ScanDirectoryError: If the scan fails; nothing has been sent yet.
+        """
+        batch: list[GatheredEntryData] = []
+        seen = 0
+        entries = self.file_scanner(
+            directory=self.validated_work_dir,
+            fs=self.fs,
+            extension_no_dot=self.file_extension_no_dot,
+        )
+        try:
+            for entry in entries:
+                seen += 1
+                # Skip files that have permanently failed
+                if entry.path in self.critically_failed_files:
+                    logger.debug(
+                        "%s skipping critically failed file: %s",
+                        self.name,
+                        entry.path,
+                    )
+                    continue
+                batch.append(entry)
+                if len(batch) == self.scan_batch_size:
+                    break
+        finally:
+            # Release the directory if the batch stopped the scan early
+            close = getattr(entries, "close", None)
+            if close is not None:
+                close()
+        return batch, seen
+
+    def _send_entries(self, entries: list[GatheredEntryData]) -> None:
+        """Sends each scanned entry, stopping early on the stop event."""
+        for entry in entries:
+            # Re-check stop event between files
+            if self.stop_event.is_set():
+                logger.info(
+                    "%s stop event detected; breaking file loop.",
+                    self.name,
+                )
+                break
+
+            path = entry.path
+            logger.debug("%s sending file: %s", self.name, path)
+            try:
+                ok = self.file_sender.send_file(path)
+                if ok:
+                    self.files_processed_count += 1
+                else:
+                    # Sender returned False: mark file as permanently failed
+                    self.critically_failed_files.add(path)
+                    logger.error(
+                        "%s critical failure for file %s (sender returned False).",
+                        self.name,
+                        path,
+                    )
+            except Exception:
+                # Unexpected exception: log and mark as critically failed
+                self.critically_failed_files.add(path)
+                logger.exception(
+                    "%s CRITICAL: exception during send_file('%s').",
+                    self.name,
+                    path,
+                )
@@ -0,0 +1,93 @@
+"""
+Benchmarks the scanner's per-cycle state processing.
+
+Compares process_scan_results on the dict of FileStateRecord (the original
+implementation) with the columnar FileStateTable, with and without NumPy,
+over a steady-state cycle: every file seen again, ~10% of them grown, 1%
+removed and replaced by new files. Directory scanning is not included.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tests.benchmarks.bench_scanner_state [N ...]
+
+N defaults to 10000 100000 1000000.
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from datamover.file_functions.gather_entry_data import GatheredEntryData
+from datamover.scanner.file_state_table import HAVE_NUMPY, FileStateTable
+from datamover.scanner.process_scan_results import process_scan_results
+
+BASE = Path("/bench/source")
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+CYCLES = 3
+
+
+def _cycles(n: int) -> list[list[GatheredEntryData]]:
+    """Gathered data for CYCLES + 1 scans of a directory of n files."""
+    paths = [BASE / f"app-{i % 50}-{i}.pcap" for i in range(n)]
+    sizes = [1000] * n
+    scans = []
+    for cycle in range(CYCLES + 1):
+        wall = 1_700_000_000.0 + cycle * 5.0
+        if cycle:
+            for i in range(cycle, n, 10):
+                sizes[i] += 100
+            for i in range(cycle, n, 100):
+                paths[i] = BASE / f"new-{cycle}-{i}.pcap"
+        scans.append(
+            [
+                GatheredEntryData(mtime=wall, size=s, path=p)
+                for p, s in zip(paths, sizes)
+            ]
+        )
+    return scans
+
+
+def _time_cycles(make_states: Callable[[], Any], scans: list) -> float:
+    """Seconds per cycle, after a first (unmeasured) cycle fills the state."""
+    states = make_states()
+    kwargs = dict(lost_timeout=30.0, stuck_active_timeout=60.0)
+    states = process_scan_results(
+        gathered_data=scans[0],
+        existing_states=states,
+        monotonic_now=0.0,
+        wall_now=scans[0][0].mtime,
+        **kwargs,
+    )[0]
+    started = time.perf_counter()
+    for cycle, gathered in enumerate(scans[1:], start=1):
+        states = process_scan_results(
+            gathered_data=gathered,
+            existing_states=states,
+            monotonic_now=cycle * 5.0,
+            wall_now=gathered[0].mtime,
+            **kwargs,
+        )[0]
+    return (time.perf_counter() - started) / CYCLES
+
+
+def main(argv: list[str]) -> None:
+    logging.disable(logging.WARNING)  # Keep per-file warnings out of the timing
+    sizes = [int(a) for a in argv] or list(DEFAULT_SIZES)
+    variants: list[tuple[str, Callable[[], Any]]] = [
+        ("dict", dict),
+        ("table/array", lambda: FileStateTable(use_numpy=False)),
+    ]
+    if HAVE_NUMPY:
+        variants.append(("table/numpy", lambda: FileStateTable(use_numpy=True)))
+
+    print(f"{'files':>10} " + " ".join(f"{name:>14}" for name, _ in variants))
+    for n in sizes:
+        scans = _cycles(n)
+        timings = [_time_cycles(make, scans) for _, make in variants]
+        print(f"{n:>10} " + " ".join(f"{t * 1000:>12.1f}ms" for t in timings))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,119 @@
+"""
+Benchmarks peak memory of the list-based and streaming directory scans.
+
+Creates N empty .pcap files (plus N/10 files with another extension) in a
+temporary directory and measures, with tracemalloc, the peak memory
+allocated while each variant walks the whole directory. The consumer only
+counts entries, as the uploader does before its first send; the list
+variants hold every entry at once, the streaming ones one (or one batch)
+at a time. Also times each variant and the delay until the first entry.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tests.benchmarks.bench_streaming_scan [N ...]
+
+N defaults to 10000 100000.
+"""
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, Callable
+
+from datamover.file_functions.fs_mock import FS
+from datamover.file_functions.gather_entry_data import (
+    gather_file_data,
+    iter_file_batches,
+    iter_file_data,
+)
+from datamover.file_functions.scan_directory_and_filter import (
+    iter_directory_and_filter,
+    scan_directory_and_filter,
+)
+
+DEFAULT_SIZES = (10_000, 100_000)
+BATCH_SIZE = 1_000
+
+
+def _consume(entries: Iterable[Any]) -> int:
+    return sum(len(e) if isinstance(e, list) else 1 for e in entries)
+
+
+def _peak_bytes(func: Callable[[], Any]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _seconds(func: Callable[[], Any]) -> float:
+    started = time.perf_counter()
+    func()
+    return time.perf_counter() - started
+
+
+def _first_entry_seconds(scan: Callable[[], Iterable[Any]]) -> float:
+    started = time.perf_counter()
+    entries = iter(scan())
+    next(entries, None)
+    elapsed = time.perf_counter() - started
+    close = getattr(entries, "close", None)
+    if close is not None:
+        close()
+    return elapsed
+
+
+def main(argv: list[str]) -> None:
+    sizes = [int(a) for a in argv] or list(DEFAULT_SIZES)
+    fs = FS()
+
+    print(f"{'files':>8} {'mode':>14} {'peak':>10} {'time':>10} {'first entry':>12}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            for i in range(n):
+                (directory / f"app-{i}.pcap").touch()
+            for i in range(n // 10):
+                (directory / f"app-{i}.csv").touch()
+            variants: list[tuple[str, Callable[[], Iterable[Any]]]] = [
+                ("list", lambda: gather_file_data(directory, fs, fast_scan=True)),
+                ("stream", lambda: iter_file_data(directory, fs, fast_scan=True)),
+                (
+                    "batches",
+                    lambda: iter_file_batches(
+                        directory, fs, batch_size=BATCH_SIZE, fast_scan=True
+                    ),
+                ),
+                (
+                    "filter list",
+                    lambda: scan_directory_and_filter(
+                        directory, fs, "pcap", fast_scan=True
+                    ),
+                ),
+                (
+                    "filter stream",
+                    lambda: iter_directory_and_filter(
+                        directory=directory,
+                        fs=fs,
+                        extension_no_dot="pcap",
+                        fast_scan=True,
+                    ),
+                ),
+            ]
+            for name, scan in variants:
+                peak = _peak_bytes(lambda: _consume(scan()))
+                seconds = _seconds(lambda: _consume(scan()))
+                first = _first_entry_seconds(scan)
+                print(
+                    f"{n:>8} {name:>14} {peak / 1024:>8.0f}KB "
+                    f"{seconds * 1000:>8.1f}ms {first * 1000:>10.2f}ms"
+                )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
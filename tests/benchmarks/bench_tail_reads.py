@@ -0,0 +1,74 @@
+"""
+Benchmarks the TailProcessor's handling of modified events with and
+without the descriptor cache.
+
+Appends one manifest line to a CSV N times, handling a ModifiedEvent after
+each append, once reading through the FS object (exists, stat, open, seek,
+read, tell, close per event) and once with a TailFileCache (fstat and pread
+on a held descriptor). Enqueued targets are drained and discarded.
+
+Run from the repository root:
+
+    PYTHONPATH=src python -m tests.benchmarks.bench_tail_reads [N ...]
+
+N defaults to 10000 100000.
+"""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+from queue import Queue
+from typing import Optional
+
+from datamover.file_functions.fs_mock import FS
+from datamover.tailer.data_class import InitialFoundEvent, ModifiedEvent
+from datamover.tailer.fd_cache import TailFileCache
+from datamover.tailer.tail_processor import TailProcessor
+
+DEFAULT_SIZES = (10_000, 100_000)
+LINE = f"1700000000,/source/app-1.pcap,{'ab' * 32}\n".encode()
+
+
+def _run(csv_path: Path, n: int, fd_cache: Optional[TailFileCache]) -> float:
+    csv_path.write_bytes(b"")
+    processor = TailProcessor(
+        fs=FS(),
+        move_queue=Queue(),
+        move_queue_name="bench",
+        enqueuer=lambda _target: None,
+        fd_cache=fd_cache,
+    )
+    processor.process_event(InitialFoundEvent(path=str(csv_path)))
+    event = ModifiedEvent(path=str(csv_path))
+    elapsed = 0.0
+    with open(csv_path, "ab", buffering=0) as writer:
+        for _ in range(n):
+            writer.write(LINE)
+            started = time.perf_counter()
+            processor.process_event(event)
+            elapsed += time.perf_counter() - started
+    processor.close()
+    return elapsed
+
+
+def main(argv: list[str]) -> None:
+    sizes = [int(a) for a in argv] or list(DEFAULT_SIZES)
+
+    print(f"{'events':>8} {'mode':>8} {'time':>10} {'per event':>10}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = Path(tmp) / "app.csv"
+            for name, fd_cache in (
+                ("fs", None),
+                ("fd", TailFileCache(max_open=1, fs=FS())),
+            ):
+                seconds = _run(csv_path, n, fd_cache)
+                print(
+                    f"{n:>8} {name:>8} {seconds * 1000:>8.1f}ms "
+                    f"{seconds / n * 1e6:>8.2f}us"
+                )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
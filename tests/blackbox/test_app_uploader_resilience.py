@@ -1,4 +1,5 @@
 import logging
+import threading
 import time
 
 import pytest
@@ -129,12 +130,17 @@ class TestAppUploaderResilience:
         # --- Use a handler for stateful responses ---
         # Using a list to make call_count modifiable by the inner function
         handler_call_count = [0]
+        # With 10ms backoffs all three attempts fit between two 100ms polls, so the
+        # first attempt is held until the test has seen the file in worker_dir.
+        seen_in_worker_dir = threading.Event()
 
         def sequenced_response_handler(
             request: Request,
         ) -> Response:  # Use werkzeug.wrappers.Request
             handler_call_count[0] += 1
             attempt_number = handler_call_count[0]
+            if attempt_number == 1:
+                seen_in_worker_dir.wait(timeout=1.0)
 
             # Optional: Add more detailed matching inside the handler if needed
             # For example, check request.data or specific headers if the URI/method isn't unique enough.
@@ -190,6 +196,7 @@ class TestAppUploaderResilience:
             timeout=10.0,
         ), f"File {pcap_filename} did not arrive in worker_dir. Logs:\n{caplog.text}"
         test_logger.info(f"File {pcap_filename} found in worker_dir.")
+        seen_in_worker_dir.set()
 
         # 4. Allow time for initial failed attempts and retries (remains the same)
         # This sleep needs to be long enough for at least 3 attempts to occur.
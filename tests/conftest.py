@@ -155,13 +155,28 @@ def mock_config(
     cfg.uploaded_dir = standard_test_dirs.uploaded_dir
     cfg.dead_letter_dir = standard_test_dirs.dead_letter_dir
     cfg.csv_dir = standard_test_dirs.csv_dir
+    cfg.tiered_storage_enabled = False
+    cfg.cross_device_max_concurrent_copies = 2
+    cfg.extra_base_dirs = ()
+    cfg.extra_source_dirs = ()
 
     # [Files]
     cfg.pcap_extension_no_dot = "pcap"
     cfg.csv_extension_no_dot = "csv"
+    cfg.fast_scan_enabled = False
 
     # [Mover] - Default mock values, can be overridden in tests
     cfg.move_poll_interval_seconds = 1.0
+    cfg.fused_upload_enabled = False
+    cfg.noreplace_move_enabled = False
+    cfg.mover_worker_count = 1
+    cfg.duplicate_suppression_ttl_seconds = 0.0
+    cfg.mover_batch_size = 1
+    cfg.move_queue_spill_enabled = False
+    cfg.move_journal_enabled = False
+    cfg.move_retry_max_attempts = 0
+    cfg.move_retry_initial_delay_seconds = 1.0
+    cfg.move_retry_max_delay_seconds = 30.0
 
     # [Scanner] - Default mock values
     # CRITICAL: Ensure 'scanner_check_seconds' matches your actual Config class attribute name.
@@ -169,9 +184,33 @@ def mock_config(
     cfg.scanner_check_seconds = 5.0
     cfg.lost_timeout_seconds = 30.0
     cfg.stuck_active_file_timeout_seconds = 60.0  # Must be > lost_timeout
+    cfg.close_write_trigger_enabled = False
+    cfg.close_write_settle_seconds = 2.0
+    cfg.deadline_wake_enabled = False
+    cfg.activity_tracking_enabled = False
+    cfg.activity_rescan_seconds = 300.0
+    cfg.scanner_state_enabled = False
+    cfg.scanner_state_save_seconds = 60.0
+    cfg.scanner_workers = 4
+    cfg.adaptive_interval_enabled = False
+    cfg.scanner_min_check_seconds = 1.0
+    cfg.scanner_max_check_seconds = 60.0
+    cfg.cadence_thresholds_enabled = False
+    cfg.cadence_lost_factor = 2.0
+    cfg.cadence_stuck_factor = 4.0
+    cfg.app_health_enabled = False
+    cfg.app_overrun_factor = 3.0
+    cfg.open_writer_check_enabled = False
+    cfg.open_writer_process_names = ()
+    cfg.open_writer_user_ids = ()
+    cfg.manifest_reconciliation_enabled = False
+    cfg.manifest_index_max_entries = 100000
+    cfg.manifest_index_ttl_seconds = 3600.0
 
     # [Tailer]
     cfg.event_queue_poll_timeout_seconds = 1.0
+    cfg.modify_coalescing_enabled = False
+    cfg.fd_cache_max_open = 0
 
     # [Purger]
     cfg.purger_poll_interval_seconds = 600.0
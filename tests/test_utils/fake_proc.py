@@ -0,0 +1,34 @@
+import os
+from pathlib import Path
+
+
+class FakeProc:
+    """
+    A directory laid out like the parts of /proc that ProcOpenWriters reads:
+    <pid>/comm, <pid>/fd/<n> (symlinks to the open files) and
+    <pid>/fdinfo/<n> (with the octal open flags).
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.root.mkdir(parents=True, exist_ok=True)
+        (self.root / "self").mkdir(exist_ok=True)  # Non-pid entries are ignored
+
+    def add_process(self, pid: int, comm: str) -> Path:
+        process_dir = self.root / str(pid)
+        (process_dir / "fd").mkdir(parents=True)
+        (process_dir / "fdinfo").mkdir()
+        (process_dir / "comm").write_text(comm + "\n")
+        return process_dir
+
+    def open_file(self, pid: int, fd: int, target: Path, flags: int) -> None:
+        process_dir = self.root / str(pid)
+        os.symlink(target, process_dir / "fd" / str(fd))
+        (process_dir / "fdinfo" / str(fd)).write_text(
+            f"pos:\t0\nflags:\t{flags:07o}\nmnt_id:\t29\n"
+        )
+
+    def close_file(self, pid: int, fd: int) -> None:
+        process_dir = self.root / str(pid)
+        (process_dir / "fd" / str(fd)).unlink()
+        (process_dir / "fdinfo" / str(fd)).unlink()
@@ -2,6 +2,7 @@ import logging
 import queue
 import threading
 import time
+from pathlib import Path
 from types import SimpleNamespace
 from typing import cast
 from unittest.mock import MagicMock
@@ -10,6 +11,7 @@ import pytest
 
 import datamover.app as app_module
 from datamover.app import AppRunFailureError, AppSetupError
+from datamover.file_functions.fs_mock import FS as RealFS
 from datamover.protocols import FS, HttpClient, FileScanner
 from datamover.startup_code.context import AppContext
 from tests.test_utils.logging_helpers import find_log_record
@@ -19,7 +21,7 @@ from datamover.uploader.thread_factory import (
     UploaderOperationalSettings,
     SenderConnectionConfig,
 )
-from datamover.file_functions.scan_directory_and_filter import scan_directory_and_filter
+from datamover.file_functions.scan_directory_and_filter import iter_directory_and_filter
 from datamover.file_functions.move_file_safely import move_file_safely_impl
 
 logger = logging.getLogger(__name__)
@@ -62,9 +64,9 @@ def mock_app_context(mock_config) -> SimpleNamespace:
 def mock_queues(monkeypatch) -> dict[str, MagicMock]:
     mock_move_q = MagicMock(spec=queue.Queue, name="mock_move_queue")
     mock_tailer_q = MagicMock(spec=queue.Queue, name="mock_tailer_queue")
-    queue_creation_order = [mock_move_q, mock_tailer_q]
+    monkeypatch.setattr(app_module, "TimedQueue", MagicMock(side_effect=[mock_move_q]))
     monkeypatch.setattr(
-        app_module.queue, "Queue", MagicMock(side_effect=queue_creation_order)
+        app_module.queue, "Queue", MagicMock(side_effect=[mock_tailer_q])
     )
     return {"move_queue": mock_move_q, "tailer_queue": mock_tailer_q}
 
@@ -83,9 +85,9 @@ def mock_all_thread_factories_and_components(monkeypatch) -> dict:
             return_value=mock_components["directory_scanner"],
             name="patched_create_scan_thread",
         ),
-        "create_file_move_thread": MagicMock(
-            return_value=mock_components["file_mover"],
-            name="patched_create_file_move_thread",
+        "create_file_move_threads": MagicMock(
+            return_value=[mock_components["file_mover"]],
+            name="patched_create_file_move_threads",
         ),
         "create_csv_tailer_thread": MagicMock(
             return_value=(
@@ -178,7 +180,7 @@ def test_run_initialization_failure_in_build_phase_raises_appsetuperror(
 
     # Ensure the move factory is never called
     mock_move_factory = MagicMock(name="move_factory_not_called")
-    monkeypatch.setattr(app_module, "create_file_move_thread", mock_move_factory)
+    monkeypatch.setattr(app_module, "create_file_move_threads", mock_move_factory)
 
     # Cast our SimpleNamespace into the real AppContext type for mypy
     ctx = cast(AppContext, mock_app_context)
@@ -368,8 +370,8 @@ def test_run_factory_arguments_passed_correctly(
 
     inspectable_factories = {
         "create_scan_thread": MagicMock(name="inspectable_create_scan_thread_mock"),
-        "create_file_move_thread": MagicMock(
-            name="inspectable_create_file_move_thread_mock"
+        "create_file_move_threads": MagicMock(
+            name="inspectable_create_file_move_threads_mock"
         ),
         "create_csv_tailer_thread": MagicMock(
             name="inspectable_create_csv_tailer_thread_mock"
@@ -394,9 +396,9 @@ def test_run_factory_arguments_passed_correctly(
     inspectable_factories["create_scan_thread"].return_value = mock_threads_returned[
         "scanner"
     ]
-    inspectable_factories[
-        "create_file_move_thread"
-    ].return_value = mock_threads_returned["mover"]
+    inspectable_factories["create_file_move_threads"].return_value = [
+        mock_threads_returned["mover"]
+    ]
     inspectable_factories["create_csv_tailer_thread"].return_value = (
         mock_threads_returned["observer"],
         mock_threads_returned["csv_consumer"],
@@ -436,8 +438,8 @@ def test_run_factory_arguments_passed_correctly(
     assert scan_kwargs["time_func"] is time.time
     assert scan_kwargs["monotonic_func"] is time.monotonic
 
-    inspectable_factories["create_file_move_thread"].assert_called_once()
-    mover_kwargs = inspectable_factories["create_file_move_thread"].call_args.kwargs
+    inspectable_factories["create_file_move_threads"].assert_called_once()
+    mover_kwargs = inspectable_factories["create_file_move_threads"].call_args.kwargs
     assert mover_kwargs["source_dir_path"] == config.source_dir
     assert mover_kwargs["worker_dir_path"] == config.worker_dir
     assert mover_kwargs["poll_interval_seconds"] == config.move_poll_interval_seconds
@@ -445,6 +447,10 @@ def test_run_factory_arguments_passed_correctly(
     assert mover_kwargs["stop_event"] is mock_app_context.shutdown_event
     assert mover_kwargs["fs"] is mock_app_context.fs
     assert mover_kwargs["sleep_func"] is time.sleep
+    assert mover_kwargs["file_mover_func"] is move_file_safely_impl
+    assert mover_kwargs["worker_count"] == config.mover_worker_count
+    assert mover_kwargs["batch_size"] == config.mover_batch_size
+    assert mover_kwargs["retry_heap"] is None
 
     inspectable_factories["create_csv_tailer_thread"].assert_called_once()
     csv_kwargs = inspectable_factories["create_csv_tailer_thread"].call_args.kwargs
@@ -479,9 +485,256 @@ def test_run_factory_arguments_passed_correctly(
     assert uploader_kwargs["stop_event"] is mock_app_context.shutdown_event
     assert uploader_kwargs["fs"] is mock_app_context.fs
     assert uploader_kwargs["http_client"] is mock_app_context.http_client
-    assert uploader_kwargs["file_scanner_impl"] is scan_directory_and_filter
+    assert uploader_kwargs["file_scanner_impl"] is iter_directory_and_filter
     assert uploader_kwargs["safe_file_mover_impl"] is move_file_safely_impl
 
     for thread_mock_obj in mock_threads_returned.values():
         thread_mock_obj.start.assert_called_once()
         thread_mock_obj.join.assert_called_once_with(timeout=SUT_THREAD_JOIN_TIMEOUT)
+
+
+def test_build_components_registers_each_pool_worker():
+    workers = [create_mock_thread_object(f"mover_{i}") for i in range(3)]
+    single = create_mock_thread_object("single")
+    specs = [
+        {
+            "key": "file_mover",
+            "factory": MagicMock(return_value=workers),
+            "args_builder": dict,
+        },
+        {
+            "key": "solo",
+            "factory": MagicMock(return_value=[single]),
+            "args_builder": dict,
+        },
+    ]
+
+    components, to_join = app_module._build_components(specs)
+
+    assert components == {
+        "file_mover_1": workers[0],
+        "file_mover_2": workers[1],
+        "file_mover_3": workers[2],
+        "solo": single,
+    }
+    assert to_join == [*workers, single]
+
+
+def test_initialize_queues_uses_spilling_queue_when_enabled(tmp_path):
+    config = SimpleNamespace(
+        move_queue_spill_enabled=True, move_journal_enabled=False, base_dir=tmp_path
+    )
+    ctx = cast(AppContext, SimpleNamespace(config=config, fs=RealFS()))
+
+    queues = app_module._initialize_queues(ctx)
+
+    move_queue = queues["move_queue"]
+    assert isinstance(move_queue, app_module.SpillingQueue)
+    assert (tmp_path / app_module.MOVE_QUEUE_SPILL_FILENAME).exists()
+    move_queue.close()
+
+
+def test_initialize_queues_requeues_paths_from_move_journal(tmp_path):
+    (tmp_path / app_module.MOVE_JOURNAL_FILENAME).write_bytes(
+        b"E\t/s/a.pcap\nE\t/s/b.pcap\nD\t/s/a.pcap\n"
+    )
+    config = SimpleNamespace(
+        move_queue_spill_enabled=False, move_journal_enabled=True, base_dir=tmp_path
+    )
+    ctx = cast(AppContext, SimpleNamespace(config=config, fs=RealFS()))
+
+    queues = app_module._initialize_queues(ctx)
+
+    move_queue = queues["move_queue"]
+    assert move_queue.get_nowait() == Path("/s/b.pcap")
+    stats = move_queue.journal.stats()
+    assert stats.pending == 1
+    assert stats.commits == 0  # Replayed paths are not journaled again
+    assert (tmp_path / app_module.MOVE_JOURNAL_FILENAME).read_bytes() == (
+        b"E\t/s/b.pcap\n"
+    )
+
+
+def test_journal_replay_drops_paths_that_do_not_fit_the_queue(tmp_path, monkeypatch):
+    (tmp_path / app_module.MOVE_JOURNAL_FILENAME).write_bytes(
+        b"E\t/s/a.pcap\nE\t/s/b.pcap\nE\t/s/c.pcap\n"
+    )
+    monkeypatch.setattr(app_module, "MOVE_QUEUE_MAXSIZE", 2)
+    config = SimpleNamespace(
+        move_queue_spill_enabled=False, move_journal_enabled=True, base_dir=tmp_path
+    )
+    ctx = cast(AppContext, SimpleNamespace(config=config, fs=RealFS()))
+
+    queues = app_module._initialize_queues(ctx)
+
+    # c is left to the scanner, which journals it again when it queues it
+    assert queues["move_queue"].journal.stats().pending == 2
+    assert (tmp_path / app_module.MOVE_JOURNAL_FILENAME).read_bytes() == (
+        b"E\t/s/a.pcap\nE\t/s/b.pcap\n"
+    )
+
+
+def test_close_queues_closes_spill_files_and_journals(tmp_path):
+    config = SimpleNamespace(
+        move_queue_spill_enabled=True, move_journal_enabled=True, base_dir=tmp_path
+    )
+    ctx = cast(AppContext, SimpleNamespace(config=config, fs=RealFS()))
+    queues = app_module._initialize_queues(ctx)
+    move_queue = queues["move_queue"]
+    move_queue.put(Path("/s/a.pcap"))
+
+    app_module._close_queues([queues])
+
+    assert move_queue.journal._file.closed
+    assert (tmp_path / app_module.MOVE_JOURNAL_FILENAME).read_bytes() == (
+        b"E\t/s/a.pcap\n"
+    )
+    with pytest.raises(ValueError):
+        move_queue.put(Path("/s/b.pcap"))
+
+
+def test_claim_registry_is_built_for_close_write_trigger_without_ttl():
+    config = SimpleNamespace(
+        duplicate_suppression_ttl_seconds=0.0, close_write_trigger_enabled=True
+    )
+    ctx = cast(AppContext, SimpleNamespace(config=config))
+
+    registry = app_module._build_claim_registry(ctx)
+
+    assert isinstance(registry, app_module.ClaimRegistry)
+    config.close_write_trigger_enabled = False
+    assert app_module._build_claim_registry(ctx) is None
+
+
+def test_manifest_index_is_built_only_when_reconciliation_or_fused_upload_is_enabled():
+    config = SimpleNamespace(
+        manifest_reconciliation_enabled=True,
+        fused_upload_enabled=False,
+        manifest_index_max_entries=50,
+        manifest_index_ttl_seconds=120.0,
+    )
+    ctx = cast(AppContext, SimpleNamespace(config=config))
+
+    index = app_module._build_manifest_index(ctx)
+
+    assert isinstance(index, app_module.ManifestIndex)
+    assert (index.max_entries, index.ttl_seconds) == (50, 120.0)
+    config.manifest_reconciliation_enabled = False
+    assert app_module._build_manifest_index(ctx) is None
+    # The fused upload path needs it to tell which files were announced
+    config.fused_upload_enabled = True
+    assert isinstance(app_module._build_manifest_index(ctx), app_module.ManifestIndex)
+
+
+def test_fused_uploader_is_built_once_when_components_are_built(
+    mock_app_context: SimpleNamespace, monkeypatch
+):
+    mock_app_context.config.fused_upload_enabled = True
+    fused = MagicMock(name="fused_uploader")
+    create_fused = MagicMock(return_value=fused)
+    monkeypatch.setattr(app_module, "create_fused_move_uploader", create_fused)
+    queues = {"move_queue": MagicMock(), "tailer_queue": MagicMock()}
+
+    specs = app_module._define_thread_factory_specs(
+        cast(AppContext, mock_app_context), queues
+    )
+
+    # Defining the specs does not recover in-flight files yet
+    create_fused.assert_not_called()
+    by_key = {spec["key"]: spec for spec in specs}
+    assert by_key["file_mover"]["args_builder"]()["fused_uploader"] is fused
+    assert by_key["fused_uploader"]["args_builder"]()["fused_uploader"] is fused
+    create_fused.assert_called_once()
+
+
+def test_extra_volumes_get_prefixed_pipelines_sharing_the_context(
+    mock_app_context: SimpleNamespace, monkeypatch
+):
+    second_cfg = SimpleNamespace(base_dir=Path("/disk2/MOVE"))
+    monkeypatch.setattr(
+        app_module,
+        "volume_configs",
+        lambda cfg: [cfg, second_cfg],
+    )
+    volume_queues = {"move_queue": MagicMock(), "tailer_queue": MagicMock()}
+    monkeypatch.setattr(
+        app_module, "_initialize_queues", MagicMock(return_value=volume_queues)
+    )
+    define_specs = MagicMock(
+        return_value=[
+            {"key": "file_mover", "factory": MagicMock(), "args_builder": dict},
+            {
+                "key": "csv_tailer_components",
+                "factory": MagicMock(),
+                "args_builder": dict,
+            },
+        ]
+    )
+    monkeypatch.setattr(app_module, "_define_thread_factory_specs", define_specs)
+
+    specs = app_module._define_volume_specs(cast(AppContext, mock_app_context))
+
+    assert [s["key"] for s in specs] == [
+        "volume2_file_mover",
+        "volume2_csv_tailer_components",
+    ]
+    assert {s["name_prefix"] for s in specs} == {"Volume2-"}
+    volume_context, queues = define_specs.call_args.args
+    assert volume_context.config is second_cfg
+    assert queues is volume_queues
+    assert volume_context.shutdown_event is mock_app_context.shutdown_event
+    assert volume_context.http_client is mock_app_context.http_client
+    assert volume_context.fs is mock_app_context.fs
+
+
+def test_build_components_prefixes_volume_components():
+    mover = create_mock_thread_object("FileMover-worker")
+    observer = create_mock_thread_object("Observer")
+    consumer = create_mock_thread_object("CsvConsumer")
+    specs = [
+        {
+            "key": "volume2_file_mover",
+            "factory": MagicMock(return_value=[mover]),
+            "args_builder": dict,
+            "name_prefix": "Volume2-",
+        },
+        {
+            "key": "volume2_csv_tailer_components",
+            "factory": MagicMock(return_value=(observer, consumer)),
+            "args_builder": dict,
+            "name_prefix": "Volume2-",
+        },
+    ]
+
+    components, _ = app_module._build_components(specs)
+
+    assert set(components) == {
+        "volume2_file_mover",
+        "volume2_observer",
+        "volume2_csv_tail_consumer",
+    }
+    assert mover.name == "Volume2-FileMover-worker"
+    assert observer.name == "Volume2-Observer"
+
+    app_module._stop_and_join_components(components, [], threading.Event())
+    observer.stop.assert_called_once()
+    consumer.stop.assert_called_once()
+
+
+def test_extra_source_dirs_select_the_sharded_scanner(
+    mock_app_context: SimpleNamespace,
+):
+    config = mock_app_context.config
+    config.extra_source_dirs = (Path("/data/nic1"),)
+    queues = {"move_queue": MagicMock(), "tailer_queue": MagicMock()}
+
+    spec = app_module._directory_scanner_spec(
+        cast(AppContext, mock_app_context), queues, None
+    )
+
+    assert spec["factory"] is app_module.create_sharded_scan_thread
+    args = spec["args_builder"]()
+    assert args["scan_directory_paths"] == [config.source_dir, Path("/data/nic1")]
+    assert args["max_workers"] == config.scanner_workers
+    assert args["lost_file_queue"] is queues["move_queue"]
+    assert "scan_directory_path" not in args
@@ -0,0 +1,172 @@
+import logging
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from datamover.file_functions.atomic_move import (
+    AtomicNoReplaceMover,
+    rename_into_noreplace,
+)
+from datamover.file_functions.fs_mock import FS
+from tests.test_utils.logging_helpers import find_log_record
+
+
+@pytest.fixture
+def source_dir(tmp_path: Path) -> Path:
+    d = tmp_path / "source"
+    d.mkdir()
+    return d.resolve()
+
+
+@pytest.fixture
+def dest_dir(tmp_path: Path) -> Path:
+    d = tmp_path / "worker"
+    d.mkdir()
+    return d.resolve()
+
+
+@pytest.fixture
+def mover() -> AtomicNoReplaceMover:
+    return AtomicNoReplaceMover()
+
+
+def test_moves_file_into_destination(mover, source_dir, dest_dir):
+    src = source_dir / "app-1.pcap"
+    src.write_bytes(b"data")
+
+    result = mover(
+        source_path_raw=src,
+        destination_dir=dest_dir,
+        fs=FS(),
+        expected_source_dir=source_dir,
+    )
+
+    assert result == dest_dir / "app-1.pcap"
+    assert result.read_bytes() == b"data"
+    assert not src.exists()
+    stats = mover.stats()
+    assert stats.moves == 1 and stats.failures == 0
+    # lstat + one rename (1 or 2 syscalls depending on backend)
+    assert stats.syscalls in (2, 3)
+
+
+def test_conflicts_get_next_free_suffix(mover, source_dir, dest_dir):
+    (dest_dir / "app-1.pcap").write_bytes(b"first")
+    (dest_dir / "app-1-1.pcap").write_bytes(b"second")
+    src = source_dir / "app-1.pcap"
+    src.write_bytes(b"third")
+
+    result = mover(source_path_raw=src, destination_dir=dest_dir, fs=FS())
+
+    assert result == dest_dir / "app-1-2.pcap"
+    assert (dest_dir / "app-1.pcap").read_bytes() == b"first"
+    assert (dest_dir / "app-1-1.pcap").read_bytes() == b"second"
+    assert mover.stats().conflicts == 2
+
+
+def test_conflict_limit_exhausted_fails(source_dir, dest_dir, caplog):
+    mover = AtomicNoReplaceMover(conflict_limit=1)
+    (dest_dir / "a.pcap").write_bytes(b"")
+    (dest_dir / "a-1.pcap").write_bytes(b"")
+    src = source_dir / "a.pcap"
+    src.write_bytes(b"x")
+
+    with caplog.at_level(logging.ERROR):
+        assert mover(source_path_raw=src, destination_dir=dest_dir, fs=FS()) is None
+
+    assert src.exists()
+    assert mover.stats().failures == 1
+    assert find_log_record(caplog, logging.ERROR, ["No free name", "a.pcap"])
+
+
+def test_missing_source_returns_none(mover, source_dir, dest_dir):
+    result = mover(
+        source_path_raw=source_dir / "gone.pcap",
+        destination_dir=dest_dir,
+        fs=FS(),
+        expected_source_dir=source_dir,
+    )
+
+    assert result is None
+    assert mover.stats().failures == 1
+
+
+def test_symlink_source_is_rejected(mover, source_dir, dest_dir, tmp_path):
+    target = tmp_path / "real.pcap"
+    target.write_bytes(b"x")
+    link = source_dir / "link.pcap"
+    link.symlink_to(target)
+
+    result = mover(
+        source_path_raw=link,
+        destination_dir=dest_dir,
+        fs=FS(),
+        expected_source_dir=source_dir,
+    )
+
+    assert result is None
+    assert link.is_symlink()
+
+
+def test_file_outside_expected_dir_is_rejected(mover, source_dir, dest_dir, tmp_path):
+    outside = tmp_path / "outside.pcap"
+    outside.write_bytes(b"x")
+
+    result = mover(
+        source_path_raw=outside,
+        destination_dir=dest_dir,
+        fs=FS(),
+        expected_source_dir=source_dir,
+    )
+
+    assert result is None
+    assert outside.exists()
+
+
+def test_symlinked_parent_is_resolved_once(mover, source_dir, dest_dir, tmp_path):
+    alias = tmp_path / "alias"
+    alias.symlink_to(source_dir)
+    (source_dir / "app.pcap").write_bytes(b"x")
+
+    result = mover(
+        source_path_raw=alias / "app.pcap",
+        destination_dir=dest_dir,
+        fs=FS(),
+        expected_source_dir=source_dir,
+    )
+
+    assert result == dest_dir / "app.pcap"
+
+
+def test_lexically_confined_path_does_not_resolve(source_dir, dest_dir):
+    fs = MagicMock(spec=FS)
+    fs.lstat.return_value = MagicMock(st_mode=0o100644)
+    fs.rename_noreplace.return_value = 1
+
+    result = AtomicNoReplaceMover()(
+        source_path_raw=source_dir / "app.pcap",
+        destination_dir=dest_dir,
+        fs=fs,
+        expected_source_dir=source_dir,
+    )
+
+    assert result == dest_dir / "app.pcap"
+    fs.resolve.assert_not_called()
+    fs.exists.assert_not_called()
+    fs.rename_noreplace.assert_called_once_with(
+        source_dir / "app.pcap", dest_dir / "app.pcap"
+    )
+
+
+def test_rename_into_noreplace_uses_target_name(source_dir, dest_dir):
+    src = source_dir / "x.pcap.inflight"
+    src.write_bytes(b"x")
+
+    final, syscalls, conflicts = rename_into_noreplace(
+        src, dest_dir, fs=FS(), target_name="x.pcap"
+    )
+
+    assert final == dest_dir / "x.pcap"
+    assert conflicts == 0
+    assert syscalls >= 1
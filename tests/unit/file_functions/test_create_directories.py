@@ -478,3 +478,33 @@ def test_fs_type_error_is_wrapped(
         match=f"Error accessing or processing path '{target_path}': {type_err}",
     ):
         create_directories(mock_app_config, mock_fs)
+
+
+@patch(PATCH_PATH_GET_DEVICE)
+def test_tiered_storage_allows_other_device_for_uploaded(
+    mock_get_device: MagicMock, mock_app_config: MagicMock, mock_fs: MagicMock
+):
+    """With tiered storage, worker/uploaded/dead_letter may be on another device."""
+    mock_app_config.tiered_storage_enabled = True
+    mock_fs.exists.return_value = True
+    mock_fs.is_dir.return_value = True
+    mock_get_device.side_effect = lambda path, fs: (
+        DEVICE_ID_OTHER if path == UPLOADED_DIR_PATH else DEVICE_ID_BASE
+    )
+
+    create_directories(mock_app_config, mock_fs)
+
+
+@patch(PATCH_PATH_GET_DEVICE)
+def test_tiered_storage_still_requires_source_on_base_device(
+    mock_get_device: MagicMock, mock_app_config: MagicMock, mock_fs: MagicMock
+):
+    mock_app_config.tiered_storage_enabled = True
+    mock_fs.exists.return_value = True
+    mock_fs.is_dir.return_value = True
+    mock_get_device.side_effect = lambda path, fs: (
+        DEVICE_ID_OTHER if path == SOURCE_DIR_PATH else DEVICE_ID_BASE
+    )
+
+    with pytest.raises(ConfigError, match="is not on the same filesystem"):
+        create_directories(mock_app_config, mock_fs)
@@ -0,0 +1,170 @@
+import errno
+import os
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from datamover.file_functions import cross_device_move
+from datamover.file_functions.cross_device_move import (
+    CrossDeviceMover,
+    with_cross_device_moves,
+)
+from datamover.file_functions.fs_mock import FS
+from datamover.file_functions.rename_noreplace import rename_noreplace
+
+PAYLOAD = b"pcap-bytes" * 1000
+MTIME_NS = 1_600_000_000_000_000_000
+
+
+def _exdev(*_args) -> None:
+    raise OSError(errno.EXDEV, os.strerror(errno.EXDEV))
+
+
+@pytest.fixture
+def src_file(tmp_path: Path) -> Path:
+    src = tmp_path / "source" / "a.pcap"
+    src.parent.mkdir()
+    src.write_bytes(PAYLOAD)
+    os.utime(src, ns=(MTIME_NS, MTIME_NS))
+    return src
+
+
+@pytest.fixture
+def dst_dir(tmp_path: Path) -> Path:
+    dst = tmp_path / "uploaded"
+    dst.mkdir()
+    return dst
+
+
+def _cross_device_mover(**kwargs) -> CrossDeviceMover:
+    """A mover that sees every direct rename fail with EXDEV."""
+    return CrossDeviceMover(
+        rename_func=lambda s, d: os.rename(s, d) if ".part" in str(s) else _exdev(),
+        rename_noreplace_func=lambda s, d: (
+            rename_noreplace(s, d) if ".part" in str(s) else _exdev()
+        ),
+        chunk_bytes=4096,
+        **kwargs,
+    )
+
+
+def test_same_device_move_is_a_plain_rename(src_file, dst_dir):
+    rename = MagicMock()
+    mover = CrossDeviceMover(rename_func=rename)
+
+    mover.move(src_file, dst_dir / "a.pcap")
+
+    rename.assert_called_once_with(src_file, dst_dir / "a.pcap")
+    assert mover.stats().copies == 0
+
+
+def test_cross_device_move_copies_then_unlinks(src_file, dst_dir):
+    mover = _cross_device_mover()
+    dst = dst_dir / "a.pcap"
+
+    mover.move(src_file, dst)
+
+    assert not src_file.exists()
+    assert dst.read_bytes() == PAYLOAD
+    assert dst.stat().st_mtime_ns == MTIME_NS
+    assert os.listdir(dst_dir) == ["a.pcap"]
+    stats = mover.stats()
+    assert stats.copies == 1
+    assert stats.bytes_copied == len(PAYLOAD)
+    assert stats.failures == 0
+
+
+def test_cross_device_noreplace_refuses_taken_name_without_copying(src_file, dst_dir):
+    (dst_dir / "a.pcap").write_bytes(b"existing")
+    mover = _cross_device_mover()
+
+    with pytest.raises(FileExistsError):
+        mover.rename_noreplace(src_file, dst_dir / "a.pcap")
+
+    assert src_file.read_bytes() == PAYLOAD
+    assert (dst_dir / "a.pcap").read_bytes() == b"existing"
+    assert mover.stats().copies == 0
+
+
+def test_cross_device_noreplace_moves_to_free_name(src_file, dst_dir):
+    mover = _cross_device_mover()
+
+    syscalls = mover.rename_noreplace(src_file, dst_dir / "a.pcap")
+
+    assert syscalls >= 2
+    assert (dst_dir / "a.pcap").read_bytes() == PAYLOAD
+    assert not src_file.exists()
+
+
+def test_falls_back_to_buffered_copy_when_copy_file_range_unsupported(
+    src_file, dst_dir, monkeypatch
+):
+    monkeypatch.setattr(cross_device_move, "_copy_file_range", _exdev)
+    mover = _cross_device_mover()
+
+    mover.move(src_file, dst_dir / "a.pcap")
+
+    assert (dst_dir / "a.pcap").read_bytes() == PAYLOAD
+    assert mover.stats().fallback_copies == 1
+
+
+def test_failed_copy_leaves_source_and_no_temp_file(src_file, dst_dir, monkeypatch):
+    def broken_copy(*_args):
+        raise OSError(errno.EIO, "disk error")
+
+    monkeypatch.setattr(cross_device_move, "_copy_file_range", broken_copy)
+    mover = _cross_device_mover()
+
+    with pytest.raises(OSError):
+        mover.move(src_file, dst_dir / "a.pcap")
+
+    assert src_file.read_bytes() == PAYLOAD
+    assert os.listdir(dst_dir) == []
+    assert mover.stats().failures == 1
+
+
+def test_destination_directory_is_fsynced_before_source_unlink(
+    src_file, dst_dir, monkeypatch
+):
+    synced = []
+
+    def fake_fsync_directory(directory):
+        # The rename is done, but the source must still be there
+        assert (dst_dir / "a.pcap").read_bytes() == PAYLOAD
+        assert src_file.exists()
+        synced.append(directory)
+
+    monkeypatch.setattr(cross_device_move, "_fsync_directory", fake_fsync_directory)
+
+    _cross_device_mover().rename_noreplace(src_file, dst_dir / "a.pcap")
+
+    assert synced == [dst_dir]
+    assert not src_file.exists()
+
+
+def test_stale_temp_file_from_a_crashed_run_is_replaced(src_file, dst_dir):
+    stale = dst_dir / f".a.pcap.{os.getpid()}.{threading.get_ident()}.part"
+    stale.write_bytes(b"half a copy")
+
+    _cross_device_mover().rename_noreplace(src_file, dst_dir / "a.pcap")
+
+    assert (dst_dir / "a.pcap").read_bytes() == PAYLOAD
+    assert os.listdir(dst_dir) == ["a.pcap"]
+
+
+def test_rejects_zero_concurrency():
+    with pytest.raises(ValueError):
+        CrossDeviceMover(max_concurrent_copies=0)
+
+
+def test_with_cross_device_moves_replaces_move_functions():
+    mover = CrossDeviceMover()
+    base = FS()
+
+    fs = with_cross_device_moves(base, mover)
+
+    assert fs.move == mover.move
+    assert fs.rename_noreplace == mover.rename_noreplace
+    assert fs.stat is base.stat
@@ -0,0 +1,140 @@
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from datamover.file_functions.atomic_move import rename_into_noreplace
+from datamover.file_functions.destination_name_index import DestinationNameIndex
+from datamover.file_functions.fs_mock import FS
+
+
+@pytest.fixture
+def dest_dir(tmp_path: Path) -> Path:
+    d = tmp_path / "uploaded"
+    d.mkdir()
+    return d.resolve()
+
+
+def test_untracked_name_reserves_plain_name_without_io():
+    fs = MagicMock(spec=FS)
+    index = DestinationNameIndex(fs=fs)
+
+    assert index.reserve(Path("/d"), "a.pcap") == 0
+    assert index.reserve(Path("/d"), "a.pcap") == 0
+    fs.listdir.assert_not_called()
+
+
+def test_refresh_jumps_past_highest_suffix_on_disk():
+    fs = MagicMock(spec=FS)
+    fs.listdir.return_value = [
+        "a.pcap",
+        "a-1.pcap",
+        "a-7.pcap",
+        "ab-99.pcap",
+        "a-3.csv",
+    ]
+    index = DestinationNameIndex(fs=fs)
+
+    assert index.refresh(Path("/d"), "a.pcap") == 8
+    # Later conflicts are served from the counter
+    assert index.reserve(Path("/d"), "a.pcap") == 9
+    assert index.reserve(Path("/d"), "a.pcap") == 10
+    assert index.reserve(Path("/other"), "a.pcap") == 0
+    fs.listdir.assert_called_once_with(Path("/d"))
+    assert index.refreshes == 1
+
+
+def test_refresh_never_goes_back_below_reserved_counter():
+    fs = MagicMock(spec=FS)
+    fs.listdir.return_value = ["a.pcap"]
+    index = DestinationNameIndex(fs=fs)
+
+    assert index.refresh(Path("/d"), "a.pcap") == 1
+    assert index.reserve(Path("/d"), "a.pcap") == 2
+    # Disk does not show -2 yet (e.g. its rename is still in progress)
+    assert index.refresh(Path("/d"), "a.pcap") == 3
+
+
+def test_evicts_least_recently_used_names():
+    fs = MagicMock(spec=FS)
+    fs.listdir.return_value = []
+    index = DestinationNameIndex(fs=fs, max_entries=2)
+
+    index.refresh(Path("/d"), "a.pcap")
+    index.refresh(Path("/d"), "b.pcap")
+    index.reserve(Path("/d"), "a.pcap")
+    index.refresh(Path("/d"), "c.pcap")
+
+    assert index.reserve(Path("/d"), "b.pcap") == 0
+    assert index.reserve(Path("/d"), "a.pcap") != 0
+
+
+def test_rename_with_index_skips_many_existing_variants(
+    tmp_path: Path, dest_dir: Path
+):
+    (dest_dir / "app.pcap").write_bytes(b"old")
+    for n in range(1, 251):
+        (dest_dir / f"app-{n}.pcap").write_bytes(b"old")
+    index = DestinationNameIndex(fs=FS())
+
+    sources = []
+    for i in range(2):
+        src = tmp_path / f"src{i}"
+        src.mkdir()
+        (src / "app.pcap").write_bytes(b"new")
+        sources.append(src / "app.pcap")
+
+    first, syscalls, conflicts = rename_into_noreplace(
+        sources[0], dest_dir, fs=FS(), name_index=index
+    )
+    second, _, second_conflicts = rename_into_noreplace(
+        sources[1], dest_dir, fs=FS(), name_index=index
+    )
+
+    # Beyond the old 100-variant limit, found with one listdir
+    assert first == dest_dir / "app-251.pcap"
+    assert conflicts == 1
+    assert syscalls <= 4
+    # Served straight from the counter
+    assert second == dest_dir / "app-252.pcap"
+    assert second_conflicts == 0
+    assert index.refreshes == 1
+
+
+def test_rename_with_stale_index_retries_next_suffix(dest_dir: Path, tmp_path: Path):
+    src = tmp_path / "app.pcap"
+    src.write_bytes(b"new")
+    fs = MagicMock(spec=FS)
+    fs.listdir.return_value = ["app.pcap"]
+    fs.rename_noreplace.side_effect = [FileExistsError(), FileExistsError(), 1]
+    index = DestinationNameIndex(fs=fs)
+
+    final, _, conflicts = rename_into_noreplace(src, dest_dir, fs=fs, name_index=index)
+
+    # Plain name taken, refreshed to -1, which another writer took meanwhile
+    assert final == dest_dir / "app-2.pcap"
+    assert conflicts == 2
+
+
+def test_concurrent_reservations_are_unique():
+    fs = MagicMock(spec=FS)
+    fs.listdir.return_value = ["a.pcap"]
+    index = DestinationNameIndex(fs=fs)
+    index.refresh(Path("/d"), "a.pcap")
+    seen: list[int] = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        for _ in range(200):
+            n = index.reserve(Path("/d"), "a.pcap")
+            with lock:
+                seen.append(n)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(seen) == len(set(seen)) == 800
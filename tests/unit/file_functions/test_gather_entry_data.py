@@ -9,8 +9,11 @@ import pytest
 
 from datamover.file_functions.file_exceptions import ScanDirectoryError
 
+from datamover.file_functions.fs_mock import FS
 from datamover.file_functions.gather_entry_data import (
     gather_file_data,
+    iter_file_batches,
+    iter_file_data,
     GatheredEntryData,
 )
 
@@ -414,3 +417,95 @@ def test_logging_summary_files_found(
     assert len(result) == 1
     assert f"Gathered data for 1 regular files in {scan_dir}" in caplog.text
     assert f"Gathered data for: {scan_dir / 'resolved_file1.txt'}" in caplog.text
+
+
+# --- Tests for fast_scan ---
+
+
+def test_fast_scan_resolves_directory_once(scan_dir: Path, mock_fs: MagicMock):
+    resolved_dir = Path("/real/scan_dir")
+    entries = [
+        make_mock_dir_entry(
+            f"file{i}.pcap", scan_dir, stat_result=create_mock_stat_attrs(i, 10 * i)
+        )
+        for i in range(3)
+    ]
+    mock_fs.scandir.return_value.__enter__.return_value = iter(entries)
+    mock_fs.resolve.return_value = resolved_dir
+
+    result = gather_file_data(scan_dir, mock_fs, fast_scan=True)
+
+    mock_fs.resolve.assert_called_once_with(scan_dir, strict=False)
+    assert [(e.path, e.mtime, e.size) for e in result] == [
+        (resolved_dir / f"file{i}.pcap", i, 10 * i) for i in range(3)
+    ]
+
+
+def test_fast_scan_matches_per_entry_resolve_on_real_directory(tmp_path: Path):
+    real_dir = tmp_path / "real"
+    real_dir.mkdir()
+    (real_dir / "a.pcap").write_bytes(b"a")
+    (real_dir / "b.pcap").write_bytes(b"bb")
+    (real_dir / "link.pcap").symlink_to(real_dir / "a.pcap")
+    (real_dir / "sub").mkdir()
+    via_link = tmp_path / "via_link"
+    via_link.symlink_to(real_dir)
+    fs = FS()
+
+    slow = gather_file_data(via_link, fs)
+    fast = gather_file_data(via_link, fs, fast_scan=True)
+
+    # GatheredEntryData equality ignores path, so compare plain tuples
+    def as_tuples(entries):
+        return sorted((e.mtime, e.size, e.path) for e in entries)
+
+    assert as_tuples(fast) == as_tuples(slow)
+    assert {e.path for e in fast} == {real_dir / "a.pcap", real_dir / "b.pcap"}
+
+
+def test_fast_scan_missing_directory_raises(tmp_path: Path):
+    with pytest.raises(ScanDirectoryError):
+        gather_file_data(tmp_path / "missing", FS(), fast_scan=True)
+
+
+def test_iter_file_data_yields_while_scanning_and_closes_directory_early(
+    tmp_path: Path,
+):
+    for i in range(5):
+        (tmp_path / f"f{i}.pcap").write_bytes(b"x" * i)
+    mock_fs = MagicMock(spec=FS)
+    scandir_cm = MagicMock()
+    dir_entries = iter(sorted(os.scandir(tmp_path), key=lambda e: e.name))
+    scandir_cm.__enter__.return_value = dir_entries
+    mock_fs.scandir.return_value = scandir_cm
+    mock_fs.resolve.return_value = tmp_path
+
+    entries = iter_file_data(tmp_path, mock_fs, fast_scan=True)
+    mock_fs.scandir.assert_not_called()  # Nothing happens until iterated
+
+    first = next(entries)
+    assert first.path == tmp_path / "f0.pcap"
+    assert len(list(dir_entries)) == 4  # Only one entry was read so far
+    scandir_cm.__exit__.assert_not_called()
+
+    entries.close()
+    scandir_cm.__exit__.assert_called_once()
+
+
+def test_iter_file_data_raises_scan_error_on_first_next(tmp_path: Path):
+    entries = iter_file_data(tmp_path / "missing", FS())
+
+    with pytest.raises(ScanDirectoryError):
+        next(entries)
+
+
+def test_iter_file_batches_splits_entries(tmp_path: Path):
+    for i in range(5):
+        (tmp_path / f"f{i}.pcap").touch()
+
+    batches = list(iter_file_batches(tmp_path, FS(), batch_size=2, fast_scan=True))
+
+    assert [len(b) for b in batches] == [2, 2, 1]
+    assert {e.path.name for b in batches for e in b} == {f"f{i}.pcap" for i in range(5)}
+    with pytest.raises(ValueError):
+        next(iter_file_batches(tmp_path, FS(), batch_size=0))
@@ -0,0 +1,68 @@
+import errno
+import struct
+from pathlib import Path
+
+import pytest
+
+from datamover.file_functions import inotify_watch
+from datamover.file_functions.inotify_watch import (
+    IN_CLOSE_WRITE,
+    IN_DELETE,
+    IN_MODIFY,
+    IN_Q_OVERFLOW,
+    InotifyEvent,
+    open_inotify_watch,
+    parse_events,
+)
+
+
+def _raw_event(mask: int, name: bytes = b"") -> bytes:
+    padded = name + b"\0" * (16 - len(name)) if name else b""
+    return struct.pack("iIII", 1, mask, 0, len(padded)) + padded
+
+
+def test_parse_events_splits_buffer():
+    buffer = _raw_event(IN_MODIFY, b"a.pcap") + _raw_event(IN_Q_OVERFLOW)
+
+    assert parse_events(buffer) == [
+        InotifyEvent(IN_MODIFY, "a.pcap"),
+        InotifyEvent(IN_Q_OVERFLOW, ""),
+    ]
+
+
+def test_open_without_inotify_raises_enosys(monkeypatch, tmp_path: Path):
+    monkeypatch.setattr(inotify_watch, "_inotify", None)
+
+    with pytest.raises(OSError) as exc_info:
+        open_inotify_watch(tmp_path, IN_MODIFY)
+
+    assert exc_info.value.errno == errno.ENOSYS
+
+
+def test_reports_writes_and_deletes(tmp_path: Path):
+    try:
+        watch = open_inotify_watch(tmp_path, IN_MODIFY | IN_CLOSE_WRITE | IN_DELETE)
+    except OSError as e:
+        pytest.skip(f"inotify not available: {e}")
+    with watch:
+        assert watch.read_events(0.0) == []
+
+        target = tmp_path / "a.pcap"
+        target.write_bytes(b"data")
+        target.unlink()
+
+        assert watch.read_events(1.0) == [
+            InotifyEvent(IN_MODIFY, "a.pcap"),
+            InotifyEvent(IN_CLOSE_WRITE, "a.pcap"),
+            InotifyEvent(IN_DELETE, "a.pcap"),
+        ]
+
+
+def test_watching_a_file_is_rejected(tmp_path: Path):
+    target = tmp_path / "a.pcap"
+    target.touch()
+
+    with pytest.raises(OSError) as exc_info:
+        open_inotify_watch(target, IN_MODIFY)
+
+    assert exc_info.value.errno in (errno.ENOTDIR, errno.ENOSYS)
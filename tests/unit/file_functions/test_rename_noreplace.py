@@ -0,0 +1,60 @@
+import errno
+
+import pytest
+
+from datamover.file_functions import rename_noreplace as rn_module
+from datamover.file_functions.rename_noreplace import rename_noreplace
+
+
+@pytest.fixture(params=[True, False], ids=["renameat2", "link_unlink"])
+def backend(request, monkeypatch):
+    """Runs each test against renameat2 (where available) and the link fallback."""
+    if request.param and not rn_module.renameat2_available():
+        pytest.skip("renameat2 not available on this platform")
+    monkeypatch.setattr(rn_module, "_renameat2_usable", request.param)
+    return request.param
+
+
+def test_rename_to_free_name(tmp_path, backend):
+    src = tmp_path / "a.pcap"
+    dst = tmp_path / "b.pcap"
+    src.write_bytes(b"data")
+
+    syscalls = rename_noreplace(src, dst)
+
+    assert syscalls == (1 if backend else 2)
+    assert not src.exists()
+    assert dst.read_bytes() == b"data"
+
+
+def test_existing_destination_is_never_replaced(tmp_path, backend):
+    src = tmp_path / "a.pcap"
+    dst = tmp_path / "b.pcap"
+    src.write_bytes(b"new")
+    dst.write_bytes(b"old")
+
+    with pytest.raises(FileExistsError):
+        rename_noreplace(src, dst)
+
+    assert src.read_bytes() == b"new"
+    assert dst.read_bytes() == b"old"
+
+
+def test_missing_source_raises(tmp_path, backend):
+    with pytest.raises(FileNotFoundError):
+        rename_noreplace(tmp_path / "missing.pcap", tmp_path / "b.pcap")
+
+
+def test_unsupported_renameat2_falls_back_to_link(tmp_path, monkeypatch):
+    def _unsupported(*_args):
+        rn_module.ctypes.set_errno(errno.ENOSYS)
+        return -1
+
+    monkeypatch.setattr(rn_module, "_renameat2", _unsupported)
+    monkeypatch.setattr(rn_module, "_renameat2_usable", True)
+    src = tmp_path / "a.pcap"
+    src.write_bytes(b"data")
+
+    assert rename_noreplace(src, tmp_path / "b.pcap") == 2
+    assert (tmp_path / "b.pcap").exists()
+    assert rn_module.renameat2_available() is False
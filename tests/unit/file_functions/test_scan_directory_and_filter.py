@@ -6,7 +6,10 @@ import pytest
 from unittest.mock import Mock
 
 # Import SUT and related types
+from datamover.file_functions.fs_mock import FS
 from datamover.file_functions.scan_directory_and_filter import (
+    fast_iter_directory_and_filter,
+    iter_directory_and_filter,
     scan_directory_and_filter,
 )
 from datamover.file_functions.gather_entry_data import GatheredEntryData
@@ -102,7 +105,9 @@ def test_filters_correctly_with_case_insensitive_behavior(
     # Assert
     assert result == expected_filtered_entries, "Filtered list or order is incorrect"
 
-    mock_gather.assert_called_once_with(directory=mock_scan_directory, fs=mock_fs)
+    mock_gather.assert_called_once_with(
+        directory=mock_scan_directory, fs=mock_fs, fast_scan=False
+    )
 
     log_entry = find_log_record(
         caplog,
@@ -171,7 +176,9 @@ def test_returns_empty_list_scenarios(
     assert result == [], (
         f"Result should be an empty list for scenario: {description_id}"
     )
-    mock_gather.assert_called_once_with(directory=mock_scan_directory, fs=mock_fs)
+    mock_gather.assert_called_once_with(
+        directory=mock_scan_directory, fs=mock_fs, fast_scan=False
+    )
 
     expected_log_suffix = f".{input_extension.lower()}"
     initial_count = len(actual_gather_return_value)
@@ -227,5 +234,33 @@ def test_propagates_scan_directory_error(
 
     # Verify the dependency was still called using the variable that holds the mock
     mocked_gather_function.assert_called_once_with(
-        directory=mock_scan_directory, fs=mock_fs
+        directory=mock_scan_directory, fs=mock_fs, fast_scan=False
+    )
+
+
+def test_iter_directory_and_filter_matches_list_scan(tmp_path: Path):
+    for name in ("a.pcap", "b.PCAP", "c.csv", "d"):
+        (tmp_path / name).touch()
+    fs = FS()
+
+    listed = scan_directory_and_filter(tmp_path, fs, "pcap")
+    streamed = iter_directory_and_filter(
+        directory=tmp_path, fs=fs, extension_no_dot="pcap"
     )
+    fast = fast_iter_directory_and_filter(
+        directory=tmp_path, fs=fs, extension_no_dot="pcap"
+    )
+
+    assert not isinstance(streamed, list)
+    names = sorted(e.path.name for e in streamed)
+    assert names == sorted(e.path.name for e in listed) == ["a.pcap", "b.PCAP"]
+    assert sorted(e.path.name for e in fast) == names
+
+
+def test_iter_directory_and_filter_raises_scan_error_when_iterated(tmp_path: Path):
+    entries = iter_directory_and_filter(
+        directory=tmp_path / "missing", fs=FS(), extension_no_dot="pcap"
+    )
+
+    with pytest.raises(ScanDirectoryError):
+        list(entries)
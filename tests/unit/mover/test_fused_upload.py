@@ -0,0 +1,229 @@
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from datamover.file_functions.fs_mock import FS
+from datamover.mover.fused_upload import (
+    INFLIGHT_SUFFIX,
+    FusedMoveUploader,
+    create_fused_move_uploader,
+)
+from datamover.mover.fused_upload_thread import FusedUploadThread
+from datamover.protocols import HttpClient
+
+
+@pytest.fixture
+def dirs(tmp_path: Path) -> dict[str, Path]:
+    d = {
+        "source": tmp_path / "source",
+        "worker": tmp_path / "worker",
+        "uploaded": tmp_path / "uploaded",
+    }
+    for p in d.values():
+        p.mkdir()
+    return d
+
+
+@pytest.fixture
+def http_client() -> MagicMock:
+    client = MagicMock(spec=HttpClient)
+    client.post.return_value = MagicMock(status_code=200, text="OK")
+    return client
+
+
+@pytest.fixture
+def fused(dirs: dict[str, Path], http_client: MagicMock) -> FusedMoveUploader:
+    return FusedMoveUploader(
+        validated_source_dir=dirs["source"],
+        validated_worker_dir=dirs["worker"],
+        validated_uploaded_dir=dirs["uploaded"],
+        remote_url="http://upload.test/pcap",
+        request_timeout_seconds=5.0,
+        verify_ssl=False,
+        http_client=http_client,
+        fs=FS(),
+        is_announced=lambda path: path.name != "unannounced.pcap",
+        pending_maxsize=2,
+    )
+
+
+def _make_source(dirs: dict[str, Path], name: str = "app-1.pcap") -> Path:
+    p = dirs["source"] / name
+    p.write_bytes(b"pcap-data")
+    return p
+
+
+def test_success_uploads_and_moves_straight_to_uploaded(fused, dirs, http_client):
+    src = _make_source(dirs)
+
+    assert fused.process(src) is True
+    assert fused.upload_next(timeout=0) is True
+
+    assert not src.exists()
+    assert (dirs["uploaded"] / src.name).read_bytes() == b"pcap-data"
+    assert list(dirs["worker"].iterdir()) == []
+    assert fused.uploaded_count == 1
+
+    kwargs = http_client.post.call_args.kwargs
+    assert kwargs["headers"]["x-filename"] == src.name
+
+
+def test_upload_is_sent_from_the_inflight_name(fused, dirs, http_client):
+    src = _make_source(dirs)
+    seen_names: list[str] = []
+
+    def _post(url, data, headers, timeout, verify):
+        seen_names.append(Path(data.name).name)
+        return MagicMock(status_code=201, text="")
+
+    http_client.post.side_effect = _post
+
+    fused.process(src)
+    fused.upload_next(timeout=0)
+
+    assert seen_names == [src.name + INFLIGHT_SUFFIX]
+
+
+@pytest.mark.parametrize("status_code", [500, 404])
+def test_non_2xx_hands_file_over_to_worker(fused, dirs, http_client, status_code):
+    http_client.post.return_value = MagicMock(status_code=status_code, text="nope")
+    src = _make_source(dirs)
+
+    assert fused.process(src) is True
+    fused.upload_next(timeout=0)
+
+    assert (dirs["worker"] / src.name).exists()
+    assert list(dirs["uploaded"].iterdir()) == []
+    assert fused.handed_off_count == 1
+
+
+def test_network_error_hands_file_over_to_worker(fused, dirs, http_client):
+    http_client.post.side_effect = requests.exceptions.ConnectionError("down")
+    src = _make_source(dirs)
+
+    assert fused.process(src) is True
+    fused.upload_next(timeout=0)
+
+    assert (dirs["worker"] / src.name).exists()
+    assert fused.handed_off_count == 1
+
+
+def test_name_conflict_in_uploaded_uses_unique_name(fused, dirs):
+    (dirs["uploaded"] / "app-1.pcap").write_bytes(b"older")
+    src = _make_source(dirs)
+
+    fused.process(src)
+    fused.upload_next(timeout=0)
+
+    assert (dirs["uploaded"] / "app-1.pcap").read_bytes() == b"older"
+    assert (dirs["uploaded"] / "app-1-1.pcap").read_bytes() == b"pcap-data"
+
+
+def test_path_outside_source_dir_is_declined(fused, tmp_path, http_client):
+    other = tmp_path / "elsewhere.pcap"
+    other.write_bytes(b"x")
+
+    assert fused.process(other) is False
+
+    assert other.exists()
+    http_client.post.assert_not_called()
+    assert fused.fallback_count == 1
+
+
+def test_missing_file_is_declined(fused, dirs, http_client):
+    assert fused.process(dirs["source"] / "gone.pcap") is False
+    http_client.post.assert_not_called()
+
+
+def test_directory_is_declined(fused, dirs, http_client):
+    (dirs["source"] / "adir.pcap").mkdir()
+
+    assert fused.process(dirs["source"] / "adir.pcap") is False
+    http_client.post.assert_not_called()
+
+
+def test_factory_recovers_inflight_files(dirs, http_client):
+    (dirs["source"] / ("app-2.pcap" + INFLIGHT_SUFFIX)).write_bytes(b"left-over")
+    (dirs["source"] / "app-3.pcap").write_bytes(b"untouched")
+
+    fused = create_fused_move_uploader(
+        source_dir_path=dirs["source"],
+        worker_dir_path=dirs["worker"],
+        uploaded_dir_path=dirs["uploaded"],
+        remote_url="http://upload.test/pcap",
+        request_timeout_seconds=5.0,
+        verify_ssl=False,
+        http_client=http_client,
+        fs=FS(),
+        is_announced=lambda path: True,
+    )
+
+    assert isinstance(fused, FusedMoveUploader)
+    assert (dirs["worker"] / "app-2.pcap").read_bytes() == b"left-over"
+    assert (dirs["source"] / "app-3.pcap").exists()
+
+
+def test_unannounced_file_is_declined(fused, dirs, http_client):
+    src = _make_source(dirs, "unannounced.pcap")
+
+    assert fused.process(src) is False
+
+    assert src.exists()
+    assert fused.fallback_count == 1
+
+
+def test_claim_does_not_upload_on_the_calling_thread(fused, dirs, http_client):
+    src = _make_source(dirs)
+
+    assert fused.process(src) is True
+
+    assert (dirs["source"] / (src.name + INFLIGHT_SUFFIX)).exists()
+    http_client.post.assert_not_called()
+
+
+def test_claimed_files_beyond_the_pending_limit_go_to_worker(fused, dirs, http_client):
+    sources = [_make_source(dirs, f"app-{i}.pcap") for i in range(3)]
+
+    assert all(fused.process(src) for src in sources)
+
+    assert [p.name for p in dirs["worker"].iterdir()] == ["app-2.pcap"]
+    assert fused.handed_off_count == 1
+    http_client.post.assert_not_called()
+
+
+def test_pending_files_are_handed_off_when_the_worker_stops(fused, dirs, http_client):
+    first = _make_source(dirs, "app-1.pcap")
+    fused.process(first)
+
+    assert fused.hand_off_pending() == 1
+    # Claims after the worker stopped go straight to the worker dir
+    late = _make_source(dirs, "app-2.pcap")
+    assert fused.process(late) is True
+
+    assert sorted(p.name for p in dirs["worker"].iterdir()) == [
+        "app-1.pcap",
+        "app-2.pcap",
+    ]
+    assert fused.upload_next(timeout=0) is False
+    http_client.post.assert_not_called()
+
+
+def test_upload_thread_uploads_claimed_files(fused, dirs, http_client):
+    stop_event = threading.Event()
+    thread = FusedUploadThread(
+        fused_uploader=fused, stop_event=stop_event, poll_interval=0.01
+    )
+    thread.start()
+    src = _make_source(dirs)
+
+    fused.process(src)
+    fused._pending.join()
+    stop_event.set()
+    thread.join(timeout=2.0)
+
+    assert not thread.is_alive()
+    assert (dirs["uploaded"] / src.name).read_bytes() == b"pcap-data"
+    assert fused.uploaded_count == 1
@@ -0,0 +1,168 @@
+import logging
+import threading
+import time
+from pathlib import Path
+from queue import Full
+from unittest.mock import MagicMock
+
+import pytest
+
+from datamover.file_functions.fs_mock import FS
+from datamover.mover.move_journal import MoveJournal
+from datamover.mover.timed_queue import TimedQueue
+from tests.test_utils.logging_helpers import find_log_record
+
+
+@pytest.fixture
+def journal_path(tmp_path: Path) -> Path:
+    return tmp_path / "move_queue.journal"
+
+
+def make_journal(journal_path: Path, **kwargs) -> MoveJournal:
+    return MoveJournal(journal_path=journal_path, fs=FS(), report_every=0, **kwargs)
+
+
+def test_replay_returns_enqueued_but_not_done_paths_in_order(journal_path):
+    journal = make_journal(journal_path)
+    for name in ["a", "b", "c", "d"]:
+        journal.record_enqueued(Path(f"/s/{name}.pcap"))
+    journal.record_done(Path("/s/b.pcap"))
+    journal.record_done(Path("/s/d.pcap"))
+    journal.close()
+
+    restarted = make_journal(journal_path)
+
+    assert restarted.replay() == [Path("/s/a.pcap"), Path("/s/c.pcap")]
+    assert restarted.stats().replayed == 2
+
+
+def test_replay_ignores_torn_last_record(journal_path, caplog):
+    journal_path.write_bytes(b"E\t/s/a.pcap\nE\t/s/b.pc")
+    journal = make_journal(journal_path)
+
+    with caplog.at_level(logging.WARNING):
+        assert journal.replay() == [Path("/s/a.pcap")]
+    assert find_log_record(caplog, logging.WARNING, ["incomplete last record"])
+
+
+def test_enqueue_is_fsynced_before_returning(journal_path):
+    fsync = MagicMock()
+    journal = make_journal(journal_path, fsync_func=fsync)
+
+    journal.record_enqueued(Path("/s/a.pcap"))
+
+    fsync.assert_called_once()
+    assert journal_path.read_bytes() == b"E\t/s/a.pcap\n"
+    # Completions are written but not synced
+    journal.record_done(Path("/s/a.pcap"))
+    fsync.assert_called_once()
+    assert journal_path.read_bytes().endswith(b"D\t/s/a.pcap\n")
+
+
+def test_concurrent_enqueues_share_fsyncs(journal_path):
+    in_fsync = threading.Event()
+    release = threading.Event()
+    calls: list[int] = []
+
+    def slow_fsync(fd: int) -> None:
+        calls.append(fd)
+        in_fsync.set()
+        release.wait(5)
+
+    journal = make_journal(journal_path, fsync_func=slow_fsync)
+    threads = [
+        threading.Thread(target=journal.record_enqueued, args=(Path(f"/s/{i}"),))
+        for i in range(8)
+    ]
+    threads[0].start()
+    assert in_fsync.wait(5)
+    # These all buffer their records while the first commit is in progress
+    for t in threads[1:]:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join(timeout=5)
+
+    stats = journal.stats()
+    assert stats.records == 8
+    assert stats.commits == len(calls) == 2
+    assert stats.records_per_commit == 4.0
+    assert len(make_journal(journal_path).replay()) == 8
+
+
+def test_compaction_keeps_only_pending_paths(journal_path):
+    journal = make_journal(journal_path, compact_after_records=4)
+    journal.record_enqueued(Path("/s/a.pcap"))
+    journal.record_enqueued(Path("/s/b.pcap"))
+    journal.record_enqueued(Path("/s/c.pcap"))
+    journal.record_done(Path("/s/a.pcap"))  # 4th record triggers compaction
+
+    assert journal_path.read_bytes() == b"E\t/s/b.pcap\nE\t/s/c.pcap\n"
+    journal.record_done(Path("/s/b.pcap"))
+    journal.close()
+    assert make_journal(journal_path).replay() == [Path("/s/c.pcap")]
+
+
+def test_path_queued_twice_stays_pending_until_both_are_done(journal_path):
+    journal = make_journal(journal_path)
+    journal.record_enqueued(Path("/s/a.pcap"))
+    journal.record_enqueued(Path("/s/a.pcap"))
+    journal.record_done(Path("/s/a.pcap"))
+
+    assert journal.stats().pending == 1
+    journal.compact()
+    assert journal_path.read_bytes() == b"E\t/s/a.pcap\n"
+    journal.close()
+    assert make_journal(journal_path).replay() == [Path("/s/a.pcap")]
+
+
+def test_replayed_path_is_pending_once(journal_path):
+    journal_path.write_bytes(b"E\t/s/a.pcap\nE\t/s/a.pcap\n")
+    journal = make_journal(journal_path)
+
+    assert journal.replay() == [Path("/s/a.pcap")]
+    journal.record_done(Path("/s/a.pcap"))
+    assert journal.stats().pending == 0
+
+
+def test_timed_queue_journals_each_put(journal_path):
+    journal = make_journal(journal_path)
+    q = TimedQueue(journal=journal)
+
+    q.put(Path("/s/a.pcap"))
+
+    assert journal.stats().pending == 1
+    assert q.get_nowait() == Path("/s/a.pcap")
+
+
+def test_timed_queue_put_that_times_out_is_not_replayed(journal_path):
+    journal = make_journal(journal_path)
+    q = TimedQueue(maxsize=1, journal=journal)
+    q.put(Path("/s/a.pcap"))
+
+    with pytest.raises(Full):
+        q.put(Path("/s/b.pcap"), timeout=0.01)
+    journal.close()
+
+    assert make_journal(journal_path).replay() == [Path("/s/a.pcap")]
+
+
+def test_compaction_renames_through_the_fs(journal_path):
+    real_fs = FS()
+    replace_calls = []
+
+    def _replace(src, dst):
+        replace_calls.append((src, dst))
+        real_fs.replace(src, dst)
+
+    journal = MoveJournal(
+        journal_path=journal_path, fs=FS(replace=_replace), report_every=0
+    )
+    journal.record_enqueued(Path("/s/a.pcap"))
+
+    journal.compact()
+
+    tmp_path = journal_path.with_name(journal_path.name + ".tmp")
+    assert replace_calls == [(tmp_path, journal_path)]
+    assert make_journal(journal_path).replay() == [Path("/s/a.pcap")]
@@ -0,0 +1,152 @@
+import logging
+import os
+import stat
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from datamover.file_functions.fs_mock import FS
+from datamover.mover.move_retry_heap import (
+    MoveFailure,
+    MoveRetryHeap,
+    classify_move_failure,
+)
+from tests.test_utils.logging_helpers import find_log_record
+
+SRC = Path("/data/source")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def heap(clock: FakeClock) -> MoveRetryHeap:
+    return MoveRetryHeap(
+        max_attempts=4,
+        initial_delay_seconds=1.0,
+        max_delay_seconds=3.0,
+        monotonic_func=clock,
+    )
+
+
+def _stat_result(mode: int) -> os.stat_result:
+    return os.stat_result((mode, 0, 0, 1, 0, 0, 10, 0, 0, 0))
+
+
+# --- classify_move_failure ---
+
+
+@pytest.mark.parametrize(
+    "lstat_effect, expected",
+    [
+        (_stat_result(stat.S_IFREG | 0o644), MoveFailure.TRANSIENT),
+        (_stat_result(stat.S_IFLNK | 0o777), MoveFailure.PERMANENT),
+        (_stat_result(stat.S_IFDIR | 0o755), MoveFailure.PERMANENT),
+        (FileNotFoundError(), MoveFailure.GONE),
+        (PermissionError(), MoveFailure.TRANSIENT),
+    ],
+)
+def test_classify_by_source_state(lstat_effect, expected):
+    fs = MagicMock(spec=FS)
+    if isinstance(lstat_effect, Exception):
+        fs.lstat.side_effect = lstat_effect
+    else:
+        fs.lstat.return_value = lstat_effect
+
+    assert classify_move_failure(SRC / "a.pcap", SRC, fs) is expected
+    fs.resolve.assert_not_called()
+
+
+def test_classify_file_outside_source_dir_is_permanent():
+    fs = MagicMock(spec=FS)
+    fs.resolve.return_value = Path("/elsewhere")
+
+    assert classify_move_failure(Path("/elsewhere/a.pcap"), SRC, fs) is (
+        MoveFailure.PERMANENT
+    )
+    fs.lstat.assert_not_called()
+
+
+# --- MoveRetryHeap ---
+
+
+def test_constructor_rejects_zero_attempts():
+    with pytest.raises(ValueError):
+        MoveRetryHeap(max_attempts=0, initial_delay_seconds=1.0, max_delay_seconds=1.0)
+
+
+def test_delay_doubles_up_to_cap(heap: MoveRetryHeap):
+    assert [heap.delay_for(n) for n in range(1, 5)] == [1.0, 2.0, 3.0, 3.0]
+
+
+def test_transient_failure_becomes_due_after_delay(heap, clock):
+    path = SRC / "a.pcap"
+
+    assert heap.record_failure(path, MoveFailure.TRANSIENT) is True
+    assert heap.pop_due() == []
+    assert heap.seconds_until_due() == pytest.approx(1.0)
+
+    clock.now += 1.0
+    assert heap.pop_due() == [path]
+    assert heap.seconds_until_due() is None
+
+
+def test_due_paths_come_out_in_due_order_and_respect_limit(heap, clock):
+    a, b, c = SRC / "a.pcap", SRC / "b.pcap", SRC / "c.pcap"
+    heap.record_failure(a, MoveFailure.TRANSIENT)
+    heap.record_failure(a, MoveFailure.TRANSIENT)  # Already waiting: not pushed twice
+    clock.now += 0.5
+    heap.record_failure(b, MoveFailure.TRANSIENT)
+    heap.record_failure(c, MoveFailure.TRANSIENT)
+    clock.now += 5.0
+
+    assert heap.pop_due(limit=2) == [a, b]
+    assert heap.pop_due() == [c]
+
+
+@pytest.mark.parametrize("failure", [MoveFailure.GONE, MoveFailure.PERMANENT])
+def test_non_transient_failures_are_not_retried(heap, failure):
+    assert heap.record_failure(SRC / "a.pcap", failure) is False
+    stats = heap.stats()
+    assert stats.pending == 0
+    assert stats.failures_by_kind[failure.value] == 1
+
+
+def test_gives_up_after_max_attempts(heap, clock, caplog):
+    path = SRC / "a.pcap"
+    for _ in range(3):
+        assert heap.record_failure(path, MoveFailure.TRANSIENT) is True
+        clock.now += 10.0
+        assert heap.pop_due() == [path]
+
+    assert heap.record_failure(path, MoveFailure.TRANSIENT) is False
+    assert heap.is_retrying(path) is False
+    assert heap.stats().gave_up == 1
+    assert find_log_record(caplog, logging.WARNING, ["Giving up", "a.pcap"])
+
+
+def test_success_after_retry_is_counted(heap, clock):
+    path = SRC / "a.pcap"
+    heap.record_failure(path, MoveFailure.TRANSIENT)
+    clock.now += 1.0
+    heap.pop_due()
+
+    heap.record_success(path)
+    heap.record_success(SRC / "never_failed.pcap")
+
+    stats = heap.stats()
+    assert stats.scheduled == 1
+    assert stats.retried == 1
+    assert stats.succeeded_after_retry == 1
+    assert heap.is_retrying(path) is False
@@ -9,7 +9,9 @@ from unittest.mock import MagicMock
 import pytest
 from pytest_mock import MockerFixture
 
+from datamover.mover.move_retry_heap import MoveRetryHeap
 from datamover.mover.mover_thread import FileMoveThread
+from datamover.mover.timed_queue import TimedQueue
 
 # Get the actual logger instance from the module under test
 from datamover.mover.mover_thread import logger as mover_thread_logger
@@ -491,3 +493,177 @@ class TestFileMoveThread:
         assert not file_move_thread.is_alive(), "Thread should have terminated."
         mock_process_single.assert_not_called()
         mock_sleep.assert_not_called()  # Importantly, sleep is not called for Empty
+
+
+class TestFileMoveThreadStats:
+    def test_reports_throughput_and_queue_wait(
+        self,
+        mock_process_single: MagicMock,
+        real_stop_event: threading.Event,
+        mock_sleep: MagicMock,
+        caplog: pytest.LogCaptureFixture,
+    ):
+        clock = {"now": 0.0}
+
+        def monotonic() -> float:
+            return clock["now"]
+
+        q = TimedQueue(monotonic_func=monotonic)
+        q.put(Path("a.pcap"))
+        q.put(Path("b.pcap"))
+        clock["now"] = 0.2  # both items waited 200ms
+
+        def process(_item: Path) -> None:
+            clock["now"] += 1.0
+
+        mock_process_single.side_effect = process
+
+        thread = FileMoveThread(
+            source_queue=q,
+            process_single=mock_process_single,
+            stop_event=real_stop_event,
+            sleep_func=mock_sleep,
+            name="StatsMover",
+            poll_interval=0.01,
+            stats_interval_seconds=2.0,
+            monotonic_func=monotonic,
+        )
+
+        expected = ["StatsMover: moved 2 item(s)", "queue wait avg"]
+        with caplog.at_level(logging.INFO, logger=mover_thread_logger.name):
+            thread.start()
+            q.join()
+            # The report is emitted at the top of the next loop iteration
+            deadline = time.monotonic() + 5
+            while (
+                find_log_record(caplog, logging.INFO, expected) is None
+                and time.monotonic() < deadline
+            ):
+                time.sleep(0.01)
+            real_stop_event.set()
+            thread.join(timeout=5)
+
+        assert thread.items_processed == 2
+        assert thread.total_queue_wait_seconds == pytest.approx(0.2 + 1.2)
+        record = find_log_record(caplog, logging.INFO, expected)
+        assert record is not None
+        assert "max 1200.0ms" in record.getMessage()
+
+
+class TestFileMoveThreadBatching:
+    def test_rejects_batch_size_below_one(
+        self,
+        mock_process_single: MagicMock,
+        real_stop_event: threading.Event,
+    ):
+        with pytest.raises(ValueError, match="batch_size"):
+            FileMoveThread(
+                source_queue=Queue(),
+                process_single=mock_process_single,
+                stop_event=real_stop_event,
+                poll_interval=0.01,
+                batch_size=0,
+            )
+
+    def test_drains_dedupes_and_orders_batch(
+        self,
+        mock_process_single: MagicMock,
+        real_stop_event: threading.Event,
+        mock_sleep: MagicMock,
+    ):
+        q: Queue[Path] = Queue()
+        for p in ["/b/2.pcap", "/a/9.pcap", "/b/1.pcap", "/a/9.pcap", "/c/1.pcap"]:
+            q.put(Path(p))
+        batches: list[list[Path]] = []
+        mock_process_batch = MagicMock(side_effect=lambda items: batches.append(items))
+
+        thread = FileMoveThread(
+            source_queue=q,
+            process_single=mock_process_single,
+            stop_event=real_stop_event,
+            sleep_func=mock_sleep,
+            name="BatchMover",
+            poll_interval=0.01,
+            batch_size=4,
+            process_batch=mock_process_batch,
+        )
+        thread.start()
+        q.join()  # task_done must be called for every dequeued item
+        real_stop_event.set()
+        thread.join(timeout=5)
+
+        assert batches == [
+            [Path("/a/9.pcap"), Path("/b/1.pcap"), Path("/b/2.pcap")],
+        ]
+        # The trailing single item goes through process_single
+        mock_process_single.assert_called_once_with(Path("/c/1.pcap"))
+        assert thread.items_processed == 5
+        assert thread.batches_processed == 2
+        assert thread.max_batch_size == 4
+
+    def test_batch_processor_exception_is_contained(
+        self,
+        mock_process_single: MagicMock,
+        real_stop_event: threading.Event,
+        mock_sleep: MagicMock,
+        caplog: pytest.LogCaptureFixture,
+    ):
+        q: Queue[Path] = Queue()
+        q.put(Path("/a/1.pcap"))
+        q.put(Path("/a/2.pcap"))
+
+        thread = FileMoveThread(
+            source_queue=q,
+            process_single=mock_process_single,
+            stop_event=real_stop_event,
+            sleep_func=mock_sleep,
+            name="BatchMover",
+            poll_interval=0.01,
+            batch_size=4,
+            process_batch=MagicMock(side_effect=RuntimeError("boom")),
+        )
+        with caplog.at_level(logging.ERROR, logger=mover_thread_logger.name):
+            thread.start()
+            q.join()
+            real_stop_event.set()
+            thread.join(timeout=5)
+
+        assert not thread.is_alive()
+        assert find_log_record(
+            caplog, logging.ERROR, ["BatchMover", "process_batch", "2 item(s)"]
+        )
+
+
+def test_due_retries_run_before_queue_poll(
+    mock_source_queue: MagicMock,
+    mock_process_single: MagicMock,
+    real_stop_event: threading.Event,
+    mock_sleep: MagicMock,
+):
+    retry_path = Path("/src/retry.pcap")
+    retry_heap = MagicMock(spec=MoveRetryHeap)
+    retry_heap.pop_due.side_effect = [[retry_path], []]
+    retry_heap.seconds_until_due.return_value = 0.002
+
+    def stop_on_poll(block, timeout):
+        real_stop_event.set()
+        raise Empty
+
+    mock_source_queue.get.side_effect = stop_on_poll
+    thread = FileMoveThread(
+        source_queue=mock_source_queue,
+        process_single=mock_process_single,
+        stop_event=real_stop_event,
+        sleep_func=mock_sleep,
+        poll_interval=1.0,
+        retry_heap=retry_heap,
+    )
+
+    thread.run()
+
+    mock_process_single.assert_called_once_with(retry_path)
+    # The poll does not wait past the next due retry
+    mock_source_queue.get.assert_called_once_with(block=True, timeout=0.002)
+    # Retried items were not taken from the queue
+    mock_source_queue.task_done.assert_not_called()
+    assert thread.items_processed == 1
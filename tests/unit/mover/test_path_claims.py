@@ -0,0 +1,62 @@
+import threading
+import time
+from pathlib import Path
+
+from datamover.mover.path_claims import PathClaimGuard
+
+
+def test_same_path_is_serialised():
+    guard = PathClaimGuard()
+    path = Path("/src/a.pcap")
+    events: list[str] = []
+    first_holding = threading.Event()
+
+    def first() -> None:
+        with guard.claim(path):
+            events.append("first-start")
+            first_holding.set()
+            time.sleep(0.05)
+            events.append("first-end")
+
+    def second() -> None:
+        first_holding.wait(timeout=5)
+        with guard.claim(path):
+            events.append("second")
+
+    threads = [threading.Thread(target=first), threading.Thread(target=second)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=5)
+
+    assert events == ["first-start", "first-end", "second"]
+    assert guard.contended_count == 1
+
+
+def test_different_paths_do_not_block():
+    guard = PathClaimGuard()
+    with guard.claim(Path("/src/a.pcap")):
+        done = threading.Event()
+
+        def other() -> None:
+            with guard.claim(Path("/src/b.pcap")):
+                done.set()
+
+        t = threading.Thread(target=other)
+        t.start()
+        assert done.wait(timeout=5)
+        t.join(timeout=5)
+    assert guard.contended_count == 0
+
+
+def test_claim_released_on_exception():
+    guard = PathClaimGuard()
+    path = Path("/src/a.pcap")
+    try:
+        with guard.claim(path):
+            raise RuntimeError("boom")
+    except RuntimeError:
+        pass
+
+    with guard.claim(path):
+        pass
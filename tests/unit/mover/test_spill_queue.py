@@ -0,0 +1,172 @@
+import logging
+import threading
+from pathlib import Path
+from queue import Empty
+from unittest.mock import MagicMock
+
+import pytest
+
+from datamover.file_functions.fs_mock import FS
+from datamover.mover.move_journal import MoveJournal
+from datamover.mover.spill_queue import SpillingQueue
+from tests.test_utils.logging_helpers import find_log_record
+
+
+@pytest.fixture
+def spill_path(tmp_path: Path) -> Path:
+    return tmp_path / "move_queue.spill"
+
+
+@pytest.fixture
+def clock() -> dict[str, float]:
+    return {"now": 100.0}
+
+
+def make_queue(spill_path: Path, clock: dict[str, float], maxsize: int = 2):
+    return SpillingQueue(
+        maxsize,
+        spill_path=spill_path,
+        fs=FS(),
+        monotonic_func=lambda: clock["now"],
+        report_every=0,
+    )
+
+
+def drain(q: SpillingQueue) -> list[Path]:
+    items = []
+    while True:
+        try:
+            items.append(q.get_nowait())
+        except Empty:
+            return items
+        q.task_done()
+
+
+def test_rejects_unbounded_queue(spill_path: Path):
+    with pytest.raises(ValueError):
+        SpillingQueue(0, spill_path=spill_path, fs=FS())
+
+
+def test_stays_in_memory_below_maxsize(spill_path, clock):
+    q = make_queue(spill_path, clock)
+    q.put(Path("/s/a.pcap"))
+    q.put(Path("/s/b.pcap"))
+
+    assert spill_path.read_bytes() == b""
+    assert q.stats().in_memory == 2
+    assert drain(q) == [Path("/s/a.pcap"), Path("/s/b.pcap")]
+
+
+def test_spills_when_full_and_drains_in_fifo_order(spill_path, clock, caplog):
+    q = make_queue(spill_path, clock)
+    paths = [Path(f"/s/{i}.pcap") for i in range(7)]
+
+    with caplog.at_level(logging.INFO):
+        for p in paths:
+            q.put(p, timeout=0)  # never blocks, even when "full"
+        assert q.qsize() == 7
+        stats = q.stats()
+        assert (stats.in_memory, stats.on_disk, stats.bursts) == (2, 5, 1)
+
+        first = [q.get_nowait(), q.get_nowait(), q.get_nowait()]
+        # Memory has room again, but new items queue behind the spilled ones
+        q.put(Path("/s/late.pcap"))
+        rest = drain(q)
+
+    assert first + rest[:-1] == paths[:3] + paths[3:]
+    assert rest[-1] == Path("/s/late.pcap")
+    assert find_log_record(caplog, logging.WARNING, ["spilling new items"])
+    assert find_log_record(
+        caplog, logging.INFO, ["overflow drained", "6 item(s) spilled"]
+    )
+    # Fully drained: the file is truncated and puts go to memory again
+    assert spill_path.read_bytes() == b""
+    q.put(Path("/s/after.pcap"))
+    assert q.stats().on_disk == 0
+    assert q.stats().spilled_total == 6
+    assert q.stats().drained_total == 6
+
+
+def test_spilled_items_keep_their_queue_wait(spill_path, clock):
+    q = make_queue(spill_path, clock, maxsize=1)
+    q.put(Path("/s/a.pcap"))
+    q.put(Path("/s/b.pcap"))  # spilled at t=100
+    clock["now"] = 103.0
+
+    q.get_nowait()
+    q.get_nowait()
+
+    assert q.last_get_wait_seconds() == pytest.approx(3.0)
+
+
+def test_pending_items_survive_restart(spill_path, clock):
+    q = make_queue(spill_path, clock, maxsize=1)
+    for name in ["a", "b", "c"]:
+        q.put(Path(f"/s/{name}.pcap"))
+    q.close()
+
+    clock["now"] = 5.0  # new process, new clock
+    restarted = make_queue(spill_path, clock, maxsize=1)
+
+    assert restarted.qsize() == 2
+    assert drain(restarted) == [Path("/s/b.pcap"), Path("/s/c.pcap")]
+    assert restarted.last_get_wait_seconds() == 0.0
+    restarted.join()  # every restored item was accounted for by task_done
+
+
+def test_drained_items_are_not_fed_again_after_restart(spill_path, clock):
+    q = make_queue(spill_path, clock, maxsize=2)
+    for name in ["a", "b", "c", "d", "e", "f"]:
+        q.put(Path(f"/s/{name}.pcap"))
+    for name in ["a", "b", "c"]:
+        assert q.get_nowait() == Path(f"/s/{name}.pcap")
+    # c and d were read back from the file; d is still in memory
+    q.close()
+
+    restarted = make_queue(spill_path, clock, maxsize=2)
+
+    assert restarted.stats().on_disk == 3
+    assert drain(restarted) == [Path(f"/s/{name}.pcap") for name in "def"]
+    assert not spill_path.with_name(spill_path.name + ".tmp").exists()
+
+
+def test_rejects_paths_with_newlines(spill_path, clock):
+    q = make_queue(spill_path, clock, maxsize=1)
+    q.put(Path("/s/a.pcap"))
+
+    with pytest.raises(ValueError):
+        q.put(Path("/s/bad\nname.pcap"))
+
+
+def test_failed_spill_is_not_left_pending_in_the_journal(spill_path, tmp_path):
+    journal_path = tmp_path / "move_queue.journal"
+    journal = MoveJournal(journal_path=journal_path, fs=FS(), report_every=0)
+    q = SpillingQueue(1, spill_path=spill_path, fs=FS(), journal=journal)
+    q.put(Path("/s/a.pcap"))
+    q._writer = MagicMock(write=MagicMock(side_effect=OSError("disk full")))
+
+    with pytest.raises(OSError):
+        q.put(Path("/s/b.pcap"))
+    journal.close()
+
+    replayed = MoveJournal(journal_path=journal_path, fs=FS()).replay()
+    assert replayed == [Path("/s/a.pcap")]
+
+
+def test_concurrent_producer_and_consumer_lose_nothing(spill_path):
+    q = SpillingQueue(4, spill_path=spill_path, fs=FS(), report_every=0)
+    expected = [Path(f"/s/{i}.pcap") for i in range(500)]
+    received: list[Path] = []
+
+    def consume() -> None:
+        while len(received) < len(expected):
+            received.append(q.get(timeout=5))
+            q.task_done()
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    for p in expected:
+        q.put(p)
+    consumer.join(timeout=10)
+
+    assert received == expected
@@ -1,5 +1,6 @@
 import logging
 import threading
+import time
 from pathlib import Path
 from queue import Queue
 from unittest.mock import MagicMock, patch, call
@@ -8,9 +9,16 @@ from typing import Callable, Tuple
 import pytest
 
 from datamover.file_functions.fs_mock import FS
+from datamover.mover.fused_upload import FusedMoveUploader
+from datamover.mover.move_journal import MoveJournal
+from datamover.mover.move_retry_heap import MoveFailure, MoveRetryHeap
 from datamover.mover.mover_thread import FileMoveThread
-from datamover.mover.thread_factory import create_file_move_thread
+from datamover.mover.thread_factory import (
+    create_file_move_thread,
+    create_file_move_threads,
+)
 from datamover.protocols import SafeFileMover, SleepCallable
+from datamover.queues.claim_registry import ClaimRegistry
 from tests.test_utils.logging_helpers import find_log_record
 
 # --- Constants for patch locations and logger name ---
@@ -320,3 +328,378 @@ def test_resolve_directory_raises_exception_propagates(
 
     assert exc.value is expected_exc
     filemove_ctor.assert_not_called()
+
+
+def test_process_single_item_uses_fused_uploader_when_it_handles_file(
+    test_source_dir_path: Path,
+    test_worker_dir_path: Path,
+    test_poll_interval: float,
+    source_queue: MagicMock,
+    stop_event: threading.Event,
+    mock_fs: MagicMock,
+    mock_sleep_func: MagicMock,
+    filemove_ctor: MagicMock,
+):
+    mover_mock = MagicMock(spec=SafeFileMover)
+    fused = MagicMock(spec=FusedMoveUploader)
+    fused.process.side_effect = [True, False]
+
+    create_file_move_thread(
+        source_dir_path=test_source_dir_path,
+        worker_dir_path=test_worker_dir_path,
+        poll_interval_seconds=test_poll_interval,
+        source_queue=source_queue,
+        stop_event=stop_event,
+        fs=mock_fs,
+        file_mover_func=mover_mock,
+        sleep_func=mock_sleep_func,
+        fused_uploader=fused,
+    )
+    proc_fn = filemove_ctor.call_args[1]["process_single"]
+
+    # First file handled by the fused path: no regular move
+    proc_fn(Path("fused.pcap"))
+    mover_mock.assert_not_called()
+
+    # Second file declined: falls back to the regular move
+    proc_fn(Path("fallback.pcap"))
+    mover_mock.assert_called_once()
+    assert mover_mock.call_args.kwargs["source_path_raw"] == Path("fallback.pcap")
+
+
+def test_create_threads_builds_named_pool_sharing_queue(
+    test_source_dir_path: Path,
+    test_worker_dir_path: Path,
+    test_poll_interval: float,
+    source_queue: MagicMock,
+    stop_event: threading.Event,
+    mock_fs: MagicMock,
+    mock_sleep_func: MagicMock,
+    mock_resolved_dst_dir: MagicMock,
+    filemove_ctor: MagicMock,
+    resolve_dir: MagicMock,
+):
+    threads = create_file_move_threads(
+        source_dir_path=test_source_dir_path,
+        worker_dir_path=test_worker_dir_path,
+        poll_interval_seconds=test_poll_interval,
+        source_queue=source_queue,
+        stop_event=stop_event,
+        fs=mock_fs,
+        file_mover_func=MagicMock(spec=SafeFileMover),
+        sleep_func=mock_sleep_func,
+        worker_count=3,
+    )
+
+    assert len(threads) == 3
+    assert resolve_dir.call_count == 2  # directories resolved once for the pool
+    names = [c.kwargs["name"] for c in filemove_ctor.call_args_list]
+    assert names == [f"FileMover-{mock_resolved_dst_dir.name}-{i}" for i in (1, 2, 3)]
+    assert all(c.kwargs["source_queue"] is source_queue for c in filemove_ctor.call_args_list)
+
+
+def test_pool_never_moves_same_path_concurrently(
+    test_source_dir_path: Path,
+    test_worker_dir_path: Path,
+    test_poll_interval: float,
+    source_queue: MagicMock,
+    stop_event: threading.Event,
+    mock_fs: MagicMock,
+    mock_sleep_func: MagicMock,
+    filemove_ctor: MagicMock,
+):
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def slow_mover(**_kwargs):
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(max_active, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return None
+
+    create_file_move_threads(
+        source_dir_path=test_source_dir_path,
+        worker_dir_path=test_worker_dir_path,
+        poll_interval_seconds=test_poll_interval,
+        source_queue=source_queue,
+        stop_event=stop_event,
+        fs=mock_fs,
+        file_mover_func=slow_mover,
+        sleep_func=mock_sleep_func,
+        worker_count=2,
+    )
+    proc_fns = [c.kwargs["process_single"] for c in filemove_ctor.call_args_list]
+
+    same = Path("dup.pcap")
+    workers = [threading.Thread(target=fn, args=(same,)) for fn in proc_fns]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join(timeout=5)
+
+    assert max_active == 1
+
+
+def test_create_threads_rejects_zero_workers(
+    test_source_dir_path: Path,
+    test_worker_dir_path: Path,
+    source_queue: MagicMock,
+    stop_event: threading.Event,
+    mock_fs: MagicMock,
+):
+    with pytest.raises(ValueError, match="worker_count"):
+        create_file_move_threads(
+            source_dir_path=test_source_dir_path,
+            worker_dir_path=test_worker_dir_path,
+            poll_interval_seconds=0.1,
+            source_queue=source_queue,
+            stop_event=stop_event,
+            fs=mock_fs,
+            worker_count=0,
+        )
+
+
+def test_process_single_item_updates_claim_registry(
+    test_source_dir_path: Path,
+    test_worker_dir_path: Path,
+    test_poll_interval: float,
+    source_queue: MagicMock,
+    stop_event: threading.Event,
+    mock_fs: MagicMock,
+    mock_sleep_func: MagicMock,
+    filemove_ctor: MagicMock,
+):
+    registry = MagicMock(spec=ClaimRegistry)
+    mover_mock = MagicMock(
+        spec=SafeFileMover, side_effect=[Path("/resolved/worker/ok.pcap"), None]
+    )
+
+    create_file_move_thread(
+        source_dir_path=test_source_dir_path,
+        worker_dir_path=test_worker_dir_path,
+        poll_interval_seconds=test_poll_interval,
+        source_queue=source_queue,
+        stop_event=stop_event,
+        fs=mock_fs,
+        file_mover_func=mover_mock,
+        sleep_func=mock_sleep_func,
+        claim_registry=registry,
+    )
+    proc_fn = filemove_ctor.call_args[1]["process_single"]
+
+    proc_fn(Path("ok.pcap"))
+    proc_fn(Path("bad.pcap"))
+
+    registry.mark_in_flight.assert_has_calls([call(Path("ok.pcap")), call(Path("bad.pcap"))])
+    registry.mark_done.assert_has_calls(
+        [call(Path("ok.pcap"), moved=True), call(Path("bad.pcap"), moved=False)]
+    )
+
+
+def test_process_batch_resolves_each_parent_once(
+    test_source_dir_path: Path,
+    test_worker_dir_path: Path,
+    test_poll_interval: float,
+    source_queue: MagicMock,
+    stop_event: threading.Event,
+    mock_fs: MagicMock,
+    mock_sleep_func: MagicMock,
+    filemove_ctor: MagicMock,
+    resolved_src_dir: Path,
+):
+    mover_mock = MagicMock(spec=SafeFileMover, return_value=Path("/dest/x"))
+    mock_fs.resolve.side_effect = lambda p, strict: {
+        Path("relative/source"): resolved_src_dir,
+        Path("/elsewhere"): Path("/elsewhere"),
+    }[p]
+
+    create_file_move_thread(
+        source_dir_path=test_source_dir_path,
+        worker_dir_path=test_worker_dir_path,
+        poll_interval_seconds=test_poll_interval,
+        source_queue=source_queue,
+        stop_event=stop_event,
+        fs=mock_fs,
+        file_mover_func=mover_mock,
+        sleep_func=mock_sleep_func,
+        batch_size=8,
+    )
+    ctor_kwargs = filemove_ctor.call_args[1]
+    assert ctor_kwargs["batch_size"] == 8
+    process_batch = ctor_kwargs["process_batch"]
+
+    process_batch(
+        [
+            resolved_src_dir / "a.pcap",
+            Path("relative/source/b.pcap"),
+            Path("relative/source/c.pcap"),
+            Path("/elsewhere/d.pcap"),
+        ]
+    )
+
+    # Canonical paths skip resolution; each other parent is resolved once
+    assert mock_fs.resolve.call_args_list == [
+        call(Path("relative/source"), strict=True),
+        call(Path("/elsewhere"), strict=True),
+    ]
+    moved_sources = [c.kwargs["source_path_raw"] for c in mover_mock.call_args_list]
+    assert moved_sources == [
+        resolved_src_dir / "a.pcap",
+        resolved_src_dir / "b.pcap",
+        resolved_src_dir / "c.pcap",
+        # Left as-is so the mover rejects it as outside the source dir
+        Path("/elsewhere/d.pcap"),
+    ]
+
+
+def test_single_item_workers_have_no_batch_processor(
+    test_source_dir_path: Path,
+    test_worker_dir_path: Path,
+    test_poll_interval: float,
+    source_queue: MagicMock,
+    stop_event: threading.Event,
+    mock_fs: MagicMock,
+    filemove_ctor: MagicMock,
+):
+    create_file_move_thread(
+        source_dir_path=test_source_dir_path,
+        worker_dir_path=test_worker_dir_path,
+        poll_interval_seconds=test_poll_interval,
+        source_queue=source_queue,
+        stop_event=stop_event,
+        fs=mock_fs,
+    )
+
+    ctor_kwargs = filemove_ctor.call_args[1]
+    assert ctor_kwargs["batch_size"] == 1
+    assert ctor_kwargs["process_batch"] is None
+
+
+def test_process_single_item_records_completion_in_journal(
+    test_source_dir_path: Path,
+    test_worker_dir_path: Path,
+    test_poll_interval: float,
+    source_queue: MagicMock,
+    stop_event: threading.Event,
+    mock_fs: MagicMock,
+    filemove_ctor: MagicMock,
+):
+    journal = MagicMock(spec=MoveJournal)
+    mover_mock = MagicMock(spec=SafeFileMover, side_effect=[None, RuntimeError("x")])
+
+    create_file_move_thread(
+        source_dir_path=test_source_dir_path,
+        worker_dir_path=test_worker_dir_path,
+        poll_interval_seconds=test_poll_interval,
+        source_queue=source_queue,
+        stop_event=stop_event,
+        fs=mock_fs,
+        file_mover_func=mover_mock,
+        move_journal=journal,
+    )
+    proc_fn = filemove_ctor.call_args[1]["process_single"]
+
+    proc_fn(Path("failed.pcap"))
+    proc_fn(Path("crashed.pcap"))
+
+    # Recorded even when the move fails, so the path is not replayed
+    assert journal.record_done.call_args_list == [
+        call(Path("failed.pcap")),
+        call(Path("crashed.pcap")),
+    ]
+
+
+def test_transient_failure_is_scheduled_for_retry(
+    test_source_dir_path: Path,
+    test_worker_dir_path: Path,
+    test_poll_interval: float,
+    source_queue: MagicMock,
+    stop_event: threading.Event,
+    mock_fs: MagicMock,
+    filemove_ctor: MagicMock,
+    resolved_src_dir: Path,
+):
+    registry = MagicMock(spec=ClaimRegistry)
+    journal = MagicMock(spec=MoveJournal)
+    retry_heap = MagicMock(spec=MoveRetryHeap)
+    retry_heap.record_failure.return_value = True
+    mover_mock = MagicMock(spec=SafeFileMover, side_effect=[None, Path("/dest/a")])
+    path = resolved_src_dir / "a.pcap"
+
+    with patch(
+        f"{FACTORY_MODULE_PATH}.classify_move_failure",
+        return_value=MoveFailure.TRANSIENT,
+    ) as classify:
+        create_file_move_thread(
+            source_dir_path=test_source_dir_path,
+            worker_dir_path=test_worker_dir_path,
+            poll_interval_seconds=test_poll_interval,
+            source_queue=source_queue,
+            stop_event=stop_event,
+            fs=mock_fs,
+            file_mover_func=mover_mock,
+            claim_registry=registry,
+            move_journal=journal,
+            retry_heap=retry_heap,
+        )
+        ctor_kwargs = filemove_ctor.call_args[1]
+        assert ctor_kwargs["retry_heap"] is retry_heap
+        proc_fn = ctor_kwargs["process_single"]
+
+        proc_fn(path)
+        classify.assert_called_once_with(path, resolved_src_dir, mock_fs)
+
+    # Waiting for its retry: still claimed and pending in the journal
+    retry_heap.record_failure.assert_called_once_with(path, MoveFailure.TRANSIENT)
+    registry.mark_done.assert_not_called()
+    journal.record_done.assert_not_called()
+
+    proc_fn(path)
+
+    retry_heap.record_success.assert_called_once_with(path)
+    registry.mark_done.assert_called_once_with(path, moved=True)
+    journal.record_done.assert_called_once_with(path)
+
+
+def test_files_from_extra_source_dirs_are_validated_against_their_own_dir(
+    test_source_dir_path: Path,
+    test_worker_dir_path: Path,
+    test_poll_interval: float,
+    source_queue: MagicMock,
+    stop_event: threading.Event,
+    mock_fs: MagicMock,
+    filemove_ctor: MagicMock,
+    resolve_dir: MagicMock,
+    resolved_src_dir: Path,
+    mock_resolved_dst_dir: MagicMock,
+):
+    nic_dir = Path("/resolved/nic1")
+    resolve_dir.side_effect = [resolved_src_dir, mock_resolved_dst_dir, nic_dir]
+    mover_mock = MagicMock(spec=SafeFileMover, return_value=Path("/dest/x"))
+
+    create_file_move_threads(
+        source_dir_path=test_source_dir_path,
+        worker_dir_path=test_worker_dir_path,
+        poll_interval_seconds=test_poll_interval,
+        source_queue=source_queue,
+        stop_event=stop_event,
+        fs=mock_fs,
+        file_mover_func=mover_mock,
+        batch_size=4,
+        extra_source_dir_paths=[Path("/raw/nic1")],
+    )
+    assert resolve_dir.call_args.kwargs["raw_path"] == Path("/raw/nic1")
+    process_batch = filemove_ctor.call_args[1]["process_batch"]
+
+    process_batch(
+        [resolved_src_dir / "a.pcap", nic_dir / "b.pcap", Path("/elsewhere/c.pcap")]
+    )
+
+    mock_fs.resolve.assert_called_once_with(Path("/elsewhere"), strict=True)
+    expected_dirs = [c.kwargs["expected_source_dir"] for c in mover_mock.call_args_list]
+    assert expected_dirs == [resolved_src_dir, nic_dir, resolved_src_dir]
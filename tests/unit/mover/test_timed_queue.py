@@ -0,0 +1,55 @@
+import threading
+
+from datamover.mover.timed_queue import TimedQueue
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_fifo_order_and_wait_recorded():
+    clock = FakeClock()
+    q = TimedQueue(monotonic_func=clock)
+
+    q.put("a")
+    clock.now += 1.5
+    q.put("b")
+    clock.now += 0.5
+
+    assert q.last_get_wait_seconds() is None
+    assert q.get_nowait() == "a"
+    assert q.last_get_wait_seconds() == 2.0
+    assert q.get_nowait() == "b"
+    assert q.last_get_wait_seconds() == 0.5
+    assert q.empty()
+
+
+def test_wait_is_tracked_per_consumer_thread():
+    clock = FakeClock()
+    q = TimedQueue(monotonic_func=clock)
+    q.put("a")
+    clock.now += 3.0
+
+    seen: list = []
+
+    def consume() -> None:
+        q.get()
+        seen.append(q.last_get_wait_seconds())
+
+    t = threading.Thread(target=consume)
+    t.start()
+    t.join(timeout=5)
+
+    assert seen == [3.0]
+    assert q.last_get_wait_seconds() is None
+
+
+def test_maxsize_is_respected():
+    q = TimedQueue(maxsize=1)
+    q.put_nowait("a")
+    assert q.full()
+    assert q.qsize() == 1
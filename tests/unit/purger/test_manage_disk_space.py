@@ -58,8 +58,8 @@ class TestManageDiskSpace:
         )
 
         assert mock_scan.call_count == 2
-        mock_scan.assert_any_call(uploaded_dir, mock_fs, "uploaded")
-        mock_scan.assert_any_call(work_dir, mock_fs, "work")
+        mock_scan.assert_any_call(uploaded_dir, mock_fs, "uploaded", False)
+        mock_scan.assert_any_call(work_dir, mock_fs, "work", False)
         mock_process.assert_not_called()
         assert "Both directory scans failed. Aborting cleanup." in caplog.text
         assert any(
@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import pytest
+
+from datamover.queues.claim_registry import ClaimRegistry
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def registry(clock: FakeClock) -> ClaimRegistry:
+    return ClaimRegistry(completed_ttl_seconds=30.0, monotonic_func=clock)
+
+
+PATH = Path("/source/app-1.pcap")
+
+
+def test_first_registration_is_accepted(registry):
+    assert registry.try_register(PATH, source="tailer") is True
+    stats = registry.stats()
+    assert stats.queued == 1
+    assert stats.suppressed_total == 0
+
+
+def test_duplicate_while_queued_is_suppressed(registry):
+    registry.try_register(PATH, source="tailer")
+
+    assert registry.try_register(PATH, source="scanner") is False
+    assert registry.try_register(PATH, source="tailer") is False
+    assert registry.stats().suppressed_by_source == {"scanner": 1, "tailer": 1}
+
+
+def test_duplicate_while_in_flight_is_suppressed(registry):
+    registry.try_register(PATH, source="tailer")
+    registry.mark_in_flight(PATH)
+
+    assert registry.try_register(PATH, source="scanner") is False
+    assert registry.stats().in_flight == 1
+
+
+def test_completed_path_suppressed_until_ttl_expires(registry, clock):
+    registry.try_register(PATH, source="tailer")
+    registry.mark_in_flight(PATH)
+    registry.mark_done(PATH, moved=True)
+
+    clock.now += 29.0
+    assert registry.try_register(PATH, source="tailer") is False
+
+    clock.now += 2.0
+    assert registry.try_register(PATH, source="tailer") is True
+    assert registry.stats().completed == 0
+
+
+def test_failed_move_is_forgotten(registry):
+    registry.try_register(PATH, source="tailer")
+    registry.mark_in_flight(PATH)
+    registry.mark_done(PATH, moved=False)
+
+    assert registry.try_register(PATH, source="scanner") is True
+
+
+def test_release_only_drops_queued_entries(registry):
+    registry.try_register(PATH, source="tailer")
+    registry.release(PATH)
+    assert registry.try_register(PATH, source="tailer") is True
+
+    registry.mark_in_flight(PATH)
+    registry.release(PATH)
+    assert registry.try_register(PATH, source="tailer") is False
+
+
+def test_reregistered_path_not_evicted_by_stale_completion(registry, clock):
+    registry.try_register(PATH, source="tailer")
+    registry.mark_done(PATH, moved=True)
+    clock.now += 31.0
+    # Expired: accepted again and now queued
+    assert registry.try_register(PATH, source="tailer") is True
+    registry.mark_in_flight(PATH)
+    registry.mark_done(PATH, moved=True)
+
+    clock.now += 10.0
+    assert registry.try_register(PATH, source="tailer") is False
+
+
+def test_negative_ttl_rejected():
+    with pytest.raises(ValueError):
+        ClaimRegistry(completed_ttl_seconds=-1.0)
@@ -0,0 +1,135 @@
+from pathlib import Path
+
+import pytest
+
+from datamover.queues.manifest_index import ManifestIndex
+
+SOURCE = Path("/source")
+HASH = "a" * 64
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def index(clock: FakeClock) -> ManifestIndex:
+    return ManifestIndex(max_entries=3, ttl_seconds=60.0, monotonic_func=clock)
+
+
+def announce(index: ManifestIndex, name: str, timestamp: int = 1) -> Path:
+    path = SOURCE / name
+    index.record(path, timestamp=timestamp, sha256_hash=HASH)
+    return path
+
+
+def test_announcements_are_found_by_file_name(index):
+    announce(index, "app-1.pcap", timestamp=42)
+
+    entry = index.get(Path("/elsewhere/app-1.pcap"))
+
+    assert entry is not None
+    assert entry.timestamp == 42
+    assert not index.is_announced(SOURCE / "app-2.pcap")
+
+
+def test_least_recently_announced_is_evicted_first(index):
+    for name in ("a.pcap", "b.pcap", "c.pcap"):
+        announce(index, name)
+    announce(index, "a.pcap")  # Announced again: now the newest
+
+    announce(index, "d.pcap")
+
+    assert not index.is_announced(SOURCE / "b.pcap")
+    assert index.is_announced(SOURCE / "a.pcap")
+    assert len(index) == 3
+    assert index.stats().evicted == 1
+
+
+def test_announcements_expire_after_ttl(index, clock):
+    announce(index, "a.pcap")
+    clock.now += 30.0
+    announce(index, "b.pcap")
+    clock.now += 31.0
+
+    assert not index.is_announced(SOURCE / "a.pcap")
+    assert index.is_announced(SOURCE / "b.pcap")
+
+
+def test_reconcile_requeues_files_still_present_a_cycle_later(index, clock):
+    stuck = announce(index, "stuck.pcap")
+    moved = announce(index, "moved.pcap")
+    clock.now += 5.0
+    fresh = announce(index, "fresh.pcap")
+    scanned = [stuck, fresh, SOURCE / "unannounced.pcap"]
+
+    requeue = index.reconcile(scanned, directory=SOURCE, announced_before=clock.now)
+
+    assert requeue == [stuck]
+    assert not index.is_announced(moved)
+    assert index.stats().requeued == 1
+    # Re-queued at most once per announcement, however many cycles follow
+    for _ in range(4):
+        clock.now += 10.0
+        assert (
+            index.reconcile([stuck], directory=SOURCE, announced_before=clock.now) == []
+        )
+    assert index.is_announced(stuck)
+    assert index.stats().requeued == 1
+
+
+def test_a_new_announcement_can_be_requeued_again(index, clock):
+    stuck = announce(index, "stuck.pcap")
+    clock.now += 5.0
+    assert index.reconcile([stuck], directory=SOURCE, announced_before=clock.now) == [
+        stuck
+    ]
+
+    announce(index, "stuck.pcap")
+    clock.now += 5.0
+
+    assert index.reconcile([stuck], directory=SOURCE, announced_before=clock.now) == [
+        stuck
+    ]
+
+
+def test_reconcile_keeps_announcements_for_other_directories(index, clock):
+    other = Path("/source2/app-1.pcap")
+    index.record(other, timestamp=1, sha256_hash=HASH)
+    clock.now += 5.0
+
+    assert index.reconcile([], directory=SOURCE, announced_before=clock.now) == []
+    assert index.is_announced(other)
+
+
+def test_reconcile_ignores_same_name_announced_for_another_directory(index, clock):
+    # Shards share the index; a namesake in this scan is not the announced file
+    other = Path("/source2/app-1.pcap")
+    index.record(other, timestamp=1, sha256_hash=HASH)
+    clock.now += 5.0
+
+    namesake = SOURCE / other.name
+    assert (
+        index.reconcile([namesake], directory=SOURCE, announced_before=clock.now) == []
+    )
+    assert index.stats().requeued == 0
+    # Still re-queued by a scan of its own directory
+    assert index.reconcile(
+        [other], directory=other.parent, announced_before=clock.now
+    ) == [other]
+
+
+def test_requires_positive_bounds(clock):
+    with pytest.raises(ValueError, match="max_entries"):
+        ManifestIndex(max_entries=0, ttl_seconds=1.0)
+    with pytest.raises(ValueError, match="ttl_seconds"):
+        ManifestIndex(max_entries=1, ttl_seconds=0.0)
@@ -0,0 +1,253 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from datamover.file_functions.fs_mock import FS
+from datamover.file_functions.gather_entry_data import GatheredEntryData
+from datamover.file_functions.inotify_watch import (
+    IN_CLOSE_WRITE,
+    IN_CREATE,
+    IN_DELETE,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MODIFY,
+    IN_MOVED_FROM,
+    IN_Q_OVERFLOW,
+    InotifyEvent,
+)
+from datamover.scanner.activity_tracker import WATCH_MASK, ActivityTracker
+from tests.test_utils.logging_helpers import find_log_record
+
+WATCHED = Path("/data/source")
+RESCAN = 300.0
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _stat_result(size: int, mtime: float) -> os.stat_result:
+    return os.stat_result((0o100644, 0, 0, 1, 0, 0, size, 0, mtime, 0))
+
+
+def _entry(name: str, size: int, mtime: float) -> GatheredEntryData:
+    return GatheredEntryData(mtime=mtime, size=size, path=WATCHED / name)
+
+
+def _as_tuples(entries) -> list[tuple]:
+    return sorted((e.path.name, e.size, e.mtime) for e in entries)
+
+
+@pytest.fixture
+def fs() -> MagicMock:
+    return MagicMock(spec=FS)
+
+
+@pytest.fixture
+def wall() -> FakeClock:
+    return FakeClock(1_700_000_000.0)
+
+
+@pytest.fixture
+def mono() -> FakeClock:
+    return FakeClock(100.0)
+
+
+@pytest.fixture
+def tracker(fs, wall, mono) -> ActivityTracker:
+    tracker = ActivityTracker(
+        directory=WATCHED,
+        extension_no_dot="pcap",
+        fs=fs,
+        stop_event=threading.Event(),
+        rescan_interval=RESCAN,
+        time_func=wall,
+        monotonic_func=mono,
+    )
+    assert tracker._open_watch()
+    return tracker
+
+
+def _rescan(tracker: ActivityTracker, gathered) -> None:
+    tracker.complete_rescan(tracker.begin_rescan(), gathered)
+
+
+def test_needs_a_rescan_before_the_first_snapshot(tracker, fs):
+    fs.watch_directory.assert_called_once_with(WATCHED, WATCH_MASK)
+    assert tracker.snapshot() is None
+
+    _rescan(tracker, [_entry("a.pcap", 10, 50.0)])
+
+    assert _as_tuples(tracker.snapshot()) == [("a.pcap", 10, 50.0)]
+
+
+def test_events_update_snapshot_without_scanning(tracker, fs, wall):
+    _rescan(tracker, [_entry("a.pcap", 10, 50.0), _entry("b.pcap", 5, 50.0)])
+    fs.stat.return_value = _stat_result(7, 60.0)
+
+    tracker.apply_events(
+        [
+            InotifyEvent(IN_MODIFY, "a.pcap"),
+            InotifyEvent(IN_MODIFY, "a.pcap"),
+            InotifyEvent(IN_DELETE, "b.pcap"),
+            InotifyEvent(IN_CREATE, "c.pcap"),
+            InotifyEvent(IN_MODIFY, "notes.txt"),
+            InotifyEvent(IN_CREATE | IN_ISDIR, "dir.pcap"),
+        ]
+    )
+
+    # The first write and a new file are stat'ed, once each
+    assert _as_tuples(tracker.snapshot()) == [
+        ("a.pcap", 7, 60.0),
+        ("c.pcap", 7, 60.0),
+    ]
+    assert fs.stat.call_count == 2
+
+
+def test_writes_are_stated_at_most_once_per_interval(tracker, fs, wall, mono):
+    _rescan(tracker, [_entry("a.pcap", 10, 50.0)])
+    fs.stat.return_value = _stat_result(20, 60.0)
+    tracker.apply_events([InotifyEvent(IN_MODIFY, "a.pcap")])
+
+    # Within the interval a write only moves the mtime
+    fs.stat.return_value = _stat_result(30, 61.0)
+    mono.now += tracker.modify_stat_interval / 2
+    tracker.apply_events([InotifyEvent(IN_MODIFY, "a.pcap")])
+    assert _as_tuples(tracker.snapshot()) == [("a.pcap", 20, wall.now)]
+
+    # Once it has passed, the next write picks up the new size
+    mono.now += tracker.modify_stat_interval
+    tracker.apply_events([InotifyEvent(IN_MODIFY, "a.pcap")])
+    assert _as_tuples(tracker.snapshot()) == [("a.pcap", 30, 61.0)]
+    assert fs.stat.call_count == 2
+
+
+def test_close_write_stats_file_and_moved_away_file_is_dropped(tracker, fs):
+    _rescan(tracker, [_entry("a.pcap", 10, 50.0), _entry("b.pcap", 5, 50.0)])
+    fs.stat.return_value = _stat_result(99, 70.0)
+
+    tracker.apply_events(
+        [InotifyEvent(IN_CLOSE_WRITE, "a.pcap"), InotifyEvent(IN_MOVED_FROM, "b.pcap")]
+    )
+
+    assert _as_tuples(tracker.snapshot()) == [("a.pcap", 99, 70.0)]
+
+
+def test_overflow_forces_rescan(tracker, caplog):
+    _rescan(tracker, [_entry("a.pcap", 10, 50.0)])
+
+    tracker.apply_events([InotifyEvent(IN_Q_OVERFLOW, "")])
+
+    assert tracker.snapshot() is None
+    assert tracker.overflow_count == 1
+    assert find_log_record(caplog, logging.WARNING, ["overflowed"])
+
+
+def test_rescan_is_due_again_after_interval(tracker, mono):
+    _rescan(tracker, [])
+    mono.now += RESCAN - 1.0
+    assert tracker.snapshot() == []
+
+    mono.now += 1.0
+
+    assert tracker.snapshot() is None
+
+
+def test_events_during_rescan_win_over_scan_result(tracker, fs, wall):
+    _rescan(tracker, [_entry("a.pcap", 10, 50.0), _entry("b.pcap", 5, 50.0)])
+    token = tracker.begin_rescan()
+    fs.stat.return_value = _stat_result(12, 55.0)
+    tracker.apply_events(
+        [InotifyEvent(IN_MODIFY, "a.pcap"), InotifyEvent(IN_DELETE, "b.pcap")]
+    )
+
+    # The scan listed b before it was deleted and saw a's older size and mtime
+    tracker.complete_rescan(
+        token, [_entry("a.pcap", 10, 50.0), _entry("b.pcap", 5, 50.0)]
+    )
+
+    assert _as_tuples(tracker.snapshot()) == [("a.pcap", 12, 55.0)]
+
+
+def test_rescan_overlapping_an_overflow_is_not_trusted(tracker):
+    token = tracker.begin_rescan()
+    tracker.apply_events([InotifyEvent(IN_Q_OVERFLOW, "")])
+
+    tracker.complete_rescan(token, [_entry("a.pcap", 10, 50.0)])
+
+    assert tracker.snapshot() is None
+
+
+def test_lost_watch_is_closed_and_rescan_required(tracker, fs):
+    _rescan(tracker, [])
+    watch = fs.watch_directory.return_value
+
+    tracker.apply_events([InotifyEvent(IN_IGNORED, "")])
+
+    watch.close.assert_called_once()
+    assert tracker.snapshot() is None
+    assert tracker.begin_rescan() is None
+
+
+def test_run_falls_back_when_watch_cannot_be_opened(fs, caplog):
+    stop_event = threading.Event()
+    fs.watch_directory.side_effect = OSError(28, "No space left on device")
+    tracker = ActivityTracker(
+        directory=WATCHED,
+        extension_no_dot="pcap",
+        fs=fs,
+        stop_event=stop_event,
+        rescan_interval=RESCAN,
+    )
+    stop_event.wait = MagicMock(side_effect=lambda _timeout: stop_event.set())
+
+    tracker.run()
+
+    assert tracker.snapshot() is None
+    assert find_log_record(caplog, logging.ERROR, ["cannot watch", str(WATCHED)])
+
+
+def test_tracks_real_directory(tmp_path: Path):
+    """End to end with the kernel's inotify."""
+    try:
+        FS().watch_directory(tmp_path, WATCH_MASK).close()
+    except OSError as e:
+        pytest.skip(f"inotify not available: {e}")
+    stop_event = threading.Event()
+    tracker = ActivityTracker(
+        directory=tmp_path,
+        extension_no_dot="pcap",
+        fs=FS(),
+        stop_event=stop_event,
+        rescan_interval=RESCAN,
+        poll_interval=0.05,
+    )
+    tracker.start()
+    try:
+        for _ in range(100):
+            token = tracker.begin_rescan()
+            if token is not None:
+                break
+            stop_event.wait(0.01)
+        tracker.complete_rescan(token, [])
+
+        (tmp_path / "a.pcap").write_bytes(b"x" * 100)
+        for _ in range(100):
+            entries = tracker.snapshot()
+            if entries and entries[0].size == 100:
+                break
+            stop_event.wait(0.01)
+
+        assert _as_tuples(entries)[0][:2] == ("a.pcap", 100)
+    finally:
+        stop_event.set()
+        tracker.join(timeout=5.0)
+    assert not tracker.is_alive()
@@ -0,0 +1,59 @@
+import pytest
+
+from datamover.scanner.adaptive_interval import (
+    DEADLINE_MARGIN_SECONDS,
+    AdaptiveScanInterval,
+    CycleMetrics,
+)
+
+QUIET = CycleMetrics(entries=10, new_files=0, changed_files=0, removed_files=0)
+GROWING = CycleMetrics(entries=10, new_files=0, changed_files=3, removed_files=0)
+ARRIVING = CycleMetrics(entries=11, new_files=1, changed_files=3, removed_files=0)
+
+
+def make_policy(initial: float = 8.0) -> AdaptiveScanInterval:
+    return AdaptiveScanInterval(
+        min_seconds=1.0, max_seconds=20.0, initial_seconds=initial
+    )
+
+
+def test_quiet_cycles_slow_down_up_to_the_maximum():
+    policy = make_policy()
+
+    intervals = [policy.next_interval(QUIET, None) for _ in range(4)]
+
+    assert intervals == pytest.approx([12.0, 18.0, 20.0, 20.0])
+
+
+def test_growing_files_speed_up_and_new_files_go_to_the_minimum():
+    policy = make_policy()
+
+    assert policy.next_interval(GROWING, None) == pytest.approx(4.0)
+    assert policy.next_interval(ARRIVING, None) == pytest.approx(1.0)
+    assert policy.next_interval(GROWING, None) == pytest.approx(1.0)
+
+
+def test_near_deadline_shortens_only_the_next_wait():
+    policy = make_policy()
+
+    assert policy.next_interval(QUIET, 3.0) == pytest.approx(
+        3.0 + DEADLINE_MARGIN_SECONDS
+    )
+    assert policy.next_interval(QUIET, 0.0) == pytest.approx(1.0)  # Never below min
+    assert policy.interval_seconds == pytest.approx(18.0)
+
+
+def test_failed_cycle_keeps_the_interval():
+    policy = make_policy()
+
+    assert policy.next_interval(None, None) == pytest.approx(8.0)
+
+
+def test_initial_interval_is_clamped_and_bounds_are_checked():
+    assert make_policy(initial=100.0).interval_seconds == 20.0
+    with pytest.raises(ValueError):
+        AdaptiveScanInterval(min_seconds=5.0, max_seconds=1.0, initial_seconds=2.0)
+    with pytest.raises(ValueError):
+        AdaptiveScanInterval(
+            min_seconds=1.0, max_seconds=5.0, initial_seconds=2.0, slow_down=1.0
+        )
@@ -0,0 +1,126 @@
+from pathlib import Path
+
+import pytest
+
+from datamover.scanner.app_cadence import (
+    MIN_DERIVED_LOST_SECONDS,
+    AppCadenceIndex,
+    AppHealthMonitor,
+    AppStatus,
+    CadenceThresholds,
+)
+
+BASE = Path("/src")
+
+
+def arrive(index: AppCadenceIndex, mono: float, *names: str) -> None:
+    index.observe_new_files([BASE / name for name in names], mono)
+
+
+def test_cadence_is_learned_per_app_after_min_samples():
+    index = AppCadenceIndex(smoothing=0.5, min_samples=2)
+
+    arrive(index, 0.0, "fast-1.pcap", "slow-1.pcap")
+    arrive(index, 10.0, "fast-2.pcap")
+    assert index.cadence("fast") is None  # One sample so far
+    arrive(index, 20.0, "fast-3.pcap")
+    arrive(index, 60.0, "fast-4.pcap", "fast-5.pcap", "slow-2.pcap")
+
+    # Samples 10, 10 and 20 (40 s over two files), halfway each time
+    assert index.cadence("fast") == pytest.approx(15.0)
+    assert index.cadence("slow") is None
+    assert index.slowest_cadence() == pytest.approx(15.0)
+
+
+def test_files_without_app_name_are_ignored():
+    index = AppCadenceIndex(min_samples=1)
+
+    arrive(index, 0.0, "noappname.pcap")
+    arrive(index, 5.0, "noappname2.pcap")
+
+    assert index.slowest_cadence() is None
+
+
+def test_thresholds_follow_the_slowest_app_once_known():
+    index = AppCadenceIndex(smoothing=1.0, min_samples=1)
+    thresholds = CadenceThresholds(index=index, lost_factor=2.0, stuck_factor=4.0)
+
+    assert thresholds.derive(46.0, 61.0) == (46.0, 61.0)
+
+    arrive(index, 0.0, "a-1.pcap", "b-1.pcap")
+    arrive(index, 5.0, "a-2.pcap")
+    arrive(index, 10.0, "b-2.pcap")
+
+    assert thresholds.derive(46.0, 61.0) == pytest.approx((20.0, 40.0))
+
+
+def test_very_fast_cadence_keeps_a_minimum_lost_timeout():
+    index = AppCadenceIndex(smoothing=1.0, min_samples=1)
+    thresholds = CadenceThresholds(index=index, lost_factor=2.0, stuck_factor=4.0)
+    arrive(index, 0.0, "a-1.pcap")
+    arrive(index, 1.0, "a-2.pcap")
+
+    # 4 s stuck would not be later than the 5 s minimum lost timeout
+    assert MIN_DERIVED_LOST_SECONDS == 5.0
+    assert thresholds.derive(46.0, 61.0) == (46.0, 61.0)
+
+
+def grow(index: AppCadenceIndex, mono: float, *files: tuple[str, int, int]) -> None:
+    index.observe_growth(
+        [(BASE / name, size, grown) for name, size, grown in files], mono
+    )
+
+
+def learned_index() -> AppCadenceIndex:
+    """'a' starts a file every 10 s and writes 100 bytes/s into it."""
+    index = AppCadenceIndex(smoothing=1.0, min_samples=1)
+    arrive(index, 0.0, "a-1.pcap")
+    grow(index, 0.0, ("a-1.pcap", 0, 0))
+    grow(index, 5.0, ("a-1.pcap", 500, 500))
+    arrive(index, 10.0, "a-2.pcap")
+    grow(index, 10.0, ("a-1.pcap", 1000, 500), ("a-2.pcap", 0, 0))
+    return index
+
+
+def test_write_rate_and_typical_file_size_are_learned():
+    index = learned_index()
+    arrive(index, 20.0, "a-3.pcap")
+    grow(index, 20.0, ("a-2.pcap", 800, 800))
+
+    [health] = index.health(20.0, overrun_factor=3.0)
+    assert health.status is AppStatus.OK
+    assert health.cadence_seconds == 10.0
+    assert health.bytes_per_second == pytest.approx(80.0)
+    # a-1 kept growing after a-2 started; its final size is what counts
+    assert health.typical_file_size == 1000.0
+    assert health.current_file == BASE / "a-3.pcap"
+
+
+@pytest.mark.parametrize(
+    "last_growth, status",
+    [(35.0, AppStatus.OVERRUN), (12.0, AppStatus.SILENT)],
+    ids=["still_writing", "stopped"],
+)
+def test_app_without_new_file_for_factor_cadences_is_flagged(last_growth, status):
+    index = learned_index()
+    monitor = AppHealthMonitor(index=index, overrun_factor=3.0)
+    grow(index, last_growth, ("a-2.pcap", 2000, 100))
+
+    assert monitor.flagged_apps(40.0) == {}
+    flagged = monitor.flagged_apps(41.0)
+
+    assert flagged["a"].status is status
+    assert flagged["a"].seconds_since_arrival == 31.0
+
+
+def test_apps_still_learning_are_never_flagged():
+    index = AppCadenceIndex(min_samples=3)
+    arrive(index, 0.0, "a-1.pcap")
+    monitor = AppHealthMonitor(index=index, overrun_factor=2.0)
+
+    [health] = monitor.health(1000.0)
+
+    assert health.status is AppStatus.LEARNING
+    assert monitor.flagged_apps(1000.0) == {}
+    with pytest.raises(ValueError):
+        AppHealthMonitor(index=index, overrun_factor=1.0)
@@ -0,0 +1,226 @@
+import logging
+import os
+import threading
+from pathlib import Path
+from queue import Queue
+from unittest.mock import MagicMock
+
+import pytest
+from watchdog.events import FileClosedEvent
+
+from datamover.file_functions.fs_mock import FS
+from datamover.queues.claim_registry import ClaimRegistry
+from datamover.queues.manifest_index import ManifestIndex
+from datamover.scanner.close_write_trigger import (
+    CloseWriteTriggerThread,
+    PcapCloseHandler,
+)
+from tests.test_utils.logging_helpers import find_log_record
+
+WATCHED = Path("/data/source")
+PCAP = WATCHED / "a.pcap"
+SETTLE = 2.0
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _stat_result(size: int) -> os.stat_result:
+    return os.stat_result((0o100644, 0, 0, 1, 0, 0, size, 0, 0, 0))
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def fs() -> MagicMock:
+    return MagicMock(spec=FS)
+
+
+@pytest.fixture
+def move_queue() -> Queue:
+    return Queue()
+
+
+def _make_thread(clock, fs, move_queue, claim_registry=None, manifest_index=None):
+    return CloseWriteTriggerThread(
+        watched_directory=WATCHED,
+        file_extension_no_dot="pcap",
+        move_queue=move_queue,
+        stop_event=threading.Event(),
+        fs=fs,
+        settle_seconds=SETTLE,
+        claim_registry=claim_registry,
+        manifest_index=manifest_index,
+        monotonic_func=clock,
+        observer_factory=MagicMock,
+    )
+
+
+# --- PcapCloseHandler ---
+
+
+@pytest.mark.parametrize(
+    "event, expected",
+    [
+        (FileClosedEvent(str(PCAP)), [PCAP]),
+        (FileClosedEvent(str(WATCHED / "B.PCAP")), [WATCHED / "B.PCAP"]),
+        (FileClosedEvent(str(WATCHED / "a.csv")), []),
+        (FileClosedEvent(str(WATCHED / "sub" / "a.pcap")), []),
+        (MagicMock(is_directory=True, src_path=str(WATCHED / "x.pcap")), []),
+    ],
+)
+def test_handler_reports_only_matching_files(event, expected):
+    seen = []
+    handler = PcapCloseHandler(
+        watched_directory=WATCHED, file_extension="pcap", on_file_closed=seen.append
+    )
+    handler.on_closed(event)
+    assert seen == expected
+
+
+# --- CloseWriteTriggerThread ---
+
+
+def test_observer_is_scheduled_on_watched_directory(clock, fs, move_queue):
+    thread = _make_thread(clock, fs, move_queue)
+    thread.observer.schedule.assert_called_once_with(
+        thread.handler, str(WATCHED), recursive=False
+    )
+
+
+def test_enqueues_file_once_size_settles(clock, fs, move_queue, caplog):
+    caplog.set_level(logging.INFO)
+    fs.stat.return_value = _stat_result(500)
+    thread = _make_thread(clock, fs, move_queue)
+
+    thread.note_closed(PCAP)
+    thread.check_pending()  # First size sample
+    assert move_queue.empty()
+
+    clock.now += SETTLE - 0.1
+    thread.check_pending()  # Not due yet
+    assert fs.stat.call_count == 1
+
+    clock.now += 0.1
+    thread.check_pending()
+    assert move_queue.get_nowait() == PCAP
+    assert thread.enqueued_count == 1
+    assert thread.total_close_to_enqueue_seconds == pytest.approx(SETTLE)
+    assert find_log_record(caplog, logging.INFO, ["Enqueued closed file", "a.pcap"])
+
+
+def test_growing_file_is_rearmed(clock, fs, move_queue):
+    fs.stat.side_effect = [_stat_result(100), _stat_result(200), _stat_result(200)]
+    thread = _make_thread(clock, fs, move_queue)
+
+    thread.note_closed(PCAP)
+    thread.check_pending()
+    clock.now += SETTLE
+    thread.check_pending()  # Grew: settle again
+    assert move_queue.empty()
+    assert thread.rearmed_count == 1
+
+    clock.now += SETTLE
+    thread.check_pending()
+    assert move_queue.get_nowait() == PCAP
+
+
+def test_vanished_file_is_dropped(clock, fs, move_queue):
+    fs.stat.side_effect = [_stat_result(100), FileNotFoundError()]
+    thread = _make_thread(clock, fs, move_queue)
+
+    thread.note_closed(PCAP)
+    thread.check_pending()
+    clock.now += SETTLE
+    thread.check_pending()
+
+    assert move_queue.empty()
+    assert thread.vanished_count == 1
+    assert thread._next_wait() == thread.poll_interval
+
+
+def test_file_already_claimed_is_suppressed(clock, fs, move_queue):
+    fs.stat.return_value = _stat_result(100)
+    registry = ClaimRegistry(completed_ttl_seconds=60.0, monotonic_func=clock)
+    assert registry.try_register(PCAP, source="tailer")
+    thread = _make_thread(clock, fs, move_queue, claim_registry=registry)
+
+    thread.note_closed(PCAP)
+    thread.check_pending()
+    clock.now += SETTLE
+    thread.check_pending()
+
+    assert move_queue.empty()
+    assert thread.suppressed_count == 1
+    assert registry.stats().suppressed_by_source == {"close_write": 1}
+
+
+def test_file_announced_by_manifest_is_left_to_tailer(clock, fs, move_queue):
+    fs.stat.return_value = _stat_result(100)
+    index = ManifestIndex(max_entries=10, ttl_seconds=60.0, monotonic_func=clock)
+    index.record(PCAP, timestamp=1, sha256_hash="abc")
+    registry = ClaimRegistry(completed_ttl_seconds=60.0, monotonic_func=clock)
+    thread = _make_thread(
+        clock, fs, move_queue, claim_registry=registry, manifest_index=index
+    )
+
+    thread.note_closed(PCAP)
+    thread.check_pending()
+    clock.now += SETTLE
+    thread.check_pending()
+
+    assert move_queue.empty()
+    assert thread.suppressed_count == 1
+    # No claim was taken, so the tailer's request is not suppressed either
+    assert registry.try_register(PCAP, source="tailer")
+
+
+def test_file_not_yet_announced_is_enqueued(clock, fs, move_queue):
+    fs.stat.return_value = _stat_result(100)
+    index = ManifestIndex(max_entries=10, ttl_seconds=60.0, monotonic_func=clock)
+    thread = _make_thread(clock, fs, move_queue, manifest_index=index)
+
+    thread.note_closed(PCAP)
+    thread.check_pending()
+    clock.now += SETTLE
+    thread.check_pending()
+
+    assert move_queue.get_nowait() == PCAP
+    assert thread.suppressed_count == 0
+
+
+def test_failed_put_releases_claim(clock, fs, caplog):
+    fs.stat.return_value = _stat_result(100)
+    registry = ClaimRegistry(completed_ttl_seconds=60.0, monotonic_func=clock)
+    failing_queue = MagicMock(spec=Queue)
+    failing_queue.put.side_effect = RuntimeError("queue broken")
+    thread = _make_thread(clock, fs, failing_queue, claim_registry=registry)
+
+    thread.note_closed(PCAP)
+    thread.check_pending()
+    clock.now += SETTLE
+    thread.check_pending()
+
+    assert thread.enqueued_count == 0
+    assert registry.try_register(PCAP, source="tailer")
+    assert find_log_record(caplog, logging.ERROR, ["Failed to enqueue closed file"])
+
+
+def test_run_stops_observer_on_shutdown(clock, fs, move_queue):
+    thread = _make_thread(clock, fs, move_queue)
+    thread.poll_interval = 0.01
+    thread.start()
+    thread.stop_event.set()
+    thread.join(timeout=2.0)
+
+    assert not thread.is_alive()
+    thread.observer.start.assert_called_once()
+    thread.observer.stop.assert_called_once()
@@ -8,9 +8,16 @@ import pytest
 
 from datamover.file_functions.file_exceptions import ScanDirectoryError
 from datamover.file_functions.gather_entry_data import GatheredEntryData
+from datamover.queues.claim_registry import ClaimRegistry
+from datamover.queues.manifest_index import ManifestIndex
 from datamover.queues.queue_functions import QueuePutError
+from datamover.scanner.activity_tracker import ActivityTracker
+from datamover.scanner.adaptive_interval import CycleMetrics
+from datamover.scanner.app_cadence import AppCadenceIndex, CadenceThresholds
 from datamover.scanner.do_single_cycle import DoSingleCycle
 from datamover.scanner.file_state_record import FileStateRecord
+from datamover.scanner.file_state_table import FileStateTable
+from datamover.scanner.open_writers import OpenWriterSnapshot, ProcOpenWriters
 
 # --- Test Target ---
 
@@ -347,6 +354,7 @@ def test_enqueue_variations_and_happy_path_logs(
         directory=processor.directory_to_scan,
         fs=processor.fs,
         extension_no_dot=processor.extension_no_dot,
+        fast_scan=False,
     )
     patch_process.assert_called_once_with(
         gathered_data=mock_gathered_data,
@@ -513,3 +521,284 @@ def test_process_one_cycle_safe_put_fails_in_enqueue_loop(
             assert log_entry.exc_info[1] is put_side_effect_exception, (
                 "Incorrect exception instance in exc_info"
             )
+
+
+# --- Claim registry consulted before enqueuing lost files ---
+
+
+def test_enqueue_lost_files_skips_paths_in_claim_registry(
+    mock_fs: MagicMock,
+    mock_lost_file_queue: MagicMock,
+    patch_put: MagicMock,
+):
+    registry = ClaimRegistry(completed_ttl_seconds=60.0)
+    already_queued = SCAN_DIR / "queued_by_tailer.pcap"
+    fresh = SCAN_DIR / "fresh.pcap"
+    assert registry.try_register(already_queued, source="tailer")
+
+    proc = DoSingleCycle(
+        validated_directory_to_scan=SCAN_DIR,
+        csv_restart_directory=CSV_RESTART_DIR,
+        extension_to_scan_no_dot=EXT,
+        lost_timeout=LOST_T,
+        stuck_active_file_timeout=STUCK_T,
+        lost_file_queue=mock_lost_file_queue,
+        time_func=lambda: MOCK_WALL,
+        monotonic_func=lambda: MOCK_MONO,
+        fs=mock_fs,
+        claim_registry=registry,
+    )
+
+    proc._enqueue_lost_files(paths_to_enqueue={already_queued, fresh})
+
+    patch_put.assert_called_once_with(
+        item=fresh,
+        output_queue=mock_lost_file_queue,
+        queue_name=proc.lost_queue_name,
+    )
+    assert registry.stats().suppressed_by_source == {"scanner": 1}
+
+
+def test_enqueue_lost_files_releases_claim_on_put_error(
+    mock_fs: MagicMock,
+    mock_lost_file_queue: MagicMock,
+    patch_put: MagicMock,
+):
+    registry = ClaimRegistry(completed_ttl_seconds=60.0)
+    path = SCAN_DIR / "lost.pcap"
+    patch_put.side_effect = QueuePutError("full")
+
+    proc = DoSingleCycle(
+        validated_directory_to_scan=SCAN_DIR,
+        csv_restart_directory=CSV_RESTART_DIR,
+        extension_to_scan_no_dot=EXT,
+        lost_timeout=LOST_T,
+        stuck_active_file_timeout=STUCK_T,
+        lost_file_queue=mock_lost_file_queue,
+        time_func=lambda: MOCK_WALL,
+        monotonic_func=lambda: MOCK_MONO,
+        fs=mock_fs,
+        claim_registry=registry,
+    )
+
+    proc._enqueue_lost_files(paths_to_enqueue={path})
+
+    assert registry.try_register(path, source="tailer") is True
+
+
+@pytest.mark.parametrize("snapshot_available", [True, False], ids=["tracked", "rescan"])
+def test_gather_entries_uses_activity_tracker(
+    processor: DoSingleCycle,
+    mock_fs: MagicMock,
+    patch_scan: MagicMock,
+    snapshot_available: bool,
+):
+    tracked = [GatheredEntryData(mtime=1.0, size=1, path=SCAN_DIR / "t.pcap")]
+    scanned = [GatheredEntryData(mtime=2.0, size=2, path=SCAN_DIR / "s.pcap")]
+    tracker = MagicMock(spec=ActivityTracker)
+    tracker.snapshot.return_value = tracked if snapshot_available else None
+    tracker.begin_rescan.return_value = 7
+    patch_scan.return_value = scanned
+    processor.activity_tracker = tracker
+
+    gathered = processor._gather_entries()
+
+    if snapshot_available:
+        assert gathered is tracked
+        patch_scan.assert_not_called()
+        tracker.complete_rescan.assert_not_called()
+    else:
+        assert gathered is scanned
+        patch_scan.assert_called_once_with(
+            directory=SCAN_DIR, fs=mock_fs, extension_no_dot=EXT, fast_scan=False
+        )
+        tracker.complete_rescan.assert_called_once_with(7, scanned)
+
+
+@pytest.mark.parametrize("use_table", [False, True], ids=["dict", "table"])
+def test_cycle_metrics_count_new_changed_and_removed_files(
+    processor: DoSingleCycle, patch_scan: MagicMock, use_table: bool
+):
+    def entry(name: str, size: int) -> GatheredEntryData:
+        return GatheredEntryData(mtime=MOCK_WALL, size=size, path=SCAN_DIR / name)
+
+    states = FileStateTable() if use_table else {}
+    patch_scan.return_value = [entry("a-1.pcap", 1), entry("a-2.pcap", 1)]
+    states, _, _ = processor.process_one_cycle(states, set(), set())
+    patch_scan.return_value = [entry("a-2.pcap", 5), entry("a-3.pcap", 1)]
+
+    processor.process_one_cycle(states, set(), set())
+
+    assert processor.last_cycle_metrics == CycleMetrics(
+        entries=2, new_files=1, changed_files=1, removed_files=1
+    )
+
+
+def test_cadence_thresholds_replace_timeouts_once_learned(
+    mock_fs: MagicMock, mock_lost_file_queue: MagicMock, patch_scan: MagicMock
+):
+    mono = [0.0]
+    index = AppCadenceIndex(smoothing=1.0, min_samples=2)
+    processor = DoSingleCycle(
+        validated_directory_to_scan=SCAN_DIR,
+        csv_restart_directory=CSV_RESTART_DIR,
+        extension_to_scan_no_dot=EXT,
+        lost_timeout=LOST_T,
+        stuck_active_file_timeout=STUCK_T,
+        lost_file_queue=mock_lost_file_queue,
+        time_func=lambda: MOCK_WALL,
+        monotonic_func=lambda: mono[0],
+        fs=mock_fs,
+        cadence_thresholds=CadenceThresholds(
+            index=index, lost_factor=2.0, stuck_factor=4.0
+        ),
+    )
+    states: object = {}
+    files: list[GatheredEntryData] = []
+    for cycle in range(3):
+        mono[0] = cycle * 4.0
+        files.append(
+            GatheredEntryData(
+                mtime=MOCK_WALL, size=1, path=SCAN_DIR / f"app-{cycle}.pcap"
+            )
+        )
+        patch_scan.return_value = list(files)
+        states, _, _ = processor.process_one_cycle(states, set(), set())
+
+    assert (processor.lost_timeout, processor.stuck_active_file_timeout) == (
+        LOST_T,
+        STUCK_T,
+    )
+    processor.process_one_cycle(states, set(), set())
+
+    assert index.cadence("app") == 4.0
+    assert (processor.lost_timeout, processor.stuck_active_file_timeout) == (8.0, 16.0)
+    assert processor.configured_lost_timeout == LOST_T
+
+
+@pytest.mark.parametrize("use_table", [False, True], ids=["dict", "table"])
+def test_settled_file_without_open_writer_is_lost_at_once(
+    processor: DoSingleCycle,
+    patch_scan: MagicMock,
+    patch_put: MagicMock,
+    caplog: pytest.LogCaptureFixture,
+    use_table: bool,
+):
+    caplog.set_level(logging.INFO, logger=MODULE)
+    writing, closed = SCAN_DIR / "app-1.pcap", SCAN_DIR / "app-2.pcap"
+    open_writers = MagicMock(spec=ProcOpenWriters)
+    open_writers.snapshot.return_value = OpenWriterSnapshot(
+        paths=frozenset({writing}), complete=True, processes=1
+    )
+    processor.open_writers = open_writers
+    patch_scan.return_value = [
+        GatheredEntryData(mtime=MOCK_WALL, size=10, path=writing),
+        GatheredEntryData(mtime=MOCK_WALL, size=10, path=closed),
+    ]
+    states: object = FileStateTable() if use_table else {}
+
+    # First sighting: nothing is known to be settled yet
+    states, lost, _ = processor.process_one_cycle(states, set(), set())
+    assert lost == set()
+    open_writers.snapshot.assert_not_called()
+
+    states, lost, _ = processor.process_one_cycle(states, lost, set())
+    assert lost == {closed}
+    patch_put.assert_called_once()
+    assert patch_put.call_args.kwargs["item"] == closed
+    assert find_log_record(caplog, logging.INFO, ["CLOSED", str(closed)])
+
+    # Still there and unchanged: stays lost without being queued again
+    _, lost, _ = processor.process_one_cycle(states, lost, set())
+    assert lost == {closed}
+    assert patch_put.call_count == 1
+
+
+def test_incomplete_open_writer_snapshot_waits_for_lost_timeout(
+    processor: DoSingleCycle, patch_scan: MagicMock, patch_put: MagicMock
+):
+    open_writers = MagicMock(spec=ProcOpenWriters)
+    open_writers.snapshot.return_value = OpenWriterSnapshot(
+        paths=frozenset(), complete=False, processes=1
+    )
+    processor.open_writers = open_writers
+    patch_scan.return_value = [
+        GatheredEntryData(mtime=MOCK_WALL, size=10, path=SCAN_DIR / "app-1.pcap")
+    ]
+
+    states, lost, _ = processor.process_one_cycle({}, set(), set())
+    _, lost, _ = processor.process_one_cycle(states, lost, set())
+
+    assert lost == set()
+    patch_put.assert_not_called()
+
+
+def test_manifest_reconciliation_requeues_announced_files_left_behind(
+    mock_fs: MagicMock,
+    mock_lost_file_queue: MagicMock,
+    patch_scan: MagicMock,
+    patch_put: MagicMock,
+):
+    mono = [100.0]
+    index = ManifestIndex(
+        max_entries=10, ttl_seconds=600.0, monotonic_func=lambda: mono[0]
+    )
+    processor = DoSingleCycle(
+        validated_directory_to_scan=SCAN_DIR,
+        csv_restart_directory=CSV_RESTART_DIR,
+        extension_to_scan_no_dot=EXT,
+        lost_timeout=LOST_T,
+        stuck_active_file_timeout=STUCK_T,
+        lost_file_queue=mock_lost_file_queue,
+        time_func=lambda: MOCK_WALL,
+        monotonic_func=lambda: mono[0],
+        fs=mock_fs,
+        manifest_index=index,
+    )
+    left_behind = SCAN_DIR / "app-1.pcap"
+    patch_scan.return_value = [
+        GatheredEntryData(mtime=MOCK_WALL, size=10, path=left_behind)
+    ]
+
+    states, _, _ = processor.process_one_cycle({}, set(), set())
+    index.record(left_behind, timestamp=1, sha256_hash="a" * 64)
+    mono[0] += 5.0
+    # Announced since the last cycle: the tailer's request may still be queued
+    states, _, _ = processor.process_one_cycle(states, set(), set())
+    patch_put.assert_not_called()
+
+    mono[0] += 5.0
+    processor.process_one_cycle(states, set(), set())
+
+    patch_put.assert_called_once()
+    assert patch_put.call_args.kwargs["item"] == left_behind
+
+
+def test_lost_files_never_announced_are_reported(
+    processor: DoSingleCycle,
+    patch_scan: MagicMock,
+    patch_put: MagicMock,
+    caplog: pytest.LogCaptureFixture,
+):
+    caplog.set_level(logging.INFO, logger=MODULE)
+    index = ManifestIndex(
+        max_entries=10, ttl_seconds=600.0, monotonic_func=lambda: MOCK_MONO
+    )
+    processor.manifest_index = index
+    announced, unannounced = SCAN_DIR / "app-1.pcap", SCAN_DIR / "app-2.pcap"
+    index.record(announced, timestamp=1, sha256_hash="a" * 64)
+    old = MOCK_WALL - LOST_T - 1
+    patch_scan.return_value = [
+        GatheredEntryData(mtime=old, size=10, path=announced),
+        GatheredEntryData(mtime=old, size=10, path=unannounced),
+    ]
+
+    states, _, _ = processor.process_one_cycle({}, set(), set())
+    processor.process_one_cycle(states, set(), set())
+
+    assert find_log_record(
+        caplog, logging.WARNING, ["never announced", str(unannounced)]
+    )
+    assert not find_log_record(
+        caplog, logging.WARNING, ["never announced", str(announced)]
+    )
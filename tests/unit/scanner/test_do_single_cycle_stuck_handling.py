@@ -7,6 +7,8 @@ import pytest
 
 # FS type for mocking, adjust if you have a more specific FSProtocol
 from datamover.file_functions.fs_mock import FS  # Assuming FS is the type for self.fs
+from datamover.file_functions.gather_entry_data import GatheredEntryData
+from datamover.scanner.app_cadence import AppCadenceIndex, AppHealthMonitor, AppStatus
 
 # --- Classes and functions to be tested or mocked from the main application ---
 from datamover.scanner.do_single_cycle import DoSingleCycle
@@ -1183,3 +1185,53 @@ def test_tc_dsc_13_verify_order_of_side_effects(
     # If any of these assertions fail, it implies either not called or called with wrong args.
     # If they all pass, and assuming no exceptions were raised that aborted the sequence,
     # the order is implicitly verified by the code structure.
+
+
+def test_app_behind_its_cadence_gets_restart_trigger_before_stuck_timeout(
+    caplog: pytest.LogCaptureFixture,
+    mock_fs_stuck: MagicMock,
+    mock_lost_file_queue_stuck: MagicMock,
+    mock_scan_directory_and_filter: MagicMock,
+):
+    """An app rotating every 2s is signalled after 3 cadences without a file."""
+    caplog.set_level(logging.INFO, logger=MODULE_UNDER_TEST)
+    mono = [MOCK_TIME_MONO]
+    processor = DoSingleCycle(
+        validated_directory_to_scan=SCAN_DIR_TEST,
+        csv_restart_directory=CSV_RESTART_DIR_TEST,
+        extension_to_scan_no_dot=DEFAULT_EXTENSION,
+        lost_timeout=DEFAULT_LOST_TIMEOUT,
+        stuck_active_file_timeout=DEFAULT_STUCK_ACTIVE_TIMEOUT,
+        lost_file_queue=mock_lost_file_queue_stuck,
+        time_func=lambda: MOCK_TIME_WALL,
+        monotonic_func=lambda: mono[0],
+        fs=mock_fs_stuck,
+        app_health=AppHealthMonitor(
+            index=AppCadenceIndex(smoothing=1.0, min_samples=2), overrun_factor=3.0
+        ),
+    )
+    states: object = {}
+    for second in range(0, 8, 2):  # APP1-0 .. APP1-3, one every 2s
+        mono[0] = MOCK_TIME_MONO + second
+        mock_scan_directory_and_filter.return_value = [
+            GatheredEntryData(
+                mtime=MOCK_TIME_WALL,
+                size=100,
+                path=SCAN_DIR_TEST / f"APP1-{second // 2}.pcap",
+            )
+        ]
+        states, _, _ = processor.process_one_cycle(states, set(), set())
+    mock_fs_stuck.open.assert_not_called()
+
+    mono[0] = MOCK_TIME_MONO + 13.0  # 7s without a new file or growth
+    processor.process_one_cycle(states, set(), set())
+
+    mock_fs_stuck.open.assert_called_once_with(
+        CSV_RESTART_DIR_TEST / "APP1.restart", "a"
+    )
+    assert find_log_record(caplog, logging.WARNING, ["APP1", "silent"])
+    assert processor.previously_signaled_stuck_apps == {"APP1"}
+    [health] = processor.app_health_stats()
+    assert health.status is AppStatus.SILENT
+    assert health.cadence_seconds == 2.0
+    assert health.typical_file_size == 100.0  # APP1-0 and APP1-1
@@ -0,0 +1,272 @@
+import logging
+import random
+from pathlib import Path
+
+import pytest
+
+from datamover.file_functions.gather_entry_data import GatheredEntryData
+from datamover.scanner.file_state_record import FileStateRecord
+from datamover.scanner.file_state_table import HAVE_NUMPY, FileStateTable
+from datamover.scanner.process_scan_results import process_scan_results
+from tests.test_utils.logging_helpers import find_log_record
+
+BASE = Path("/test/scan_dir")
+LOST_TIMEOUT = 30.0
+STUCK_TIMEOUT = 60.0
+
+backends = pytest.mark.parametrize(
+    "use_numpy",
+    [
+        False,
+        pytest.param(
+            True,
+            marks=pytest.mark.skipif(not HAVE_NUMPY, reason="NumPy not installed"),
+        ),
+    ],
+    ids=["array", "numpy"],
+)
+
+
+def _entry(name: str, size: int, mtime: float) -> GatheredEntryData:
+    return GatheredEntryData(mtime=mtime, size=size, path=BASE / name)
+
+
+def _run_cycle(states, gathered, mono, wall):
+    return process_scan_results(
+        gathered_data=gathered,
+        existing_states=states,
+        lost_timeout=LOST_TIMEOUT,
+        stuck_active_timeout=STUCK_TIMEOUT,
+        monotonic_now=mono,
+        wall_now=wall,
+    )
+
+
+def _dict_states(gathered, mono):
+    states, removed, _, _ = _run_cycle({}, gathered, mono, 0.0)
+    return states, removed
+
+
+@backends
+def test_update_tracks_new_changed_and_removed_files(use_numpy):
+    table = FileStateTable(use_numpy=use_numpy)
+
+    assert table.update([_entry("a", 10, 100.0), _entry("b", 20, 100.0)], 5.0) == set()
+    assert table.is_new(BASE / "a")
+    a = table[BASE / "a"]
+    assert (a.size, a.prev_scan_size, a.first_seen_mono) == (10, 10, 5.0)
+
+    removed = table.update([_entry("b", 25, 101.0), _entry("c", 1, 101.0)], 9.0)
+
+    assert removed == {BASE / "a"}
+    assert set(table) == {BASE / "b", BASE / "c"}
+    b = table[BASE / "b"]
+    assert (b.size, b.prev_scan_size, b.mtime_wall, b.prev_scan_mtime_wall) == (
+        25,
+        20,
+        101.0,
+        100.0,
+    )
+    assert b.first_seen_mono == 5.0
+    assert not table.is_new(BASE / "b")
+    assert table.is_new(BASE / "c")
+
+
+@backends
+def test_table_compares_equal_to_dict_of_records(use_numpy):
+    table = FileStateTable(use_numpy=use_numpy)
+    assert table == {}
+
+    table.update([_entry("a", 10, 100.0)], 5.0)
+
+    states, _ = _dict_states([_entry("a", 10, 100.0)], 5.0)
+    assert table == states
+
+
+@backends
+def test_classification_matches_dict_implementation(use_numpy):
+    """Random multi-cycle workload: the table and the dict path must agree."""
+    rng = random.Random(1234)
+    table = FileStateTable(use_numpy=use_numpy)
+    states: dict = {}
+    files = {f"f{i}": (rng.randint(0, 100), 1000.0) for i in range(200)}
+    mono, wall = 100.0, 1000.0
+    seen_lost = seen_stuck = False
+
+    for _ in range(12):
+        mono += 20.0
+        wall += 20.0
+        for name in list(files):
+            roll = rng.random()
+            if roll < 0.1:
+                del files[name]
+            elif roll < 0.4:
+                size, _ = files[name]
+                files[name] = (size + rng.randint(1, 50), wall)
+        for i in range(rng.randint(0, 20)):
+            files[f"n{mono:.0f}_{i}"] = (0, wall)
+        gathered = [_entry(n, s, m) for n, (s, m) in files.items()]
+        rng.shuffle(gathered)
+
+        states, dict_removed, dict_lost, dict_stuck = _run_cycle(
+            states, gathered, mono, wall
+        )
+        next_table, removed, lost, stuck = _run_cycle(table, gathered, mono, wall)
+
+        assert next_table is table
+        assert removed == dict_removed
+        assert lost == dict_lost
+        assert stuck == dict_stuck
+        assert table == states
+        seen_lost |= bool(lost)
+        seen_stuck |= bool(stuck)
+
+    assert seen_lost and seen_stuck
+
+
+@backends
+def test_classification_follows_timeouts_that_change_between_cycles(use_numpy):
+    """CadenceThresholds can grow or shrink the timeouts from cycle to cycle."""
+    table = FileStateTable(use_numpy=use_numpy)
+    states: dict = {}
+    gathered = [_entry("a", 1, 0.0), _entry("b", 1, 20.0)]
+    # (mono, wall, lost_timeout, stuck_active_timeout)
+    cycles = [
+        (0.0, 25.0, 30.0, 60.0),
+        (50.0, 45.0, 30.0, 40.0),  # a lost and overdue; b overdue
+        (55.0, 50.0, 100.0, 100.0),  # both grown: nothing lost or overdue
+        (60.0, 55.0, 30.0, 55.0),  # shrunk again: a and b lost, both overdue
+    ]
+    results = []
+    for mono, wall, lost_timeout, stuck_timeout in cycles:
+        kwargs = dict(
+            gathered_data=gathered,
+            lost_timeout=lost_timeout,
+            stuck_active_timeout=stuck_timeout,
+            monotonic_now=mono,
+            wall_now=wall,
+        )
+        states, _, dict_lost, _ = process_scan_results(existing_states=states, **kwargs)
+        _, _, lost, _ = process_scan_results(existing_states=table, **kwargs)
+        assert lost == dict_lost
+        results.append(lost)
+        classification = table.classify(
+            wall_now=wall,
+            lost_timeout=lost_timeout,
+            monotonic_now=mono,
+            stuck_active_timeout=stuck_timeout,
+        )
+        assert classification.present_too_long_idle == {
+            path
+            for path, record in states.items()
+            if path not in lost and mono - record.first_seen_mono > stuck_timeout
+        }
+
+    assert results == [set(), {BASE / "a"}, set(), {BASE / "a", BASE / "b"}]
+
+
+@backends
+def test_columnar_path_logs_like_dict_path(use_numpy, caplog):
+    caplog.set_level(logging.INFO)
+    table = FileStateTable(use_numpy=use_numpy)
+    _run_cycle(table, [_entry("old", 1, 0.0), _entry("busy", 1, 0.0)], 0.0, 0.0)
+
+    _run_cycle(
+        table,
+        [_entry("old", 1, 0.0), _entry("busy", 2, 100.0)],
+        STUCK_TIMEOUT + 1.0,
+        LOST_TIMEOUT + 1.0,
+    )
+
+    assert find_log_record(caplog, logging.INFO, ["Identified file as LOST", "old"])
+    assert find_log_record(
+        caplog, logging.WARNING, ["Identified file as STUCK ACTIVE", "busy"]
+    )
+
+
+def test_use_numpy_without_numpy_is_rejected(monkeypatch):
+    from datamover.scanner import file_state_table
+
+    monkeypatch.setattr(file_state_table, "HAVE_NUMPY", False)
+    with pytest.raises(ValueError):
+        FileStateTable(use_numpy=True)
+
+
+@backends
+def test_lost_file_leaves_lost_set_when_it_changes(use_numpy):
+    table = FileStateTable(use_numpy=use_numpy)
+    _run_cycle(table, [_entry("a", 1, 0.0)], 0.0, 0.0)
+
+    _, _, lost, _ = _run_cycle(table, [_entry("a", 1, 0.0)], 5.0, LOST_TIMEOUT + 1.0)
+    assert lost == {BASE / "a"}
+
+    wall = LOST_TIMEOUT + 2.0
+    _, _, lost, _ = _run_cycle(table, [_entry("a", 2, wall)], 10.0, wall)
+    assert lost == set()
+
+
+@backends
+def test_removed_and_re_added_file_starts_a_new_deadline(use_numpy):
+    table = FileStateTable(use_numpy=use_numpy)
+    _run_cycle(table, [_entry("a", 1, 0.0)], 0.0, 0.0)
+    _run_cycle(table, [], 5.0, 5.0)
+
+    # Same name and mtime as before, but the old heap entries must not apply
+    _, _, lost, stuck = _run_cycle(
+        table, [_entry("a", 1, 0.0)], STUCK_TIMEOUT + 1.0, LOST_TIMEOUT + 1.0
+    )
+
+    assert lost == set()
+    assert stuck == set()
+
+
+@backends
+def test_seconds_until_next_deadline(use_numpy):
+    table = FileStateTable(use_numpy=use_numpy)
+    assert table.seconds_until_next_deadline(0.0) is None
+
+    _run_cycle(table, [_entry("a", 1, 90.0)], 0.0, 100.0)
+    # Lost at wall 120 (20s away), overdue at mono 60
+    assert table.seconds_until_next_deadline(0.0) == pytest.approx(20.0)
+    assert table.seconds_until_next_deadline(5.0) == pytest.approx(15.0)
+    assert table.seconds_until_next_deadline(50.0) == 0.0
+
+    _run_cycle(table, [], 1.0, 101.0)
+    assert table.seconds_until_next_deadline(1.0) is None
+
+
+@backends
+def test_loaded_records_are_not_new_and_can_be_lost(use_numpy):
+    table = FileStateTable(use_numpy=use_numpy)
+    saved = FileStateRecord(
+        path=BASE / "a",
+        size=1,
+        mtime_wall=0.0,
+        first_seen_mono=-100.0,
+        prev_scan_size=1,
+        prev_scan_mtime_wall=0.0,
+    )
+    table.load_records([saved])
+    assert table[BASE / "a"] == saved
+
+    _, _, lost, _ = _run_cycle(table, [_entry("a", 1, 0.0)], 0.0, LOST_TIMEOUT + 1.0)
+
+    assert not table.is_new(BASE / "a")
+    assert table[BASE / "a"].first_seen_mono == -100.0
+    assert lost == {BASE / "a"}
+
+
+@backends
+def test_new_and_changed_paths_describe_the_last_update(use_numpy):
+    table = FileStateTable(use_numpy=use_numpy)
+    table.update([_entry("a", 10, 100.0), _entry("b", 20, 100.0)], 5.0)
+
+    assert sorted(table.new_paths()) == [BASE / "a", BASE / "b"]
+    assert table.changed_paths() == []
+
+    table.update(
+        [_entry("a", 15, 101.0), _entry("b", 20, 100.0), _entry("c", 1, 101.0)], 9.0
+    )
+
+    assert table.new_paths() == [BASE / "c"]
+    assert table.changed_paths() == [BASE / "a"]
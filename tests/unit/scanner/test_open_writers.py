@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from datamover.scanner.open_writers import ProcOpenWriters, closed_stable_files
+from tests.test_utils.fake_proc import FakeProc
+
+WRITE_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_APPEND
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    directory = tmp_path / "source"
+    directory.mkdir()
+    for name in ("app-1.pcap", "app-2.pcap", "app-3.pcap"):
+        (directory / name).touch()
+    return directory
+
+
+@pytest.fixture
+def proc(tmp_path: Path) -> FakeProc:
+    return FakeProc(tmp_path / "proc")
+
+
+def make_writers(source: Path, proc: FakeProc, **kwargs) -> ProcOpenWriters:
+    return ProcOpenWriters(directory=source, proc_root=proc.root, **kwargs)
+
+
+def test_snapshot_keeps_producer_writers_into_the_directory(
+    source: Path, proc: FakeProc, tmp_path: Path
+):
+    proc.add_process(100, "exportcliv2")
+    proc.open_file(100, 3, source / "app-1.pcap", WRITE_FLAGS)
+    proc.open_file(100, 4, source / "app-2.pcap", os.O_RDONLY)
+    proc.open_file(100, 5, tmp_path / "elsewhere.log", WRITE_FLAGS)
+    proc.add_process(200, "tcpdump")
+    proc.open_file(200, 3, source / "app-3.pcap", os.O_RDWR)
+
+    snapshot = make_writers(source, proc, process_names=["exportcliv2"]).snapshot()
+
+    assert snapshot.complete
+    assert snapshot.processes == 1
+    assert snapshot.paths == frozenset({source / "app-1.pcap"})
+
+
+def test_every_process_is_a_producer_when_none_are_configured(
+    source: Path, proc: FakeProc
+):
+    proc.add_process(100, "exportcliv2")
+    proc.add_process(200, "tcpdump")
+    proc.open_file(200, 3, source / "app-3.pcap", os.O_RDWR)
+
+    snapshot = make_writers(source, proc).snapshot()
+
+    assert snapshot.processes == 2
+    assert snapshot.is_open_for_writing(source / "app-3.pcap")
+
+
+def test_producers_can_be_selected_by_user(source: Path, proc: FakeProc):
+    proc.add_process(100, "anything")
+    proc.open_file(100, 3, source / "app-1.pcap", WRITE_FLAGS)
+
+    mine = make_writers(source, proc, user_ids=[os.getuid()]).snapshot()
+    others = make_writers(source, proc, user_ids=[os.getuid() + 1]).snapshot()
+
+    assert mine.paths == frozenset({source / "app-1.pcap"})
+    assert others.processes == 0
+
+
+def test_unreadable_descriptors_make_the_snapshot_incomplete(
+    source: Path, proc: FakeProc
+):
+    process_dir = proc.add_process(100, "exportcliv2")
+    proc.open_file(100, 3, source / "app-1.pcap", WRITE_FLAGS)
+    (process_dir / "fdinfo" / "3").write_text("pos:\t0\n")  # No flags line
+
+    snapshot = make_writers(source, proc).snapshot()
+
+    assert not snapshot.complete
+    assert (
+        closed_stable_files(
+            candidates={source / "app-2.pcap"}, open_writers=make_writers(source, proc)
+        )
+        is None
+    )
+
+
+def test_missing_proc_root_gives_an_incomplete_snapshot(source: Path, tmp_path: Path):
+    writers = ProcOpenWriters(directory=source, proc_root=tmp_path / "no-proc")
+
+    snapshot = writers.snapshot()
+
+    assert not snapshot.complete
+    assert snapshot.paths == frozenset()
+
+
+def test_closed_stable_files_are_the_candidates_nobody_writes(
+    source: Path, proc: FakeProc
+):
+    proc.add_process(100, "exportcliv2")
+    proc.open_file(100, 3, source / "app-3.pcap", WRITE_FLAGS)
+    writers = make_writers(source, proc, process_names=["exportcliv2"])
+    candidates = {source / "app-1.pcap", source / "app-3.pcap"}
+
+    assert closed_stable_files(candidates=candidates, open_writers=writers) == {
+        source / "app-1.pcap"
+    }
+    proc.close_file(100, 3)
+    assert closed_stable_files(candidates=candidates, open_writers=writers) == (
+        candidates
+    )
@@ -5,7 +5,11 @@ from unittest.mock import MagicMock, call
 
 import pytest
 
-from datamover.scanner.scan_thread import ScanThread
+from datamover.scanner.activity_tracker import ActivityTracker
+from datamover.scanner.adaptive_interval import AdaptiveScanInterval, CycleMetrics
+from datamover.scanner.file_state_table import FileStateTable
+from datamover.scanner.scan_thread import MIN_DEADLINE_WAIT_SECONDS, ScanThread
+from datamover.scanner.scanner_state_store import SavedScannerState, ScannerStateStore
 from datamover.scanner.do_single_cycle import DoSingleCycle
 from datamover.scanner.file_state_record import FileStateRecord  # For type hinting
 from datamover.file_functions.file_exceptions import ScanDirectoryError
@@ -558,6 +562,142 @@ class TestScanThreadRun:
         )
 
 
+class TestScanThreadDeadlineWake:
+    @pytest.fixture
+    def waking_thread(
+        self,
+        mock_processor: MagicMock,
+        mock_stop_event: MagicMock,
+        mock_sleep_func: MagicMock,
+        mock_monotonic_func: MagicMock,
+    ) -> ScanThread:
+        thread = ScanThread(
+            processor=mock_processor,
+            stop_event=mock_stop_event,
+            scan_interval_seconds=10.0,
+            sleep_func=mock_sleep_func,
+            monotonic_func=mock_monotonic_func,
+            name=THREAD_NAME,
+            wake_for_deadlines=True,
+        )
+        thread._current_file_states = MagicMock(spec=FileStateTable)
+        return thread
+
+    @pytest.mark.parametrize(
+        "deadline_wait, expected_wait",
+        [
+            (None, 10.0),
+            (20.0, 10.0),
+            (4.0, 4.1),
+            (0.0, MIN_DEADLINE_WAIT_SECONDS),
+        ],
+        ids=["no_deadline", "deadline_after_interval", "early", "floored"],
+    )
+    def test_wait_is_shortened_to_next_deadline(
+        self, waking_thread: ScanThread, deadline_wait, expected_wait
+    ):
+        states = waking_thread._current_file_states
+        states.seconds_until_next_deadline.return_value = deadline_wait
+
+        assert waking_thread.shorten_wait_for_deadline(10.0) == pytest.approx(
+            expected_wait
+        )
+        states.seconds_until_next_deadline.assert_called_once_with(MOCK_MONO_START)
+
+    def test_wait_not_shortened_when_disabled(
+        self,
+        scan_thread_instance: ScanThread,
+        mock_stop_event: MagicMock,
+        mock_monotonic_func: MagicMock,
+    ):
+        states = MagicMock(spec=FileStateTable)
+        states.seconds_until_next_deadline.return_value = 0.0
+        scan_thread_instance._current_file_states = states
+        mock_stop_event.is_set.side_effect = [False, False, True]
+        setup_monotonic_time_for_cycles(
+            mock_monotonic_func, num_cycles=1, cycle_duration=MOCK_MONO_CYCLE_DURATION
+        )
+
+        scan_thread_instance.run()
+
+        states.seconds_until_next_deadline.assert_not_called()
+        mock_stop_event.wait.assert_called_once_with(
+            pytest.approx(SCAN_INTERVAL - MOCK_MONO_CYCLE_DURATION)
+        )
+
+
+class TestScanThreadActivityTracker:
+    def test_run_starts_and_stops_processor_tracker(
+        self,
+        mock_processor: MagicMock,
+        mock_stop_event: MagicMock,
+        mock_sleep_func: MagicMock,
+        mock_monotonic_func: MagicMock,
+    ):
+        tracker = MagicMock(spec=ActivityTracker)
+        tracker.stop_event = threading.Event()
+        tracker.is_alive.side_effect = [True, False]
+        tracker.name = "ActivityTracker-test_dir"
+        mock_processor.activity_tracker = tracker
+        mock_stop_event.is_set.side_effect = [True]
+        thread = ScanThread(
+            processor=mock_processor,
+            stop_event=mock_stop_event,
+            scan_interval_seconds=SCAN_INTERVAL,
+            sleep_func=mock_sleep_func,
+            monotonic_func=mock_monotonic_func,
+            name=THREAD_NAME,
+        )
+
+        thread.run()
+
+        tracker.start.assert_called_once()
+        assert tracker.stop_event.is_set()
+        tracker.join.assert_called_once()
+
+
+class TestScanThreadStateStore:
+    def test_run_restores_then_saves_state(
+        self,
+        mock_processor: MagicMock,
+        mock_stop_event: MagicMock,
+        mock_sleep_func: MagicMock,
+        mock_monotonic_func: MagicMock,
+    ):
+        stuck_path = SCAN_DIR / "stuck.pcap"
+        saved = SavedScannerState(
+            file_states={}, stuck_active_paths={stuck_path}, signaled_apps={"app"}
+        )
+        store = MagicMock(spec=ScannerStateStore)
+        store.load.return_value = saved
+        mock_processor.previously_signaled_stuck_apps = {"app"}
+        mock_processor.process_one_cycle.return_value = ({}, set(), {stuck_path})
+        setup_stop_event_for_cycles(mock_stop_event, num_cycles=1)
+        setup_monotonic_time_for_cycles(
+            mock_monotonic_func, num_cycles=1, cycle_duration=MOCK_MONO_CYCLE_DURATION
+        )
+        thread = ScanThread(
+            processor=mock_processor,
+            stop_event=mock_stop_event,
+            scan_interval_seconds=SCAN_INTERVAL,
+            sleep_func=mock_sleep_func,
+            monotonic_func=mock_monotonic_func,
+            name=THREAD_NAME,
+            state_store=store,
+        )
+
+        thread.run()
+
+        mock_processor.restore_saved_state.assert_called_once_with(saved)
+        first_call = mock_processor.process_one_cycle.call_args_list[0]
+        assert first_call.kwargs["previously_stuck_active_paths"] == {stuck_path}
+        # Once after the first cycle, once on exit
+        assert store.save.call_count == 2
+        store.save.assert_called_with(
+            file_states={}, stuck_active_paths={stuck_path}, signaled_apps={"app"}
+        )
+
+
 class TestScanThreadStop:
     def test_stop_method_sets_event_and_logs_info(
         self,
@@ -592,3 +732,58 @@ class TestScanThreadStop:
         assert find_log_record(
             caplog, logging.DEBUG, [f"{THREAD_NAME} is already stopping or has stopped"]
         )
+
+
+class TestScanThreadCycleStats:
+    QUIET = CycleMetrics(entries=3, new_files=0, changed_files=0, removed_files=0)
+    ARRIVING = CycleMetrics(entries=4, new_files=1, changed_files=0, removed_files=0)
+
+    def make_thread(self, processor, stop_event, monotonic_func) -> ScanThread:
+        return ScanThread(
+            processor=processor,
+            stop_event=stop_event,
+            scan_interval_seconds=4.0,
+            sleep_func=MagicMock(),
+            monotonic_func=monotonic_func,
+            name=THREAD_NAME,
+            interval_policy=AdaptiveScanInterval(
+                min_seconds=1.0, max_seconds=10.0, initial_seconds=4.0
+            ),
+        )
+
+    def test_interval_follows_cycle_metrics_and_stats_are_counted(
+        self, mock_processor, mock_stop_event, mock_monotonic_func
+    ):
+        thread = self.make_thread(mock_processor, mock_stop_event, mock_monotonic_func)
+
+        mock_processor.last_cycle_metrics = self.QUIET
+        thread.record_cycle(success=True, cycle_seconds=0.5, now=10.0)
+        assert thread.current_interval_seconds == pytest.approx(6.0)
+
+        mock_processor.last_cycle_metrics = self.ARRIVING
+        thread.record_cycle(success=True, cycle_seconds=2.0, now=20.0)
+        assert thread.current_interval_seconds == pytest.approx(1.0)
+
+        thread.record_cycle(success=False, cycle_seconds=1.5, now=30.0)
+
+        stats = thread.stats()
+        assert (stats.cycles, stats.failed_cycles, stats.overruns) == (3, 1, 1)
+        assert stats.max_cycle_seconds == 2.0
+        assert stats.last_cycle_seconds == 1.5
+        assert stats.interval_seconds == pytest.approx(1.0)
+        assert stats.last_metrics == self.ARRIVING
+
+    def test_interval_is_shortened_to_the_next_file_deadline(
+        self, mock_processor, mock_stop_event, mock_monotonic_func
+    ):
+        thread = self.make_thread(mock_processor, mock_stop_event, mock_monotonic_func)
+        table = MagicMock(spec=FileStateTable)
+        table.seconds_until_next_deadline.return_value = 2.0
+        thread._current_file_states = table
+        mock_processor.last_cycle_metrics = self.QUIET
+
+        thread.record_cycle(success=True, cycle_seconds=0.1, now=10.0)
+
+        table.seconds_until_next_deadline.assert_called_once_with(10.0)
+        assert thread.current_interval_seconds == pytest.approx(2.1)
+        assert thread.interval_policy.interval_seconds == pytest.approx(6.0)
@@ -0,0 +1,199 @@
+import logging
+from pathlib import Path
+from queue import Queue
+from unittest.mock import MagicMock
+
+import pytest
+
+from datamover.file_functions.fs_mock import FS
+from datamover.file_functions.gather_entry_data import GatheredEntryData
+from datamover.scanner.do_single_cycle import DoSingleCycle
+from datamover.scanner.file_state_record import FileStateRecord
+from datamover.scanner.file_state_table import FileStateTable
+from datamover.scanner.scanner_state_store import (
+    FORMAT_HEADER,
+    ScannerStateStore,
+    reconcile_with_scan,
+)
+from tests.test_utils.logging_helpers import find_log_record
+
+SCAN_DIR = Path("/data/source")
+LOST_TIMEOUT = 30.0
+STUCK_TIMEOUT = 60.0
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _record(name: str, size: int, mtime: float, first_seen: float) -> FileStateRecord:
+    return FileStateRecord(
+        path=SCAN_DIR / name,
+        size=size,
+        mtime_wall=mtime,
+        first_seen_mono=first_seen,
+        prev_scan_size=size - 1,
+        prev_scan_mtime_wall=mtime - 1.0,
+    )
+
+
+def _entry(name: str, size: int, mtime: float) -> GatheredEntryData:
+    return GatheredEntryData(mtime=mtime, size=size, path=SCAN_DIR / name)
+
+
+def _store(tmp_path: Path, wall: FakeClock, mono: FakeClock) -> ScannerStateStore:
+    return ScannerStateStore(
+        state_path=tmp_path / "scanner.state",
+        directory=SCAN_DIR,
+        fs=FS(),
+        time_func=wall,
+        monotonic_func=mono,
+        fsync_func=lambda fd: None,
+    )
+
+
+def test_round_trip_converts_first_seen_through_wall_clock(tmp_path):
+    wall, mono = FakeClock(1_700_000_000.0), FakeClock(500.0)
+    record = _record("app1-1.pcap", 100, 1_699_999_990.0, first_seen=460.0)
+
+    assert _store(tmp_path, wall, mono).save(
+        file_states={record.path: record},
+        stuck_active_paths={record.path, Path("/elsewhere/x.pcap")},
+        signaled_apps={"app1"},
+    )
+
+    # New process: monotonic clock restarted, 100s of wall time later
+    wall.now += 100.0
+    mono.now = 7.0
+    saved = _store(tmp_path, wall, mono).load()
+
+    restored = saved.file_states[record.path]
+    assert restored.first_seen_mono == pytest.approx(7.0 - 140.0)
+    assert (restored.size, restored.mtime_wall) == (100, record.mtime_wall)
+    assert (restored.prev_scan_size, restored.prev_scan_mtime_wall) == (
+        record.prev_scan_size,
+        record.prev_scan_mtime_wall,
+    )
+    assert saved.stuck_active_paths == {record.path}
+    assert saved.signaled_apps == {"app1"}
+    assert not (tmp_path / "scanner.state.tmp").exists()
+
+
+def test_load_without_file_returns_none(tmp_path):
+    assert _store(tmp_path, FakeClock(0.0), FakeClock(0.0)).load() is None
+
+
+@pytest.mark.parametrize(
+    "content, message",
+    [
+        (b"something else\n", "unknown format"),
+        (FORMAT_HEADER + b"D\t/other/dir\n", "is for '/other/dir'"),
+        (FORMAT_HEADER + b"D\t/data/source\nF\tnot-a-number\n", "could not be read"),
+    ],
+    ids=["header", "directory", "corrupt"],
+)
+def test_load_ignores_unusable_state(tmp_path, caplog, content, message):
+    (tmp_path / "scanner.state").write_bytes(content)
+
+    assert _store(tmp_path, FakeClock(0.0), FakeClock(0.0)).load() is None
+    assert find_log_record(caplog, logging.WARNING, [message])
+
+
+def test_save_failure_is_logged(tmp_path, caplog):
+    store = ScannerStateStore(
+        state_path=tmp_path / "missing_dir" / "scanner.state",
+        directory=SCAN_DIR,
+        fs=FS(),
+    )
+
+    assert not store.save(file_states={}, stuck_active_paths=(), signaled_apps=())
+    assert find_log_record(caplog, logging.ERROR, ["save failed"])
+
+
+def test_save_replaces_the_state_file_through_the_fs(tmp_path, caplog):
+    def _replace(src, dst):
+        raise OSError("replace refused")
+
+    store = ScannerStateStore(
+        state_path=tmp_path / "scanner.state",
+        directory=SCAN_DIR,
+        fs=FS(replace=_replace),
+        fsync_func=lambda fd: None,
+    )
+
+    assert not store.save(file_states={}, stuck_active_paths=(), signaled_apps=())
+    assert find_log_record(caplog, logging.ERROR, ["replace refused"])
+    assert not (tmp_path / "scanner.state").exists()
+
+
+def test_reconcile_keeps_only_files_that_can_be_the_same():
+    saved = {
+        r.path: r
+        for r in (
+            _record("grown.pcap", 10, 100.0, 0.0),
+            _record("same.pcap", 10, 100.0, 0.0),
+            _record("shrunk.pcap", 10, 100.0, 0.0),
+            _record("older.pcap", 10, 100.0, 0.0),
+            _record("gone.pcap", 10, 100.0, 0.0),
+        )
+    }
+    gathered = [
+        _entry("grown.pcap", 20, 110.0),
+        _entry("same.pcap", 10, 100.0),
+        _entry("shrunk.pcap", 5, 110.0),
+        _entry("older.pcap", 10, 90.0),
+        _entry("new.pcap", 1, 110.0),
+    ]
+
+    kept = reconcile_with_scan(saved, gathered)
+
+    assert sorted(r.path.name for r in kept) == ["grown.pcap", "same.pcap"]
+
+
+@pytest.mark.parametrize("use_table", [True, False], ids=["table", "dict"])
+def test_restart_keeps_stuck_detection_timing(tmp_path, mocker, use_table):
+    """A file stuck before a restart is reported stuck in the first cycle after it."""
+    mocker.patch("datamover.scanner.do_single_cycle.report_state_changes")
+    wall, mono = FakeClock(1_700_000_000.0), FakeClock(1000.0)
+    gathered = [_entry("app1-1.pcap", 10, wall.now)]
+    scan = mocker.patch("datamover.scanner.do_single_cycle.scan_directory_and_filter")
+    scan.return_value = gathered
+
+    def processor() -> DoSingleCycle:
+        return DoSingleCycle(
+            validated_directory_to_scan=SCAN_DIR,
+            csv_restart_directory=tmp_path,
+            extension_to_scan_no_dot="pcap",
+            lost_timeout=LOST_TIMEOUT,
+            stuck_active_file_timeout=STUCK_TIMEOUT,
+            lost_file_queue=MagicMock(spec=Queue),
+            time_func=wall,
+            monotonic_func=mono,
+            fs=FS(),
+        )
+
+    def empty_states():
+        return FileStateTable() if use_table else {}
+
+    before = processor()
+    states, lost, stuck = before.process_one_cycle(empty_states(), set(), set())
+    _store(tmp_path, wall, mono).save(
+        file_states=states, stuck_active_paths=stuck, signaled_apps=set()
+    )
+
+    # Restart just over STUCK_TIMEOUT later; the file kept growing meanwhile
+    wall.now += STUCK_TIMEOUT + 1.0
+    mono.now = 5.0
+    scan.return_value = [_entry("app1-1.pcap", 50, wall.now)]
+    after = processor()
+    after.restore_saved_state(_store(tmp_path, wall, mono).load())
+
+    _, lost, stuck = after.process_one_cycle(empty_states(), set(), set())
+
+    assert stuck == {SCAN_DIR / "app1-1.pcap"}
+    assert lost == set()
+    assert (tmp_path / "app1.restart").exists()
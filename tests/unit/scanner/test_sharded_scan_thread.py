@@ -0,0 +1,146 @@
+import logging
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from datamover.file_functions.file_exceptions import ScanDirectoryError
+from datamover.scanner.scan_thread import ScanThread
+from datamover.scanner.sharded_scan_thread import ShardedScanThread
+from tests.test_utils.logging_helpers import find_log_record
+
+MODULE_LOGGER = "datamover.scanner.sharded_scan_thread"
+SCAN_INTERVAL = 0.02
+JOIN_TIMEOUT = 5.0
+
+
+def make_scanner(directory: str) -> MagicMock:
+    scanner = MagicMock(spec=ScanThread)
+    scanner.log_scan_dir = Path(directory)
+    scanner.wake_for_deadlines = False
+    scanner.current_interval_seconds = SCAN_INTERVAL
+    scanner.run_cycle.return_value = True
+    return scanner
+
+
+def wait_until(condition, timeout: float = JOIN_TIMEOUT) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.005)
+
+
+def make_thread(scanners: list, stop_event: threading.Event, **kwargs):
+    return ShardedScanThread(
+        scanners=scanners,
+        stop_event=stop_event,
+        scan_interval_seconds=SCAN_INTERVAL,
+        monotonic_func=time.monotonic,
+        max_workers=2,
+        name="TestSharded",
+        **kwargs,
+    )
+
+
+def test_scans_every_directory_each_round_and_reports_cycle_times(caplog):
+    caplog.set_level(logging.INFO, logger=MODULE_LOGGER)
+    nic1, nic2 = make_scanner("/src/nic1"), make_scanner("/src/nic2")
+    stop_event = threading.Event()
+    thread = make_thread([nic1, nic2], stop_event, report_every=2)
+
+    thread.start()
+    wait_until(
+        lambda: nic1.run_cycle.call_count >= 3 and nic2.run_cycle.call_count >= 3
+    )
+    stop_event.set()
+    thread.join(JOIN_TIMEOUT)
+
+    assert not thread.is_alive()
+    for scanner in (nic1, nic2):
+        scanner.begin_scanning.assert_called_once_with()
+        scanner.end_scanning.assert_called_once_with()
+        assert scanner.save_state_if_due.call_count == scanner.run_cycle.call_count
+    stats = {s.directory: s for s in thread.stats()}
+    assert stats[Path("/src/nic1")].cycles == nic1.run_cycle.call_count
+    assert stats[Path("/src/nic2")].failed_cycles == 0
+    assert find_log_record(caplog, logging.INFO, ["TestSharded", "/src/nic2", "avg"])
+
+
+def test_slow_directory_is_skipped_without_delaying_the_others():
+    release = threading.Event()
+    slow, fast = make_scanner("/src/slow"), make_scanner("/src/fast")
+    slow.run_cycle.side_effect = lambda iteration: release.wait(JOIN_TIMEOUT)
+    stop_event = threading.Event()
+    thread = make_thread([slow, fast], stop_event)
+
+    thread.start()
+    wait_until(lambda: fast.run_cycle.call_count >= 4)
+    release.set()
+    stop_event.set()
+    thread.join(JOIN_TIMEOUT)
+
+    stats = {s.directory: s for s in thread.stats()}
+    assert slow.run_cycle.call_count == 1
+    assert stats[Path("/src/slow")].overruns >= 2
+    assert stats[Path("/src/fast")].overruns == 0
+
+
+def test_directory_that_cannot_be_scanned_is_dropped():
+    gone, ok = make_scanner("/src/gone"), make_scanner("/src/ok")
+    gone.run_cycle.side_effect = ScanDirectoryError(
+        "vanished", Path("/src/gone"), FileNotFoundError()
+    )
+    stop_event = threading.Event()
+    thread = make_thread([gone, ok], stop_event)
+
+    thread.start()
+    wait_until(lambda: ok.run_cycle.call_count >= 3)
+    stop_event.set()
+    thread.join(JOIN_TIMEOUT)
+
+    assert gone.run_cycle.call_count == 1
+    gone.save_state_if_due.assert_not_called()
+
+
+def test_thread_stops_when_no_directory_is_left():
+    gone = make_scanner("/src/gone")
+    gone.run_cycle.side_effect = ScanDirectoryError(
+        "vanished", Path("/src/gone"), FileNotFoundError()
+    )
+    thread = make_thread([gone], threading.Event())
+
+    thread.start()
+    thread.join(JOIN_TIMEOUT)
+
+    assert not thread.is_alive()
+    gone.end_scanning.assert_called_once_with()
+
+
+def test_failed_cycle_is_counted_and_not_saved():
+    flaky = make_scanner("/src/flaky")
+    flaky.run_cycle.return_value = False
+    stop_event = threading.Event()
+    thread = make_thread([flaky], stop_event)
+
+    thread.start()
+    wait_until(lambda: thread.stats()[0].cycles >= 2)
+    stop_event.set()
+    thread.join(JOIN_TIMEOUT)
+
+    assert thread.stats()[0].failed_cycles == thread.stats()[0].cycles
+    flaky.save_state_if_due.assert_not_called()
+
+
+def test_requires_scanners_and_workers():
+    with pytest.raises(ValueError, match="at least one scanner"):
+        make_thread([], threading.Event())
+    with pytest.raises(ValueError, match="max_workers"):
+        ShardedScanThread(
+            scanners=[make_scanner("/src/a")],
+            stop_event=threading.Event(),
+            scan_interval_seconds=SCAN_INTERVAL,
+            monotonic_func=time.monotonic,
+            max_workers=0,
+        )
@@ -398,3 +398,15 @@ def test_determine_app_restart_actions_cycle_simulation(
         logging.INFO,
         ["Newly stuck applications identified for restart signal: APP1"],
     )
+
+
+def test_determine_app_restart_actions_treats_flagged_apps_as_stuck():
+    restarts, apps = determine_app_restart_actions(
+        current_stuck_file_paths={Path("/src/APP1-ts.pcap")},
+        previously_signaled_apps={"APP1"},
+        restart_trigger_directory=RESTART_DIR,
+        flagged_apps={"APP2"},
+    )
+
+    assert restarts == {RESTART_DIR / "APP2.restart"}
+    assert apps == {"APP1", "APP2"}
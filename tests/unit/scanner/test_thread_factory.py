@@ -9,7 +9,10 @@ from datamover.file_functions.fs_mock import FS
 from datamover.protocols import SleepCallable
 from datamover.scanner.do_single_cycle import DoSingleCycle
 from datamover.scanner.scan_thread import ScanThread
-from datamover.scanner.thread_factory import create_scan_thread
+from datamover.scanner.thread_factory import (
+    create_scan_thread,
+    create_sharded_scan_thread,
+)
 
 MODULE_PATH = "datamover.scanner.thread_factory"
 
@@ -198,6 +201,13 @@ class TestCreateScanThread:
             time_func=mock_time_func,
             monotonic_func=mock_monotonic_func,
             fs=mock_fs_instance,
+            claim_registry=None,
+            fast_scan=False,
+            activity_tracker=None,
+            cadence_thresholds=None,
+            app_health=None,
+            open_writers=None,
+            manifest_index=None,
         )
         created_processor_instance = patch_do_single_cycle_constructor.return_value
 
@@ -210,6 +220,10 @@ class TestCreateScanThread:
             sleep_func=expected_sleep_for_thread,
             monotonic_func=mock_monotonic_func,
             name=expected_thread_name,
+            wake_for_deadlines=False,
+            state_store=None,
+            state_save_interval_seconds=60.0,
+            interval_policy=None,
         )
         patch_default_time_sleep.assert_not_called()
         assert returned_thread is patch_scan_thread_constructor.return_value
@@ -321,3 +335,101 @@ class TestCreateScanThread:
 
         patch_do_single_cycle_constructor.assert_not_called()
         patch_scan_thread_constructor.assert_not_called()
+
+    def test_cadence_policies_share_one_index(
+        self,
+        scanner_factory_params: dict,
+        mock_lost_file_queue: MagicMock,
+        mock_stop_event: MagicMock,
+        mock_fs_instance: MagicMock,
+        patch_resolve_validate_directory: MagicMock,
+        patch_do_single_cycle_constructor: MagicMock,
+        patch_scan_thread_constructor: MagicMock,
+    ):
+        create_scan_thread(
+            **scanner_factory_params,
+            lost_file_queue=mock_lost_file_queue,
+            stop_event=mock_stop_event,
+            fs=mock_fs_instance,
+            cadence_factors=(2.0, 4.0),
+            app_overrun_factor=3.0,
+        )
+
+        kwargs = patch_do_single_cycle_constructor.call_args.kwargs
+        assert kwargs["app_health"].overrun_factor == 3.0
+        assert kwargs["cadence_thresholds"].index is kwargs["app_health"].index
+
+    def test_open_writer_producers_build_a_proc_view_of_the_scan_directory(
+        self,
+        scanner_factory_params: dict,
+        mock_lost_file_queue: MagicMock,
+        mock_stop_event: MagicMock,
+        mock_fs_instance: MagicMock,
+        patch_resolve_validate_directory: MagicMock,
+        patch_do_single_cycle_constructor: MagicMock,
+        patch_scan_thread_constructor: MagicMock,
+    ):
+        create_scan_thread(
+            **scanner_factory_params,
+            lost_file_queue=mock_lost_file_queue,
+            stop_event=mock_stop_event,
+            fs=mock_fs_instance,
+            open_writer_producers=(("exportcliv2",), (1000,)),
+        )
+
+        kwargs = patch_do_single_cycle_constructor.call_args.kwargs
+        open_writers = kwargs["open_writers"]
+        assert open_writers.directory == kwargs["validated_directory_to_scan"]
+        assert open_writers.process_names == frozenset({"exportcliv2"})
+        assert open_writers.user_ids == frozenset({1000})
+
+
+class TestCreateShardedScanThread:
+    def test_builds_one_scanner_per_directory_with_own_state_file(
+        self,
+        scanner_factory_params: dict,
+        mock_lost_file_queue: MagicMock,
+        mock_stop_event: MagicMock,
+        mock_fs_instance: MagicMock,
+        mock_monotonic_func: MagicMock,
+        mocker,
+    ):
+        scanners = [MagicMock(spec=ScanThread) for _ in range(3)]
+        create_one = mocker.patch(
+            f"{MODULE_PATH}.create_scan_thread", side_effect=scanners
+        )
+        sharded_ctor = mocker.patch(f"{MODULE_PATH}.ShardedScanThread", autospec=True)
+        directories = [Path("/raw/nic0"), Path("/raw/nic1"), Path("/raw/nic2")]
+        state_path = Path("/base/scanner.state")
+
+        returned = create_sharded_scan_thread(
+            scan_directory_paths=directories,
+            max_workers=2,
+            csv_directory_to_put_restart_in=RAW_CSV_RESTART_DIR_PATH,
+            file_extension_to_scan=TEST_FILE_EXTENSION_NO_DOT,
+            scan_interval_seconds=TEST_SCAN_INTERVAL,
+            lost_timeout_seconds=TEST_LOST_TIMEOUT,
+            stuck_active_file_timeout_seconds=TEST_STUCK_TIMEOUT,
+            lost_file_queue=mock_lost_file_queue,
+            stop_event=mock_stop_event,
+            fs=mock_fs_instance,
+            monotonic_func=mock_monotonic_func,
+            state_file_path=state_path,
+        )
+
+        calls = create_one.call_args_list
+        assert [c.kwargs["scan_directory_path"] for c in calls] == directories
+        assert [c.kwargs["state_file_path"] for c in calls] == [
+            state_path,
+            Path("/base/scanner.state.1"),
+            Path("/base/scanner.state.2"),
+        ]
+        assert all(c.kwargs["lost_file_queue"] is mock_lost_file_queue for c in calls)
+        sharded_ctor.assert_called_once_with(
+            scanners=scanners,
+            stop_event=mock_stop_event,
+            scan_interval_seconds=TEST_SCAN_INTERVAL,
+            monotonic_func=mock_monotonic_func,
+            max_workers=2,
+        )
+        assert returned is sharded_ctor.return_value
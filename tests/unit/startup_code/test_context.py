@@ -3,6 +3,10 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from datamover.file_functions.cross_device_move import CrossDeviceMover
+from datamover.file_functions.scan_directory_and_filter import (
+    fast_scan_directory_and_filter,
+)
 from datamover.protocols import FS, HttpClient, FileScanner
 from datamover.startup_code.context import AppContext, build_context
 
@@ -234,3 +238,22 @@ class TestBuildContextWithOverrides(TestBuildContext):  # Or a new class
 
         MockDefaultFSConst.assert_not_called()
         MockDefaultHttpClientConst.assert_not_called()
+
+
+def test_build_context_installs_cross_device_moves_for_tiered_storage(
+    mock_config: MagicMock,
+):
+    mock_config.tiered_storage_enabled = True
+
+    app_context = build_context(config=mock_config)
+
+    assert isinstance(app_context.fs.move.__self__, CrossDeviceMover)
+    assert app_context.fs.rename_noreplace.__self__ is app_context.fs.move.__self__
+
+
+def test_build_context_uses_fast_scanner_when_enabled(mock_config: MagicMock):
+    mock_config.fast_scan_enabled = True
+
+    app_context = build_context(config=mock_config)
+
+    assert app_context.file_scanner is fast_scan_directory_and_filter
@@ -5,7 +5,7 @@ from unittest.mock import MagicMock, patch
 import pytest
 
 from datamover.file_functions.fs_mock import FS  # Assuming this exists
-from datamover.startup_code.load_config import load_config, ConfigError
+from datamover.startup_code.load_config import load_config, ConfigError, volume_configs
 
 VALID_INI = """
 [Directories]
@@ -117,6 +117,45 @@ def test_load_config_happy_path(config_file):
 
     # Mover
     assert cfg.move_poll_interval_seconds == 1.5
+    assert cfg.fused_upload_enabled is False
+    assert cfg.noreplace_move_enabled is False
+    assert cfg.mover_worker_count == 1
+    assert cfg.duplicate_suppression_ttl_seconds == 0.0
+    assert cfg.mover_batch_size == 1
+    assert cfg.move_queue_spill_enabled is False
+    assert cfg.move_journal_enabled is False
+    assert cfg.move_retry_max_attempts == 0
+    assert cfg.move_retry_initial_delay_seconds == 1.0
+    assert cfg.move_retry_max_delay_seconds == 30.0
+    assert cfg.tiered_storage_enabled is False
+    assert cfg.cross_device_max_concurrent_copies == 2
+    assert cfg.extra_base_dirs == ()
+    assert cfg.extra_source_dirs == ()
+    assert cfg.fast_scan_enabled is False
+    assert cfg.close_write_trigger_enabled is False
+    assert cfg.deadline_wake_enabled is False
+    assert cfg.activity_tracking_enabled is False
+    assert cfg.activity_rescan_seconds == 300.0
+    assert cfg.scanner_state_enabled is False
+    assert cfg.scanner_state_save_seconds == 60.0
+    assert cfg.scanner_workers == 4
+    assert cfg.adaptive_interval_enabled is False
+    assert cfg.scanner_min_check_seconds == 1.0
+    assert cfg.scanner_max_check_seconds == 60.0
+    assert cfg.cadence_thresholds_enabled is False
+    assert cfg.cadence_lost_factor == 2.0
+    assert cfg.cadence_stuck_factor == 4.0
+    assert cfg.app_health_enabled is False
+    assert cfg.app_overrun_factor == 3.0
+    assert cfg.open_writer_check_enabled is False
+    assert cfg.open_writer_process_names == ()
+    assert cfg.open_writer_user_ids == ()
+    assert cfg.manifest_reconciliation_enabled is False
+    assert cfg.manifest_index_max_entries == 100000
+    assert cfg.manifest_index_ttl_seconds == 3600.0
+    assert cfg.modify_coalescing_enabled is False
+    assert cfg.fd_cache_max_open == 0
+    assert cfg.close_write_settle_seconds == 2.0
 
     # Scanner
     assert cfg.scanner_check_seconds == 2.0
@@ -268,6 +307,26 @@ def test_bad_float_parsing(tmp_path, config_file):
     assert "[Mover] 'move_poll_interval_seconds' ('notafloat')" in str(exc.value)
 
 
+def test_fused_upload_enabled_parsed(tmp_path, config_file):
+    txt = config_file.read_text().replace(
+        "move_poll_interval_seconds = 1.5",
+        "move_poll_interval_seconds = 1.5\nfused_upload_enabled = yes",
+    )
+    cfg_path = tmp_path / "config_modified.ini"
+    cfg_path.write_text(txt)
+
+    fs = make_fs_stub()
+    fs.exists.side_effect = (
+        lambda p: p == Path("/tmp/logs").expanduser()
+        or p == Path("/tmp/base").expanduser()
+        or p == cfg_path
+    )
+    fs.is_file.side_effect = lambda p: p == cfg_path
+
+    cfg = load_config(str(cfg_path), fs=fs)
+    assert cfg.fused_upload_enabled is True
+
+
 def test_bad_boolean(tmp_path, config_file):
     txt = config_file.read_text().replace("verify_ssl = true", "verify_ssl = maybe")
     cfg_path = tmp_path / "config_modified.ini"
@@ -831,3 +890,118 @@ def test_get_int_option_validations():
         ConfigError, match=r"\[TestInt\] 'empty_val' \(''\) must be an integer"
     ):
         _get_int_option(cp, "TestInt", "empty_val")
+
+
+def test_extra_base_dirs_give_one_config_per_volume(config_file):
+    config_file.write_text(
+        VALID_INI.replace(
+            "logger_dir = /tmp/logs\n",
+            "logger_dir = /tmp/logs\nextra_base_dirs = /tmp/disk2, /tmp/disk3\n",
+        )
+    )
+    fs = make_fs_stub()
+
+    cfg = load_config(str(config_file), fs=fs)
+    volumes = volume_configs(cfg)
+
+    assert cfg.extra_base_dirs == (Path("/tmp/disk2"), Path("/tmp/disk3"))
+    assert [v.base_dir for v in volumes] == [
+        Path("/tmp/base"),
+        Path("/tmp/disk2"),
+        Path("/tmp/disk3"),
+    ]
+    assert volumes[0] is cfg
+    assert volumes[1].source_dir == Path("/tmp/disk2/source")
+    assert volumes[2].uploaded_dir == Path("/tmp/disk3/uploaded")
+    assert volumes[1].logger_dir == cfg.logger_dir
+    assert volumes[1].remote_host_url == cfg.remote_host_url
+    assert volumes[1].extra_base_dirs == ()
+
+
+def test_extra_base_dirs_rejects_base_dir(config_file):
+    config_file.write_text(
+        VALID_INI.replace(
+            "logger_dir = /tmp/logs\n",
+            "logger_dir = /tmp/logs\nextra_base_dirs = /tmp/base\n",
+        )
+    )
+
+    with pytest.raises(ConfigError, match="listed twice"):
+        load_config(str(config_file), fs=make_fs_stub())
+
+
+def test_extra_source_dirs_belong_to_the_first_volume_only(config_file):
+    config_file.write_text(
+        VALID_INI.replace(
+            "logger_dir = /tmp/logs\n",
+            "logger_dir = /tmp/logs\nextra_base_dirs = /tmp/disk2\n"
+            "extra_source_dirs = /tmp/nic1, /tmp/nic2\n",
+        )
+    )
+
+    cfg = load_config(str(config_file), fs=make_fs_stub())
+    volumes = volume_configs(cfg)
+
+    assert cfg.extra_source_dirs == (Path("/tmp/nic1"), Path("/tmp/nic2"))
+    assert volumes[1].extra_source_dirs == ()
+
+
+def test_extra_source_dirs_rejects_source_dir(config_file):
+    config_file.write_text(
+        VALID_INI.replace(
+            "logger_dir = /tmp/logs\n",
+            "logger_dir = /tmp/logs\nextra_source_dirs = /tmp/base/source\n",
+        )
+    )
+
+    with pytest.raises(ConfigError, match="or is the source dir"):
+        load_config(str(config_file), fs=make_fs_stub())
+
+
+def test_cadence_stuck_factor_must_exceed_lost_factor(config_file):
+    config_file.write_text(
+        VALID_INI.replace(
+            "[Scanner]\n",
+            "[Scanner]\ncadence_lost_factor = 3.0\ncadence_stuck_factor = 3.0\n",
+        )
+    )
+
+    with pytest.raises(ConfigError, match="cadence_stuck_factor"):
+        load_config(str(config_file), fs=make_fs_stub())
+
+
+def test_app_overrun_factor_must_exceed_one(config_file):
+    config_file.write_text(
+        VALID_INI.replace("[Scanner]\n", "[Scanner]\napp_overrun_factor = 1.0\n")
+    )
+
+    with pytest.raises(ConfigError, match="app_overrun_factor"):
+        load_config(str(config_file), fs=make_fs_stub())
+
+
+def test_open_writer_producers_are_parsed(config_file):
+    config_file.write_text(
+        VALID_INI.replace(
+            "[Scanner]\n",
+            "[Scanner]\nopen_writer_check_enabled = true\n"
+            "open_writer_process_names = exportcliv2, tcpdump\n"
+            "open_writer_users = root, 1234\n",
+        )
+    )
+
+    cfg = load_config(str(config_file), fs=make_fs_stub())
+
+    assert cfg.open_writer_check_enabled is True
+    assert cfg.open_writer_process_names == ("exportcliv2", "tcpdump")
+    assert cfg.open_writer_user_ids == (0, 1234)
+
+
+def test_open_writer_users_must_exist(config_file):
+    config_file.write_text(
+        VALID_INI.replace(
+            "[Scanner]\n", "[Scanner]\nopen_writer_users = no-such-user-here\n"
+        )
+    )
+
+    with pytest.raises(ConfigError, match="no-such-user-here"):
+        load_config(str(config_file), fs=make_fs_stub())
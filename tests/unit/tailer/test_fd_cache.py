@@ -0,0 +1,120 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from datamover.file_functions.fs_mock import FS
+from datamover.tailer.fd_cache import FileReplacedError, TailFileCache
+
+
+@pytest.fixture
+def csv_file(tmp_path: Path) -> Path:
+    path = tmp_path / "app.csv"
+    path.write_bytes(b"line one\n")
+    return path
+
+
+def append(path: Path, data: bytes) -> None:
+    with open(path, "ab") as f:
+        f.write(data)
+
+
+def test_reads_appends_from_the_held_descriptor(csv_file: Path):
+    cache = TailFileCache(max_open=4, fs=FS())
+    start = cache.stat(csv_file).st_size
+
+    append(csv_file, b"line two\n")
+
+    size = cache.stat(csv_file).st_size
+    assert cache.pread(csv_file, size - start, start) == b"line two\n"
+    assert len(cache) == 1
+
+
+def test_least_recently_used_descriptor_is_closed_first(tmp_path: Path):
+    paths = [tmp_path / f"app-{i}.csv" for i in range(3)]
+    for path in paths:
+        path.write_bytes(b"x\n")
+    cache = TailFileCache(max_open=2, fs=FS())
+
+    cache.stat(paths[0])
+    cache.stat(paths[1])
+    cache.stat(paths[0])  # paths[1] is now the least recently used
+    cache.stat(paths[2])
+
+    assert list(cache._open) == [paths[0], paths[2]]
+    # An evicted file is reopened transparently
+    assert cache.pread(paths[1], 2, 0) == b"x\n"
+
+
+def test_replacement_under_the_same_name_is_reported(csv_file: Path, tmp_path: Path):
+    cache = TailFileCache(max_open=4, fs=FS())
+    cache.stat(csv_file)
+    replacement = tmp_path / "app.csv.tmp"
+    replacement.write_bytes(b"new\n")
+
+    os.replace(replacement, csv_file)  # Old inode unlinked while held
+
+    with pytest.raises(FileReplacedError) as exc_info:
+        cache.stat(csv_file)
+    assert exc_info.value.stat_result.st_size == 4
+    assert cache.stat(csv_file).st_size == 4  # The new file is held from now on
+
+
+def test_replacement_is_reported_after_eviction(csv_file: Path, tmp_path: Path):
+    other = tmp_path / "other.csv"
+    other.write_bytes(b"")
+    cache = TailFileCache(max_open=1, fs=FS())
+    cache.stat(csv_file)
+    cache.stat(other)  # Evicts csv_file, keeping its identity
+
+    keep_old_inode = tmp_path / "app.csv.old"
+    os.link(csv_file, keep_old_inode)
+    os.unlink(csv_file)
+    csv_file.write_bytes(b"new\n")
+
+    with pytest.raises(FileReplacedError):
+        cache.stat(csv_file)
+
+
+def test_forget_closes_and_drops_the_identity(csv_file: Path):
+    cache = TailFileCache(max_open=4, fs=FS())
+    cache.stat(csv_file)
+    csv_file.unlink()
+
+    with pytest.raises(FileNotFoundError):
+        cache.stat(csv_file)
+
+    cache.forget(csv_file)
+    csv_file.write_bytes(b"recreated\n")
+    assert cache.stat(csv_file).st_size == 10  # Not reported as a replacement
+
+
+def test_close_all_releases_every_descriptor(csv_file: Path):
+    cache = TailFileCache(max_open=4, fs=FS())
+    cache.stat(csv_file)
+
+    cache.close_all()
+
+    assert len(cache) == 0
+
+
+def test_max_open_must_be_positive():
+    with pytest.raises(ValueError):
+        TailFileCache(max_open=0, fs=FS())
+
+
+def test_files_are_opened_through_the_fs(csv_file: Path):
+    real_fs = FS()
+    opened = []
+
+    def _open(path, mode, **kwargs):
+        opened.append((path, mode))
+        return real_fs.open(path, mode, **kwargs)
+
+    cache = TailFileCache(max_open=4, fs=FS(open=_open))
+
+    cache.stat(csv_file)
+    cache.stat(csv_file)
+
+    assert opened == [(csv_file, "rb")]
+    cache.close_all()
@@ -25,6 +25,7 @@ from datamover.tailer.data_class import (
     MovedEvent,
 )
 from datamover.tailer.handler import MappingEventHandler
+from datamover.tailer.modify_coalescer import ModifyCoalescer
 from tests.test_utils.logging_helpers import (
     find_log_record,
 )
@@ -442,6 +443,47 @@ def test_on_modified_file(
     )
 
 
+def test_on_modified_coalesces_a_burst_into_one_event(handler_and_deps):
+    handler, file_map, queue_mock, watched_dir = handler_and_deps
+    handler.coalescer = ModifyCoalescer()
+    file_to_modify = watched_dir / f"myfile.{EXT}"
+    file_map.add(str(file_to_modify))
+    modify_event = make_event(FileModifiedEvent, file_to_modify)
+
+    for _ in range(100):
+        handler.on_modified(modify_event)
+
+    queue_mock.put.assert_called_once()
+    assert queue_mock.put.call_args.args[0] == ModifiedEvent(path=str(file_to_modify))
+    assert handler.fs.resolve.call_count == 1  # Coalesced events skip the checks
+    stats = handler.coalescer.stats()
+    assert (stats.modified_events, stats.enqueued) == (100, 1)
+
+    # Once the consumer picks the event up, the next write queues a new one
+    handler.coalescer.clear(str(file_to_modify))
+    handler.on_modified(modify_event)
+    assert queue_mock.put.call_count == 2
+
+
+def test_on_modified_failed_put_does_not_leave_path_pending(
+    handler_and_deps, mocker: MagicMock
+):
+    handler, file_map, _, watched_dir = handler_and_deps
+    handler.coalescer = ModifyCoalescer()
+    file_to_modify = watched_dir / f"myfile.{EXT}"
+    file_map.add(str(file_to_modify))
+    patched_safe_put = mocker.patch(
+        "datamover.tailer.handler.safe_put", side_effect=QueuePutError("full")
+    )
+
+    handler.on_modified(make_event(FileModifiedEvent, file_to_modify))
+    patched_safe_put.side_effect = None
+    handler.on_modified(make_event(FileModifiedEvent, file_to_modify))
+
+    assert patched_safe_put.call_count == 2
+    assert handler.coalescer.stats().enqueued == 1
+
+
 @pytest.mark.parametrize("is_tracked_initially", [True, False])
 def test_on_deleted_file_inside_watched_dir(
     handler_and_deps, caplog: pytest.LogCaptureFixture, is_tracked_initially: bool
@@ -0,0 +1,41 @@
+from datamover.tailer.modify_coalescer import CoalescingStats, ModifyCoalescer
+
+
+def test_only_the_first_mark_of_a_pending_path_enqueues():
+    coalescer = ModifyCoalescer()
+
+    results = [coalescer.mark("/csv/app.csv") for _ in range(5)]
+
+    assert results == [True, False, False, False, False]
+    assert coalescer.mark("/csv/other.csv") is True
+    assert coalescer.stats() == CoalescingStats(modified_events=6, enqueued=2)
+
+
+def test_clear_lets_the_next_mark_enqueue_again():
+    coalescer = ModifyCoalescer()
+    coalescer.mark("/csv/app.csv")
+
+    coalescer.clear("/csv/app.csv")
+
+    assert coalescer.mark("/csv/app.csv") is True
+    assert coalescer.stats().enqueued == 2
+
+
+def test_release_undoes_an_unqueued_mark():
+    coalescer = ModifyCoalescer()
+    coalescer.mark("/csv/app.csv")
+
+    coalescer.release("/csv/app.csv")
+    coalescer.release("/csv/app.csv")  # Not pending: no effect
+
+    stats = coalescer.stats()
+    assert (stats.modified_events, stats.enqueued) == (1, 0)
+    assert coalescer.mark("/csv/app.csv") is True
+
+
+def test_stats_ratio_and_coalesced():
+    stats = CoalescingStats(modified_events=120, enqueued=4)
+
+    assert stats.coalesced == 116
+    assert stats.ratio == 30.0
+    assert CoalescingStats(modified_events=0, enqueued=0).ratio == 0.0
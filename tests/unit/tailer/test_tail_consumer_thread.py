@@ -8,6 +8,7 @@ from unittest.mock import MagicMock
 import pytest
 
 from datamover.tailer.data_class import TailerQueueEvent, CreatedEvent
+from datamover.tailer.modify_coalescer import ModifyCoalescer
 from datamover.tailer.tail_consumer_thread import TailConsumerThread
 from datamover.tailer.tail_processor import TailProcessor
 
@@ -267,6 +268,34 @@ def test_thread_stops_if_event_set_before_run_loop(
     # mock_processor (if passed to factory) should not have process_event called.
 
 
+def test_coalescing_stats_logged_on_stop(
+    event_queue, stop_event, mock_processor, caplog
+):
+    coalescer = ModifyCoalescer()
+    for _ in range(6):
+        coalescer.mark("/csv/app.csv")
+    coalescer.clear("/csv/app.csv")
+    for _ in range(4):
+        coalescer.mark("/csv/app.csv")
+    thread = TailConsumerThread(
+        event_queue=event_queue,
+        stop_event=stop_event,
+        processor=mock_processor,
+        name="Coalescing",
+        poll_interval=TEST_POLL_INTERVAL,
+        coalescer=coalescer,
+    )
+    caplog.set_level(logging.INFO)
+
+    stop_event.set()
+    thread.run()
+
+    assert (
+        "Coalescing: 10 modify notifications coalesced into 2 reads (5.0 per read)."
+        in caplog.text
+    )
+
+
 def test_error_during_processor_process_event(
     consumer_thread_factory, event_queue, mock_processor, stop_event, caplog
 ):
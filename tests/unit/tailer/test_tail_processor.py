@@ -5,6 +5,9 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
+from datamover.file_functions.fs_mock import FS
+from datamover.queues.claim_registry import ClaimRegistry
+from datamover.queues.manifest_index import ManifestIndex
 from datamover.queues.queue_functions import QueuePutError
 from datamover.tailer.data_class import (
     TailerQueueEvent,
@@ -18,6 +21,8 @@ from datamover.tailer.parse_csv_line import (
     ParsedLine,
     LineParsingError,
 )
+from datamover.tailer.fd_cache import TailFileCache
+from datamover.tailer.modify_coalescer import ModifyCoalescer
 from datamover.tailer.tail_processor import TailProcessor
 from tests.test_utils.logging_helpers import find_log_record
 
@@ -779,3 +784,169 @@ class TestTailProcessorUnit:
             logging.WARNING,
             [f"Unhandled event type: {type(unhandled_event_instance)}"],
         )
+
+
+# --- Default enqueuer with a claim registry ---
+
+
+def test_default_enqueue_skips_paths_in_claim_registry(configured_mock_fs: MagicMock):
+    move_queue: Queue[Path] = Queue()
+    registry = ClaimRegistry(completed_ttl_seconds=60.0)
+    proc = TailProcessor(
+        fs=configured_mock_fs,
+        move_queue=move_queue,
+        move_queue_name="registry_q",
+        claim_registry=registry,
+    )
+    target = Path("/source/app-1.pcap")
+
+    proc.enqueuer(target)
+    proc.enqueuer(target)  # duplicate announcement
+
+    assert move_queue.qsize() == 1
+    assert registry.stats().suppressed_by_source == {"tailer": 1}
+
+
+def test_default_enqueue_releases_claim_when_put_fails(configured_mock_fs: MagicMock):
+    registry = ClaimRegistry(completed_ttl_seconds=60.0)
+    proc = TailProcessor(
+        fs=configured_mock_fs,
+        move_queue=MagicMock(spec=Queue),
+        move_queue_name="registry_q",
+        claim_registry=registry,
+    )
+    target = Path("/source/app-1.pcap")
+
+    with patch(SAFE_PUT_PATH, side_effect=QueuePutError("full")):
+        with pytest.raises(QueuePutError):
+            proc.enqueuer(target)
+
+    # The failed put must not block a later announcement
+    assert registry.try_register(target, source="scanner") is True
+
+
+def test_parsed_lines_are_recorded_in_manifest_index_even_if_put_fails(
+    configured_mock_fs: MagicMock,
+):
+    index = ManifestIndex(max_entries=10, ttl_seconds=60.0)
+    proc = TailProcessor(
+        fs=configured_mock_fs,
+        move_queue=MagicMock(spec=Queue),
+        move_queue_name="manifest_q",
+        manifest_index=index,
+    )
+    target = Path("/source/app-1.pcap")
+    line = f"1700000000,{target},{'ab' * 32}\n".encode()
+
+    with patch(SAFE_PUT_PATH, side_effect=QueuePutError("full")):
+        proc._process_new_lines(Path("/csv/app.csv"), line)
+
+    entry = index.get(target)
+    assert entry is not None
+    assert (entry.path, entry.timestamp, entry.sha256_hash) == (
+        target,
+        1700000000,
+        "ab" * 32,
+    )
+
+
+def test_modified_event_clears_the_coalescer_flag_before_reading(
+    configured_mock_fs: MagicMock,
+):
+    coalescer = ModifyCoalescer()
+    proc = TailProcessor(
+        fs=configured_mock_fs,
+        move_queue=MagicMock(spec=Queue),
+        move_queue_name="coalesce_q",
+        coalescer=coalescer,
+    )
+    path_str = "/csv/app.csv"
+    coalescer.mark(path_str)
+    flag_when_read = []
+    configured_mock_fs.exists.side_effect = lambda p: flag_when_read.append(
+        coalescer.mark(path_str)
+    )
+
+    proc.process_event(ModifiedEvent(path=path_str))
+
+    # A write landing while the file is read queues a fresh event
+    assert flag_when_read == [True]
+
+
+def _manifest_line(target: Path) -> bytes:
+    return f"1700000000,{target},{'ab' * 32}\n".encode()
+
+
+@pytest.fixture
+def cached_processor(configured_mock_fs: MagicMock) -> TailProcessor:
+    return TailProcessor(
+        fs=configured_mock_fs,
+        move_queue=Queue(),
+        move_queue_name="fd_cache_q",
+        fd_cache=TailFileCache(max_open=4, fs=FS()),
+    )
+
+
+def test_fd_cache_reads_appends_without_the_fs_object(
+    cached_processor: TailProcessor, configured_mock_fs: MagicMock, tmp_path: Path
+):
+    csv_path = tmp_path / "app.csv"
+    csv_path.write_bytes(_manifest_line(Path("/source/old.pcap")))
+    cached_processor.process_event(InitialFoundEvent(path=str(csv_path)))
+
+    with open(csv_path, "ab") as f:
+        f.write(_manifest_line(Path("/source/app-1.pcap")))
+        f.write(_manifest_line(Path("/source/app-2.pcap"))[:10])
+    cached_processor.process_event(ModifiedEvent(path=str(csv_path)))
+
+    assert cached_processor.move_queue.get_nowait() == Path("/source/app-1.pcap")
+    assert cached_processor.move_queue.empty()
+    assert cached_processor.file_positions[csv_path] == csv_path.stat().st_size
+    assert cached_processor.file_buffers[csv_path] == b"1700000000"
+    configured_mock_fs.exists.assert_not_called()
+    configured_mock_fs.stat.assert_not_called()
+    configured_mock_fs.open.assert_not_called()
+
+
+def test_fd_cache_tracks_a_replaced_file_from_its_eof(
+    cached_processor: TailProcessor, tmp_path: Path, caplog: pytest.LogCaptureFixture
+):
+    caplog.set_level(logging.WARNING)
+    csv_path = tmp_path / "app.csv"
+    csv_path.write_bytes(b"")
+    cached_processor.process_event(InitialFoundEvent(path=str(csv_path)))
+    replacement = tmp_path / "app.csv.tmp"
+    replacement.write_bytes(_manifest_line(Path("/source/replayed.pcap")))
+    replacement.replace(csv_path)
+
+    cached_processor.process_event(ModifiedEvent(path=str(csv_path)))
+
+    assert cached_processor.move_queue.empty()
+    assert find_log_record(caplog, logging.WARNING, ["File replaced", str(csv_path)])
+    with open(csv_path, "ab") as f:
+        f.write(_manifest_line(Path("/source/app-1.pcap")))
+    cached_processor.process_event(ModifiedEvent(path=str(csv_path)))
+    assert cached_processor.move_queue.get_nowait() == Path("/source/app-1.pcap")
+
+
+def test_fd_cache_descriptor_released_on_delete_and_move(
+    cached_processor: TailProcessor, tmp_path: Path
+):
+    a_path, b_path = tmp_path / "a.csv", tmp_path / "b.csv"
+    a_path.write_bytes(b"")
+    b_path.write_bytes(b"")
+    cached_processor.process_event(InitialFoundEvent(path=str(a_path)))
+    cached_processor.process_event(InitialFoundEvent(path=str(b_path)))
+    assert len(cached_processor.fd_cache) == 2
+
+    a_path.unlink()
+    cached_processor.process_event(DeletedEvent(path=str(a_path)))
+    moved = tmp_path / "b.csv.1"
+    b_path.rename(moved)
+    cached_processor.process_event(
+        MovedEvent(src_path=str(b_path), dest_path=str(moved))
+    )
+
+    assert set(cached_processor.fd_cache._open) == {moved}
+    cached_processor.close()
+    assert len(cached_processor.fd_cache) == 0
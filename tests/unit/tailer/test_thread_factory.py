@@ -10,6 +10,7 @@ from datamover.file_functions.file_exceptions import ScanDirectoryError
 from datamover.protocols import FileScanner
 from datamover.queues.queue_functions import QueuePutError
 from datamover.tailer.data_class import TailerQueueEvent, InitialFoundEvent
+from datamover.tailer.modify_coalescer import ModifyCoalescer
 from datamover.tailer.tail_consumer_thread import TailConsumerThread
 from datamover.tailer.thread_factory import (
     create_csv_tailer_thread,
@@ -147,6 +148,7 @@ class TestCreateCsvTailerThread:
             watched_directory=csv_dir_to_watch,
             fs=mock_fs,
             file_extension=TEST_CSV_EXTENSION_NO_DOT,
+            coalescer=None,
         )
 
         MockObserver_arg.assert_called_once_with()
@@ -161,6 +163,10 @@ class TestCreateCsvTailerThread:
             fs=mock_fs,
             move_queue=move_queue,
             move_queue_name=expected_processor_q_name,
+            claim_registry=None,
+            manifest_index=None,
+            coalescer=None,
+            fd_cache=None,
         )
 
         # The constructor mock (MockTailConsumerThread_arg) is checked here
@@ -170,6 +176,7 @@ class TestCreateCsvTailerThread:
             processor=mock_processor_instance,
             name=expected_consumer_name,  # SUT passes this name to constructor
             poll_interval=TEST_POLE_INTERVAL,
+            coalescer=None,
         )
         assert isinstance(
             tail_thread, TailConsumerThread
@@ -262,6 +269,7 @@ class TestCreateCsvTailerThread:
             watched_directory=csv_dir_to_watch,
             fs=mock_fs,
             file_extension=TEST_CSV_EXTENSION_NO_DOT,
+            coalescer=None,
         )
         mock_observer_instance.schedule.assert_called_once()
 
@@ -280,6 +288,41 @@ class TestCreateCsvTailerThread:
         assert observer is mock_observer_instance
         assert tail_thread is MockTailConsumerThread_arg.return_value
 
+    def test_coalescing_shares_one_coalescer(
+        self,
+        mock_safe_put_arg: MagicMock,
+        MockObserver_arg: MagicMock,
+        MockMappingEventHandler_arg: MagicMock,
+        MockTailProcessor_arg: MagicMock,
+        MockTailConsumerThread_arg: MagicMock,
+        mock_config: MagicMock,
+        event_queue: queue.Queue,
+        move_queue: queue.Queue,
+        mock_stop_event: MagicMock,
+        mock_fs: MagicMock,
+        mock_file_scanner: MagicMock,
+    ):
+        csv_dir_to_watch = mock_config.csv_dir
+        csv_dir_to_watch.mkdir(parents=True, exist_ok=True)
+        mock_file_scanner.return_value = []
+
+        create_csv_tailer_thread(
+            csv_directory_to_watch=csv_dir_to_watch,
+            csv_file_extension_no_dot=TEST_CSV_EXTENSION_NO_DOT,
+            event_queue=event_queue,
+            move_queue=move_queue,
+            stop_event=mock_stop_event,
+            fs=mock_fs,
+            file_scanner=mock_file_scanner,
+            poll_interval=TEST_POLE_INTERVAL,
+            coalesce_modified_events=True,
+        )
+
+        coalescer = MockMappingEventHandler_arg.call_args.kwargs["coalescer"]
+        assert isinstance(coalescer, ModifyCoalescer)
+        assert MockTailProcessor_arg.call_args.kwargs["coalescer"] is coalescer
+        assert MockTailConsumerThread_arg.call_args.kwargs["coalescer"] is coalescer
+
     def test_initial_scan_raises_scan_directory_error(
         self,
         mock_safe_put_arg: MagicMock,
@@ -9,7 +9,7 @@ import pytest
 from datamover.file_functions.fs_mock import FS  # Renamed from RealFS for consistency
 from datamover.file_functions.move_file_safely import move_file_safely_impl
 from datamover.file_functions.scan_directory_and_filter import (
-    scan_directory_and_filter,
+    iter_directory_and_filter,
 )
 
 # HttpClient for spec
@@ -158,7 +158,7 @@ class TestCreateUploaderThread:
             stop_event=stop_event,
             poll_interval=default_uploader_op_settings.poll_interval_seconds,
             heartbeat_interval=default_uploader_op_settings.heartbeat_interval_seconds,
-            file_scanner=scan_directory_and_filter,
+            file_scanner=iter_directory_and_filter,
             file_sender=mock_sender_instance,
             fs=mock_fs_dependency,
         )
@@ -7,6 +7,7 @@ from unittest.mock import MagicMock
 
 import pytest
 
+from datamover.file_functions.file_exceptions import ScanDirectoryError
 from datamover.file_functions.fs_mock import FS
 from datamover.protocols import FileScanner
 from datamover.uploader.send_file_with_retries import RetryableFileSender
@@ -670,3 +671,102 @@ class TestUploaderThreadRunLogic:
         assert len(second_empty_log_records) >= 2, (
             f"Expected empty streak log (streak=1) to appear again after recovery. Found {len(second_empty_log_records)} times."
         )
+
+    def test_scan_is_closed_before_a_bounded_batch_is_sent(
+        self,
+        validated_work_dir: Path,
+        mock_file_scanner: MagicMock,
+        mock_file_sender: MagicMock,
+        mock_fs_for_uploader: MagicMock,
+    ):
+        """Only scan_batch_size entries are read, and the scan is closed first."""
+        stop_event = threading.Event()
+        thread = UploaderThread(
+            thread_name="BatchTest",
+            validated_work_dir=validated_work_dir,
+            file_extension_no_dot=TEST_FILE_EXTENSION,
+            stop_event=stop_event,
+            poll_interval=TEST_POLL_INTERVAL,
+            heartbeat_interval=TEST_HEARTBEAT_INTERVAL,
+            file_scanner=mock_file_scanner,
+            file_sender=mock_file_sender,
+            fs=mock_fs_for_uploader,
+            scan_batch_size=2,
+        )
+        yielded: List[Path] = []
+        closed = threading.Event()
+
+        def streaming_scan(**kwargs):
+            try:
+                for name in ("a", "b", "c"):
+                    path = validated_work_dir / f"{name}.{TEST_FILE_EXTENSION}"
+                    yielded.append(path)
+                    yield MockFileEntry(path=path)
+            finally:
+                closed.set()
+
+        mock_file_scanner.side_effect = streaming_scan
+        sent: List[Path] = []
+
+        def send(path: Path) -> bool:
+            assert closed.is_set()
+            sent.append(path)
+            if len(sent) == 2:
+                stop_event.set()
+            return True
+
+        mock_file_sender.send_file.side_effect = send
+
+        thread.start()
+        thread.join(timeout=THREAD_JOIN_TIMEOUT)
+
+        assert not thread.is_alive()
+        assert len(yielded) == 2
+        assert sent == yielded
+
+    def test_scan_error_after_entries_sends_nothing(
+        self,
+        uploader_thread_factory,
+        mock_file_scanner: MagicMock,
+        mock_file_sender: MagicMock,
+        validated_work_dir: Path,
+    ):
+        """A scan that fails partway through sends none of the entries it read."""
+        stop_event = threading.Event()
+        thread = uploader_thread_factory(custom_stop_event=stop_event)
+
+        def failing_scan(**kwargs):
+            yield MockFileEntry(path=validated_work_dir / f"a.{TEST_FILE_EXTENSION}")
+            stop_event.set()
+            raise ScanDirectoryError("boom", validated_work_dir, OSError("EIO"))
+
+        mock_file_scanner.side_effect = failing_scan
+
+        thread.start()
+        thread.join(timeout=THREAD_JOIN_TIMEOUT)
+
+        assert not thread.is_alive()
+        mock_file_sender.send_file.assert_not_called()
+        assert thread.scan_cycles_completed == 0
+
+    def test_scan_batch_size_must_be_positive(
+        self,
+        validated_work_dir: Path,
+        mock_file_scanner: MagicMock,
+        mock_file_sender: MagicMock,
+        mock_fs_for_uploader: MagicMock,
+    ):
+        """A batch must hold at least one entry."""
+        with pytest.raises(ValueError, match="scan_batch_size"):
+            UploaderThread(
+                thread_name="BadBatch",
+                validated_work_dir=validated_work_dir,
+                file_extension_no_dot=TEST_FILE_EXTENSION,
+                stop_event=threading.Event(),
+                poll_interval=TEST_POLL_INTERVAL,
+                heartbeat_interval=TEST_HEARTBEAT_INTERVAL,
+                file_scanner=mock_file_scanner,
+                file_sender=mock_file_sender,
+                fs=mock_fs_for_uploader,
+                scan_batch_size=0,
+            )